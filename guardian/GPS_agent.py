@@ -1,52 +1,55 @@
-import time
 import logging
-from typing import Tuple, Generator
-from math import radians, cos, sin, asin, sqrt
+import asyncio
+from typing import Tuple, Generator, AsyncGenerator, Optional, Union, Callable
 import random
 
+from guardian.clock import SYSTEM_CLOCK
+from guardian.geodesy import distance_m
+
 def haversine(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:  #Calcule la distance en mètres entre deux points GPS
+    """Compatibilité : points en (longitude, latitude) ; voir guardian.geodesy pour (lat, lon)"""
     lon1, lat1 = coord1 #coordonnée 1 = longitude et latitude du premier point
     lon2, lat2 = coord2 #idem pour le deuxième point
-    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2]) #convertir en radians pour faire de la trigonométrie et calculer les distances
-    dlon = lon2 - lon1 #calcul de la diff de longitude entre deux points
-    dlat = lat2 - lat1 #idem pour la latitude
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2 #formule de Haversine 
-    c = 2 * asin(sqrt(a)) #convertit a en radian donc résultat en distance angulaire
-    r = 6371000 #rayon moyen de la terre
-    return c * r #calcul de la distance linéaire entre 2 points
+    return distance_m((lat1, lon1), (lat2, lon2))
 
 class StaticAgent: #Début de l'agent statique
-    def __init__(self, distance_threshold=10, time_threshold=300): #définition du seuil à partir de quand qq est "statique"
+    def __init__(self, distance_threshold=10, time_threshold=300, clock=None): #définition du seuil à partir de quand qq est "statique"
         self.distance_threshold = distance_threshold #seuil de distance
         self.time_threshold = time_threshold #seuil de temps
+        self.clock = clock or SYSTEM_CLOCK #horloge injectable (SimulatedClock pour le rejeu accéléré)
         self.last_position = None #aucune position au départ
+        self.anchor_position = None #point où l'immobilité a commencé
         self.last_time = None #aucun temps au départ
         self.static_time = 0 #compteur de temps cumulé sans bouger
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
         self.logger.info(f"Agent statique initialisé - Seuils: {distance_threshold}m, {time_threshold}s")
 
-    def update_position(self, coord: Tuple[float, float]) -> bool: #méthode appelée à chaque nouvelle coordonnée
+    def update_position(self, coord: Tuple[float, float], timestamp: Optional[float] = None) -> bool: #méthode appelée à chaque nouvelle coordonnée
         """
         Met à jour la position et vérifie si une alerte doit être déclenchée
         
         Args:
             coord: Tuple (latitude, longitude)
+            timestamp: Horodatage du fix GPS (secondes), sinon l'heure de l'horloge
             
         Returns:
             bool: True si alerte à déclencher, False sinon
         """
         try:
-            now = time.time() #récupération de l'heure actuelle en secondes
+            now = timestamp if timestamp is not None else self.clock.now() #heure du fix GPS ou heure actuelle en secondes
             alert = False
             
             if self.last_position is None: 
                 self.last_position = coord #définition du premier point
+                self.anchor_position = coord
                 self.last_time = now #définition du premier temps
                 self.logger.info(f"Position initiale définie: {coord}")
                 return False
                 
-            dist = haversine(coord, self.last_position) #calcule la distance en mètres entre position actuelle et dernière position
+            # distance au point où l'immobilité a commencé (et non au dernier point) :
+            # le résultat ne dépend pas de la cadence des fixes (1 s, 10 s, adaptative)
+            dist = distance_m(coord, self.anchor_position)
             elapsed = now - self.last_time
             
             if dist < self.distance_threshold: #si la distance est inférieure au seuil de distance
@@ -60,6 +63,7 @@ class StaticAgent: #Début de l'agent statique
             else:
                 self.logger.debug(f"Mouvement détecté: {dist:.1f}m")
                 self.static_time = 0 #si distance est supérieure ou égale au seuil de distance, compteur statique à 0
+                self.anchor_position = coord #nouveau point de départ
                 
             self.last_position = coord #mise à jour position
             self.last_time = now #mise à jour temps
@@ -69,10 +73,14 @@ class StaticAgent: #Début de l'agent statique
             self.logger.error(f"Erreur lors de la mise à jour de position: {e}")
             return False 
 
-    def simulate_gps(self) -> Generator[Tuple[float, float], None, None]: #simulation de coordonnées GPS aléatoire autour d'un point fixe car pas de vrai GPS pour l'instant
+    def simulate_gps(self, interval: Union[float, Callable[[], float]] = 10) -> Generator[Tuple[float, float], None, None]: #simulation de coordonnées GPS aléatoire autour d'un point fixe car pas de vrai GPS pour l'instant
         """
         Simule des coordonnées GPS pour les tests
         
+        L'attente entre deux points passe par l'horloge : avec une SimulatedClock,
+        la simulation avance le temps sans dormir. interval peut être une
+        fonction (ex: AdaptiveSampler), relue avant chaque attente.
+        
         Yields:
             Tuple[float, float]: Coordonnées (latitude, longitude)
         """
@@ -85,7 +93,22 @@ class StaticAgent: #Début de l'agent statique
                 new_coord = (lat + jitter, lon + jitter)
                 self.logger.debug(f"Nouvelle position simulée: {new_coord}")
                 yield new_coord #simulation de coordonnées de points
-                time.sleep(10)  # 10 secondes entre chaque mise à jour des positions > pour aller plus vite dans les tests
+                self.clock.sleep(interval() if callable(interval) else interval)  # 10 secondes par défaut entre chaque mise à jour des positions
         except Exception as e:
             self.logger.error(f"Erreur dans la simulation GPS: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def simulate_gps_async(self, interval: float = 10) -> AsyncGenerator[Tuple[float, float], None]:
+        """
+        Variante asynchrone de simulate_gps (attente sans bloquer la boucle)
+        
+        Yields:
+            Tuple[float, float]: Coordonnées (latitude, longitude)
+        """
+        lat, lon = 48.8566, 2.3522 #point de départ est Paris
+        self.logger.info(f"Simulation GPS asynchrone démarrée depuis Paris: {lat}, {lon}")
+        
+        while True:
+            jitter = random.choice([0, 0.00001, 0.00002, 0.00005])
+            yield (lat + jitter, lon + jitter)
+            await asyncio.sleep(interval)
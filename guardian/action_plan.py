@@ -0,0 +1,194 @@
+"""
+Plan d'actions d'urgence pour Guardian
+Exécute les étapes d'une réponse d'urgence en graphe de dépendances concurrent
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, Any, List, Optional, Sequence
+
+
+class ActionPlan:
+    """
+    Graphe d'étapes exécutées en parallèle sous une échéance globale
+
+    Une étape démarre dès que ses dépendances ont réussi et reçoit leurs
+    résultats en arguments positionnels. Si une dépendance échoue ou dépasse
+    l'échéance, les étapes qui en dépendent sont ignorées. Les étapes marquées
+    `notification` mesurent le délai avant la première notification envoyée :
+    elles renvoient True si quelque chose a réellement été envoyé, sinon
+    l'étape est comptée en échec.
+    """
+
+    def __init__(self, name: str, executor: Executor):
+        self.name = name
+        self.executor = executor
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._start_time = 0.0
+        self._expired = False
+
+    def add_step(self, name: str, func: Callable, depends_on: Sequence[str] = (),
+                 notification: bool = False) -> 'ActionPlan':
+        """Ajoute une étape au plan (les dépendances doivent déjà exister)"""
+        for dependency in depends_on:
+            if dependency not in self._steps:
+                raise ValueError(f"Dépendance inconnue pour l'étape '{name}': {dependency}")
+
+        self._steps[name] = {
+            'func': func,
+            'depends_on': tuple(depends_on),
+            'dependents': [],
+            'notification': notification,
+            'waiting': len(depends_on),
+            'status': 'pending',
+            'result': None,
+            'error': None,
+            'started_at': None,
+            'finished_at': None
+        }
+        for dependency in depends_on:
+            self._steps[dependency]['dependents'].append(name)
+        return self
+
+    def run(self, deadline: float, first_notification_budget: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Exécute le plan et attend au plus `deadline` secondes
+
+        Returns:
+            Dict avec statut et durée par étape, délai de première notification
+            et respect de l'échéance
+        """
+        self._start_time = time.perf_counter()
+
+        if not self._steps:
+            self._finished.set()
+        else:
+            with self._lock:
+                ready = [name for name, step in self._steps.items() if step['waiting'] == 0]
+            for name in ready:
+                self._submit(name)
+
+        completed = self._finished.wait(deadline)
+
+        with self._lock:
+            self._expired = True
+            for step in self._steps.values():
+                if step['status'] in ('pending', 'running'):
+                    step['status'] = 'timeout'
+
+        report = self._build_report(deadline, completed, first_notification_budget)
+        self._log_report(report)
+        return report
+
+    def _submit(self, name: str):
+        with self._lock:
+            if self._expired:
+                return
+            self._steps[name]['status'] = 'running'
+        self.executor.submit(self._execute, name)
+
+    def _execute(self, name: str):
+        step = self._steps[name]
+        args = [self._steps[dependency]['result'] for dependency in step['depends_on']]
+
+        step['started_at'] = time.perf_counter() - self._start_time
+        try:
+            result = step['func'](*args)
+            error = None
+            if step['notification'] and not result:
+                error = RuntimeError("aucune notification envoyée")
+        except Exception as e:
+            result = None
+            error = e
+        finished_at = time.perf_counter() - self._start_time
+
+        ready = []
+        with self._lock:
+            if step['status'] != 'running':
+                # Échéance dépassée : on garde seulement la trace de la fin
+                step['finished_at'] = finished_at
+                return
+            step['finished_at'] = finished_at
+            step['result'] = result
+            if error is not None:
+                step['status'] = 'failed'
+                step['error'] = str(error)
+                self.logger.error(f"[{self.name}] Étape '{name}' en échec: {error}")
+                self._skip_dependents(name)
+            else:
+                step['status'] = 'done'
+                for dependent in step['dependents']:
+                    self._steps[dependent]['waiting'] -= 1
+                    if self._steps[dependent]['waiting'] == 0:
+                        ready.append(dependent)
+            self._check_finished()
+
+        for dependent in ready:
+            self._submit(dependent)
+
+    def _skip_dependents(self, name: str):
+        for dependent in self._steps[name]['dependents']:
+            step = self._steps[dependent]
+            if step['status'] == 'pending':
+                step['status'] = 'skipped'
+                self._skip_dependents(dependent)
+
+    def _check_finished(self):
+        if all(step['status'] in ('done', 'failed', 'skipped') for step in self._steps.values()):
+            self._finished.set()
+
+    def _build_report(self, deadline: float, completed: bool,
+                      first_notification_budget: Optional[float]) -> Dict[str, Any]:
+        steps = {}
+        for name, step in self._steps.items():
+            duration = None
+            if step['started_at'] is not None and step['finished_at'] is not None:
+                duration = step['finished_at'] - step['started_at']
+            steps[name] = {
+                'status': step['status'],
+                'started_at': step['started_at'],
+                'duration': duration,
+                'error': step['error']
+            }
+
+        notification_times: List[float] = [
+            step['finished_at'] for step in self._steps.values()
+            if step['notification'] and step['status'] == 'done'
+        ]
+        first_notification = min(notification_times) if notification_times else None
+
+        report = {
+            'plan': self.name,
+            'elapsed': time.perf_counter() - self._start_time,
+            'deadline': deadline,
+            'deadline_met': completed,
+            'first_notification': first_notification,
+            'steps': steps
+        }
+        if first_notification_budget is not None:
+            report['first_notification_budget'] = first_notification_budget
+            report['first_notification_in_budget'] = (
+                first_notification is not None and first_notification <= first_notification_budget
+            )
+        return report
+
+    def _log_report(self, report: Dict[str, Any]):
+        timings = ", ".join(
+            f"{name}={info['duration']:.2f}s" if info['duration'] is not None else f"{name}={info['status']}"
+            for name, info in report['steps'].items()
+        )
+        self.logger.info(f"[{self.name}] Plan terminé en {report['elapsed']:.2f}s - {timings}")
+
+        if not report['deadline_met']:
+            self.logger.warning(f"[{self.name}] Échéance de {report['deadline']}s dépassée")
+        if report.get('first_notification_in_budget') is False:
+            self.logger.warning(
+                f"[{self.name}] Première notification hors budget "
+                f"({report['first_notification_budget']}s)"
+            )
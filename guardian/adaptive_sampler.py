@@ -0,0 +1,132 @@
+"""
+Échantillonnage GPS adaptatif pour Guardian
+Choisit l'intervalle jusqu'au prochain point d'après l'état de StaticAgent et
+de FallDetector : rare à l'arrêt ou en marche régulière, dense à vélo, lors
+d'un changement brusque de vitesse ou quand une alerte est en cours
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from guardian.GPS_agent import StaticAgent
+from guardian.fall_detector import FallDetector
+from guardian.gps_sources import GPSFix
+
+
+class AdaptiveSampler:
+    """
+    Planificateur d'intervalles d'échantillonnage, avec métriques de décision
+
+    Raisons possibles : initial, alert_pending, fall_watch, speed_change,
+    fast_motion, walking, stationary.
+    """
+
+    def __init__(self, min_interval: float = 1.0,
+                 walking_interval: float = 5.0,
+                 max_interval: float = 30.0,
+                 speed_change_kmh: float = 5.0,
+                 fast_speed_kmh: float = 8.0,
+                 stationary_speed_kmh: float = 2.0):
+        self.min_interval = min_interval
+        self.walking_interval = walking_interval
+        self.max_interval = max_interval
+        self.speed_change_kmh = speed_change_kmh
+        # Au-delà, les motifs de chute de FallDetector sont possibles : pas d'économie
+        self.fast_speed_kmh = fast_speed_kmh
+        self.stationary_speed_kmh = stationary_speed_kmh
+
+        self.interval = min_interval
+        self.reason = 'initial'
+        self.next_due = float('-inf')
+
+        self._decisions: Dict[str, int] = {}
+        self._samples = 0
+        self._skipped = 0
+        self._interval_total = 0.0
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def decide(self, static_agent: Optional[StaticAgent] = None,
+               fall_detector: Optional[FallDetector] = None,
+               alert_pending: bool = False) -> float:
+        """Intervalle (secondes) jusqu'au prochain point, après traitement du point courant"""
+        interval, reason = self._choose(static_agent, fall_detector, alert_pending)
+        if reason != self.reason:
+            self.logger.debug(f"Échantillonnage {self.reason} -> {reason}: {interval:.0f}s")
+
+        self.interval = interval
+        self.reason = reason
+        self._decisions[reason] = self._decisions.get(reason, 0) + 1
+        self._samples += 1
+        self._interval_total += interval
+        return interval
+
+    def _choose(self, static_agent, fall_detector, alert_pending):
+        if alert_pending:
+            return self.min_interval, 'alert_pending'
+
+        if fall_detector is not None:
+            if fall_detector.fall_detected:
+                return self.min_interval, 'fall_watch'
+            speeds = fall_detector.history.speeds()
+            if len(speeds) >= 2:
+                speed = speeds[-1]
+                if abs(speed - speeds[-2]) > self.speed_change_kmh:
+                    return self.min_interval, 'speed_change'
+                if speed > self.fast_speed_kmh:
+                    return self.min_interval, 'fast_motion'
+                if speed > self.stationary_speed_kmh:
+                    return self.walking_interval, 'walking'
+            else:
+                return self.min_interval, 'initial'
+
+        if static_agent is not None and static_agent.last_position is not None:
+            # Prochain point juste après l'échéance de l'alerte d'immobilité
+            remaining = static_agent.time_threshold - static_agent.static_time
+            interval = min(self.max_interval, max(self.min_interval, remaining + self.min_interval))
+            return interval, 'stationary'
+
+        return (self.max_interval, 'stationary') if fall_detector is not None else (self.min_interval, 'initial')
+
+    def filter(self, fixes: Iterable[GPSFix],
+               static_agent: Optional[StaticAgent] = None,
+               fall_detector: Optional[FallDetector] = None,
+               alert_pending: Optional[Callable[[], bool]] = None) -> Iterator[GPSFix]:
+        """
+        Ne laisse passer que les fixes échus
+
+        La décision suivante est prise une fois le fix traité par le
+        consommateur (au retour dans le générateur).
+        """
+        for fix in fixes:
+            timestamp = fix[0]  # GPSFix ou tuple (t, lat, lon)
+            if timestamp < self.next_due:
+                self._skipped += 1
+                continue
+            yield fix
+            interval = self.decide(static_agent, fall_detector,
+                                   alert_pending() if alert_pending else False)
+            self.next_due = timestamp + interval
+
+    def metrics(self) -> Dict:
+        """Décisions par raison, points traités et ignorés, intervalle moyen"""
+        return {
+            'samples': self._samples,
+            'skipped': self._skipped,
+            'decisions': dict(self._decisions),
+            'mean_interval': self._interval_total / self._samples if self._samples else 0.0,
+            'current_interval': self.interval,
+            'current_reason': self.reason
+        }
+
+    def format_report(self) -> str:
+        """Rapport lisible des décisions d'échantillonnage"""
+        metrics = self.metrics()
+        total = metrics['samples'] + metrics['skipped']
+        lines = [
+            "📡 Échantillonnage GPS adaptatif",
+            f"   Points traités: {metrics['samples']}/{total} "
+            f"(intervalle moyen {metrics['mean_interval']:.1f}s)"
+        ]
+        for reason, count in sorted(metrics['decisions'].items(), key=lambda item: -item[1]):
+            lines.append(f"   {reason}: {count}")
+        return "\n".join(lines)
@@ -0,0 +1,513 @@
+"""
+Orchestrateur asyncio pour Guardian
+Les attentes de réponse, les monitors et les appels réseau sont des coroutines :
+des milliers d'alertes peuvent être en cours sans un thread par alerte
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+
+from guardian.GPS_agent import StaticAgent
+from guardian.geofence import GeofenceIndex, GeofenceMonitor, geofence_from_config
+from guardian.async_support import run_blocking, run_sync, close_http_sessions
+from guardian.gps_sources import GPSFix, timestamped_async
+from guardian.guardian_agent import GuardianOrchestrator
+from guardian.services import GuardianServices
+from guardian.session import GuardianSession
+from guardian.vosk_models import preload_models
+
+
+class AsyncGuardianOrchestrator:
+    """
+    Version asyncio du workflow d'alerte de GuardianOrchestrator
+
+    Partage les services et la session de l'orchestrateur synchrone ;
+    celui-ci reste disponible (attribut `sync`) pour les messages, les
+    escalades programmées et les workflows non encore portés.
+    """
+
+    def __init__(self, config: Dict[str, Any], services: GuardianServices = None,
+                 session: GuardianSession = None):
+        self.config = config
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self.sync = GuardianOrchestrator(config, services=services, session=session)
+        self.services = self.sync.services
+        self.session = self.sync.session
+
+        self.response_timeout = self.sync.response_timeout
+        # Questions en attente (type, futur), par ordre d'ouverture : chaque
+        # attente reçoit sa propre réponse, même quand plusieurs alertes se chevauchent
+        self._prompts: List[Tuple[str, asyncio.Future]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks = set()
+
+    @property
+    def current_position(self) -> Optional[Tuple[float, float]]:
+        return self.session.current_position
+
+    @current_position.setter
+    def current_position(self, position: Tuple[float, float]):
+        self.session.current_position = position
+
+    def spawn(self, coroutine) -> asyncio.Task:
+        """Lance un workflow en tâche de fond en gardant une référence"""
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @property
+    def pending_prompts(self) -> List[str]:
+        """Types des questions en attente de réponse ('fall', 'alert', 'details')"""
+        return [kind for kind, future in self._prompts if not future.done()]
+
+    def process_user_input(self, text_input: str):
+        """Transmet une réponse utilisateur (appelable depuis n'importe quel thread)"""
+        if self._loop is not None and self._loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not self._loop:
+                self._loop.call_soon_threadsafe(self._dispatch_response, text_input)
+                return
+        self._dispatch_response(text_input)
+
+    def _dispatch_response(self, text_input: str):
+        """
+        Route une réponse vers la question concernée
+
+        'oui'/'non' répond d'abord au compte à rebours de chute (comme
+        _resolve_fall_countdown côté synchrone), puis à la plus ancienne
+        alerte ; un texte libre répond d'abord à la demande de description.
+        """
+        if text_input.lower() in ("oui", "non"):
+            order = ("fall", "alert", "details")
+        else:
+            order = ("details", "alert", "fall")
+        pending = [(kind, future) for kind, future in self._prompts if not future.done()]
+        for wanted in order:
+            for kind, future in pending:
+                if kind == wanted:
+                    future.set_result(text_input)
+                    return
+        self.logger.info(f"Réponse ignorée, aucune question en attente: {text_input}")
+
+    def _open_prompt(self, kind: str) -> asyncio.Future:
+        """Enregistre une question avant de la poser (une réponse rapide n'est pas perdue)"""
+        self._loop = asyncio.get_running_loop()
+        future = self._loop.create_future()
+        self._prompts.append((kind, future))
+        return future
+
+    async def _await_prompt(self, future: asyncio.Future, timeout: float) -> Optional[str]:
+        """Attend la réponse à une question ouverte (None si timeout)"""
+        try:
+            response = await asyncio.wait_for(future, timeout)
+            self.logger.info(f"Réponse reçue: {response}")
+            return response
+        except asyncio.TimeoutError:
+            self.logger.warning("Aucune réponse reçue dans le délai imparti")
+            return None
+        finally:
+            self._prompts = [prompt for prompt in self._prompts if prompt[1] is not future]
+
+    async def handle_alert(self, trigger_type: str, position: Tuple[float, float] = None):
+        """Gère une alerte selon le workflow du diagramme"""
+        self.logger.warning(f"ALERTE déclenchée: {trigger_type}")
+        self.session.alert_trace = self.services.latency.start_trace(trigger_type)
+
+        if position:
+            self.current_position = position
+
+        alert_message = f"ALERTE {trigger_type}. Tout va bien ? Répondez oui ou non."
+        print(f"\n🚨 ALERTE ({trigger_type}) : Tout va bien ? 🚨")
+        print("Répondez 'oui' ou 'non' (vocal ou texte)")
+
+        prompt = self._open_prompt("alert")
+        await self.services.speech_agent.speak_alert_async("emergency", alert_message)
+
+        response = await self._await_prompt(prompt, self.response_timeout)
+        response = response.lower() if response else None
+        self.sync._trace_response_received()
+
+        if response == "oui":
+            await self._handle_positive_response()
+        elif response == "non":
+            await self._handle_negative_response()
+        else:
+            await self._handle_no_response()
+
+    async def _handle_positive_response(self):
+        """Gère une réponse positive ('oui')"""
+        self.logger.info("Réponse positive reçue - Situation normale")
+        confirmation_message = "OK, merci de votre réponse. Surveillance continue."
+        print("✅ OK, merci de votre réponse. Surveillance continue.\n")
+
+        self.sync.cancel_emergency_escalations()
+        await asyncio.gather(
+            self.services.speech_agent.speak_alert_async("confirmation", confirmation_message),
+            self.services.emergency_response.send_confirmation_alert_async(
+                "Situation normale - Utilisateur a confirmé"
+            )
+        )
+
+    async def _handle_negative_response(self):
+        """Gère une réponse négative ('non') avec analyse IA"""
+        self.logger.warning("Réponse négative reçue - Demande d'aide")
+        question_message = "Que se passe-t-il ? Décrivez votre situation. Le système IA va analyser votre réponse."
+        print("⚠️  Que se passe-t-il ? Décrivez votre situation :")
+
+        prompt = self._open_prompt("details")
+        await self.services.speech_agent.speak_alert_async("emergency", question_message)
+
+        reason = await self._await_prompt(prompt, 120)  # 2 minutes pour expliquer
+        self.sync._trace_response_received()
+        if reason is None:
+            self.logger.warning("Aucun détail fourni par l'utilisateur")
+            await self._trigger_emergency_assistance("Aucun détail fourni")
+            return
+
+        self.logger.warning(f"Motif reçu: {reason}")
+        gemini_agent = self.services.gemini_agent
+
+        if gemini_agent.is_available:
+            with self.services.latency.span("analysis"):
+                analysis = await gemini_agent.analyze_emergency_situation_async(
+                    reason, self.current_position, time_of_day='current'
+                )
+            print("\n" + "="*60)
+            print(f"🤖 ANALYSE GEMINI 2.5 FLASH:")
+            print(gemini_agent.get_personalized_emergency_message(analysis))
+            print("="*60)
+
+            await self.services.speech_agent.speak_alert_async("info", analysis.get('specific_advice', ''))
+            await self._trigger_emergency_assistance(reason, analysis)
+        else:
+            # Fallback vers l'ancien système IA (workflow synchrone existant)
+            smart_response = self.services.smart_response_system.process_emergency_response(
+                reason, "emergency_description"
+            )
+            print("\n" + "="*60)
+            print(smart_response["message"])
+            print("="*60)
+
+            await self.services.speech_agent.speak_alert_async("info", smart_response["message"])
+            await run_blocking(self.sync._trigger_emergency_assistance_with_ai, reason, smart_response["analysis"])
+
+    async def _handle_no_response(self):
+        """Gère l'absence de réponse (timeout)"""
+        self.logger.critical("AUCUNE RÉPONSE - Déclenchement d'urgence automatique")
+        print("🚨 AUCUNE RÉPONSE DÉTECTÉE - DÉCLENCHEMENT D'URGENCE AUTOMATIQUE 🚨")
+
+        await self.services.speech_agent.speak_alert_async(
+            "emergency", "AUCUNE RÉPONSE DÉTECTÉE. Je déclenche automatiquement l'urgence."
+        )
+        await self._trigger_emergency_assistance("Aucune réponse de l'utilisateur")
+
+    async def _trigger_emergency_assistance(self, reason: str, analysis: Dict[str, Any] = None):
+        """
+        Déclenche l'assistance d'urgence : notifications en parallèle, puis
+        refuges et transports en mise à jour
+        """
+        self.logger.critical(f"Déclenchement assistance d'urgence: {reason}")
+
+        position = self.current_position
+        urgency_level = analysis.get('urgency_level', 5) if analysis else 5
+
+        enhanced_reason = reason
+        emergency_type = 'URGENCE GÉNÉRALE'
+        if analysis:
+            enhanced_reason += f"\n\n🧠 ANALYSE GEMINI:\n"
+            enhanced_reason += f"- Type: {analysis.get('emergency_type', 'Urgence')}\n"
+            enhanced_reason += f"- Urgence: {urgency_level}/10\n"
+            enhanced_reason += f"- Conseils: {analysis.get('specific_advice', '')}"
+            emergency_type = 'URGENCE CRITIQUE' if urgency_level >= 8 else 'URGENCE ÉLEVÉE' if urgency_level >= 6 else 'URGENCE STANDARD'
+
+        emergency_context = {
+            'emergency_type': emergency_type,
+            'what3words': (analysis or {}).get('what3words', '')
+        }
+
+        notifications = [self._send_emergency_notifications(emergency_context, reason)]
+        if position:
+            if urgency_level >= 8:
+                notifications.append(
+                    self._send_email_alert(
+                        self.services.emergency_response.send_immediate_danger_alert_async, position, enhanced_reason
+                    )
+                )
+            else:
+                notifications.append(
+                    self._send_email_alert(
+                        self.services.emergency_response.send_location_to_contacts_async, position, enhanced_reason
+                    )
+                )
+        if analysis and urgency_level >= 7 and position:
+            notifications.append(run_blocking(
+                self.sync.send_emergency_email_alert,
+                user_name="Utilisateur Guardian",
+                location=f"Position GPS: {position}",
+                situation=enhanced_reason,
+                urgency_level=urgency_level
+            ))
+
+        await asyncio.gather(*notifications, return_exceptions=True)
+        print("✅ Contacts d'urgence notifiés. Aide en route.")
+
+        # Enrichissement : refuges et transports envoyés en mise à jour
+        locations = self.services.emergency_locations
+        if position and locations:
+            with self.services.latency.span("location_lookup"):
+                refuges = await locations.find_emergency_refuges_async(position)
+                transports = locations.find_emergency_transport(position)
+            refuges_message = locations.format_emergency_locations_message(
+                refuges, transports, current_location=position
+            )
+            print(refuges_message)
+            await self._send_email_alert(
+                self.services.emergency_response.send_location_with_refuges_info_async,
+                position, refuges_message, enhanced_reason
+            )
+
+        delay = GuardianOrchestrator.ESCALATION_DELAYS.get(urgency_level, 600)
+        self.sync._schedule_emergency_escalation(reason, delay)
+
+    async def handle_fall_detection(self, fall_info: dict):
+        """Gère la détection d'une chute (attente de réponse sans thread)"""
+        fall_type = fall_info.get('fall_type', 'chute_generale')
+        severity = fall_info.get('severity', 'modérée')
+
+        print(f"\n🚨 CHUTE DÉTECTÉE ! 🚨")
+        print(f"Type: {self.sync._translate_fall_type(fall_type)}")
+        print(f"Sévérité: {severity}")
+        print(f"\n🤖 Guardian: {self.sync._get_fall_response_message(fall_type, severity)}")
+
+        self.session.alert_trace = self.services.latency.start_trace("chute")
+
+        speech_agent = self.services.speech_agent
+        prompt = self._open_prompt("fall")
+        await speech_agent.speak_fall_alert_async(fall_info)
+
+        print(f"\n❓ Êtes-vous blessé(e) ? (Répondez 'oui' ou 'non' dans les 30 secondes)")
+        await speech_agent.speak_alert_async(
+            "emergency",
+            "Êtes-vous blessé ? Répondez oui ou non dans les 30 secondes. Sans réponse, j'alerterai les secours."
+        )
+
+        response = await self._await_prompt(prompt, 30.0)
+        response = response.lower() if response else None
+        self.sync._trace_response_received()
+
+        if response == 'non':
+            print("\n✅ Bien reçu - Vous semblez aller bien")
+            self.sync.cancel_emergency_escalations()
+            await speech_agent.speak_alert_async(
+                "confirmation",
+                "Bien reçu. Vous semblez aller bien. Je continue la surveillance au cas où."
+            )
+        elif response == 'oui':
+            print("\n🚨 URGENCE CONFIRMÉE - BLESSURE APRÈS CHUTE")
+            await self._trigger_fall_emergency_response(fall_info, "Je suis blessé après ma chute")
+        else:
+            print("\n⏰ TIMEOUT - AUCUNE RÉPONSE APRÈS CHUTE")
+            await self._trigger_fall_emergency_response(fall_info, None)
+
+    async def handle_post_fall_emergency(self, post_fall_info: dict):
+        """Gère l'immobilité prolongée après une chute (urgence sans question)"""
+        time_since_fall = post_fall_info.get('time_since_fall', 0)
+
+        # Aucune attente de réponse : le traitement commence immédiatement
+        self.session.alert_trace = self.services.latency.start_trace("immobilité après chute")
+        self.sync._trace_response_received()
+
+        print(f"\n🆘 URGENCE MAXIMALE - IMMOBILITÉ PROLONGÉE APRÈS CHUTE 🆘")
+        print(f"Temps écoulé depuis la chute: {time_since_fall:.0f} secondes")
+        print(f"Mouvement détecté: {post_fall_info.get('movement_since_fall', 0):.1f}m")
+
+        await self._trigger_fall_emergency_response(post_fall_info, None, immediate=True)
+
+    async def _trigger_fall_emergency_response(self, fall_info: dict, user_response: Optional[str],
+                                               immediate: bool = False):
+        """Réponse d'urgence après chute : analyse et notifications concurrentes"""
+        position = fall_info.get('position', self.current_position)
+        if immediate:
+            reason = f"🆘 IMMOBILITÉ PROLONGÉE APRÈS CHUTE ({fall_info.get('time_since_fall', 0):.0f}s)"
+        else:
+            reason = f"🚨 CHUTE - {self.sync._translate_fall_type(fall_info.get('fall_type', 'chute_generale'))}"
+
+        gemini_agent = self.services.gemini_agent
+        if gemini_agent.is_available:
+            with self.services.latency.span("analysis"):
+                analysis = await gemini_agent.analyze_fall_emergency_async(fall_info, user_response)
+        else:
+            analysis = {'emergency_type': 'Accident/Chute', 'urgency_level': 8}
+
+        emergency_context = {
+            'emergency_type': 'CHUTE DÉTECTÉE',
+            'what3words': analysis.get('what3words', '')
+        }
+        await asyncio.gather(
+            self._send_email_alert(self.services.emergency_response.send_fall_emergency_alert_async, position, fall_info),
+            self._send_emergency_notifications(emergency_context, reason),
+            return_exceptions=True
+        )
+        print(f"\n✅ Alerte d'urgence envoyée pour chute")
+
+    async def _send_email_alert(self, send, *args) -> bool:
+        """Envoie une alerte email EmergencyResponse et la trace si elle est partie"""
+        sent = await send(*args)
+        if sent:
+            self.sync._trace_notification_sent("email")
+        return bool(sent)
+
+    async def _send_emergency_notifications(self, emergency_context: dict, reason: str):
+        """Envoie le SMS d'urgence sans bloquer la boucle"""
+        contacts = self.session.emergency_contacts or self.config.get('emergency_contacts', [])
+        if not contacts:
+            self.logger.warning("Aucun contact d'urgence configuré")
+            return
+
+        sms_context = {
+            'user_name': 'Votre proche',
+            'emergency_type': emergency_context.get('emergency_type', 'Urgence'),
+            'location': {
+                'address': self.sync._get_location_address(),
+                'what3words': emergency_context.get('what3words', '')
+            }
+        }
+
+        try:
+            if await self.services.sms_agent.send_emergency_sms_async(contacts, sms_context):
+                self.sync._trace_notification_sent("sms")
+                self.logger.info("SMS d'urgence envoyé avec succès")
+            else:
+                self.logger.warning("Échec envoi SMS d'urgence")
+        except Exception as e:
+            self.logger.error(f"Erreur envoi SMS: {e}")
+
+
+async def static_monitor_async(orchestrator: AsyncGuardianOrchestrator, agent: StaticAgent,
+                               fixes: AsyncIterator[GPSFix] = None,
+                               geofences: Optional[GeofenceMonitor] = None):
+    """
+    Surveille les positions GPS ; les alertes tournent en tâches de fond
+
+    fixes: flux asynchrone de GPSFix ; à défaut, la simulation GPS de l'agent
+    statique horodatée avec son horloge
+    geofences: GeofenceMonitor optionnel ; pas d'alerte d'immobilité en zone sûre
+    """
+    logger = logging.getLogger("static_monitor_async")
+    session = orchestrator.session
+    fall_detector = session.fall_detector
+    if fixes is None:
+        fixes = timestamped_async(agent.simulate_gps_async(), agent.clock)
+
+    async for fix in fixes:
+        if orchestrator.services.shutdown_event.is_set():
+            break
+
+        position = fix.position
+        orchestrator.current_position = position
+        session.track.append(*fix)
+
+        # Entrées et sorties de zones (index spatial)
+        if geofences:
+            geofences.update(position, fix.timestamp)
+
+        if agent.update_position(position, fix.timestamp):
+            if geofences and geofences.in_safe_zone:
+                logger.info(f"🏠 Immobilité en zone sûre ({', '.join(map(str, geofences.inside))}) - alerte suspendue")
+            else:
+                orchestrator.spawn(orchestrator.handle_alert("immobilité prolongée", position))
+
+        fall_info = fall_detector.update_position(position, fix.timestamp)
+        if fall_info:
+            orchestrator.spawn(orchestrator.handle_fall_detection(fall_info))
+
+        post_fall_info = fall_detector.check_post_fall_status(position, fix.timestamp)
+        if post_fall_info:
+            # Une seule escalade par chute : le détecteur est réarmé
+            fall_detector.reset_fall_detection()
+            orchestrator.spawn(orchestrator.handle_post_fall_emergency(post_fall_info))
+
+        # Déviation de l'itinéraire suivi
+        wrong_path = session.wrong_path_agent
+        if wrong_path and wrong_path.update_position(position, fix.timestamp):
+            orchestrator.spawn(orchestrator.handle_alert("déviation d'itinéraire", position))
+
+
+async def voice_monitor_async(orchestrator: AsyncGuardianOrchestrator, voice_agent):
+    """Surveille les commandes vocales (capture audio déportée dans le pool)"""
+    while not orchestrator.services.shutdown_event.is_set():
+        result = await run_blocking(voice_agent.listen_for_keywords)
+        if result:
+            orchestrator.spawn(orchestrator.handle_alert("mot-clé d'urgence détecté"))
+
+
+async def console_input_monitor_async(orchestrator: AsyncGuardianOrchestrator):
+    """Surveille les entrées console sans bloquer la boucle"""
+    while not orchestrator.services.shutdown_event.is_set():
+        try:
+            user_input = (await run_blocking(input)).strip()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if user_input:
+            orchestrator.process_user_input(user_input)
+
+
+async def main_async():
+    """Point d'entrée asyncio de Guardian"""
+    from guardian.config import Config
+    from guardian.voice_agent import VoiceAgent
+
+    logger = logging.getLogger(__name__)
+    config = Config()
+
+    voice_config = config.get_voice_agent_config()
+    model_path = voice_config.get("model_path")
+    if model_path and os.path.exists(model_path):
+        preload_models([model_path])
+
+    orchestrator = AsyncGuardianOrchestrator(config.config_data)
+    static_agent = StaticAgent(**config.get_static_agent_config())
+
+    geofences = None
+    fences = [geofence_from_config(entry) for entry in config.get_geofences_config()]
+    if fences:
+        geofences = GeofenceMonitor(GeofenceIndex(fences))
+        logger.info(f"{len(fences)} zones géographiques chargées")
+
+    monitors = [
+        static_monitor_async(orchestrator, static_agent, geofences=geofences),
+        console_input_monitor_async(orchestrator)
+    ]
+
+    if model_path and os.path.exists(model_path):
+        monitors.append(voice_monitor_async(orchestrator, VoiceAgent(**voice_config)))
+    else:
+        logger.info("Fonctionnement en mode GPS uniquement")
+
+    print("🛡️  Guardian (asyncio) est actif et surveille votre sécurité")
+    print("⏹️  Appuyez sur Ctrl+C pour arrêter")
+
+    try:
+        await asyncio.gather(*monitors)
+    finally:
+        orchestrator.services.shutdown()
+        await close_http_sessions()
+
+
+def main():
+    """Point d'entrée synchrone (enveloppe de main_async)"""
+    try:
+        run_sync(main_async())
+    except KeyboardInterrupt:
+        logging.getLogger(__name__).info("Arrêt demandé par l'utilisateur")
+
+
+if __name__ == "__main__":
+    main()
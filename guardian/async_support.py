@@ -0,0 +1,90 @@
+"""
+Support asyncio pour Guardian
+HTTP non bloquant (aiohttp si installé) et exécution bornée des appels bloquants
+"""
+
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Pool borné pour les bibliothèques sans API asynchrone (smtplib, Twilio, TTS)
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+_http_sessions: Dict[int, Any] = {}
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="guardian-blocking")
+    return _blocking_executor
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Exécute un appel bloquant dans le pool borné sans bloquer la boucle"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_blocking_executor(), lambda: func(*args, **kwargs))
+
+
+def run_sync(coroutine) -> Any:
+    """Exécute une coroutine depuis du code synchrone (hors boucle asyncio)"""
+    return asyncio.run(coroutine)
+
+
+def _get_http_session():
+    """Session aiohttp partagée par boucle d'événements"""
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.get(id(loop))
+    if session is None or session.closed:
+        session = aiohttp.ClientSession()
+        _http_sessions[id(loop)] = session
+    return session
+
+
+async def close_http_sessions():
+    """Ferme la session HTTP de la boucle courante"""
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.pop(id(loop), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def http_post_json(url: str, payload: Dict, headers: Dict = None,
+                         timeout: float = 15) -> Tuple[int, str]:
+    """
+    POST JSON asynchrone
+
+    Returns:
+        (code HTTP, corps de la réponse)
+    """
+    if AIOHTTP_AVAILABLE:
+        session = _get_http_session()
+        async with session.post(url, json=payload, headers=headers,
+                                timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            return response.status, await response.text()
+
+    response = await run_blocking(requests.post, url, headers=headers, json=payload, timeout=timeout)
+    return response.status_code, response.text
+
+
+async def http_get_json(url: str, params: Dict = None, timeout: float = 10) -> Dict:
+    """GET asynchrone retournant le JSON décodé"""
+    if AIOHTTP_AVAILABLE:
+        session = _get_http_session()
+        async with session.get(url, params=params,
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            return json.loads(await response.text())
+
+    response = await run_blocking(requests.get, url, params=params, timeout=timeout)
+    return response.json()
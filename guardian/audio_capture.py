@@ -0,0 +1,209 @@
+"""
+Capture micro permanente pour Guardian
+Un seul flux d'entrée par fréquence d'échantillonnage, ouvert une fois pour
+tout le processus, écrit dans un tampon circulaire préalloué. Chaque
+consommateur (agent vocal, conversation, interface web) lit à son rythme via
+son propre curseur des memoryview sans copie ; la mémoire est bornée et les
+trames écrasées avant lecture sont comptées.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):  # OSError : bibliothèque PortAudio absente
+    SOUNDDEVICE_AVAILABLE = False
+
+SAMPLE_BYTES = 2  # PCM 16 bits mono
+
+
+class AudioRingBuffer:
+    """
+    Tampon circulaire d'octets PCM, un écrivain et plusieurs lecteurs
+
+    `written` compte les octets écrits depuis le début ; chaque lecteur garde
+    sa propre position. Un lecteur distancé de plus de capacity - guard_bytes
+    saute directement aux données les plus anciennes encore sûres : les
+    octets sautés sont comptés comme trames perdues. La marge guard_bytes
+    protège le bloc en cours de lecture de l'écriture suivante.
+    """
+
+    def __init__(self, capacity_bytes: int, guard_bytes: int = 0):
+        if capacity_bytes % SAMPLE_BYTES or guard_bytes % SAMPLE_BYTES:
+            raise ValueError("Les tailles doivent être des multiples de la taille d'un échantillon")
+        if not 0 <= guard_bytes < capacity_bytes:
+            raise ValueError("La marge doit être inférieure à la capacité")
+        self.capacity = capacity_bytes
+        self.guard_bytes = guard_bytes
+        self._buffer = bytearray(capacity_bytes)
+        self._view = memoryview(self._buffer)
+        self._cond = threading.Condition()
+        self.written = 0
+        self.dropped_frames = 0
+        self.closed = False
+
+    def write(self, data):
+        """Copie un bloc (bytes ou tampon du callback audio) dans l'anneau"""
+        src = memoryview(data).cast('B')
+        n = len(src)
+        skipped = 0
+        if n > self.capacity:
+            skipped = n - self.capacity
+            src = src[skipped:]
+            n = self.capacity
+
+        start = (self.written + skipped) % self.capacity
+        first = min(n, self.capacity - start)
+        self._view[start:start + first] = src[:first]
+        if first < n:
+            self._view[:n - first] = src[first:]
+
+        with self._cond:
+            self.written += skipped + n
+            self._cond.notify_all()
+
+    def close(self):
+        """Réveille les lecteurs en attente (fin de capture)"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def reader(self) -> 'AudioReader':
+        """Nouveau lecteur positionné sur les prochaines données écrites"""
+        return AudioReader(self, self.written)
+
+
+class AudioReader:
+    """Curseur de lecture d'un consommateur sur un AudioRingBuffer"""
+
+    def __init__(self, ring: AudioRingBuffer, position: int):
+        self.ring = ring
+        self.position = position
+        self.dropped_frames = 0
+
+    @property
+    def available(self) -> int:
+        """Octets écrits et pas encore lus"""
+        return self.ring.written - self.position
+
+    def read(self, max_bytes: Optional[int] = None, timeout: Optional[float] = None) -> Optional[memoryview]:
+        """
+        Prochain bloc contigu de données, sans copie
+
+        La vue reste valide tant que l'écrivain n'a pas fait le tour de
+        l'anneau : la consommer (ou la copier) sans attendre.
+
+        Returns:
+            memoryview d'au plus max_bytes octets, None si rien n'arrive avant timeout
+        """
+        ring = self.ring
+        with ring._cond:
+            if not ring._cond.wait_for(lambda: ring.written > self.position or ring.closed, timeout):
+                return None
+            written = ring.written
+        if written == self.position:
+            return None
+
+        max_lag = ring.capacity - ring.guard_bytes
+        lag = written - self.position
+        if lag > max_lag:
+            lost = (lag - max_lag) // SAMPLE_BYTES
+            self.dropped_frames += lost
+            with ring._cond:
+                ring.dropped_frames += lost
+            self.position = written - max_lag
+            lag = max_lag
+
+        start = self.position % ring.capacity
+        n = min(lag, ring.capacity - start)
+        if max_bytes is not None:
+            n = min(n, max_bytes - max_bytes % SAMPLE_BYTES)
+        self.position += n
+        return ring._view[start:start + n]
+
+    def skip(self):
+        """Ignore tout ce qui a été écrit jusqu'ici (ex: pendant que Guardian parle)"""
+        self.position = self.ring.written
+
+
+class MicrophoneCapture:
+    """
+    Flux micro unique alimentant un AudioRingBuffer
+
+    Ouvert à la première demande de lecteur et gardé ouvert : plus de perte
+    d'audio ni de coût d'ouverture entre deux écoutes.
+    """
+
+    def __init__(self, samplerate: int = 16000, blocksize: Optional[int] = None,
+                 capacity_seconds: float = 10.0, device=None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.samplerate = samplerate
+        self.blocksize = blocksize or samplerate // 10  # blocs de 100 ms
+        self.device = device
+        self.ring = AudioRingBuffer(int(capacity_seconds * samplerate) * SAMPLE_BYTES,
+                                    guard_bytes=2 * self.blocksize * SAMPLE_BYTES)
+        self.overflows = 0
+        self._stream = None
+        self._lock = threading.Lock()
+
+    def _callback(self, indata, frames, time, status):
+        if status and status.input_overflow:
+            self.overflows += 1
+        self.ring.write(indata)
+
+    @property
+    def running(self) -> bool:
+        return self._stream is not None
+
+    def start(self):
+        """Ouvre le flux micro (sans effet s'il est déjà ouvert)"""
+        with self._lock:
+            if self._stream is not None:
+                return
+            if not SOUNDDEVICE_AVAILABLE:
+                raise RuntimeError("sounddevice/PortAudio non disponible")
+            self.ring.closed = False
+            stream = sd.RawInputStream(samplerate=self.samplerate, blocksize=self.blocksize,
+                                       device=self.device, dtype='int16', channels=1,
+                                       callback=self._callback)
+            stream.start()
+            self._stream = stream
+            self.logger.info(f"🎙️ Capture micro démarrée ({self.samplerate}Hz, "
+                             f"tampon {self.ring.capacity // (SAMPLE_BYTES * self.samplerate)}s)")
+
+    def stop(self):
+        """Ferme le flux et réveille les lecteurs en attente"""
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+        self.ring.close()
+
+    def reader(self) -> AudioReader:
+        """Lecteur sur le flux (démarré au besoin)"""
+        self.start()
+        return self.ring.reader()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'seconds_captured': self.ring.written / (SAMPLE_BYTES * self.samplerate),
+            'dropped_frames': self.ring.dropped_frames,
+            'overflows': self.overflows,
+        }
+
+
+_captures: Dict[int, MicrophoneCapture] = {}
+_captures_lock = threading.Lock()
+
+
+def get_capture(samplerate: int = 16000) -> MicrophoneCapture:
+    """Capture micro partagée du processus pour cette fréquence"""
+    with _captures_lock:
+        capture = _captures.get(samplerate)
+        if capture is None:
+            capture = _captures[samplerate] = MicrophoneCapture(samplerate)
+        return capture
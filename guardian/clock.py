@@ -0,0 +1,49 @@
+"""
+Horloges injectables pour les détecteurs Guardian
+L'horloge système sert en production ; l'horloge simulée permet de rejouer
+des traces GPS bien plus vite que le temps réel
+"""
+
+import time
+
+
+class SystemClock:
+    """Horloge murale réelle (time.time / time.sleep)"""
+
+    def now(self) -> float:
+        """Heure actuelle en secondes (epoch)"""
+        return time.time()
+
+    def sleep(self, seconds: float):
+        """Attente réelle"""
+        time.sleep(seconds)
+
+
+class SimulatedClock:
+    """
+    Horloge manuelle : sleep() avance le temps sans attendre
+
+    Utilisée pour le rejeu accéléré et les tests (un scénario de 5 minutes
+    d'immobilité s'exécute instantanément).
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = float(start)
+
+    def now(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def advance(self, seconds: float):
+        """Avance l'horloge de seconds"""
+        if seconds > 0:
+            self._now += seconds
+
+    def set(self, timestamp: float):
+        """Place l'horloge à un instant donné (jamais en arrière)"""
+        self._now = max(self._now, float(timestamp))
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -4,7 +4,7 @@ Configuration loader for Guardian
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class Config:
     """Gestionnaire de configuration pour Guardian"""
@@ -48,7 +48,9 @@ class Config:
             "voice_agent": {
                 "keywords": ["aide", "stop", "urgence", "secours", "oui", "non"],
                 "model_path": "vosk-model-small-fr-0.22",
-                "samplerate": 16000
+                "samplerate": 16000,
+                "keyword_spotting": True,
+                "vad": True
             },
             "wrong_path_agent": {
                 "deviation_threshold": 50
@@ -91,6 +93,14 @@ class Config:
             config["model_path"] = self.get_model_path()
         return config
     
+    def get_gps_config(self) -> Dict[str, Any]:
+        """Retourne la configuration de la source GPS"""
+        return self.get("gps", {})
+    
+    def get_geofences_config(self) -> List[Dict[str, Any]]:
+        """Retourne la liste des zones géographiques (sûres et de vigilance)"""
+        return self.get("geofences") or []
+    
     def get_wrong_path_agent_config(self) -> Dict[str, Any]:
         """Retourne la configuration pour l'agent de déviation"""
         return self.get("wrong_path_agent", {})
\ No newline at end of file
@@ -1,6 +1,7 @@
 """
 Système de recherche de refuges et transports d'urgence pour Guardian
 """
+import asyncio
 import requests
 import logging
 import json
@@ -8,9 +9,19 @@ from typing import List, Dict, Tuple, Optional, Any
 import yaml
 from datetime import datetime
 
+from guardian.async_support import http_get_json
+from guardian.geodesy import decode_polyline, distance_m, distances_from, sort_by_distance
+
 class EmergencyLocationService:
     """Service de localisation d'urgence pour trouver refuges et transports"""
     
+    # Types de lieux sûrs à rechercher
+    SAFE_PLACE_TYPES = [
+        'restaurant', 'bar', 'cafe', 'pharmacy', 'hospital', 
+        'police', 'fire_station', 'shopping_mall', 'hotel',
+        'gas_station', 'bank'  # Souvent ouverts et avec sécurité
+    ]
+    
     def __init__(self, api_keys_config: dict):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.config = api_keys_config
@@ -32,14 +43,7 @@ class EmergencyLocationService:
         
         refuges = []
         
-        # Types de lieux sûrs à rechercher
-        safe_place_types = [
-            'restaurant', 'bar', 'cafe', 'pharmacy', 'hospital', 
-            'police', 'fire_station', 'shopping_mall', 'hotel',
-            'gas_station', 'bank'  # Souvent ouverts et avec sécurité
-        ]
-        
-        for place_type in safe_place_types:
+        for place_type in self.SAFE_PLACE_TYPES:
             places = self._search_places_nearby(location, place_type, radius_m)
             refuges.extend(places)
         
@@ -49,6 +53,25 @@ class EmergencyLocationService:
         self.logger.info(f"Trouvé {len(refuges)} refuges potentiels")
         return refuges[:10]  # Top 10 refuges les plus proches
     
+    async def find_emergency_refuges_async(self, location: Tuple[float, float], radius_m: int = 500) -> List[Dict]:
+        """
+        Variante asynchrone de find_emergency_refuges : une requête par type
+        de lieu, toutes lancées en parallèle
+        """
+        lat, lon = location
+        self.logger.info(f"Recherche refuges d'urgence près de {lat}, {lon} (rayon: {radius_m}m)")
+        
+        results = await asyncio.gather(*[
+            self._search_places_nearby_async(location, place_type, radius_m)
+            for place_type in self.SAFE_PLACE_TYPES
+        ])
+        refuges = [place for places in results for place in places]
+        
+        refuges = self._filter_and_sort_refuges(refuges, location)
+        
+        self.logger.info(f"Trouvé {len(refuges)} refuges potentiels")
+        return refuges[:10]
+    
     def find_emergency_transport(self, location: Tuple[float, float], radius_m: int = 1000) -> Dict[str, List]:
         """
         Trouve les moyens de transport d'urgence à proximité
@@ -93,26 +116,56 @@ class EmergencyLocationService:
             response = requests.get(url, params=params)
             data = response.json()
             
-            places = []
-            for result in data.get('results', []):
-                place = {
-                    'name': result.get('name', 'Lieu inconnu'),
-                    'type': place_type,
-                    'address': result.get('vicinity', ''),
-                    'rating': result.get('rating', 0),
-                    'is_open': self._check_if_open(result),
-                    'location': result['geometry']['location'],
-                    'distance_m': self._calculate_distance(location, 
-                        (result['geometry']['location']['lat'], result['geometry']['location']['lng']))
-                }
-                places.append(place)
+            return self._parse_places_response(data, location, place_type)
+            
+        except Exception as e:
+            self.logger.error(f"Erreur recherche places {place_type}: {e}")
+            return self._simulate_places(location, place_type)
+    
+    async def _search_places_nearby_async(self, location: Tuple[float, float], place_type: str, radius: int) -> List[Dict]:
+        """Variante asynchrone de _search_places_nearby"""
+        try:
+            if not self.maps_api_key:
+                return self._simulate_places(location, place_type)
             
-            return places
+            lat, lon = location
+            params = {
+                'location': f"{lat},{lon}",
+                'radius': radius,
+                'type': place_type,
+                'key': self.maps_api_key
+            }
+            
+            data = await http_get_json("https://maps.googleapis.com/maps/api/place/nearbysearch/json", params=params)
+            return self._parse_places_response(data, location, place_type)
             
         except Exception as e:
             self.logger.error(f"Erreur recherche places {place_type}: {e}")
             return self._simulate_places(location, place_type)
     
+    def _parse_places_response(self, data: Dict, location: Tuple[float, float], place_type: str) -> List[Dict]:
+        """Convertit une réponse Places API en liste de refuges"""
+        results = data.get('results', [])
+        # Toutes les distances en un seul calcul vectorisé
+        distances = distances_from(location, [
+            (r['geometry']['location']['lat'], r['geometry']['location']['lng']) for r in results
+        ])
+        
+        places = []
+        for result, distance in zip(results, distances):
+            place = {
+                'name': result.get('name', 'Lieu inconnu'),
+                'type': place_type,
+                'address': result.get('vicinity', ''),
+                'rating': result.get('rating', 0),
+                'is_open': self._check_if_open(result),
+                'location': result['geometry']['location'],
+                'distance_m': int(distance)
+            }
+            places.append(place)
+        
+        return places
+    
     def _simulate_places(self, location: Tuple[float, float], place_type: str) -> List[Dict]:
         """Simule des lieux pour les tests (quand pas d'API)"""
         lat, lon = location
@@ -264,33 +317,25 @@ class EmergencyLocationService:
         return opening_hours.get('open_now', False)
     
     def _calculate_distance(self, loc1: Tuple[float, float], loc2: Tuple[float, float]) -> int:
-        """Calcule la distance entre deux points (approximation simple)"""
-        from math import radians, cos, sin, asin, sqrt
-        
-        lon1, lat1 = loc1
-        lon2, lat2 = loc2
-        
-        # Formule haversine
-        lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371000  # Rayon de la Terre en mètres
-        return int(c * r)
+        """Calcule la distance en mètres entre deux points (lat, lon)"""
+        return int(distance_m(loc1, loc2))
     
     def _filter_and_sort_refuges(self, refuges: List[Dict], location: Tuple[float, float]) -> List[Dict]:
         """Filtre et trie les refuges par pertinence"""
+        if not refuges:
+            return []
         
-        # Priorité aux lieux ouverts
-        open_refuges = [r for r in refuges if r.get('is_open', False)]
-        closed_refuges = [r for r in refuges if not r.get('is_open', False)]
-        
-        # Trier par distance
-        open_refuges.sort(key=lambda x: x.get('distance_m', 9999))
-        closed_refuges.sort(key=lambda x: x.get('distance_m', 9999))
+        # Trier par distance réelle depuis la position (un seul calcul pour tous les types de lieux)
+        order, distances = sort_by_distance(location, [
+            (r['location']['lat'], r['location']['lng']) for r in refuges
+        ])
+        for refuge, distance in zip(refuges, distances):
+            refuge['distance_m'] = int(distance)
+        by_distance = [refuges[i] for i in order]
         
         # Priorité : ouverts d'abord, puis fermés
+        open_refuges = [r for r in by_distance if r.get('is_open', False)]
+        closed_refuges = [r for r in by_distance if not r.get('is_open', False)]
         return open_refuges + closed_refuges
     
     def get_escape_route_to_refuge(self, start_location: Tuple[float, float], refuge_location: Tuple[float, float]) -> Dict[str, Any]:
@@ -334,6 +379,7 @@ class EmergencyLocationService:
                     'distance': route['legs'][0]['distance']['text'],
                     'steps': self._format_escape_steps(route['legs'][0]['steps']),
                     'polyline': route['overview_polyline']['points'],
+                    'path': decode_polyline(route['overview_polyline']['points']),
                     'warnings': route.get('warnings', [])
                 }
             else:
@@ -375,6 +421,7 @@ class EmergencyLocationService:
                 "5. Arrivée au refuge - demandez de l'aide"
             ],
             'polyline': 'simulation_polyline',
+            'path': [tuple(start), tuple(end)],  # ligne droite
             'warnings': ['Itinéraire simulé - utilisez votre jugement sur le terrain']
         }
 
@@ -8,6 +8,8 @@ import time
 from typing import List, Dict, Any
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+
+from guardian.async_support import run_blocking
 # from guardian.emergency_email_generator import EmergencyEmailGenerator  # Désactivé - utilise ses propres templates
 
 class EmergencyResponse:
@@ -22,8 +24,13 @@ class EmergencyResponse:
         # Générateur d'emails visuels désactivé - utilise ses propres templates
         # self.email_generator = EmergencyEmailGenerator(api_keys_config)
         
-    def send_immediate_danger_alert(self, location: tuple, situation: str = ""):
-        """Envoie une alerte de danger immédiat aux contacts proches"""
+    def send_immediate_danger_alert(self, location: tuple, situation: str = "") -> bool:
+        """
+        Envoie une alerte de danger immédiat aux contacts proches
+        
+        Returns:
+            bool: True si au moins un email a été envoyé
+        """
         self.logger.critical(f"ALERTE DANGER IMMÉDIAT: {location}")
         
         lat, lon = location
@@ -50,14 +57,25 @@ Cette alerte a été déclenchée automatiquement par le système de sécurité.
 """
         
         # Envoyer à tous les contacts avec priorité haute
+        sent = False
         for contact in self.emergency_contacts:
-            self._send_urgent_email(contact, "🚨 DANGER IMMÉDIAT - ASSISTANCE REQUISE", urgent_message)
+            if self._send_urgent_email(contact, "🚨 DANGER IMMÉDIAT - ASSISTANCE REQUISE", urgent_message):
+                sent = True
             self._send_urgent_sms(contact, location, situation)
         
-        self.logger.info("Alertes de danger immédiat envoyées à tous les contacts")
+        if sent:
+            self.logger.info("Alertes de danger immédiat envoyées aux contacts")
+        else:
+            self.logger.warning("Aucune alerte de danger immédiat envoyée")
+        return sent
 
-    def send_location_to_contacts(self, location: tuple, situation: str = ""):
-        """Envoie la localisation aux contacts d'urgence"""
+    def send_location_to_contacts(self, location: tuple, situation: str = "") -> bool:
+        """
+        Envoie la localisation aux contacts d'urgence
+        
+        Returns:
+            bool: True si au moins un email a été envoyé
+        """
         self.logger.info(f"Envoi de localisation d'urgence: {location}")
         
         lat, lon = location
@@ -75,12 +93,20 @@ Cette personne pourrait avoir besoin d'aide.
 Merci de vérifier sa situation.
 """
         
+        sent = False
         for contact in self.emergency_contacts:
-            self._send_email(contact, "ALERTE GUARDIAN", message)
+            if self._send_email(contact, "ALERTE GUARDIAN", message):
+                sent = True
             self._send_sms_notification(contact, location)
+        return sent
             
-    def send_location_with_refuges_info(self, location: tuple, refuges_info: str, situation: str = ""):
-        """Envoie la localisation avec informations sur les refuges et transports"""
+    def send_location_with_refuges_info(self, location: tuple, refuges_info: str, situation: str = "") -> bool:
+        """
+        Envoie la localisation avec informations sur les refuges et transports
+        
+        Returns:
+            bool: True si au moins un email a été envoyé
+        """
         self.logger.info(f"Envoi localisation avec refuges: {location}")
         
         lat, lon = location
@@ -105,9 +131,12 @@ Merci de vérifier sa situation.
 Cette alerte contient des informations de sécurité actualisées.
 """
         
+        sent = False
         for contact in self.emergency_contacts:
-            self._send_email(contact, "🚨 ALERTE AVEC REFUGES - GUARDIAN", enhanced_message)
+            if self._send_email(contact, "🚨 ALERTE AVEC REFUGES - GUARDIAN", enhanced_message):
+                sent = True
             self._send_sms_notification(contact, location)
+        return sent
     
     def send_confirmation_alert(self, alert_state: str):
         """Envoie une notification de confirmation d'état"""
@@ -127,12 +156,12 @@ Tout semble normal.
             for contact in self.emergency_contacts:
                 self._send_email(contact, "Guardian - Confirmation", message)
     
-    def _send_email(self, contact: Dict[str, str], subject: str, message: str):
-        """Envoie un email à un contact"""
+    def _send_email(self, contact: Dict[str, str], subject: str, message: str) -> bool:
+        """Envoie un email à un contact (True si envoyé)"""
         try:
             if not self.email_config.get('enabled', False):
                 self.logger.debug("Email désactivé dans la configuration")
-                return
+                return False
                 
             msg = MIMEMultipart()
             msg['From'] = self.email_config['from_email']
@@ -151,16 +180,18 @@ Tout semble normal.
             server.quit()
             
             self.logger.info(f"Email envoyé à {contact['email']}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Erreur envoi email à {contact.get('email', 'inconnu')}: {e}")
+            return False
     
-    def _send_urgent_email(self, contact: Dict[str, str], subject: str, message: str):
-        """Envoie un email urgent avec priorité haute"""
+    def _send_urgent_email(self, contact: Dict[str, str], subject: str, message: str) -> bool:
+        """Envoie un email urgent avec priorité haute (True si envoyé)"""
         try:
             if not self.email_config.get('enabled', False):
                 self.logger.debug("Email urgent désactivé dans la configuration")
-                return
+                return False
                 
             msg = MIMEMultipart()
             msg['From'] = self.email_config['from_email']
@@ -181,9 +212,11 @@ Tout semble normal.
             server.quit()
             
             self.logger.critical(f"EMAIL URGENT envoyé à {contact['email']}")
+            return True
             
         except Exception as e:
             self.logger.error(f"Erreur envoi email urgent à {contact.get('email', 'inconnu')}: {e}")
+            return False
 
     def _send_urgent_sms(self, contact: Dict[str, str], location: tuple, situation: str):
         """Envoie un SMS d'urgence (avec Twilio ou simulation)"""
@@ -243,7 +276,7 @@ Tout semble normal.
                                   urgency_level: str,
                                   situation_details: str,
                                   person_name: str = "Utilisateur Guardian",
-                                  additional_info: Dict[str, Any] = None):
+                                  additional_info: Dict[str, Any] = None) -> bool:
         """
         Envoie un email visuel d'urgence enrichi avec carte et géolocalisation
         
@@ -254,12 +287,15 @@ Tout semble normal.
             situation_details: Description de la situation
             person_name: Nom de la personne en urgence
             additional_info: Informations supplémentaires (chute, vitesse, etc.)
+            
+        Returns:
+            bool: True si au moins un email a été envoyé (False en simulation)
         """
         
         if not self.email_config.get('enabled', False):
             self.logger.info("Emails désactivés - Simulation d'envoi d'email visuel d'urgence")
             self._simulate_visual_email_alert(location, emergency_type, urgency_level)
-            return
+            return False
         
         try:
             # Utiliser un template simple au lieu du générateur complexe
@@ -282,22 +318,25 @@ Tout semble normal.
             subject = f"🚨 URGENCE {urgency_level.upper()} - {person_name} a besoin d'aide"
             
             # Envoyer à tous les contacts d'urgence
+            sent_count = 0
             for contact in self.emergency_contacts:
-                self._send_html_email(
+                if self._send_html_email(
                     to_email=contact.get('email'),
                     to_name=contact.get('name', 'Contact d\'urgence'),
                     subject=subject,
                     html_content=html_content
-                )
+                ):
+                    sent_count += 1
                 
-            self.logger.info(f"Emails visuels d'urgence envoyés à {len(self.emergency_contacts)} contacts")
+            self.logger.info(f"Emails visuels d'urgence envoyés à {sent_count}/{len(self.emergency_contacts)} contacts")
+            return sent_count > 0
             
         except Exception as e:
             self.logger.error(f"Erreur envoi email visuel d'urgence: {e}")
             # Fallback vers email texte simple
-            self.send_location_to_contacts(location, f"{emergency_type}: {situation_details}")
+            return self.send_location_to_contacts(location, f"{emergency_type}: {situation_details}")
     
-    def _send_html_email(self, to_email: str, to_name: str, subject: str, html_content: str):
+    def _send_html_email(self, to_email: str, to_name: str, subject: str, html_content: str) -> bool:
         """Envoie un email HTML formaté"""
         
         try:
@@ -323,9 +362,11 @@ Tout semble normal.
                 server.send_message(msg)
             
             self.logger.info(f"Email HTML envoyé à {to_name} ({to_email})")
+            return True
             
         except Exception as e:
             self.logger.error(f"Erreur envoi email HTML à {to_email}: {e}")
+            return False
     
     def _html_to_text_fallback(self, html_content: str) -> str:
         """Convertit le HTML en texte simple pour fallback"""
@@ -368,8 +409,8 @@ Tout semble normal.
         # Générateur désactivé - retourner un message simple
         return "<html><body><h2>Test Email - EmergencyResponse</h2><p>Système opérationnel</p></body></html>"
     
-    def send_fall_emergency_alert(self, location: tuple, fall_info: Dict[str, Any]):
-        """Envoie une alerte spécialisée pour les chutes"""
+    def send_fall_emergency_alert(self, location: tuple, fall_info: Dict[str, Any]) -> bool:
+        """Envoie une alerte spécialisée pour les chutes (True si un email est parti)"""
         
         fall_type = fall_info.get('fall_type', 'chute_generale')
         severity = fall_info.get('severity', 'modérée')
@@ -403,10 +444,37 @@ Tout semble normal.
         situation += "La personne ne répond pas aux sollicitations."
         
         # Envoyer l'alerte visuelle
-        self.send_visual_emergency_alert(
+        return self.send_visual_emergency_alert(
             location=location,
             emergency_type=emergency_type,
             urgency_level=urgency_level,
             situation_details=situation,
             additional_info=fall_info
-        )
\ No newline at end of file
+        )
+    
+    # Variantes asynchrones : smtplib est bloquant, l'envoi est déporté
+    # dans le pool borné pour ne pas bloquer la boucle d'événements
+    
+    async def send_immediate_danger_alert_async(self, location: tuple, situation: str = "") -> bool:
+        """Variante asynchrone de send_immediate_danger_alert"""
+        return await run_blocking(self.send_immediate_danger_alert, location, situation)
+    
+    async def send_location_to_contacts_async(self, location: tuple, situation: str = "") -> bool:
+        """Variante asynchrone de send_location_to_contacts"""
+        return await run_blocking(self.send_location_to_contacts, location, situation)
+    
+    async def send_location_with_refuges_info_async(self, location: tuple, refuges_info: str, situation: str = "") -> bool:
+        """Variante asynchrone de send_location_with_refuges_info"""
+        return await run_blocking(self.send_location_with_refuges_info, location, refuges_info, situation)
+    
+    async def send_confirmation_alert_async(self, alert_state: str):
+        """Variante asynchrone de send_confirmation_alert"""
+        await run_blocking(self.send_confirmation_alert, alert_state)
+    
+    async def send_fall_emergency_alert_async(self, location: tuple, fall_info: Dict[str, Any]) -> bool:
+        """Variante asynchrone de send_fall_emergency_alert"""
+        return await run_blocking(self.send_fall_emergency_alert, location, fall_info)
+    
+    async def escalate_emergency_async(self, location: tuple, no_response_duration: int):
+        """Variante asynchrone de escalate_emergency"""
+        await run_blocking(self.escalate_emergency, location, no_response_duration)
@@ -3,12 +3,14 @@ Détecteur de chute pour Guardian
 Analyse les mouvements suspects et détecte les chutes potentielles
 """
 
-import time
 import logging
-from typing import Tuple, List, Optional, Dict
-from math import radians, cos, sin, asin, sqrt
+from typing import Tuple, Optional, Dict
 import random
 
+from guardian.clock import SYSTEM_CLOCK
+from guardian.geodesy import distance_m
+from guardian.ring_buffer import PositionRingBuffer
+
 class FallDetector:
     """
     Détecteur de chute basé sur l'analyse GPS et de mouvement
@@ -18,16 +20,19 @@ class FallDetector:
                  speed_threshold_high: float = 15.0,  # km/h - vitesse élevée avant chute
                  speed_threshold_low: float = 2.0,    # km/h - vitesse très faible après chute
                  acceleration_threshold: float = -8.0, # m/s² - décélération brutale
-                 stationary_time: float = 30.0):       # secondes immobile après chute
+                 stationary_time: float = 30.0,        # secondes immobile après chute
+                 clock=None,                           # horloge injectable (rejeu accéléré)
+                 history_size: int = 10):              # positions conservées (ex: 600 = 1 min à 10 Hz)
         
+        self.clock = clock or SYSTEM_CLOCK
         self.speed_threshold_high = speed_threshold_high
         self.speed_threshold_low = speed_threshold_low 
         self.acceleration_threshold = acceleration_threshold
         self.stationary_time = stationary_time
         
         # Historique des positions pour analyser le mouvement
-        self.position_history: List[Dict] = []
-        self.max_history = 10  # Garder les 10 dernières positions
+        self.max_history = history_size
+        self.history = PositionRingBuffer(history_size)
         
         # État de détection
         self.fall_detected = False
@@ -74,58 +79,37 @@ class FallDetector:
     
     def _haversine_distance(self, coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
         """Calcule la distance en mètres entre deux points GPS"""
-        lat1, lon1 = coord1
-        lat2, lon2 = coord2
-        
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371000  # Rayon de la Terre en mètres
-        
-        return c * r
+        return distance_m(coord1, coord2)
     
-    def update_position(self, position: Tuple[float, float]) -> Optional[Dict]:
+    def update_position(self, position: Tuple[float, float],
+                        timestamp: Optional[float] = None) -> Optional[Dict]:
         """
         Met à jour la position et analyse le mouvement pour détecter une chute
         
         Args:
             position: (latitude, longitude)
+            timestamp: Horodatage du fix GPS (secondes), sinon l'heure de l'horloge
             
         Returns:
             Dict avec informations de chute si détectée, None sinon
         """
-        current_time = time.time()
+        current_time = timestamp if timestamp is not None else self.clock.now()
         
-        # Ajouter la nouvelle position à l'historique
-        position_data = {
-            'position': position,
-            'timestamp': current_time,
-            'speed': 0.0
-        }
+        speed = 0.0
         
         # Calculer la vitesse si on a une position précédente
-        if len(self.position_history) > 0:
-            prev_data = self.position_history[-1]
-            speed = self._calculate_speed(
-                prev_data['position'], 
-                position,
-                prev_data['timestamp'],
-                current_time
-            )
-            position_data['speed'] = speed
+        previous = self.history.last()
+        if previous is not None:
+            prev_position, prev_time, _ = previous
+            speed = self._calculate_speed(prev_position, position, prev_time, current_time)
             
             # Analyser pour détecter une chute
             fall_info = self._analyze_fall_pattern(speed, current_time)
             if fall_info:
                 return fall_info
         
-        # Maintenir l'historique à jour
-        self.position_history.append(position_data)
-        if len(self.position_history) > self.max_history:
-            self.position_history.pop(0)
+        # Maintenir l'historique à jour (la plus ancienne position est écrasée)
+        self.history.append(position[0], position[1], current_time, speed)
             
         return None
     
@@ -133,12 +117,11 @@ class FallDetector:
         """
         Analyse le pattern de mouvement pour détecter une chute
         """
-        if len(self.position_history) < 2:
+        if len(self.history) < 2:
             return None
             
-        prev_data = self.position_history[-1]
-        prev_speed = prev_data['speed']
-        time_diff = current_time - prev_data['timestamp']
+        prev_position, prev_time, prev_speed = self.history.last()
+        time_diff = current_time - prev_time
         
         # Calculer l'accélération
         acceleration = self._calculate_acceleration(prev_speed, current_speed, time_diff)
@@ -157,7 +140,7 @@ class FallDetector:
                 'acceleration': acceleration,
                 'detection_time': current_time,
                 'severity': self._assess_fall_severity(prev_speed, acceleration),
-                'position': self.position_history[-1]['position']
+                'position': prev_position
             }
             
             self.fall_detected = True
@@ -240,18 +223,19 @@ class FallDetector:
         else:
             return "légère"
     
-    def check_post_fall_status(self, current_position: Tuple[float, float]) -> Optional[Dict]:
+    def check_post_fall_status(self, current_position: Tuple[float, float],
+                               timestamp: Optional[float] = None) -> Optional[Dict]:
         """
         Vérifie le statut après une chute détectée
         """
         if not self.fall_detected or not self.fall_detection_time:
             return None
             
-        current_time = time.time()
+        current_time = timestamp if timestamp is not None else self.clock.now()
         time_since_fall = current_time - self.fall_detection_time
         
         # Calculer si la personne bouge depuis la chute
-        if len(self.position_history) >= 2:
+        if len(self.history) >= 2:
             recent_movement = self._calculate_recent_movement()
             
             # Si immobile depuis longtemps après chute = urgence
@@ -270,20 +254,9 @@ class FallDetector:
     
     def _calculate_recent_movement(self) -> float:
         """
-        Calcule le mouvement total sur les dernières positions
+        Calcule le mouvement total sur les dernières positions (O(1), cumul du tampon)
         """
-        if len(self.position_history) < 2:
-            return 0.0
-            
-        total_distance = 0.0
-        for i in range(1, len(self.position_history)):
-            distance = self._haversine_distance(
-                self.position_history[i-1]['position'],
-                self.position_history[i]['position']
-            )
-            total_distance += distance
-            
-        return total_distance
+        return self.history.path_length
     
     def reset_fall_detection(self):
         """Reset du détecteur après intervention"""
@@ -295,7 +268,7 @@ class FallDetector:
         """
         Simule une chute pour les tests
         """
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # Simuler différents types de chute
         if fall_type == "chute_velo":
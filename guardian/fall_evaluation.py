@@ -0,0 +1,255 @@
+"""
+Banc d'évaluation du détecteur de chute Guardian
+Traces de mouvement étiquetées (vélo, marche, chutes, arrêts de bus, feux
+rouges), générées ou chargées depuis des CSV, rejouées en lot dans
+FallDetector : précision, rappel, latence de détection, débit en points par
+seconde et balayage des seuils
+"""
+
+import csv
+import glob
+import itertools
+import math
+import os
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from guardian.clock import SimulatedClock
+from guardian.fall_detector import FallDetector
+from guardian.gps_sources import GPSFix
+from guardian.replay import load_trace
+
+METERS_PER_DEGREE = 111_195.0
+START = 1_700_000_000.0
+
+KINDS = ('cycling', 'walking', 'fall', 'bus_stop', 'red_light')
+
+
+class LabelledTrace(NamedTuple):
+    """Trace étiquetée ; fall_time = instant de la chute (None si aucune)"""
+    name: str
+    kind: str
+    fixes: List[GPSFix]
+    fall_time: Optional[float] = None
+
+
+# --- Génération ----------------------------------------------------------------
+
+def _profile(kind: str, rng: random.Random):
+    """Vitesses (m/s) seconde par seconde et indice de la chute éventuelle"""
+    def cruise(seconds, low, high):
+        target = rng.uniform(low, high)
+        return [max(0.0, target + rng.uniform(-0.4, 0.4)) for _ in range(seconds)]
+
+    def ramp(start, end, rate):
+        steps = max(1, math.ceil(abs(end - start) / rate))
+        return [start + (end - start) * (i + 1) / steps for i in range(steps)]
+
+    if kind == 'walking':
+        return cruise(rng.randint(200, 400), 1.1, 1.6), None
+    if kind == 'cycling':
+        return cruise(rng.randint(200, 400), 4.0, 6.5), None
+    if kind == 'fall':
+        before = cruise(rng.randint(60, 200), 4.5, 8.0)
+        return before + [0.0] * rng.randint(60, 120), len(before)
+    if kind == 'bus_stop':
+        speed = rng.uniform(8.0, 11.0)
+        profile = cruise(rng.randint(60, 120), speed, speed)
+        profile += ramp(profile[-1], 0.0, rng.uniform(1.2, 1.8))
+        profile += [0.0] * rng.randint(15, 40)
+        profile += ramp(0.0, speed, 1.0) + cruise(60, speed, speed)
+        return profile, None
+    if kind == 'red_light':
+        speed = rng.uniform(4.5, 6.5)
+        profile = cruise(rng.randint(60, 120), speed, speed)
+        profile += ramp(profile[-1], 0.0, rng.uniform(2.5, 3.5))
+        profile += [0.0] * rng.randint(30, 60)
+        profile += ramp(0.0, speed, 1.5) + cruise(60, speed, speed)
+        return profile, None
+    raise ValueError(f"Type de trace inconnu: {kind}")
+
+
+def generate_trace(kind: str, seed: int = 0, noise_m: float = 0.5,
+                   origin=(48.8566, 2.3522)) -> LabelledTrace:
+    """Trace synthétique à 1 Hz le long d'une rue vers le nord-est, bruit GPS de noise_m"""
+    rng = random.Random(f"{kind}-{seed}")
+    speeds, fall_index = _profile(kind, rng)
+    heading = math.radians(rng.uniform(0, 360))
+    lon_scale = METERS_PER_DEGREE * math.cos(math.radians(origin[0]))
+
+    fixes = []
+    north = east = 0.0
+    for i, speed in enumerate(speeds):
+        noise_north, noise_east = rng.uniform(-noise_m, noise_m), rng.uniform(-noise_m, noise_m)
+        fixes.append(GPSFix(START + i,
+                            origin[0] + (north + noise_north) / METERS_PER_DEGREE,
+                            origin[1] + (east + noise_east) / lon_scale))
+        north += speed * math.cos(heading)
+        east += speed * math.sin(heading)
+
+    fall_time = START + fall_index if fall_index is not None else None
+    return LabelledTrace(f"{kind}-{seed}", kind, fixes, fall_time)
+
+
+def generate_corpus(traces_per_kind: int = 20, seed: int = 0, noise_m: float = 0.5,
+                    kinds: Iterable[str] = KINDS) -> List[LabelledTrace]:
+    """Corpus équilibré de traces synthétiques"""
+    return [generate_trace(kind, seed * 100_000 + i, noise_m)
+            for kind in kinds for i in range(traces_per_kind)]
+
+
+# --- Chargement / export ---------------------------------------------------------
+
+def save_labelled_trace(trace: LabelledTrace, path: str):
+    """CSV timestamp,latitude,longitude précédé des étiquettes en commentaires"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write(f"# kind: {trace.kind}\n")
+        if trace.fall_time is not None:
+            f.write(f"# fall_time: {trace.fall_time}\n")
+        writer = csv.writer(f)
+        writer.writerow(['timestamp', 'latitude', 'longitude'])
+        writer.writerows(trace.fixes)
+
+
+def load_labelled_trace(path: str) -> LabelledTrace:
+    """
+    Charge une trace CSV étiquetée
+
+    Étiquettes en commentaires d'en-tête : '# kind: fall' et '# fall_time: <epoch>'
+    """
+    labels = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith('#'):
+                break
+            key, _, value = line[1:].partition(':')
+            labels[key.strip()] = value.strip()
+    fall_time = labels.get('fall_time')
+    return LabelledTrace(os.path.splitext(os.path.basename(path))[0],
+                         labels.get('kind', 'unknown'),
+                         load_trace(path),
+                         float(fall_time) if fall_time else None)
+
+
+def load_corpus(directory: str) -> List[LabelledTrace]:
+    """Toutes les traces CSV étiquetées d'un répertoire"""
+    return [load_labelled_trace(path) for path in sorted(glob.glob(os.path.join(directory, '*.csv')))]
+
+
+# --- Évaluation ------------------------------------------------------------------
+
+def evaluate(traces: List[LabelledTrace],
+             detector_factory: Callable[..., Any] = FallDetector,
+             tolerance_seconds: float = 10.0,
+             **params) -> Dict[str, Any]:
+    """
+    Rejoue le corpus dans un détecteur neuf par trace
+
+    Une chute est reconnue (vrai positif) si la première détection tombe
+    dans [fall_time, fall_time + tolerance_seconds] ; toute autre détection
+    est une fausse alerte.
+
+    Returns:
+        Dict des métriques : precision, recall, f1, latences, fausses
+        alertes par heure, points_per_second, détail par type de trace
+    """
+    true_positives = false_positives = false_negatives = 0
+    latencies, post_fall_latencies = [], []
+    falls = post_falls = points = 0
+    non_fall_seconds = 0.0
+    by_kind: Dict[str, Dict[str, int]] = {}
+    elapsed = 0.0
+
+    for trace in traces:
+        detector = detector_factory(clock=SimulatedClock(), **params)
+        first_fall = first_post_fall = None
+
+        started = time.perf_counter()
+        for timestamp, lat, lon in trace.fixes:
+            position = (lat, lon)
+            if detector.update_position(position, timestamp) and first_fall is None:
+                first_fall = timestamp
+            if detector.check_post_fall_status(position, timestamp):
+                if first_post_fall is None:
+                    first_post_fall = timestamp
+                detector.reset_fall_detection()
+        elapsed += time.perf_counter() - started
+        points += len(trace.fixes)
+
+        stats = by_kind.setdefault(trace.kind, {'traces': 0, 'detected': 0})
+        stats['traces'] += 1
+        stats['detected'] += first_fall is not None
+
+        if trace.fall_time is None:
+            non_fall_seconds += trace.fixes[-1].timestamp - trace.fixes[0].timestamp
+            false_positives += first_fall is not None
+            continue
+
+        falls += 1
+        if first_fall is not None and 0 <= first_fall - trace.fall_time <= tolerance_seconds:
+            true_positives += 1
+            latencies.append(first_fall - trace.fall_time)
+            if first_post_fall is not None:
+                post_falls += 1
+                post_fall_latencies.append(first_post_fall - trace.fall_time)
+        else:
+            false_negatives += 1
+            false_positives += first_fall is not None
+
+    detections = true_positives + false_positives
+    precision = true_positives / detections if detections else 1.0
+    recall = true_positives / falls if falls else 1.0
+    return {
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'true_positives': true_positives,
+        'false_positives': false_positives,
+        'false_negatives': false_negatives,
+        'false_alarms_per_hour': false_positives / (non_fall_seconds / 3600) if non_fall_seconds else 0.0,
+        'mean_latency': float(np.mean(latencies)) if latencies else None,
+        'max_latency': float(np.max(latencies)) if latencies else None,
+        'post_fall_recall': post_falls / true_positives if true_positives else 0.0,
+        'mean_post_fall_latency': float(np.mean(post_fall_latencies)) if post_fall_latencies else None,
+        'points': points,
+        'points_per_second': points / elapsed if elapsed else float('inf'),
+        'by_kind': by_kind
+    }
+
+
+def sweep(traces: List[LabelledTrace], grid: Dict[str, Iterable[Any]],
+          detector_factory: Callable[..., Any] = FallDetector,
+          tolerance_seconds: float = 10.0) -> List[Dict[str, Any]]:
+    """
+    Balaie une grille de seuils (ex: speed_threshold_high, acceleration_threshold,
+    stationary_time) ; un résultat {'params', métriques...} par combinaison
+    """
+    names = list(grid)
+    results = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        metrics = evaluate(traces, detector_factory, tolerance_seconds, **params)
+        results.append({'params': params, **metrics})
+    return results
+
+
+def format_report(metrics: Dict[str, Any]) -> str:
+    """Rapport lisible d'une évaluation"""
+    def seconds(value):
+        return f"{value:.1f}s" if value is not None else "-"
+
+    lines = [
+        "🧪 Évaluation du détecteur de chute",
+        f"   Précision {metrics['precision']:.0%}  Rappel {metrics['recall']:.0%}  F1 {metrics['f1']:.2f}",
+        f"   Fausses alertes: {metrics['false_positives']} ({metrics['false_alarms_per_hour']:.1f}/h)",
+        f"   Latence moyenne {seconds(metrics['mean_latency'])}, max {seconds(metrics['max_latency'])}",
+        f"   Urgence post-chute: {metrics['post_fall_recall']:.0%} "
+        f"(après {seconds(metrics['mean_post_fall_latency'])})",
+        f"   Débit: {metrics['points_per_second']:,.0f} points/s ({metrics['points']:,} points)",
+    ]
+    for kind, stats in metrics['by_kind'].items():
+        lines.append(f"   {kind:<10} {stats['detected']}/{stats['traces']} traces avec détection")
+    return "\n".join(lines)
@@ -0,0 +1,240 @@
+"""
+Transcription de fichiers audio pour Guardian
+Les enregistrements envoyés (WAV, WebM, OGG...) sont convertis en PCM 16 bits
+mono 16 kHz puis décodés par Vosk. Les fichiers courts sont transcrits
+directement avec un reconnaisseur libre du pool ; les longs (ou quand tout
+est occupé) partent dans un pool de processus dont chaque worker garde son
+modèle chargé : le décodage ne monopolise plus le GIL du serveur web.
+"""
+
+import io
+import json
+import logging
+import multiprocessing
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from guardian.latency import LatencyHistogram
+from guardian.vad import GatedRecognizer
+from guardian.vosk_models import PoolExhausted, RecognizerPool, get_model
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+SAMPLE_BYTES = 2  # PCM 16 bits mono
+
+
+def decode_audio(data: bytes, samplerate: int = 16000) -> bytes:
+    """
+    Convertit un fichier audio en PCM 16 bits mono à samplerate
+
+    Les WAV PCM (8, 16 ou 32 bits) sont convertis avec NumPy ; les autres
+    formats (WebM/Opus des navigateurs, OGG, MP3...) passent par ffmpeg.
+
+    Raises:
+        ValueError: format illisible, ou non-WAV sans ffmpeg installé
+    """
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        try:
+            return _decode_wav(data, samplerate)
+        except (wave.Error, ValueError):
+            pass  # WAV flottant, 24 bits... : ffmpeg
+
+    if shutil.which("ffmpeg") is None:
+        raise ValueError("Format audio non supporté sans ffmpeg (WAV PCM uniquement)")
+    process = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+         "-ac", "1", "-ar", str(samplerate), "-f", "s16le", "pipe:1"],
+        input=data, capture_output=True, timeout=60)
+    if process.returncode != 0:
+        error = process.stderr.decode(errors="replace").strip().splitlines()
+        raise ValueError(f"Décodage audio impossible: {error[-1] if error else process.returncode}")
+    return process.stdout
+
+
+def _decode_wav(data: bytes, samplerate: int) -> bytes:
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) * 256.0
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32)
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 65536.0
+    else:
+        raise ValueError(f"WAV {8 * width} bits non supporté")
+
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    if rate != samplerate and len(samples):
+        n_out = int(len(samples) * samplerate / rate)
+        samples = np.interp(np.arange(n_out) * (rate / samplerate), np.arange(len(samples)), samples)
+    return np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+
+def transcribe_pcm(recognizer, pcm: bytes, chunk_bytes: int = 8000) -> str:
+    """Texte complet d'un signal PCM (énoncés successifs séparés par une espace)"""
+    texts = []
+    for offset in range(0, len(pcm), chunk_bytes):
+        if recognizer.AcceptWaveform(bytes(pcm[offset:offset + chunk_bytes])):
+            texts.append(json.loads(recognizer.Result()).get("text", ""))
+    texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    recognizer.Reset()
+    return " ".join(t.strip() for t in texts if t.strip())
+
+
+# Reconnaisseur propre à chaque processus worker
+_worker_recognizer = None
+
+
+def _init_worker(model_path: str, samplerate: int, factory: Optional[Callable[[], Any]]):
+    global _worker_recognizer
+    if factory is None:
+        # Processus forké : le registre hérité renvoie le modèle déjà chargé
+        model = get_model(model_path)
+        factory = lambda: GatedRecognizer(vosk.KaldiRecognizer(model, samplerate))
+    _worker_recognizer = factory()
+
+
+def _worker_transcribe(pcm: bytes):
+    started = time.perf_counter()
+    text = transcribe_pcm(_worker_recognizer, pcm)
+    return text, time.perf_counter() - started
+
+
+class TranscriptionPool:
+    """
+    Transcription de fichiers : en ligne pour les courts, pool de processus sinon
+
+    Les workers sont forkés dès la construction et gardent leur reconnaisseur
+    d'un fichier à l'autre : construire le pool avant que le processus ne
+    démarre d'autres threads (un fork multi-thread peut se bloquer). Le mode
+    spawn ne sert que là où fork n'existe pas : il réexécute le module
+    principal dans chaque worker. Au-delà de max_pending fichiers en file, les
+    demandes sont refusées (PoolExhausted).
+    """
+
+    def __init__(self, model_path: str, workers: int = 2, samplerate: int = 16000,
+                 max_pending: int = 16, inline_max_seconds: float = 5.0,
+                 factory: Optional[Callable[[], Any]] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.workers = workers
+        self.samplerate = samplerate
+        self.max_pending = max_pending
+        self.inline_max_seconds = inline_max_seconds
+
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        if method == "fork" and threading.active_count() > 1:
+            self.logger.warning(f"⚠️ Fork des workers avec {threading.active_count()} threads actifs : "
+                                f"créer le pool avant de démarrer les agents")
+        self._pool = multiprocessing.get_context(method).Pool(
+            workers, initializer=_init_worker, initargs=(model_path, samplerate, factory))
+
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.inline = 0
+        self.rejected = 0
+        self.audio_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.wait_times = LatencyHistogram()
+        self.logger.info(f"🗂️ Pool de transcription: {workers} processus ({method})")
+
+    def transcribe(self, pcm: bytes, timeout: Optional[float] = None,
+                   inline_pool: Optional[RecognizerPool] = None) -> Dict[str, Any]:
+        """
+        Transcrit un signal PCM 16 bits mono
+
+        Returns:
+            Dict avec text, mode ('inline' ou 'process'), audio_seconds,
+            decode_seconds, rtf, wait_seconds et queue_depth (fichiers en file
+            à la soumission, celui-ci compris)
+
+        Raises:
+            PoolExhausted: trop de fichiers déjà en file
+            TimeoutError: pas de résultat après timeout secondes
+        """
+        audio_seconds = len(pcm) / (SAMPLE_BYTES * self.samplerate)
+        if inline_pool is not None and audio_seconds <= self.inline_max_seconds:
+            try:
+                recognizer = inline_pool.acquire(timeout=0)
+            except PoolExhausted:
+                recognizer = None
+            if recognizer is not None:
+                try:
+                    started = time.perf_counter()
+                    text = transcribe_pcm(recognizer, pcm)
+                    decode_seconds = time.perf_counter() - started
+                finally:
+                    inline_pool.release(recognizer)
+                with self._lock:
+                    self.inline += 1
+                return self._record(text, 'inline', audio_seconds, decode_seconds, 0.0, self.pending)
+
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PoolExhausted(f"{self.pending} transcriptions déjà en file")
+            self.pending += 1
+            depth = self.pending
+
+        submitted = time.perf_counter()
+        job = self._pool.apply_async(_worker_transcribe, (bytes(pcm),),
+                                     callback=self._done, error_callback=self._done)
+        try:
+            text, decode_seconds = job.get(timeout)
+        except multiprocessing.TimeoutError:
+            raise TimeoutError(f"Transcription non terminée après {timeout}s")
+        wait_seconds = max(0.0, time.perf_counter() - submitted - decode_seconds)
+        return self._record(text, 'process', audio_seconds, decode_seconds, wait_seconds, depth)
+
+    def _done(self, _):
+        with self._lock:
+            self.pending -= 1
+
+    def _record(self, text, mode, audio_seconds, decode_seconds, wait_seconds, depth) -> Dict[str, Any]:
+        with self._lock:
+            self.completed += 1
+            self.audio_seconds += audio_seconds
+            self.decode_seconds += decode_seconds
+            self.wait_times.record(wait_seconds)
+        return {
+            'text': text,
+            'mode': mode,
+            'audio_seconds': audio_seconds,
+            'decode_seconds': decode_seconds,
+            'rtf': decode_seconds / audio_seconds if audio_seconds else 0.0,
+            'wait_seconds': wait_seconds,
+            'queue_depth': depth,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """File d'attente, facteur temps réel global et attente (secondes) avant décodage"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_depth': self.pending,
+                'completed': self.completed,
+                'inline': self.inline,
+                'rejected': self.rejected,
+                'audio_seconds': self.audio_seconds,
+                'rtf': self.decode_seconds / self.audio_seconds if self.audio_seconds else 0.0,
+                'wait_p50': self.wait_times.percentile(50),
+                'wait_p95': self.wait_times.percentile(95),
+            }
+
+    def close(self):
+        """Arrête les processus workers"""
+        self._pool.terminate()
+        self._pool.join()
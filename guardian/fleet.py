@@ -0,0 +1,258 @@
+"""
+Moteur de détection pour une flotte d'utilisateurs Guardian
+Traite par lots les positions de N utilisateurs (ex: depuis un bus de messages)
+avec un état en colonnes NumPy : immobilité (StaticAgent) et les trois motifs
+de chute de FallDetector, évalués de façon vectorisée
+"""
+
+import logging
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from guardian.fall_detector import FallDetector
+from guardian.geodesy import haversine
+
+# Événements émis : (user_id, événement)
+EVENT_IMMOBILITY = 'immobility'
+EVENT_FALL = 'fall'
+EVENT_POST_FALL = 'post_fall'
+
+FleetEvent = Tuple[Hashable, str]
+
+
+class FleetDetector:
+    """
+    Détection d'immobilité et de chute pour une flotte, un lot à la fois
+
+    Reproduit la logique de StaticAgent.update_position et de
+    FallDetector.update_position utilisateur par utilisateur. L'urgence
+    post-chute utilise le mouvement cumulé depuis la chute (au lieu de la
+    fenêtre glissante du détecteur individuel).
+    """
+
+    # Seuils fixes des motifs 2 et 3 de FallDetector._detect_fall_pattern
+    MODERATE_SPEED = 8.0      # km/h
+    STOP_SPEED = 1.0          # km/h
+    MODERATE_DECEL = -5.0     # m/s²
+    VERY_HIGH_SPEED = 25.0    # km/h
+    NEAR_STOP_SPEED = 3.0     # km/h
+    POST_FALL_MAX_MOVEMENT = 5.0  # mètres
+
+    def __init__(self, capacity: int = 1024,
+                 distance_threshold: float = 10,
+                 time_threshold: float = 300,
+                 speed_threshold_high: float = 15.0,
+                 speed_threshold_low: float = 2.0,
+                 acceleration_threshold: float = -8.0,
+                 stationary_time: float = 30.0):
+        self.distance_threshold = distance_threshold
+        self.time_threshold = time_threshold
+        self.speed_threshold_high = speed_threshold_high
+        self.speed_threshold_low = speed_threshold_low
+        self.acceleration_threshold = acceleration_threshold
+        self.stationary_time = stationary_time
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        # Classification et sévérité reprises du détecteur individuel
+        self._classifier = FallDetector(speed_threshold_high, speed_threshold_low,
+                                        acceleration_threshold, stationary_time)
+
+        self._ids: List[Hashable] = []
+        self._index: Dict[Hashable, int] = {}
+        self._capacity = 0
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int):
+        """Agrandit les colonnes d'état (doublement)"""
+        def grow(name, dtype):
+            column = np.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                column[:len(old)] = old
+            setattr(self, name, column)
+
+        # Immobilité (état de StaticAgent ; st_lat/st_lon = point de départ)
+        for name in ('st_lat', 'st_lon', 'st_t', 'static_time'):
+            grow(name, np.float64)
+        grow('st_has', np.bool_)
+        # Chute (dernière entrée de l'historique de FallDetector)
+        for name in ('fd_lat', 'fd_lon', 'fd_t', 'fd_speed'):
+            grow(name, np.float64)
+        grow('fd_count', np.int8)  # taille de l'historique, plafonnée à 2
+        # Suivi post-chute et détails de la dernière chute
+        for name in ('fall_time', 'movement', 'fall_prev_speed', 'fall_speed', 'fall_accel'):
+            grow(name, np.float64)
+        grow('fall_active', np.bool_)
+        grow('has_fall', np.bool_)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def register(self, user_ids: Iterable[Hashable]) -> np.ndarray:
+        """Indices internes des utilisateurs (créés au besoin)"""
+        index = self._index
+        indices = []
+        for user_id in user_ids:
+            i = index.get(user_id)
+            if i is None:
+                i = index[user_id] = len(self._ids)
+                self._ids.append(user_id)
+            indices.append(i)
+        if len(self._ids) > self._capacity:
+            capacity = self._capacity
+            while capacity < len(self._ids):
+                capacity *= 2
+            self._allocate(capacity)
+        return np.asarray(indices, dtype=np.int64)
+
+    def update(self, user_ids: Sequence[Hashable], lats, lons, timestamps) -> List[FleetEvent]:
+        """
+        Traite un lot de positions
+
+        Args:
+            user_ids: Identifiants des utilisateurs (un par position)
+            lats, lons: Coordonnées en degrés
+            timestamps: Horodatages des fixes GPS (secondes)
+
+        Returns:
+            Liste compacte [(user_id, événement)]
+        """
+        return self.update_indices(self.register(user_ids), lats, lons, timestamps)
+
+    def update_indices(self, indices: np.ndarray, lats, lons, timestamps) -> List[FleetEvent]:
+        """
+        Variante sans correspondance d'identifiants (indices issus de register)
+
+        Un même utilisateur peut apparaître plusieurs fois dans le lot : ses
+        positions sont alors traitées dans l'ordre, en plusieurs passes.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+
+        rank = self._occurrence_rank(indices)
+        if rank is None:
+            return self._update_unique(indices, lats, lons, timestamps)
+
+        events = []
+        for r in range(int(rank.max()) + 1):
+            selected = rank == r
+            events.extend(self._update_unique(indices[selected], lats[selected],
+                                              lons[selected], timestamps[selected]))
+        return events
+
+    @staticmethod
+    def _occurrence_rank(indices: np.ndarray) -> Optional[np.ndarray]:
+        """Rang d'apparition de chaque utilisateur dans le lot (None si tous uniques)"""
+        order = np.argsort(indices, kind='stable')
+        sorted_indices = indices[order]
+        starts = np.ones(len(indices), dtype=bool)
+        starts[1:] = sorted_indices[1:] != sorted_indices[:-1]
+        if starts.all():
+            return None
+        positions = np.arange(len(indices))
+        group_start = np.maximum.accumulate(np.where(starts, positions, 0))
+        rank = np.empty(len(indices), dtype=np.int64)
+        rank[order] = positions - group_start
+        return rank
+
+    def _update_unique(self, idx: np.ndarray, lat: np.ndarray, lon: np.ndarray,
+                       t: np.ndarray) -> List[FleetEvent]:
+        """Un lot où chaque utilisateur n'apparaît qu'une fois"""
+        # --- Immobilité (StaticAgent.update_position)
+        has_position = self.st_has[idx]
+        moved = haversine(self.st_lat[idx], self.st_lon[idx], lat, lon)
+        still = has_position & (moved < self.distance_threshold)
+        static_time = np.where(still, self.static_time[idx] + (t - self.st_t[idx]), 0.0)
+        immobility = still & (static_time > self.time_threshold)
+        static_time[immobility] = 0.0
+
+        self.static_time[idx] = static_time
+        # Point de départ de l'immobilité, déplacé seulement en cas de mouvement
+        self.st_lat[idx] = np.where(still, self.st_lat[idx], lat)
+        self.st_lon[idx] = np.where(still, self.st_lon[idx], lon)
+        self.st_t[idx] = t
+        self.st_has[idx] = True
+
+        # --- Chute (FallDetector.update_position / _detect_fall_pattern)
+        count = self.fd_count[idx]
+        dt = t - self.fd_t[idx]
+        segment = haversine(self.fd_lat[idx], self.fd_lon[idx], lat, lon)
+        timed = (count > 0) & (dt > 0)
+        safe_dt = np.where(timed, dt, 1.0)
+        speed = np.where(timed, segment / safe_dt * 3.6, 0.0)
+        prev_speed = self.fd_speed[idx]
+        acceleration = np.where(timed, (speed - prev_speed) / 3.6 / safe_dt, 0.0)
+
+        pattern = (
+            ((prev_speed > self.speed_threshold_high) &
+             (speed < self.speed_threshold_low) &
+             (acceleration < self.acceleration_threshold)) |
+            ((prev_speed > self.MODERATE_SPEED) &
+             (speed < self.STOP_SPEED) &
+             (acceleration < self.MODERATE_DECEL)) |
+            ((prev_speed > self.VERY_HIGH_SPEED) &
+             (speed < self.NEAR_STOP_SPEED))
+        )
+        fall = (count >= 2) & pattern
+
+        # Comme FallDetector : la position de la chute n'entre pas dans l'historique
+        appended = idx[~fall]
+        keep = ~fall
+        movement = self.movement[idx]
+        movement = np.where(keep & self.fall_active[idx] & (count > 0), movement + segment, movement)
+        self.movement[idx] = movement
+        self.fd_lat[appended] = lat[keep]
+        self.fd_lon[appended] = lon[keep]
+        self.fd_t[appended] = t[keep]
+        self.fd_speed[appended] = speed[keep]
+        self.fd_count[appended] = np.minimum(count[keep] + 1, 2)
+
+        fallen = idx[fall]
+        self.fall_active[fallen] = True
+        self.has_fall[fallen] = True
+        self.fall_time[fallen] = t[fall]
+        self.movement[fallen] = 0.0
+        self.fall_prev_speed[fallen] = prev_speed[fall]
+        self.fall_speed[fallen] = speed[fall]
+        self.fall_accel[fallen] = acceleration[fall]
+
+        # --- Urgence post-chute : immobile depuis la chute
+        post_fall = (~fall & self.fall_active[idx] &
+                     (t - self.fall_time[idx] > self.stationary_time) &
+                     (self.movement[idx] < self.POST_FALL_MAX_MOVEMENT))
+        self.fall_active[idx[post_fall]] = False
+
+        ids = self._ids
+        events = [(ids[i], EVENT_IMMOBILITY) for i in idx[immobility].tolist()]
+        events += [(ids[i], EVENT_FALL) for i in fallen.tolist()]
+        events += [(ids[i], EVENT_POST_FALL) for i in idx[post_fall].tolist()]
+        return events
+
+    def fall_info(self, user_id: Hashable) -> Optional[Dict]:
+        """Détails de la dernière chute au format de FallDetector (None si inconnue)"""
+        i = self._index.get(user_id)
+        if i is None or not self.has_fall[i]:
+            return None
+        prev_speed = float(self.fall_prev_speed[i])
+        speed = float(self.fall_speed[i])
+        acceleration = float(self.fall_accel[i])
+        return {
+            'type': 'fall_detected',
+            'fall_type': self._classifier._classify_fall_type(prev_speed, speed, acceleration),
+            'previous_speed': prev_speed,
+            'current_speed': speed,
+            'acceleration': acceleration,
+            'detection_time': float(self.fall_time[i]),
+            'severity': self._classifier._assess_fall_severity(prev_speed, acceleration),
+            'position': (float(self.fd_lat[i]), float(self.fd_lon[i]))
+        }
+
+    def reset_fall_detection(self, user_id: Hashable):
+        """Reset après intervention (équivalent de FallDetector.reset_fall_detection)"""
+        i = self._index.get(user_id)
+        if i is not None:
+            self.fall_active[i] = False
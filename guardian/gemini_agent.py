@@ -6,9 +6,12 @@ import logging
 import json
 import requests
 import os
+import threading
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+from guardian.async_support import http_post_json
+
 try:
     from google import genai
     GENAI_AVAILABLE = True
@@ -18,6 +21,11 @@ except ImportError:
 class GeminiAgent:
     """Agent Gemini pour l'analyse d'urgence avancée avec Gemini 2.5 Flash via API REST"""
     
+    # États de disponibilité de l'API (décidés par la sonde en arrière-plan)
+    AVAILABILITY_UNKNOWN = 'unknown'
+    AVAILABILITY_UP = 'available'
+    AVAILABILITY_DOWN = 'unavailable'
+    
     def __init__(self, api_keys_config: Dict[str, Any] = None):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
@@ -45,20 +53,87 @@ class GeminiAgent:
             self.logger.warning("Configuration Gemini incomplète - mode simulation")
             
         self.enabled = gemini_config.get('enabled', True)
-        
-        self.is_available = False
-        
-        # Initialiser l'API si configuration complète
+        # Délai entre deux sondes tant que l'API est injoignable
+        self.probe_retry_interval = gemini_config.get('probe_retry_interval', 60)
+
+        self._probe_lock = threading.Lock()
+        self._probe_thread: Optional[threading.Thread] = None
+        self._probe_done = threading.Event()
+        self._probe_stop = threading.Event()
+
+        # Le constructeur ne touche pas au réseau : disponibilité "inconnue"
+        # jusqu'à la première sonde ou la première vraie requête
         if self.api_key and self.enabled:
-            self._initialize_api()
+            self.availability = self.AVAILABILITY_UNKNOWN
+            self._start_health_probe()
         else:
+            self.availability = self.AVAILABILITY_DOWN
+            self._probe_done.set()
             self.logger.warning("Configuration API incomplète - fonctionnement en mode simulation")
-    
+
+    @property
+    def is_available(self) -> bool:
+        """
+        True sauf si l'API est connue comme injoignable
+
+        En état inconnu, l'analyse tente directement l'API (avec repli en
+        simulation) au lieu d'attendre la sonde.
+        """
+        return self.availability != self.AVAILABILITY_DOWN
+
+    def _set_availability(self, availability: str):
+        """Met à jour l'état et relance la sonde si l'API devient injoignable"""
+        previous, self.availability = self.availability, availability
+        if availability == previous:
+            return
+        if availability == self.AVAILABILITY_UP:
+            self.logger.info(f"✅ API {self.api_type.upper()} connectée avec succès")
+        elif availability == self.AVAILABILITY_DOWN:
+            self.logger.info(f"⚠️ Mode simulation activé pour {self.api_type.upper()}")
+            if self.api_key and self.enabled:
+                self._start_health_probe()
+
+    def _start_health_probe(self):
+        """Démarre la sonde de santé en arrière-plan (une seule à la fois)"""
+        with self._probe_lock:
+            if self._probe_stop.is_set():
+                return
+            if self._probe_thread and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(
+                target=self._health_probe_loop, name="gemini-health-probe", daemon=True
+            )
+            self._probe_thread.start()
+
+    def _health_probe_loop(self):
+        """Sonde l'API jusqu'à ce qu'elle réponde (ou arrêt demandé)"""
+        while not self._probe_stop.is_set():
+            self._initialize_api()
+            self._probe_done.set()
+            if self.availability == self.AVAILABILITY_UP:
+                return
+            if self._probe_stop.wait(self.probe_retry_interval):
+                return
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend le résultat de la première sonde (diagnostics et scripts uniquement)
+
+        Returns:
+            bool: True si l'API est disponible
+        """
+        self._probe_done.wait(timeout)
+        return self.availability == self.AVAILABILITY_UP
+
+    def stop_health_probe(self):
+        """Arrête la sonde de santé (arrêt du service)"""
+        self._probe_stop.set()
+
     def _initialize_api(self):
-        """Initialise la connexion à l'API Gemini"""
+        """Sonde la connexion à l'API Gemini (exécutée hors du constructeur)"""
         try:
             # Initialiser le client Google GenAI si disponible
-            if self.api_type == 'gemini' and GENAI_AVAILABLE:
+            if self.api_type == 'gemini' and GENAI_AVAILABLE and not hasattr(self, 'genai_client'):
                 self._initialize_genai_client()
             
             # Test de connectivité simple
@@ -70,17 +145,15 @@ class GeminiAgent:
                 # Vérifier que ce n'est pas une simulation
                 response_text = response['candidates'][0]['content']['parts'][0]['text']
                 if response_text and 'simulation' not in response_text.lower():
-                    self.is_available = True
-                    self.logger.info(f"✅ API {self.api_type.upper()} connectée avec succès")
+                    self._set_availability(self.AVAILABILITY_UP)
                     return
                     
             # Si on arrive ici, c'est une simulation ou erreur
-            self.is_available = False
-            self.logger.info(f"⚠️ Mode simulation activé pour {self.api_type.upper()}")
+            self._set_availability(self.AVAILABILITY_DOWN)
                 
         except Exception as e:
             self.logger.error(f"Erreur initialisation API {self.api_type}: {e}")
-            self.is_available = False
+            self._set_availability(self.AVAILABILITY_DOWN)
     
     def _initialize_genai_client(self):
         """Initialise le client Google GenAI moderne"""
@@ -110,76 +183,103 @@ class GeminiAgent:
         # if hasattr(self, 'use_genai_client') and self.use_genai_client and hasattr(self, 'genai_client'):
         #     return self._make_genai_request(prompt, max_tokens)
         
-        # Construire l'URL selon le type d'API (méthode REST classique)
         try:
-            if self.api_type == 'gemini':
-                # Utiliser gemini-2.0-flash-exp avec v1beta qui supporte response_mime_type JSON
-                api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={self.api_key}"
-            else:
-                # Gemini API - utiliser gemini-2.0-flash-exp
-                api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={self.api_key}"
-            
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": 0.1,
-                    "maxOutputTokens": max_tokens,
-                    "topP": 0.8,
-                    "topK": 10,
-                    "response_mime_type": "application/json"
-                },
-                "safetySettings": [
-                    {
-                        "category": "HARM_CATEGORY_HARASSMENT",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                    },
-                    {
-                        "category": "HARM_CATEGORY_HATE_SPEECH",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                    },
-                    {
-                        "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                    },
-                    {
-                        "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                    }
-                ]
-            }
+            api_url, headers, payload = self._build_api_request(prompt, max_tokens)
             
             self.logger.debug(f"Requête API {self.api_type}: {api_url[:50]}...")
             response = requests.post(api_url, headers=headers, json=payload, timeout=15)
             
-            self.logger.debug(f"Réponse API: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info("API Gemini: Réponse reçue avec succès")
-                return result
-            elif response.status_code == 400:
-                error_detail = response.text
-                self.logger.warning(f"API Gemini erreur 400 (Bad Request): {error_detail[:200]}...")
-                self.logger.info("Passage en mode simulation")
-                return self._simulate_response(prompt)
-            elif response.status_code == 403:
-                self.logger.warning("API Gemini: Clé invalide ou API non activée - mode simulation")
-                return self._simulate_response(prompt)
-            else:
-                self.logger.warning(f"API Gemini erreur {response.status_code}: {response.text[:100]}...")
-                return self._simulate_response(prompt)
+            return self._handle_api_response(response.status_code, response.text, prompt)
                 
         except requests.exceptions.RequestException as e:
             self.logger.warning(f"Erreur réseau API Gemini: {e} - mode simulation")
+            self._set_availability(self.AVAILABILITY_DOWN)
+            return self._simulate_response(prompt)
+        except Exception as e:
+            self.logger.warning(f"Erreur API Gemini: {e} - mode simulation")
             return self._simulate_response(prompt)
+    
+    async def _make_api_request_async(self, prompt: str, max_tokens: int = 1000) -> Optional[Dict]:
+        """Variante asynchrone de _make_api_request (sans bloquer la boucle)"""
+        if not self.api_key or self.api_key == "YOUR_GEMINI_API_KEY":
+            self.logger.info("API Key non configurée - mode simulation")
+            return self._simulate_response(prompt)
+        
+        try:
+            api_url, headers, payload = self._build_api_request(prompt, max_tokens)
+            status_code, body = await http_post_json(api_url, payload, headers=headers, timeout=15)
+            return self._handle_api_response(status_code, body, prompt)
         except Exception as e:
             self.logger.warning(f"Erreur API Gemini: {e} - mode simulation")
+            self._set_availability(self.AVAILABILITY_DOWN)
+            return self._simulate_response(prompt)
+    
+    def _build_api_request(self, prompt: str, max_tokens: int) -> Tuple[str, Dict, Dict]:
+        """Construit l'URL, les en-têtes et le corps de la requête REST"""
+        if self.api_type == 'gemini':
+            # Utiliser gemini-2.0-flash-exp avec v1beta qui supporte response_mime_type JSON
+            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={self.api_key}"
+        else:
+            # Gemini API - utiliser gemini-2.0-flash-exp
+            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp:generateContent?key={self.api_key}"
+        
+        headers = {
+            'Content-Type': 'application/json'
+        }
+        
+        payload = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.1,
+                "maxOutputTokens": max_tokens,
+                "topP": 0.8,
+                "topK": 10,
+                "response_mime_type": "application/json"
+            },
+            "safetySettings": [
+                {
+                    "category": "HARM_CATEGORY_HARASSMENT",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+                },
+                {
+                    "category": "HARM_CATEGORY_HATE_SPEECH",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+                },
+                {
+                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+                },
+                {
+                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+                }
+            ]
+        }
+        
+        return api_url, headers, payload
+    
+    def _handle_api_response(self, status_code: int, body: str, prompt: str) -> Optional[Dict]:
+        """Interprète la réponse HTTP de l'API Gemini"""
+        self.logger.debug(f"Réponse API: {status_code}")
+        
+        if status_code == 200:
+            result = json.loads(body)
+            self.logger.info("API Gemini: Réponse reçue avec succès")
+            self._set_availability(self.AVAILABILITY_UP)
+            return result
+        elif status_code == 400:
+            error_detail = body
+            self.logger.warning(f"API Gemini erreur 400 (Bad Request): {error_detail[:200]}...")
+            self.logger.info("Passage en mode simulation")
+            return self._simulate_response(prompt)
+        elif status_code == 403:
+            self.logger.warning("API Gemini: Clé invalide ou API non activée - mode simulation")
+            self._set_availability(self.AVAILABILITY_DOWN)
+            return self._simulate_response(prompt)
+        else:
+            self.logger.warning(f"API Gemini erreur {status_code}: {body[:100]}...")
             return self._simulate_response(prompt)
     
     def _make_genai_request(self, prompt: str, max_tokens: int = 1000) -> Optional[Dict]:
@@ -411,6 +511,32 @@ class GeminiAgent:
                                   user_input: str = "", time_of_day: str = "jour") -> Dict[str, Any]:
         """Analyse une situation d'urgence avec Gemini 2.5 Flash"""
         
+        prompt = self._build_emergency_prompt(context, location, user_input, time_of_day)
+        
+        try:
+            response = self._make_api_request(prompt, max_tokens=800)
+            return self._parse_emergency_response(response, context)
+        except Exception as e:
+            self.logger.error(f"Erreur analyse Gemini: {e}")
+        
+        return self._fallback_analysis(context)
+    
+    async def analyze_emergency_situation_async(self, context: str, location: Tuple[float, float] = None,
+                                                user_input: str = "", time_of_day: str = "jour") -> Dict[str, Any]:
+        """Variante asynchrone de analyze_emergency_situation"""
+        prompt = self._build_emergency_prompt(context, location, user_input, time_of_day)
+        
+        try:
+            response = await self._make_api_request_async(prompt, max_tokens=800)
+            return self._parse_emergency_response(response, context)
+        except Exception as e:
+            self.logger.error(f"Erreur analyse Gemini: {e}")
+        
+        return self._fallback_analysis(context)
+    
+    def _build_emergency_prompt(self, context: str, location: Tuple[float, float] = None,
+                                user_input: str = "", time_of_day: str = "jour") -> str:
+        """Construit le prompt d'analyse d'urgence"""
         # Construction du prompt contextuel
         location_str = f"GPS {location[0]:.6f}, {location[1]:.6f}" if location else "Non disponible"
         
@@ -471,25 +597,22 @@ Réponds UNIQUEMENT avec ce JSON (sans autre texte):
   "reassurance_message": "message rassurant et empathique"
 }}"""
         
-        try:
-            response = self._make_api_request(prompt, max_tokens=800)
+        return prompt
+    
+    def _parse_emergency_response(self, response: Optional[Dict], context: str) -> Dict[str, Any]:
+        """Extrait et valide l'analyse JSON de la réponse Gemini"""
+        if response and 'candidates' in response:
+            response_text = response['candidates'][0]['content']['parts'][0]['text']
             
-            if response and 'candidates' in response:
-                response_text = response['candidates'][0]['content']['parts'][0]['text']
+            try:
+                analysis = json.loads(response_text.strip())
+                analysis = self._validate_analysis_response(analysis)
                 
-                try:
-                    analysis = json.loads(response_text.strip())
-                    analysis = self._validate_analysis_response(analysis)
-                    
-                    self.logger.info("Analyse Gemini générée avec succès")
-                    return analysis
-                    
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Erreur parsing JSON: {e}")
-                    return self._fallback_analysis(context)
-            
-        except Exception as e:
-            self.logger.error(f"Erreur analyse Gemini: {e}")
+                self.logger.info("Analyse Gemini générée avec succès")
+                return analysis
+                
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Erreur parsing JSON: {e}")
         
         return self._fallback_analysis(context)
     
@@ -572,6 +695,31 @@ Réponds UNIQUEMENT avec ce JSON (sans autre texte):
                               context: str = "") -> Dict[str, Any]:
         """Analyse spécialisée pour les chutes"""
         
+        prompt = self._build_fall_prompt(fall_info, user_response, context)
+        
+        try:
+            response = self._make_api_request(prompt, max_tokens=600)
+            return self._parse_fall_response(response, fall_info, user_response)
+        except Exception as e:
+            self.logger.error(f"Erreur analyse chute: {e}")
+        
+        return self._fallback_fall_analysis(fall_info, user_response)
+    
+    async def analyze_fall_emergency_async(self, fall_info: Dict, user_response: str = None,
+                                           context: str = "") -> Dict[str, Any]:
+        """Variante asynchrone de analyze_fall_emergency"""
+        prompt = self._build_fall_prompt(fall_info, user_response, context)
+        
+        try:
+            response = await self._make_api_request_async(prompt, max_tokens=600)
+            return self._parse_fall_response(response, fall_info, user_response)
+        except Exception as e:
+            self.logger.error(f"Erreur analyse chute: {e}")
+        
+        return self._fallback_fall_analysis(fall_info, user_response)
+    
+    def _build_fall_prompt(self, fall_info: Dict, user_response: str = None, context: str = "") -> str:
+        """Construit le prompt d'analyse de chute"""
         impact_force = fall_info.get('impact_force', 'modéré')
         duration = fall_info.get('duration_seconds', 0)
         movement_after = fall_info.get('movement_detected_after', False)
@@ -587,22 +735,18 @@ Réponds UNIQUEMENT avec ce JSON (sans autre texte):
         
         prompt = " | ".join(prompt_parts)
         
-        try:
-            response = self._make_api_request(prompt, max_tokens=600)
+        return prompt
+    
+    def _parse_fall_response(self, response: Optional[Dict], fall_info: Dict, user_response: str) -> Dict[str, Any]:
+        """Extrait et valide l'analyse de chute"""
+        if response and 'candidates' in response:
+            response_text = response['candidates'][0]['content']['parts'][0]['text']
             
-            if response and 'candidates' in response:
-                response_text = response['candidates'][0]['content']['parts'][0]['text']
-                
-                try:
-                    analysis = json.loads(response_text.strip())
-                    analysis = self._validate_fall_analysis(analysis)
-                    return analysis
-                    
-                except json.JSONDecodeError:
-                    return self._fallback_fall_analysis(fall_info, user_response)
-        
-        except Exception as e:
-            self.logger.error(f"Erreur analyse chute: {e}")
+            try:
+                analysis = json.loads(response_text.strip())
+                return self._validate_fall_analysis(analysis)
+            except json.JSONDecodeError:
+                pass
         
         return self._fallback_fall_analysis(fall_info, user_response)
     
@@ -0,0 +1,124 @@
+"""
+Calculs géodésiques partagés par Guardian
+Distance haversine sur des tableaux NumPy : un-vers-plusieurs, matrice
+plusieurs-vers-plusieurs, segments consécutifs, longueur de trace et tri par distance
+
+Convention unique : les points sont toujours en (latitude, longitude) degrés.
+"""
+
+from math import radians, cos, sin, asin, sqrt
+from typing import List, Tuple, Sequence, Union
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0  # Rayon moyen de la Terre en mètres
+
+Coordinates = Tuple[float, float]
+PointArray = Union[np.ndarray, Sequence[Coordinates]]
+
+
+def _as_points(points: PointArray) -> np.ndarray:
+    """Convertit une liste de (lat, lon) en tableau (N, 2) de float64"""
+    array = np.asarray(points, dtype=np.float64)
+    if array.ndim == 1:
+        array = array.reshape(-1, 2)
+    return array
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Distance haversine en mètres, vectorisée (diffusion NumPy)
+
+    Args:
+        lat1, lon1, lat2, lon2: Scalaires ou tableaux en degrés
+
+    Returns:
+        Tableau des distances (ou scalaire NumPy)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) * 0.5) ** 2 + \
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distance_m(coord1: Coordinates, coord2: Coordinates) -> float:
+    """
+    Distance en mètres entre deux points (lat, lon)
+
+    Chemin scalaire en pur Python : plus rapide que NumPy pour un seul couple.
+    """
+    lat1, lon1, lat2, lon2 = map(radians, (coord1[0], coord1[1], coord2[0], coord2[1]))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * asin(sqrt(min(1.0, a)))
+
+
+def distances_from(origin: Coordinates, points: PointArray) -> np.ndarray:
+    """Distances (N,) d'une origine vers N points"""
+    points = _as_points(points)
+    if len(points) == 0:
+        return np.empty(0)
+    return haversine(origin[0], origin[1], points[:, 0], points[:, 1])
+
+
+def distance_matrix(points_a: PointArray, points_b: PointArray) -> np.ndarray:
+    """Matrice (N, M) des distances entre deux ensembles de points"""
+    points_a = _as_points(points_a)
+    points_b = _as_points(points_b)
+    return haversine(points_a[:, 0, None], points_a[:, 1, None],
+                     points_b[None, :, 0], points_b[None, :, 1])
+
+
+def consecutive_distances(points: PointArray) -> np.ndarray:
+    """Longueurs (N-1,) des segments consécutifs d'une trace"""
+    points = _as_points(points)
+    if len(points) < 2:
+        return np.empty(0)
+    return haversine(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1])
+
+
+def track_length(points: PointArray) -> float:
+    """Longueur totale d'une trace en mètres"""
+    return float(consecutive_distances(points).sum())
+
+
+def sort_by_distance(origin: Coordinates, points: PointArray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ordre des points du plus proche au plus lointain
+
+    Returns:
+        (indices triés, distances dans l'ordre d'origine)
+    """
+    distances = distances_from(origin, points)
+    return np.argsort(distances, kind='stable'), distances
+
+
+def decode_polyline(encoded: str) -> List[Coordinates]:
+    """
+    Décode une polyligne encodée Google (overview_polyline de l'API Directions)
+
+    Raises:
+        ValueError: si la chaîne n'est pas une polyligne valide
+    """
+    points = []
+    index, lat, lon = 0, 0, 0
+    length = len(encoded)
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            shift, result = 0, 0
+            while True:
+                if index >= length:
+                    raise ValueError("Polyligne tronquée")
+                byte = ord(encoded[index]) - 63
+                index += 1
+                if byte < 0 or byte > 63:
+                    raise ValueError(f"Caractère de polyligne invalide: {encoded[index - 1]!r}")
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        points.append((lat / 1e5, lon / 1e5))
+    return points
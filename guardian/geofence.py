@@ -0,0 +1,191 @@
+"""
+Zones géographiques (geofences) pour Guardian
+Zones sûres (domicile, bureau) et zones de vigilance, cercles ou polygones,
+indexées sur une grille régulière : chaque fix n'examine que les zones de sa
+cellule, même avec des dizaines de milliers de zones
+"""
+
+import logging
+import math
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from guardian.geodesy import distance_m
+
+SAFE = 'safe'
+CAUTION = 'caution'
+
+METERS_PER_DEGREE = 111_320.0  # longueur d'un degré de latitude
+
+Coordinates = Tuple[float, float]
+
+
+class Geofence(NamedTuple):
+    """
+    Zone circulaire (center + radius_m) ou polygonale (polygon, sommets (lat, lon))
+
+    kind: SAFE (alertes d'immobilité suspendues) ou CAUTION (vigilance)
+    """
+    fence_id: Hashable
+    kind: str = SAFE
+    center: Optional[Coordinates] = None
+    radius_m: float = 0.0
+    polygon: Optional[Tuple[Coordinates, ...]] = None
+    name: Optional[str] = None
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Rectangle englobant (lat_min, lon_min, lat_max, lon_max)"""
+        if self.polygon:
+            lats = [p[0] for p in self.polygon]
+            lons = [p[1] for p in self.polygon]
+            return min(lats), min(lons), max(lats), max(lons)
+        lat, lon = self.center
+        dlat = self.radius_m / METERS_PER_DEGREE
+        dlon = self.radius_m / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+    def contains(self, position: Coordinates) -> bool:
+        """Test exact d'appartenance"""
+        if self.polygon:
+            return _point_in_polygon(position, self.polygon)
+        return distance_m(position, self.center) <= self.radius_m
+
+
+def _point_in_polygon(position: Coordinates, polygon: Sequence[Coordinates]) -> bool:
+    """Lancer de rayon en (lat, lon) plan (zones de quelques kilomètres au plus)"""
+    lat, lon = position
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat):
+            crossing = lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if lon < crossing:
+                inside = not inside
+        j = i
+    return inside
+
+
+def geofence_from_config(entry: Dict) -> Geofence:
+    """
+    Zone depuis la configuration
+
+    Exemple : {id: maison, kind: safe, center: [48.85, 2.35], radius_m: 80}
+    ou {id: chantier, kind: caution, polygon: [[lat, lon], ...]}
+    """
+    polygon = entry.get('polygon')
+    center = entry.get('center')
+    if not polygon and not center:
+        raise ValueError(f"Zone {entry.get('id')} sans 'center' ni 'polygon'")
+    return Geofence(
+        fence_id=entry.get('id', entry.get('name')),
+        kind=entry.get('kind', SAFE),
+        center=tuple(center) if center else None,
+        radius_m=float(entry.get('radius_m', 0.0)),
+        polygon=tuple(tuple(p) for p in polygon) if polygon else None,
+        name=entry.get('name')
+    )
+
+
+class GeofenceIndex:
+    """
+    Index spatial en grille régulière (cellules de cell_size degrés)
+
+    Chaque zone est inscrite dans les cellules couvertes par son rectangle
+    englobant ; une requête ne teste exactement que les zones de la cellule
+    du point, en temps constant en moyenne quel que soit le nombre de zones.
+    """
+
+    def __init__(self, fences: Iterable[Geofence] = (), cell_size: float = 0.01):
+        self.cell_size = cell_size  # ~1,1 km en latitude
+        self._cells: Dict[Tuple[int, int], List[Geofence]] = {}
+        self._fences: Dict[Hashable, Geofence] = {}
+        for fence in fences:
+            self.add(fence)
+
+    def __len__(self) -> int:
+        return len(self._fences)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_size)), int(math.floor(lon / self.cell_size))
+
+    def _covered_cells(self, fence: Geofence) -> Iterable[Tuple[int, int]]:
+        lat_min, lon_min, lat_max, lon_max = fence.bounds()
+        row_min, col_min = self._cell(lat_min, lon_min)
+        row_max, col_max = self._cell(lat_max, lon_max)
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                yield row, col
+
+    def add(self, fence: Geofence):
+        """Ajoute (ou remplace) une zone"""
+        if fence.fence_id in self._fences:
+            self.remove(fence.fence_id)
+        self._fences[fence.fence_id] = fence
+        for cell in self._covered_cells(fence):
+            self._cells.setdefault(cell, []).append(fence)
+
+    def remove(self, fence_id: Hashable) -> bool:
+        """Retire une zone ; False si inconnue"""
+        fence = self._fences.pop(fence_id, None)
+        if fence is None:
+            return False
+        for cell in self._covered_cells(fence):
+            bucket = self._cells.get(cell)
+            if bucket:
+                bucket[:] = [f for f in bucket if f.fence_id != fence_id]
+                if not bucket:
+                    del self._cells[cell]
+        return True
+
+    def get(self, fence_id: Hashable) -> Optional[Geofence]:
+        return self._fences.get(fence_id)
+
+    def query(self, position: Coordinates) -> List[Geofence]:
+        """Zones contenant la position"""
+        bucket = self._cells.get(self._cell(*position))
+        if not bucket:
+            return []
+        return [fence for fence in bucket if fence.contains(position)]
+
+
+class GeofenceMonitor:
+    """
+    Suivi des entrées et sorties de zones d'un utilisateur
+
+    update() est appelé à chaque fix (static_monitor) et renvoie les
+    événements {'type': 'enter'|'exit', 'fence', 'timestamp', 'position'}.
+    """
+
+    def __init__(self, index: GeofenceIndex):
+        self.index = index
+        self.inside: Set[Hashable] = set()
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def update(self, position: Coordinates, timestamp: Optional[float] = None) -> List[Dict]:
+        current = {fence.fence_id: fence for fence in self.index.query(position)}
+        events = []
+
+        for fence_id in self.inside - current.keys():
+            fence = self.index.get(fence_id)
+            events.append({'type': 'exit', 'fence': fence, 'timestamp': timestamp, 'position': position})
+            self.logger.info(f"🚪 Sortie de la zone {fence_id}")
+        for fence_id in current.keys() - self.inside:
+            fence = current[fence_id]
+            events.append({'type': 'enter', 'fence': fence, 'timestamp': timestamp, 'position': position})
+            if fence.kind == CAUTION:
+                self.logger.warning(f"⚠️ Entrée dans la zone de vigilance {fence_id}")
+            else:
+                self.logger.info(f"🏠 Entrée dans la zone sûre {fence_id}")
+
+        self.inside = set(current)
+        return events
+
+    @property
+    def in_safe_zone(self) -> bool:
+        """Position courante dans au moins une zone sûre"""
+        for fence_id in self.inside:
+            fence = self.index.get(fence_id)
+            if fence is not None and fence.kind == SAFE:
+                return True
+        return False
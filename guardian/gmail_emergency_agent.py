@@ -11,6 +11,7 @@ import json
 import urllib.parse
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
 from datetime import datetime
 import requests
 from .what3words_service import What3WordsService
@@ -399,8 +400,12 @@ class GmailEmergencyAgent:
         
         return html_body
     
-    def send_email(self, recipient_email, subject, html_body, text_body):
-        """Envoie un email via Gmail API"""
+    def send_email(self, recipient_email, subject, html_body, text_body, attachments=None):
+        """
+        Envoie un email via Gmail API
+        
+        attachments: pièces jointes optionnelles [(nom, contenu, type MIME)]
+        """
         
         if not self.is_available:
             return {
@@ -417,17 +422,30 @@ class GmailEmergencyAgent:
                 }
             
             # Créer le message MIME (sans images)
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = "noreply@guardiannav.com"
-            message['To'] = recipient_email
+            body = MIMEMultipart('alternative')
             
             # Ajouter les versions texte et HTML
             text_part = MIMEText(text_body, 'plain', 'utf-8')
             html_part = MIMEText(html_body, 'html', 'utf-8')
             
-            message.attach(text_part)
-            message.attach(html_part)
+            body.attach(text_part)
+            body.attach(html_part)
+            
+            # Pièces jointes (ex: trajet récent en GPX) autour du corps
+            if attachments:
+                message = MIMEMultipart('mixed')
+                message.attach(body)
+                for filename, content, mime_type in attachments:
+                    if isinstance(content, str):
+                        content = content.encode('utf-8')
+                    part = MIMEApplication(content, _subtype=mime_type.split('/', 1)[-1])
+                    part.add_header('Content-Disposition', 'attachment', filename=filename)
+                    message.attach(part)
+            else:
+                message = body
+            message['Subject'] = subject
+            message['From'] = "noreply@guardiannav.com"
+            message['To'] = recipient_email
             
             # Encoder en base64 pour l'API Gmail
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
@@ -467,7 +485,7 @@ class GmailEmergencyAgent:
                 'recipient': recipient_email
             }
     
-    def send_to_emergency_contacts(self, user_name, location, situation, location_coords=None, emergency_type="🚨 Situation d'urgence", urgency_level="élevée"):
+    def send_to_emergency_contacts(self, user_name, location, situation, location_coords=None, emergency_type="🚨 Situation d'urgence", urgency_level="élevée", attachments=None):
         """Envoie un email d'urgence à tous les contacts d'urgence configurés"""
         
         if not self.is_available:
@@ -507,7 +525,7 @@ class GmailEmergencyAgent:
                 )
                 
                 # Envoyer l'email
-                result = self.send_email(contact_email, subject, html_body, text_body)
+                result = self.send_email(contact_email, subject, html_body, text_body, attachments)
                 
                 if result.get('success'):
                     success_count += 1
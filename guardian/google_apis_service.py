@@ -11,6 +11,8 @@ import logging
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
+from guardian.geodesy import distance_m, distances_from
+
 class GoogleAPIsService:
     """Service unifié pour toutes les APIs Google utilisées par Guardian"""
     
@@ -175,7 +177,14 @@ class GoogleAPIsService:
                     data = response.json()
                     places = data.get('results', [])
                     
-                    for place in places[:3]:  # Max 3 par type
+                    places = places[:3]  # Max 3 par type
+                    distances = distances_from((lat, lon), [
+                        (place.get('geometry', {}).get('location', {}).get('lat', lat),
+                         place.get('geometry', {}).get('location', {}).get('lng', lon))
+                        for place in places
+                    ])
+                    
+                    for place, distance in zip(places, distances):
                         place_info = {
                             'name': place.get('name', 'Lieu sûr'),
                             'type': place_type,
@@ -184,11 +193,7 @@ class GoogleAPIsService:
                             'place_id': place.get('place_id', ''),
                             'open_now': place.get('opening_hours', {}).get('open_now', False),
                             'location': place.get('geometry', {}).get('location', {}),
-                            'distance': self._calculate_distance(
-                                (lat, lon),
-                                (place.get('geometry', {}).get('location', {}).get('lat', lat),
-                                 place.get('geometry', {}).get('location', {}).get('lng', lon))
-                            )
+                            'distance': int(distance)
                         }
                         all_places.append(place_info)
                         
@@ -414,24 +419,8 @@ class GoogleAPIsService:
         return True
         
     def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> int:
-        """Calcule la distance approximative en mètres entre deux points"""
-        import math
-        
-        lat1, lon1 = pos1
-        lat2, lon2 = pos2
-        
-        # Formule haversine simplifiée pour distances courtes
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        
-        a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-             math.sin(dlon/2) * math.sin(dlon/2))
-        
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        distance = 6371000 * c  # Rayon de la Terre en mètres
-        
-        return int(distance)
+        """Calcule la distance en mètres entre deux points (lat, lon)"""
+        return int(distance_m(pos1, pos2))
         
     def get_comprehensive_emergency_data(self, location: Tuple[float, float], situation_context: str) -> Dict:
         """Récupère toutes les données d'urgence en utilisant toutes les APIs Google"""
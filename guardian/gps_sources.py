@@ -0,0 +1,287 @@
+"""
+Sources de positions GPS pour Guardian
+Pipeline de générateurs : lecteurs (NMEA, GPX, JSON-lines, socket TCP/UDP),
+puis étapes de dédoublonnage, rejet des fixes hors d'ordre et limitation de
+débit. Tout s'exécute dans le thread consommateur, à mémoire bornée.
+"""
+
+import json
+import logging
+import socket
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, NamedTuple, Optional, TextIO, Union
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+
+class GPSFix(NamedTuple):
+    """Fix GPS horodaté (secondes epoch UTC, degrés)"""
+    timestamp: float
+    latitude: float
+    longitude: float
+
+    @property
+    def position(self):
+        return (self.latitude, self.longitude)
+
+
+def _parse_time(value) -> Optional[float]:
+    """Horodatage epoch (nombre) ou ISO 8601 (chaîne) vers secondes"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+    return None
+
+
+def _count(stats: Optional[Dict[str, int]], key: str):
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + 1
+
+
+# --- Lecteurs ---------------------------------------------------------------
+
+def _nmea_checksum_ok(sentence: str) -> bool:
+    """Vérifie la somme de contrôle '*XX' (absente = acceptée)"""
+    if '*' not in sentence:
+        return True
+    body, _, checksum = sentence[1:].partition('*')
+    computed = 0
+    for char in body:
+        computed ^= ord(char)
+    try:
+        return computed == int(checksum[:2], 16)
+    except ValueError:
+        return False
+
+
+def _nmea_coordinate(value: str, hemisphere: str) -> float:
+    """ddmm.mmmm / dddmm.mmmm vers degrés décimaux"""
+    dot = value.index('.') if '.' in value else len(value)
+    degrees = float(value[:dot - 2])
+    minutes = float(value[dot - 2:])
+    coordinate = degrees + minutes / 60.0
+    return -coordinate if hemisphere in ('S', 'W') else coordinate
+
+
+def _nmea_time(hhmmss: str, day: datetime) -> float:
+    hours, minutes, seconds = int(hhmmss[0:2]), int(hhmmss[2:4]), float(hhmmss[4:])
+    midnight = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp() + hours * 3600 + minutes * 60 + seconds
+
+
+def read_nmea(lines: Iterable[str], stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """
+    Lit des phrases NMEA 0183 (RMC et GGA, tous talkers : GP, GN, GL...)
+
+    GGA ne porte pas de date : celle du dernier RMC est utilisée, sinon la
+    date UTC du jour. Les phrases sans fix valide ou corrompues sont ignorées.
+    """
+    day = datetime.now(timezone.utc)
+    for line in lines:
+        sentence = line.strip()
+        if not sentence.startswith('$') or len(sentence) < 7:
+            continue
+        if not _nmea_checksum_ok(sentence):
+            _count(stats, 'invalid')
+            continue
+
+        fields = sentence.split('*')[0].split(',')
+        kind = fields[0][3:]
+        try:
+            if kind == 'RMC' and len(fields) >= 10:
+                if fields[2] != 'A' or not fields[3] or not fields[5]:
+                    continue  # pas de fix valide
+                if fields[9]:
+                    day = datetime.strptime(fields[9], '%d%m%y').replace(tzinfo=timezone.utc)
+                yield GPSFix(_nmea_time(fields[1], day),
+                             _nmea_coordinate(fields[3], fields[4]),
+                             _nmea_coordinate(fields[5], fields[6]))
+            elif kind == 'GGA' and len(fields) >= 7:
+                if fields[6] in ('', '0') or not fields[2] or not fields[4]:
+                    continue
+                yield GPSFix(_nmea_time(fields[1], day),
+                             _nmea_coordinate(fields[2], fields[3]),
+                             _nmea_coordinate(fields[4], fields[5]))
+        except (ValueError, IndexError):
+            _count(stats, 'invalid')
+
+
+def read_gpx(source: Union[str, TextIO], stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """
+    Lit les points de trace (trkpt) d'un fichier GPX en flux
+
+    Les éléments sont libérés au fur et à mesure : mémoire bornée même
+    pour des traces de plusieurs heures. Les points sans <time> sont ignorés.
+    """
+    for _, element in ET.iterparse(source, events=('end',)):
+        if not element.tag.endswith('trkpt'):
+            continue
+        timestamp = None
+        for child in element:
+            if child.tag.endswith('time'):
+                timestamp = _parse_time(child.text or '')
+                break
+        try:
+            if timestamp is None:
+                _count(stats, 'invalid')
+            else:
+                yield GPSFix(timestamp, float(element.get('lat')), float(element.get('lon')))
+        except (TypeError, ValueError):
+            _count(stats, 'invalid')
+        element.clear()
+
+
+def read_jsonl(lines: Iterable[str], stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """
+    Lit des positions JSON, une par ligne
+
+    Clés acceptées : lat/latitude, lon/lng/longitude, timestamp/t/time
+    (epoch en secondes ou ISO 8601).
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            lat = record.get('lat', record.get('latitude'))
+            lon = record.get('lon', record.get('lng', record.get('longitude')))
+            timestamp = _parse_time(record.get('timestamp', record.get('t', record.get('time'))))
+            if lat is None or lon is None or timestamp is None:
+                raise ValueError("champ manquant")
+            yield GPSFix(timestamp, float(lat), float(lon))
+        except (ValueError, TypeError, AttributeError):
+            _count(stats, 'invalid')
+
+
+def socket_lines(host: str, port: int, protocol: str = 'udp',
+                 stop_event: Optional[threading.Event] = None,
+                 poll_interval: float = 1.0) -> Iterator[str]:
+    """
+    Lignes de texte reçues sur un socket TCP (client) ou UDP (écoute)
+
+    stop_event permet d'interrompre la lecture (vérifié toutes les poll_interval secondes).
+    """
+    if protocol == 'udp':
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((host, port))
+    else:
+        sock = socket.create_connection((host, port))
+    sock.settimeout(poll_interval)
+
+    pending = b''
+    try:
+        while not (stop_event and stop_event.is_set()):
+            try:
+                data = sock.recv(65536)
+            except socket.timeout:
+                continue
+            if not data:
+                if protocol != 'udp':
+                    break  # connexion TCP fermée
+                continue
+            if protocol == 'udp':
+                data += b'\n'  # un datagramme = une ou plusieurs lignes complètes
+            pending += data
+            *complete, pending = pending.split(b'\n')
+            for raw in complete:
+                if raw:
+                    yield raw.decode('ascii', errors='replace')
+    finally:
+        sock.close()
+
+
+# --- Étapes du pipeline -------------------------------------------------------
+
+def deduplicate(fixes: Iterable[GPSFix], stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """Supprime les fixes répétés pour le même instant (ex: RMC + GGA d'une même époque)"""
+    last_timestamp = None
+    for fix in fixes:
+        if fix.timestamp == last_timestamp:
+            _count(stats, 'duplicate')
+            continue
+        last_timestamp = fix.timestamp
+        yield fix
+
+
+def drop_out_of_order(fixes: Iterable[GPSFix], stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """Rejette les fixes plus anciens que le dernier fix transmis"""
+    latest = float('-inf')
+    for fix in fixes:
+        if fix.timestamp <= latest:
+            _count(stats, 'out_of_order')
+            continue
+        latest = fix.timestamp
+        yield fix
+
+
+def rate_limit(fixes: Iterable[GPSFix], min_interval: float,
+               stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """Garde au plus un fix par min_interval secondes (temps des fixes, sans attente)"""
+    next_allowed = float('-inf')
+    for fix in fixes:
+        if fix.timestamp < next_allowed:
+            _count(stats, 'rate_limited')
+            continue
+        next_allowed = fix.timestamp + min_interval
+        yield fix
+
+
+def build_pipeline(fixes: Iterable[GPSFix], min_interval: Optional[float] = None,
+                   stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """Enchaîne dédoublonnage, rejet hors d'ordre et limitation de débit"""
+    pipeline = drop_out_of_order(deduplicate(fixes, stats), stats)
+    if min_interval:
+        pipeline = rate_limit(pipeline, min_interval, stats)
+    for fix in pipeline:
+        _count(stats, 'emitted')
+        yield fix
+
+
+def open_source(uri: str, stop_event: Optional[threading.Event] = None,
+                stats: Optional[Dict[str, int]] = None) -> Iterator[GPSFix]:
+    """
+    Ouvre une source de positions d'après son URI
+
+    Exemples :
+        trace.nmea / trace.gpx / positions.jsonl
+        udp://0.0.0.0:10110?format=nmea
+        tcp://192.168.1.20:4352?format=jsonl
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme in ('udp', 'tcp'):
+        fmt = parse_qs(parsed.query).get('format', ['nmea'])[0]
+        lines = socket_lines(parsed.hostname, parsed.port, parsed.scheme, stop_event)
+        reader = read_jsonl if fmt == 'jsonl' else read_nmea
+        yield from reader(lines, stats)
+        return
+
+    path = parsed.path if parsed.scheme == 'file' else uri
+    if path.lower().endswith('.gpx'):
+        yield from read_gpx(path, stats)
+        return
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        reader = read_jsonl if path.lower().endswith(('.jsonl', '.json', '.ndjson')) else read_nmea
+        yield from reader(f, stats)
+
+
+def timestamped(positions: Iterable, clock) -> Iterator[GPSFix]:
+    """Horodate des positions (lat, lon) sans heure avec l'horloge fournie (ex: simulate_gps)"""
+    for lat, lon in positions:
+        yield GPSFix(clock.now(), lat, lon)
+
+
+async def timestamped_async(positions: AsyncIterable, clock) -> AsyncIterator[GPSFix]:
+    """Variante asynchrone de timestamped (ex: simulate_gps_async)"""
+    async for lat, lon in positions:
+        yield GPSFix(clock.now(), lat, lon)
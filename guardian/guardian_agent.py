@@ -5,75 +5,120 @@ import logging
 import queue
 from guardian.GPS_agent import StaticAgent
 from guardian.voice_agent import VoiceAgent
-from guardian.speech_agent import SpeechAgent
-from guardian.gemini_agent import GeminiAgent
-from guardian.sms_agent import SMSAgent
-from guardian.gmail_emergency_agent import GmailEmergencyAgent
-from guardian.emergency_response import EmergencyResponse
-from guardian.intelligent_advisor import IntelligentAdvisor, SmartResponseSystem
-from guardian.emergency_locations import EmergencyLocationService
 from guardian.fall_detector import FallDetector
+from guardian.services import GuardianServices
+from guardian.session import GuardianSession
+from guardian.action_plan import ActionPlan
+from guardian.gps_sources import build_pipeline, open_source, timestamped
+from guardian.adaptive_sampler import AdaptiveSampler
+from guardian.geofence import GeofenceIndex, GeofenceMonitor, geofence_from_config
+from guardian.wrong_path_agent import WrongPathAgent
+from guardian.imu_stream import IMUFallDetector, open_imu_source
+from guardian.vosk_models import MODEL_REGISTRY, preload_models
 
 class GuardianOrchestrator:
     """Orchestrateur principal pour Guardian selon le workflow défini"""
     
-    def __init__(self, config):
+    # Délai d'escalade (secondes) selon le niveau d'urgence Gemini
+    ESCALATION_DELAYS = {
+        10: 60,   # 1 minute pour urgence maximale
+        9: 120,   # 2 minutes pour critique
+        8: 180,   # 3 minutes pour grave
+        7: 300,   # 5 minutes pour élevée
+        6: 450,   # 7.5 minutes pour modérée-haute
+        5: 600,   # 10 minutes standard
+    }
+    
+    # Délai (secondes) pour décrire sa situation après un 'non'
+    DETAILS_TIMEOUT = 120
+    
+    def __init__(self, config, services: GuardianServices = None, session: GuardianSession = None):
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-        # Charger les clés API pour emails visuels
-        try:
-            import yaml
-            with open('api_keys.yaml', 'r', encoding='utf-8') as f:
-                api_keys_config = yaml.safe_load(f)
-        except Exception:
-            api_keys_config = {}
-            
-        self.emergency_response = EmergencyResponse(config.get('emergency_response', {}), api_keys_config)
-        
-        # Agent de synthèse vocale
-        self.speech_agent = SpeechAgent(api_keys_config)
-        
-        # Agent SMS pour notifications d'urgence
-        self.sms_agent = SMSAgent(api_keys_config)
-        
-        # Agent Gemini pour l'analyse avancée
-        self.gemini_agent = GeminiAgent(api_keys_config)
-        
-        # Agent Gmail pour emails d'urgence
-        self.gmail_agent = GmailEmergencyAgent(api_keys_config)
-        
-        # Système d'IA et de conseils (fallback si Gemini indisponible)
-        self.intelligent_advisor = IntelligentAdvisor()
-        self.smart_response_system = SmartResponseSystem(self.intelligent_advisor)
         
-        # Système de localisation d'urgence
-        try:
-            api_config = {}  # Chargé depuis api_keys.yaml si disponible
-            self.emergency_locations = EmergencyLocationService(api_config)
-        except Exception as e:
-            self.logger.warning(f"Service de localisation d'urgence non disponible: {e}")
-            self.emergency_locations = None
-        
-        # Détecteur de chute
-        self.fall_detector = FallDetector(
-            speed_threshold_high=15.0,  # km/h - vitesse élevée à vélo
-            speed_threshold_low=2.0,    # km/h - quasi-immobile
-            acceleration_threshold=-8.0, # m/s² - décélération brutale
-            stationary_time=30.0        # secondes sans mouvement = urgence
-        )
-        
-        # États du système
-        self.current_position = None
+        # Clients lourds partagés (créés ici en mode utilisateur unique)
+        if services is None:
+            services = GuardianServices(config)
+        self.services = services
+        
+        self.emergency_response = services.emergency_response
+        self.speech_agent = services.speech_agent
+        self.sms_agent = services.sms_agent
+        self.gemini_agent = services.gemini_agent
+        self.gmail_agent = services.gmail_agent
+        self.intelligent_advisor = services.intelligent_advisor
+        self.smart_response_system = services.smart_response_system
+        self.emergency_locations = services.emergency_locations
+        self.scheduler = services.scheduler
+        self.shutdown_event = services.shutdown_event
+        self.latency = services.latency
+        
+        # État propre à l'utilisateur surveillé
+        self.session = session or GuardianSession("default")
         self.agents_lock = threading.Lock()
-        self.shutdown_event = threading.Event()
-        self.response_queue = queue.Queue()
         
         # Timeout pour les réponses utilisateur
         self.response_timeout = config.get('emergency_response', {}).get('timeout_seconds', 600)
         
+        # Budgets du plan d'actions critique
+        self.critical_plan_deadline = config.get('emergency_response', {}).get('critical_plan_deadline_seconds', 30)
+        self.first_notification_budget = config.get('emergency_response', {}).get('first_notification_budget_seconds', 5)
+    
+    @property
+    def current_position(self):
+        return self.session.current_position
+    
+    @current_position.setter
+    def current_position(self, position):
+        self.session.current_position = position
+    
+    @property
+    def response_queue(self) -> queue.Queue:
+        return self.session.response_queue
+    
+    @property
+    def fall_detector(self) -> FallDetector:
+        return self.session.fall_detector
+    
+    @property
+    def _escalation_handles(self) -> list:
+        return self.session.escalation_handles
+    
+    @_escalation_handles.setter
+    def _escalation_handles(self, handles: list):
+        self.session.escalation_handles = handles
+    
+    @property
+    def _fall_countdown(self):
+        return self.session.fall_countdown
+    
+    @_fall_countdown.setter
+    def _fall_countdown(self, countdown):
+        self.session.fall_countdown = countdown
+    
+    @property
+    def _fall_countdown_lock(self) -> threading.Lock:
+        return self.session.lock
+        
     def handle_alert(self, trigger_type: str, position: tuple = None):
         """Gère une alerte selon le workflow du diagramme"""
+        self._announce_alert(trigger_type, position)
+        
+        # Démarrer l'écoute de réponse avec timeout
+        response = self._wait_for_response()
+        self._trace_response_received()
+        
+        if response == "oui":
+            self._handle_positive_response()
+        elif response == "non":
+            self._handle_negative_response()
+        else:
+            self._handle_no_response()
+    
+    def _announce_alert(self, trigger_type: str, position: tuple = None):
+        """Annonce l'alerte et pose la question 'Tout va bien ?'"""
         self.logger.warning(f"ALERTE déclenchée: {trigger_type}")
+        self.session.alert_trace = self.latency.start_trace(trigger_type)
         
         if position:
             self.current_position = position
@@ -84,16 +129,6 @@ class GuardianOrchestrator:
         
         # Synthèse vocale de l'alerte
         self.speech_agent.speak_alert("emergency", alert_message)
-        
-        # Démarrer l'écoute de réponse avec timeout
-        response = self._wait_for_response()
-        
-        if response == "oui":
-            self._handle_positive_response()
-        elif response == "non":
-            self._handle_negative_response()
-        else:
-            self._handle_no_response()
     
     def _wait_for_response(self) -> str:
         """Attend une réponse utilisateur avec timeout"""
@@ -117,11 +152,26 @@ class GuardianOrchestrator:
         # Synthèse vocale de confirmation
         self.speech_agent.speak_alert("confirmation", confirmation_message)
         
+        # L'utilisateur va bien : annuler les escalades en attente
+        self.cancel_emergency_escalations()
+        
         # Envoyer notification de confirmation si configuré
         self.emergency_response.send_confirmation_alert("Situation normale - Utilisateur a confirmé")
     
     def _handle_negative_response(self):
         """Gère une réponse négative ('non') avec IA"""
+        self._ask_for_details()
+        
+        # Demander des détails sur la situation
+        try:
+            reason = self.response_queue.get(timeout=self.DETAILS_TIMEOUT)
+        except queue.Empty:
+            reason = None
+        self._trace_response_received()
+        self._handle_situation_details(reason)
+    
+    def _ask_for_details(self):
+        """Demande à l'utilisateur de décrire sa situation"""
         self.logger.warning("Réponse négative reçue - Demande d'aide")
         question_message = "Que se passe-t-il ? Décrivez votre situation. Le système IA va analyser votre réponse."
         print("⚠️  Que se passe-t-il ? Décrivez votre situation :")
@@ -129,14 +179,20 @@ class GuardianOrchestrator:
         
         # Synthèse vocale de la question
         self.speech_agent.speak_alert("emergency", question_message)
+    
+    def _handle_situation_details(self, reason: str = None):
+        """Analyse la description de l'utilisateur (None : aucun détail fourni)"""
+        if reason is None:
+            self.logger.warning("Aucun détail fourni par l'utilisateur")
+            # Déclencher l'assistance sans analyse IA
+            self._trigger_emergency_assistance("Aucun détail fourni")
+            return
         
-        # Demander des détails sur la situation
-        try:
-            reason = self.response_queue.get(timeout=120)  # 2 minutes pour expliquer
-            self.logger.warning(f"Motif reçu: {reason}")
-            
-            # Analyser la situation avec Gemini ou IA de fallback
-            if self.gemini_agent.is_available:
+        self.logger.warning(f"Motif reçu: {reason}")
+        
+        # Analyser la situation avec Gemini ou IA de fallback
+        if self.gemini_agent.is_available:
+            with self.latency.span("analysis"):
                 ai_analysis = self.gemini_agent.analyze_emergency_situation(
                     reason, 
                     {
@@ -145,39 +201,34 @@ class GuardianOrchestrator:
                         'time_of_day': 'current'
                     }
                 )
-                
-                # Message personnalisé de Gemini
-                personalized_message = self.gemini_agent.get_personalized_emergency_message(ai_analysis)
-                print("\n" + "="*60)
-                print(f"🤖 ANALYSE GEMINI 2.5 FLASH:")
-                print(personalized_message)
-                print("="*60)
-                
-                # Synthèse vocale des conseils IA
-                self.speech_agent.speak_alert("info", ai_analysis.get('specific_advice', ''))
-                
-                # Déclencher l'assistance avec l'analyse Gemini
-                self._trigger_emergency_assistance_with_gemini(reason, ai_analysis)
-                
-            else:
-                # Fallback vers l'ancien système IA
+            
+            # Message personnalisé de Gemini
+            personalized_message = self.gemini_agent.get_personalized_emergency_message(ai_analysis)
+            print("\n" + "="*60)
+            print(f"🤖 ANALYSE GEMINI 2.5 FLASH:")
+            print(personalized_message)
+            print("="*60)
+            
+            # Synthèse vocale des conseils IA
+            self.speech_agent.speak_alert("info", ai_analysis.get('specific_advice', ''))
+            
+            # Déclencher l'assistance avec l'analyse Gemini
+            self._trigger_emergency_assistance_with_gemini(reason, ai_analysis)
+            
+        else:
+            # Fallback vers l'ancien système IA
+            with self.latency.span("analysis"):
                 smart_response = self.smart_response_system.process_emergency_response(reason, "emergency_description")
-                
-                print("\n" + "="*60)
-                print(smart_response["message"])
-                print("="*60)
-                
-                # Synthèse vocale des conseils IA
-                self.speech_agent.speak_alert("info", smart_response["message"])
-                
-                # Déclencher l'assistance avec les conseils IA
-                self._trigger_emergency_assistance_with_ai(reason, smart_response["analysis"])
             
-        except queue.Empty:
-            reason = "Aucun détail fourni"
-            self.logger.warning("Aucun détail fourni par l'utilisateur")
-            # Déclencher l'assistance sans analyse IA
-            self._trigger_emergency_assistance(reason)
+            print("\n" + "="*60)
+            print(smart_response["message"])
+            print("="*60)
+            
+            # Synthèse vocale des conseils IA
+            self.speech_agent.speak_alert("info", smart_response["message"])
+            
+            # Déclencher l'assistance avec les conseils IA
+            self._trigger_emergency_assistance_with_ai(reason, smart_response["analysis"])
     
     def _handle_no_response(self):
         """Gère l'absence de réponse (timeout)"""
@@ -201,7 +252,7 @@ class GuardianOrchestrator:
         
         # Envoyer la localisation aux contacts
         if self.current_position:
-            self.emergency_response.send_location_to_contacts(self.current_position, reason)
+            self._send_email_alert(self.emergency_response.send_location_to_contacts, self.current_position, reason)
         
         # Envoyer aussi le SMS d'urgence
         emergency_context = {
@@ -277,73 +328,92 @@ class GuardianOrchestrator:
             self._handle_gemini_standard_emergency(reason, gemini_analysis)
         
         # Programmer l'escalade basée sur l'urgence Gemini
-        escalation_delays = {
-            10: 60,   # 1 minute pour urgence maximale
-            9: 120,   # 2 minutes pour critique
-            8: 180,   # 3 minutes pour grave
-            7: 300,   # 5 minutes pour élevée
-            6: 450,   # 7.5 minutes pour modérée-haute
-            5: 600,   # 10 minutes standard
-        }
-        delay = escalation_delays.get(urgency_level, 600)
+        delay = self.ESCALATION_DELAYS.get(urgency_level, 600)
         self._schedule_emergency_escalation(reason, delay)
     
-    def _handle_gemini_critical_emergency(self, reason: str, analysis: dict):
-        """Gère les urgences critiques selon Gemini (niveau 8-10)"""
+    def _handle_gemini_critical_emergency(self, reason: str, analysis: dict) -> dict:
+        """
+        Gère les urgences critiques selon Gemini (niveau 8-10)
+        
+        Les notifications partent en parallèle sans attendre la recherche
+        d'aide ; refuges et transports suivent en mise à jour.
+        
+        Returns:
+            Dict du rapport d'exécution (timings par étape)
+        """
         self.logger.critical("URGENCE CRITIQUE GEMINI")
         
         print(f"\n🚨 **URGENCE CRITIQUE DÉTECTÉE PAR IA** 🚨")
         print(f"🤖 Confidence Gemini: Situation nécessitant intervention immédiate")
         
+        position = self.current_position
+        plan = ActionPlan("urgence_critique", self.services.action_executor)
+        
         # Instructions vocales d'urgence critique
         critical_instructions = analysis.get('immediate_actions', [])[:3]
         if critical_instructions:
-            self.speech_agent.speak_emergency_instructions(critical_instructions)
+            plan.add_step("instructions_vocales",
+                          lambda: self.speech_agent.speak_emergency_instructions(critical_instructions))
         
-        # Localiser l'aide d'urgence
-        if self.current_position and self.emergency_locations:
-            print(f"\n🚑 Recherche d'aide d'urgence immédiate...")
-            
-            emergency_help = self.emergency_locations.find_emergency_refuges(self.current_position, radius_m=1000)
-            transports = self.emergency_locations.find_emergency_transport(self.current_position, radius_m=500)
-            
-            help_message = self.emergency_locations.format_emergency_locations_message(
-                emergency_help, transports, current_location=self.current_position
-            )
-            
-            # Alerte immédiate avec analyse Gemini
-            enhanced_reason = f"{reason}\n\n🧠 ANALYSE GEMINI 2.5 FLASH:\n"
-            enhanced_reason += f"- Type: {analysis['emergency_type']}\n"
-            enhanced_reason += f"- Urgence: {analysis['urgency_level']}/10\n"
-            enhanced_reason += f"- Conseils IA: {analysis.get('specific_advice', '')}\n\n{help_message}"
-            
-            self.emergency_response.send_immediate_danger_alert(self.current_position, enhanced_reason)
-            
+        # Alerte immédiate avec analyse Gemini
+        enhanced_reason = f"{reason}\n\n🧠 ANALYSE GEMINI 2.5 FLASH:\n"
+        enhanced_reason += f"- Type: {analysis['emergency_type']}\n"
+        enhanced_reason += f"- Urgence: {analysis['urgency_level']}/10\n"
+        enhanced_reason += f"- Conseils IA: {analysis.get('specific_advice', '')}"
+        
+        emergency_context = {
+            'emergency_type': 'URGENCE CRITIQUE',
+            'what3words': analysis.get('what3words', '')
+        }
+        
+        plan.add_step("sms_urgence",
+                      lambda: self._send_emergency_notifications(emergency_context, reason),
+                      notification=True)
+        plan.add_step("alerte_danger",
+                      lambda: self._send_email_alert(
+                          self.emergency_response.send_immediate_danger_alert, position, enhanced_reason
+                      ),
+                      notification=True)
+        
+        if position and self.emergency_locations:
             # Envoyer emails d'urgence aux proches pour urgence critique
-            self.send_emergency_email_alert(
-                user_name="Utilisateur Guardian",
-                location=f"Position GPS: {self.current_position}",
-                situation=enhanced_reason,
-                urgency_level=analysis['urgency_level']
-            )
+            plan.add_step("emails_proches",
+                          lambda: self.send_emergency_email_alert(
+                              user_name="Utilisateur Guardian",
+                              location=f"Position GPS: {position}",
+                              situation=enhanced_reason,
+                              urgency_level=analysis['urgency_level']
+                          ),
+                          notification=True)
             
-            # Envoyer aussi le SMS d'urgence
-            emergency_context = {
-                'emergency_type': 'URGENCE CRITIQUE',
-                'what3words': analysis.get('what3words', '')
-            }
-            self._send_emergency_notifications(emergency_context, reason)
-        else:
-            # Alerte critique sans localisation
-            enhanced_reason = f"{reason}\n\n🧠 ANALYSE GEMINI CRITIQUE:\n{analysis.get('specific_advice', '')}"
-            self.emergency_response.send_immediate_danger_alert(self.current_position, enhanced_reason)
-            
-            # Envoyer aussi le SMS d'urgence
-            emergency_context = {
-                'emergency_type': 'URGENCE CRITIQUE',
-                'what3words': analysis.get('what3words', '')
-            }
-            self._send_emergency_notifications(emergency_context, reason)
+            # Localiser l'aide d'urgence (enrichissement envoyé en mise à jour)
+            print(f"\n🚑 Recherche d'aide d'urgence immédiate...")
+            plan.add_step("refuges",
+                          lambda: self._timed("location_lookup", self.emergency_locations.find_emergency_refuges,
+                                              position, radius_m=1000))
+            plan.add_step("transports",
+                          lambda: self._timed("location_lookup", self.emergency_locations.find_emergency_transport,
+                                              position, radius_m=500))
+            plan.add_step("formatage",
+                          lambda refuges, transports: self.emergency_locations.format_emergency_locations_message(
+                              refuges, transports, current_location=position
+                          ),
+                          depends_on=("refuges", "transports"))
+            plan.add_step("suivi_itineraire",
+                          lambda refuges: self._follow_route_to_refuge(position, refuges),
+                          depends_on=("refuges",))
+            plan.add_step("mise_a_jour_refuges",
+                          lambda help_message: self._send_email_alert(
+                              self.emergency_response.send_location_with_refuges_info,
+                              position, help_message, enhanced_reason
+                          ),
+                          depends_on=("formatage",))
+        
+        report = plan.run(self.critical_plan_deadline, self.first_notification_budget)
+        
+        if report['first_notification'] is not None:
+            print(f"⏱️  Première notification envoyée en {report['first_notification']:.2f}s")
+        return report
     
     def _handle_gemini_high_emergency(self, reason: str, analysis: dict):
         """Gère les urgences élevées selon Gemini (niveau 6-7)"""
@@ -352,8 +422,7 @@ class GuardianOrchestrator:
         if self.current_position and self.emergency_locations:
             print(f"\n🔍 Recherche d'assistance adaptée...")
             
-            refuges = self.emergency_locations.find_emergency_refuges(self.current_position)
-            transports = self.emergency_locations.find_emergency_transport(self.current_position)
+            refuges, transports = self._find_emergency_help(self.current_position)
             
             refuges_message = self.emergency_locations.format_emergency_locations_message(
                 refuges, transports, current_location=self.current_position
@@ -368,7 +437,7 @@ class GuardianOrchestrator:
                 enhanced_reason += f"- Service recommandé: {analysis['emergency_services']}\n"
             enhanced_reason += f"\n{refuges_message}"
             
-            self.emergency_response.send_location_with_refuges_info(self.current_position, refuges_message, enhanced_reason)
+            self._send_email_alert(self.emergency_response.send_location_with_refuges_info, self.current_position, refuges_message, enhanced_reason)
             
             # Envoyer emails d'urgence aux proches pour urgence élevée
             self.send_emergency_email_alert(
@@ -387,7 +456,7 @@ class GuardianOrchestrator:
         else:
             # Fallback sans localisation
             enhanced_reason = f"{reason}\n\n🧠 ANALYSE GEMINI:\n{analysis.get('specific_advice', '')}"
-            self.emergency_response.send_location_to_contacts(self.current_position, enhanced_reason)
+            self._send_email_alert(self.emergency_response.send_location_to_contacts, self.current_position, enhanced_reason)
             
             # Envoyer aussi le SMS d'urgence
             emergency_context = {
@@ -412,7 +481,7 @@ class GuardianOrchestrator:
         if analysis.get('follow_up_needed', True):
             enhanced_reason += f"\n\nSuivi recommandé par l'IA."
         
-        self.emergency_response.send_location_to_contacts(self.current_position, enhanced_reason)
+        self._send_email_alert(self.emergency_response.send_location_to_contacts, self.current_position, enhanced_reason)
         
         # Envoyer aussi le SMS d'urgence
         emergency_context = {
@@ -433,8 +502,7 @@ class GuardianOrchestrator:
             print("\n🔍 Recherche de refuges et moyens d'évasion...")
             
             # Trouver refuges et transports d'urgence
-            refuges = self.emergency_locations.find_emergency_refuges(self.current_position, radius_m=300)
-            transports = self.emergency_locations.find_emergency_transport(self.current_position, radius_m=500)
+            refuges, transports = self._find_emergency_help(self.current_position, 300, 500)
             
             # Formatter les informations avec itinéraires d'évacuation
             refuges_message = self.emergency_locations.format_emergency_locations_message(
@@ -445,7 +513,7 @@ class GuardianOrchestrator:
             
             # Envoyer alerte critique aux contacts avec refuges
             enhanced_reason = f"DANGER IMMÉDIAT: {reason}\n\n{refuges_message}"
-            self.emergency_response.send_immediate_danger_alert(self.current_position, enhanced_reason)
+            self._send_email_alert(self.emergency_response.send_immediate_danger_alert, self.current_position, enhanced_reason)
             
             # Envoyer aussi le SMS d'urgence
             emergency_context = {
@@ -459,7 +527,7 @@ class GuardianOrchestrator:
             
         else:
             # Fallback si pas de service de localisation
-            self.emergency_response.send_immediate_danger_alert(self.current_position, reason)
+            self._send_email_alert(self.emergency_response.send_immediate_danger_alert, self.current_position, reason)
             
             # Envoyer aussi le SMS d'urgence
             emergency_context = {
@@ -491,8 +559,7 @@ class GuardianOrchestrator:
             print("\n🔍 Recherche d'aide à proximité...")
             
             # Trouver refuges et transports
-            refuges = self.emergency_locations.find_emergency_refuges(self.current_position)
-            transports = self.emergency_locations.find_emergency_transport(self.current_position)
+            refuges, transports = self._find_emergency_help(self.current_position)
             
             # Formatter et afficher avec itinéraires
             refuges_message = self.emergency_locations.format_emergency_locations_message(
@@ -502,7 +569,7 @@ class GuardianOrchestrator:
             
             # Notification avec informations de refuges
             enhanced_reason = f"{reason}\n\nAnalyse IA:\n- Type: {ai_analysis['emergency_type']}\n- Urgence: {ai_analysis['urgency_level']}\n\n{refuges_message}"
-            self.emergency_response.send_location_with_refuges_info(self.current_position, refuges_message, enhanced_reason)
+            self._send_email_alert(self.emergency_response.send_location_with_refuges_info, self.current_position, refuges_message, enhanced_reason)
             
             # Envoyer aussi le SMS d'urgence
             emergency_context = {
@@ -514,7 +581,7 @@ class GuardianOrchestrator:
         else:
             # Fallback standard
             enhanced_reason = f"{reason}\n\nAnalyse IA:\n- Type: {ai_analysis['emergency_type']}\n- Urgence: {ai_analysis['urgency_level']}\n- Actions: {', '.join(ai_analysis['immediate_actions'])}"
-            self.emergency_response.send_location_to_contacts(self.current_position, enhanced_reason)
+            self._send_email_alert(self.emergency_response.send_location_to_contacts, self.current_position, enhanced_reason)
             
             # Envoyer aussi le SMS d'urgence
             emergency_context = {
@@ -532,6 +599,8 @@ class GuardianOrchestrator:
         Args:
             fall_info: Informations sur la chute détectée
         """
+        self.session.alert_trace = self.latency.start_trace("chute")
+        
         fall_type = fall_info.get('fall_type', 'chute_generale')
         severity = fall_info.get('severity', 'modérée')
         position = fall_info.get('position', self.current_position)
@@ -566,6 +635,10 @@ class GuardianOrchestrator:
         """
         time_since_fall = post_fall_info.get('time_since_fall', 0)
         
+        # Aucune attente de réponse : le traitement commence immédiatement
+        self.session.alert_trace = self.latency.start_trace("immobilité après chute")
+        self._trace_response_received()
+        
         print(f"\n🆘 URGENCE MAXIMALE - IMMOBILITÉ PROLONGÉE APRÈS CHUTE 🆘")
         print(f"Temps écoulé depuis la chute: {time_since_fall:.0f} secondes")
         print(f"Mouvement détecté: {post_fall_info.get('movement_since_fall', 0):.1f}m")
@@ -602,55 +675,75 @@ class GuardianOrchestrator:
         else:
             return "Chute détectée. Prenez votre temps pour vous relever et vérifiez que vous n'êtes pas blessé(e). Je surveille votre état."
     
-    def _start_fall_emergency_countdown(self, fall_info: dict):
+    def _start_fall_emergency_countdown(self, fall_info: dict, timeout: float = 30.0):
         """
         Démarre un countdown d'urgence après chute avec possibilité d'annulation
+        
+        La réponse de l'utilisateur est routée par process_user_input ;
+        sans réponse, le planificateur déclenche l'urgence à l'échéance.
+        """
+        with self._fall_countdown_lock:
+            if self._fall_countdown:
+                self._fall_countdown[0].cancel()
+            handle = self.scheduler.schedule(timeout, self._on_fall_countdown_timeout, fall_info,
+                                             name="fall_countdown")
+            self._fall_countdown = (handle, fall_info)
+    
+    def _resolve_fall_countdown(self, response: str) -> bool:
+        """
+        Applique la réponse 'oui'/'non' au countdown de chute en cours
+        
+        Returns:
+            bool: True si un countdown était en attente et a été résolu
         """
-        def emergency_countdown():
-            # Attendre réponse utilisateur pendant 30 secondes
-            start_time = time.time()
-            timeout = 30.0
+        with self._fall_countdown_lock:
+            if not self._fall_countdown:
+                return False
+            handle, fall_info = self._fall_countdown
+            if not handle.cancel():
+                return False
+            self._fall_countdown = None
+        
+        self._trace_response_received()
+        
+        if response == 'non':
+            recovery_message = "Bien reçu. Vous semblez aller bien. Parfait ! Je continue la surveillance au cas où. Prenez votre temps pour vous remettre."
+            print("\n✅ Bien reçu - Vous semblez aller bien")
+            print("🤖 Guardian: Parfait ! Je continue la surveillance au cas où.")
+            print("   Prenez votre temps pour vous remettre et soyez prudent(e).")
             
-            while time.time() - start_time < timeout:
-                if self.shutdown_event.is_set():
-                    return
-                    
-                try:
-                    response = self.response_queue.get(timeout=1.0)
-                    
-                    if response.lower() == 'non':
-                        recovery_message = "Bien reçu. Vous semblez aller bien. Parfait ! Je continue la surveillance au cas où. Prenez votre temps pour vous remettre."
-                        print("\n✅ Bien reçu - Vous semblez aller bien")
-                        print("🤖 Guardian: Parfait ! Je continue la surveillance au cas où.")
-                        print("   Prenez votre temps pour vous remettre et soyez prudent(e).")
-                        
-                        # Synthèse vocale de confirmation
-                        self.speech_agent.speak_alert("confirmation", recovery_message)
-                        
-                        # Reset du détecteur mais continuer surveillance
-                        return
-                        
-                    elif response.lower() == 'oui':
-                        injury_message = "URGENCE CONFIRMÉE. Blessure après chute. Je déclenche immédiatement les secours."
-                        print("\n🚨 URGENCE CONFIRMÉE - BLESSURE APRÈS CHUTE")
-                        
-                        # Synthèse vocale d'urgence
-                        self.speech_agent.speak_alert("emergency", injury_message)
-                        
-                        self._trigger_fall_emergency_response(fall_info, user_confirmed=True)
-                        return
-                        
-                except queue.Empty:
-                    continue
+            # Synthèse vocale de confirmation
+            self.speech_agent.speak_alert("confirmation", recovery_message)
+            
+            # Pas de blessure : annuler les escalades en attente
+            self.cancel_emergency_escalations()
+        else:
+            injury_message = "URGENCE CONFIRMÉE. Blessure après chute. Je déclenche immédiatement les secours."
+            print("\n🚨 URGENCE CONFIRMÉE - BLESSURE APRÈS CHUTE")
             
-            # Timeout - déclencher urgence automatique
-            print("\n⏰ TIMEOUT - AUCUNE RÉPONSE APRÈS CHUTE")
-            print("🚨 Je déclenche automatiquement l'alerte d'urgence")
-            self._trigger_fall_emergency_response(fall_info, timeout=True)
-        
-        # Démarrer le countdown dans un thread séparé
-        countdown_thread = threading.Thread(target=emergency_countdown, daemon=True)
-        countdown_thread.start()
+            # Synthèse vocale d'urgence
+            self.speech_agent.speak_alert("emergency", injury_message)
+            
+            # Réponse d'urgence hors du thread d'entrée utilisateur
+            self.scheduler.schedule(0, self._trigger_fall_emergency_response, fall_info, True,
+                                    name="fall_confirmed")
+        return True
+    
+    def _on_fall_countdown_timeout(self, fall_info: dict):
+        """Échéance du countdown de chute sans réponse de l'utilisateur"""
+        with self._fall_countdown_lock:
+            if self._fall_countdown and self._fall_countdown[1] is fall_info:
+                self._fall_countdown = None
+        
+        self._trace_response_received()
+        
+        if self.shutdown_event.is_set():
+            return
+        
+        # Timeout - déclencher urgence automatique
+        print("\n⏰ TIMEOUT - AUCUNE RÉPONSE APRÈS CHUTE")
+        print("🚨 Je déclenche automatiquement l'alerte d'urgence")
+        self._trigger_fall_emergency_response(fall_info, timeout=True)
     
     def _trigger_fall_emergency_response(self, fall_info: dict, user_confirmed: bool = False, 
                                        timeout: bool = False, immediate: bool = False):
@@ -688,20 +781,21 @@ class GuardianOrchestrator:
             elif timeout:
                 user_response_text = None  # Aucune réponse
             
-            gemini_analysis = self.gemini_agent.analyze_fall_emergency(fall_info, user_response_text)
+            with self.latency.span("analysis"):
+                gemini_analysis = self.gemini_agent.analyze_fall_emergency(fall_info, user_response_text)
             
             print(f"\n🧠 **ANALYSE GEMINI DE LA CHUTE:**")
-            print(f"   🎯 Type: {vertex_analysis['emergency_type']}")
-            print(f"   📊 Urgence: {vertex_analysis['urgency_level']}/10")
+            print(f"   🎯 Type: {gemini_analysis['emergency_type']}")
+            print(f"   📊 Urgence: {gemini_analysis['urgency_level']}/10")
             
             # Conseils spécifiques aux chutes
-            fall_advice = vertex_analysis.get('fall_specific_advice', [])
+            fall_advice = gemini_analysis.get('fall_specific_advice', [])
             if fall_advice:
                 print(f"   🏥 Conseils spécialisés:")
                 for advice in fall_advice[:3]:
                     print(f"      • {advice}")
             
-            ai_analysis = vertex_analysis
+            ai_analysis = gemini_analysis
             
         elif self.intelligent_advisor:
             # Fallback vers l'ancien système IA
@@ -715,9 +809,10 @@ class GuardianOrchestrator:
             else:
                 ai_context += "chute nécessitant vérification"
                 
-            ai_analysis = self.intelligent_advisor.analyze_emergency_situation(
-                ai_context, position, "chute_accident"
-            )
+            with self.latency.span("analysis"):
+                ai_analysis = self.intelligent_advisor.analyze_emergency_situation(
+                    ai_context, position, "chute_accident"
+                )
         else:
             ai_analysis = {'emergency_type': 'Accident/Chute', 'urgency_level': 8}
         
@@ -725,8 +820,7 @@ class GuardianOrchestrator:
         if self.emergency_locations and position:
             print("\n🚑 Recherche d'aide médicale d'urgence à proximité...")
             
-            medical_help = self.emergency_locations.find_emergency_refuges(position, radius_m=2000)
-            transports = self.emergency_locations.find_emergency_transport(position, radius_m=1000)
+            medical_help, transports = self._find_emergency_help(position, 2000, 1000)
             
             medical_message = self.emergency_locations.format_emergency_locations_message(
                 medical_help, transports, current_location=position
@@ -735,7 +829,7 @@ class GuardianOrchestrator:
             print(medical_message)
             
             # Envoyer l'alerte visuelle de chute avec informations complètes
-            self.emergency_response.send_fall_emergency_alert(position, fall_info)
+            self._send_email_alert(self.emergency_response.send_fall_emergency_alert, position, fall_info)
             
             # Envoyer aussi l'alerte traditionnelle avec refuges
             enhanced_reason = f"{reason}\n\nAnalyse IA:\n- Type: {ai_analysis['emergency_type']}\n- Urgence: {ai_analysis['urgency_level']}\n\n{medical_message}"
@@ -750,7 +844,7 @@ class GuardianOrchestrator:
             
         else:
             # Envoyer l'alerte visuelle de chute
-            self.emergency_response.send_fall_emergency_alert(position, fall_info)
+            self._send_email_alert(self.emergency_response.send_fall_emergency_alert, position, fall_info)
             
             # Alerte traditionnelle de fallback
             enhanced_reason = f"{reason}\n\nAnalyse IA:\n- Type: {ai_analysis['emergency_type']}\n- Urgence: {ai_analysis['urgency_level']}"
@@ -773,33 +867,107 @@ class GuardianOrchestrator:
     def _schedule_emergency_escalation(self, reason: str, delay_seconds: int = 600):
         """Programme une escalade d'urgence après délai personnalisé"""
         def escalate():
-            time.sleep(delay_seconds)
             if not self.shutdown_event.is_set():
                 self.emergency_response.escalate_emergency(self.current_position, delay_seconds)
                 print(f"\n🚨 ESCALADE AUTOMATIQUE après {delay_seconds}s d'inactivité")
                 print("📞 Services d'urgence contactés automatiquement")
         
-        escalation_thread = threading.Thread(target=escalate)
-        escalation_thread.daemon = True
-        escalation_thread.start()
+        handle = self.scheduler.schedule(delay_seconds, escalate, name="escalation")
+        self._escalation_handles = [h for h in self._escalation_handles if h.active]
+        self._escalation_handles.append(handle)
+        return handle
+    
+    def cancel_emergency_escalations(self) -> int:
+        """Annule les escalades en attente (l'utilisateur a confirmé être en sécurité)"""
+        cancelled = sum(1 for handle in self._escalation_handles if handle.cancel())
+        self._escalation_handles = []
+        if cancelled:
+            self.logger.info(f"{cancelled} escalade(s) d'urgence annulée(s)")
+        return cancelled
+    
+    def _open_prompt(self, kind: str, timeout: float, callback):
+        """
+        Pose une question sans bloquer de thread
+        
+        callback(réponse) est appelé par process_user_input, ou callback(None)
+        par le planificateur à l'échéance. À ouvrir avant de poser la question :
+        une réponse rapide n'est pas perdue.
+        
+        Args:
+            kind: 'alert' (oui/non) ou 'details' (description libre)
+        """
+        self.logger.info(f"Attente de réponse (timeout: {timeout}s)")
+        with self.session.lock:
+            handle = self.scheduler.schedule(timeout, self._on_prompt_timeout, callback,
+                                             name=f"prompt_{kind}")
+            self.session.prompts.append((kind, handle, callback))
+        return handle
+    
+    def _resolve_prompt(self, text_input: str) -> bool:
+        """
+        Transmet une réponse à la question ouverte concernée
+        
+        'oui'/'non' répond à la plus ancienne alerte, un texte libre à la
+        demande de description (même routage que l'orchestrateur asyncio).
+        
+        Returns:
+            bool: True si une question en attente a reçu la réponse
+        """
+        if text_input.lower() in ["oui", "non"]:
+            order = ("alert", "details")
+        else:
+            order = ("details", "alert")
+        
+        with self.session.lock:
+            prompt = None
+            for wanted in order:
+                prompt = next((p for p in self.session.prompts if p[0] == wanted and p[1].cancel()), None)
+                if prompt:
+                    self.session.prompts.remove(prompt)
+                    break
+        if prompt is None:
+            return False
+        
+        self.logger.info(f"Réponse reçue: {text_input}")
+        prompt[2](text_input)
+        return True
+    
+    def _on_prompt_timeout(self, callback):
+        """Échéance d'une question sans réponse"""
+        with self.session.lock:
+            self.session.prompts = [p for p in self.session.prompts if p[2] is not callback]
+        
+        if self.shutdown_event.is_set():
+            return
+        self.logger.warning("Aucune réponse reçue dans le délai imparti")
+        callback(None)
     
     def process_user_input(self, text_input: str):
         """Traite l'entrée utilisateur (texte ou vocal)"""
         if text_input.lower() in ["oui", "non"]:
-            self.response_queue.put(text_input)
-        else:
-            # Pour les explications détaillées
-            self.response_queue.put(text_input)
+            # Réponse à un countdown de chute en cours ?
+            if self._resolve_fall_countdown(text_input.lower()):
+                return
+        # Réponse à une question non bloquante (orchestrateur multi-sessions) ?
+        if self._resolve_prompt(text_input):
+            return
+        # Sinon : alerte en attente bloquante (ou explications détaillées)
+        self.response_queue.put(text_input)
 
-    def _send_emergency_notifications(self, emergency_context: dict, reason: str):
-        """Envoie les notifications d'urgence (email + SMS)"""
+    def _send_emergency_notifications(self, emergency_context: dict, reason: str) -> bool:
+        """
+        Envoie les notifications d'urgence (email + SMS)
+        
+        Returns:
+            bool: True si le SMS d'urgence a réellement été envoyé
+        """
         
-        # Préparer les contacts d'urgence
-        contacts = self.config.get('emergency_contacts', [])
+        # Préparer les contacts d'urgence (propres à la session si définis)
+        contacts = self.session.emergency_contacts or self.config.get('emergency_contacts', [])
         
         if not contacts:
             self.logger.warning("Aucun contact d'urgence configuré")
-            return
+            return False
         
         # L'email d'urgence sera envoyé par les méthodes appelantes
         # Cette fonction se concentre uniquement sur les SMS
@@ -818,14 +986,132 @@ class GuardianOrchestrator:
             sms_sent = self.sms_agent.send_emergency_sms(contacts, sms_context)
             
             if sms_sent:
+                self._trace_notification_sent("sms")
                 self.logger.info("SMS d'urgence envoyé avec succès")
                 print("📱 SMS d'urgence envoyé aux contacts")
-            else:
-                self.logger.warning("Échec envoi SMS d'urgence")
-                print("📱 SMS d'urgence en mode simulation")
+                return True
+            
+            self.logger.warning("Échec envoi SMS d'urgence")
+            print("📱 SMS d'urgence en mode simulation")
+            return False
                 
         except Exception as e:
             self.logger.error(f"Erreur envoi SMS: {e}")
+            return False
+    
+    def send_emergency_email_alert(self, user_name: str, location: str, situation: str, urgency_level: int = 8) -> bool:
+        """
+        Envoie des emails d'urgence aux contacts configurés quand Gemini détecte un danger élevé
+        
+        Returns:
+            bool: True si au moins un email a été envoyé
+        """
+        
+        # Seuil pour envoyer des emails (niveau 7 et plus sur 10)
+        if urgency_level < 7:
+            self.logger.info(f"Niveau d'urgence {urgency_level}/10 - Pas d'envoi d'email")
+            return False
+        
+        if not self.gmail_agent or not self.gmail_agent.is_available:
+            self.logger.warning("Agent Gmail non disponible - emails d'urgence désactivés")
+            return False
+        
+        try:
+            self.logger.critical(f"ENVOI D'EMAILS D'URGENCE - Niveau {urgency_level}/10")
+            print(f"\n📧 **ENVOI D'ALERTES EMAIL AUX PROCHES** (Urgence: {urgency_level}/10)")
+            
+            # Trajet récent compressé (quelques points au lieu de la trace brute) :
+            # résumé dans le message, trace simplifiée jointe en GPX
+            location = f"{location}\n{self.session.track.summary()}"
+            attachments = None
+            if len(self.session.track.points()) >= 2:
+                attachments = [("trajet_recent.gpx", self.session.track.gpx(), "application/gpx+xml")]
+            
+            sent = self.gmail_agent.send_to_emergency_contacts(
+                user_name=user_name,
+                location=location, 
+                situation=situation,
+                attachments=attachments
+            )
+            
+            if sent:
+                self._trace_notification_sent("email")
+                self.logger.info("Emails d'urgence envoyés")
+                print("📨 Vos proches ont été alertés de votre situation")
+                
+                # Notification vocale
+                try:
+                    self.speech_agent.speak_alert(
+                        "info", 
+                        f"Vos proches ont été alertés par email de votre situation d'urgence"
+                    )
+                except:
+                    pass
+                return True
+            
+            self.logger.error("Aucun email d'urgence envoyé")
+            print("❌ Aucun email d'urgence envoyé")
+            return False
+                
+        except Exception as e:
+            self.logger.error(f"Exception lors de l'envoi d'emails: {e}")
+            print(f"❌ Exception emails d'urgence: {e}")
+            return False
+
+    def follow_route(self, route) -> bool:
+        """
+        Surveille la déviation par rapport à un itinéraire
+        
+        Args:
+            route: Résultat de get_escape_route_to_refuge (clé 'path'), polyligne
+                   encodée ou liste de points (lat, lon)
+        """
+        if isinstance(route, dict):
+            route = route.get('path') or route.get('polyline')
+        if not route:
+            return False
+        if self.session.wrong_path_agent is None:
+            self.session.wrong_path_agent = WrongPathAgent(**self.config.get('wrong_path_agent', {}))
+        return self.session.wrong_path_agent.set_route(route)
+    
+    def _follow_route_to_refuge(self, position: tuple, refuges: list) -> bool:
+        """Calcule l'itinéraire vers le refuge le plus proche et en surveille le suivi"""
+        refuge = next((r for r in refuges if 'location' in r), None)
+        if refuge is None:
+            return False
+        route = self.emergency_locations.get_escape_route_to_refuge(
+            position, (refuge['location']['lat'], refuge['location']['lng'])
+        )
+        return self.follow_route(route)
+    
+    def _find_emergency_help(self, position: tuple, refuge_radius: int = 500, transport_radius: int = 1000):
+        """Recherche refuges et transports (durée mesurée comme 'location_lookup')"""
+        with self.latency.span("location_lookup"):
+            refuges = self.emergency_locations.find_emergency_refuges(position, radius_m=refuge_radius)
+            transports = self.emergency_locations.find_emergency_transport(position, radius_m=transport_radius)
+        return refuges, transports
+    
+    def _timed(self, stage: str, func, *args, **kwargs):
+        """Appelle func en mesurant sa durée pour l'étape donnée"""
+        with self.latency.span(stage):
+            return func(*args, **kwargs)
+    
+    def _trace_response_received(self):
+        """Marque la fin de l'attente de réponse dans la trace de l'alerte en cours"""
+        if self.session.alert_trace:
+            self.session.alert_trace.response_received()
+    
+    def _trace_notification_sent(self, channel: str):
+        """Marque la première notification envoyée dans la trace en cours"""
+        if self.session.alert_trace:
+            self.session.alert_trace.notification_sent(channel)
+    
+    def _send_email_alert(self, send, *args) -> bool:
+        """Envoie une alerte email EmergencyResponse et la trace si elle est partie"""
+        sent = send(*args)
+        if sent:
+            self._trace_notification_sent("email")
+        return bool(sent)
     
     def _get_location_address(self) -> str:
         """Retourne l'adresse actuelle formatée"""
@@ -835,36 +1121,73 @@ class GuardianOrchestrator:
         lat, lon = self.current_position
         return f"{lat:.6f}, {lon:.6f}"
 
-def static_monitor(orchestrator, agent):
-    """Surveille les positions GPS"""
+def static_monitor(orchestrator, agent, fixes=None, sampler=None, geofences=None):
+    """
+    Surveille les positions GPS
+
+    fixes: flux de GPSFix (pipeline de guardian.gps_sources) ; à défaut,
+    la simulation GPS de l'agent statique
+    sampler: AdaptiveSampler optionnel ; il fixe la cadence de la simulation
+    et écarte les fixes non échus d'une source réelle
+    geofences: GeofenceMonitor optionnel ; pas d'alerte d'immobilité en zone sûre
+    """
     logger = logging.getLogger("static_monitor")
-    
-    for position in agent.simulate_gps():
+    simulated = fixes is None
+    if simulated:
+        interval = (lambda: sampler.interval) if sampler else 10
+        fixes = timestamped(agent.simulate_gps(interval=interval), agent.clock)
+    if sampler:
+        fixes = sampler.filter(fixes, agent, orchestrator.fall_detector,
+                               alert_pending=lambda: orchestrator.session.alert_pending)
+
+    for fix in fixes:
         if orchestrator.shutdown_event.is_set():
             break
-            
+        
+        position = fix.position
         orchestrator.current_position = position
+        orchestrator.session.track.append(*fix)
         
         if orchestrator.agents_lock.acquire(blocking=False):
             try:
+                # Entrées et sorties de zones (index spatial)
+                if geofences:
+                    geofences.update(position, fix.timestamp)
+                
                 # Vérifier immobilité prolongée
-                if agent.update_position(position):
-                    orchestrator.handle_alert("immobilité prolongée", position)
+                if agent.update_position(position, fix.timestamp):
+                    if geofences and geofences.in_safe_zone:
+                        logger.info(f"🏠 Immobilité en zone sûre ({', '.join(map(str, geofences.inside))}) - alerte suspendue")
+                    else:
+                        orchestrator.handle_alert("immobilité prolongée", position)
                 
                 # Vérifier détection de chute
-                fall_info = orchestrator.fall_detector.update_position(position)
+                fall_info = orchestrator.fall_detector.update_position(position, fix.timestamp)
                 if fall_info:
                     orchestrator.handle_fall_detection(fall_info)
                     
                 # Vérifier statut post-chute
-                post_fall_info = orchestrator.fall_detector.check_post_fall_status(position)
+                post_fall_info = orchestrator.fall_detector.check_post_fall_status(position, fix.timestamp)
                 if post_fall_info:
                     orchestrator.handle_post_fall_emergency(post_fall_info)
+                
+                # Vérifier déviation de l'itinéraire suivi
+                wrong_path = orchestrator.session.wrong_path_agent
+                if wrong_path and wrong_path.update_position(position, fix.timestamp):
+                    orchestrator.handle_alert("déviation d'itinéraire", position)
                     
             finally:
                 orchestrator.agents_lock.release()
         
-        time.sleep(1)
+        if simulated and not sampler:
+            time.sleep(1)
+
+def imu_monitor(orchestrator, detector, samples):
+    """Surveille le flux accélérométrique (chute détectée en moins d'une seconde)"""
+    for fall_info in detector.process(samples):
+        if orchestrator.shutdown_event.is_set():
+            break
+        orchestrator.handle_fall_detection(fall_info)
 
 def voice_monitor(orchestrator, voice_agent):
     """Surveille les commandes vocales"""
@@ -883,50 +1206,6 @@ def voice_monitor(orchestrator, voice_agent):
         
         time.sleep(1)
 
-    def send_emergency_email_alert(self, user_name: str, location: str, situation: str, urgency_level: int = 8):
-        """Envoie des emails d'urgence aux contacts configurés quand Gemini détecte un danger élevé"""
-        
-        # Seuil pour envoyer des emails (niveau 7 et plus sur 10)
-        if urgency_level < 7:
-            self.logger.info(f"Niveau d'urgence {urgency_level}/10 - Pas d'envoi d'email")
-            return
-        
-        if not self.gmail_agent or not self.gmail_agent.is_available:
-            self.logger.warning("Agent Gmail non disponible - emails d'urgence désactivés")
-            return
-        
-        try:
-            self.logger.critical(f"ENVOI D'EMAILS D'URGENCE - Niveau {urgency_level}/10")
-            print(f"\n📧 **ENVOI D'ALERTES EMAIL AUX PROCHES** (Urgence: {urgency_level}/10)")
-            
-            result = self.gmail_agent.send_to_emergency_contacts(
-                user_name=user_name,
-                location=location, 
-                situation=situation
-            )
-            
-            if result['success']:
-                self.logger.info(f"Emails d'urgence envoyés: {result['successful_sends']}/{result['total_contacts']}")
-                print(f"✅ {result['successful_sends']}/{result['total_contacts']} emails d'urgence envoyés")
-                print("📨 Vos proches ont été alertés de votre situation")
-                
-                # Notification vocale
-                try:
-                    self.speech_agent.speak_alert(
-                        "info", 
-                        f"Vos proches ont été alertés par email de votre situation d'urgence"
-                    )
-                except:
-                    pass
-                    
-            else:
-                self.logger.error(f"Erreur envoi emails: {result.get('error', 'Inconnu')}")
-                print(f"❌ Erreur envoi emails: {result.get('error', 'Inconnu')}")
-                
-        except Exception as e:
-            self.logger.error(f"Exception lors de l'envoi d'emails: {e}")
-            print(f"❌ Exception emails d'urgence: {e}")
-
 def console_input_monitor(orchestrator):
     """Surveille les entrées console en arrière-plan"""
     logger = logging.getLogger("console_input")
@@ -953,18 +1232,22 @@ def main():
         # Charger la configuration
         config = Config()
         
+        # Charger le modèle Vosk en arrière-plan pendant l'initialisation des services
+        voice_config = config.get_voice_agent_config()
+        model_path = voice_config.get("model_path")
+        if model_path and os.path.exists(model_path):
+            preload_models([model_path])
+        
         # Créer l'orchestrateur principal
         orchestrator = GuardianOrchestrator(config.config_data)
         
         # Créer les agents avec la configuration
         static_config = config.get_static_agent_config()
-        voice_config = config.get_voice_agent_config()
         
         logger.info("Initialisation des agents...")
         static_agent = StaticAgent(**static_config)
         
         # Vérifier que le modèle Vosk existe
-        model_path = voice_config.get("model_path")
         if not model_path or not os.path.exists(model_path):
             logger.warning(f"Modèle Vosk non trouvé à {model_path}")
             logger.info("Fonctionnement en mode GPS uniquement")
@@ -972,12 +1255,51 @@ def main():
         else:
             voice_agent = VoiceAgent(**voice_config)
         
-        # Démarrer le monitoring GPS
+        # Démarrer le monitoring GPS (source réelle si configurée, sinon simulation)
         logger.info("Démarrage du monitoring GPS...")
-        t_static = threading.Thread(target=static_monitor, args=(orchestrator, static_agent))
+        gps_config = config.get_gps_config()
+        fixes = None
+        if gps_config.get("source"):
+            logger.info(f"Source GPS: {gps_config['source']}")
+            fixes = build_pipeline(
+                open_source(gps_config["source"], stop_event=orchestrator.shutdown_event),
+                min_interval=gps_config.get("min_interval_seconds")
+            )
+        sampling_config = gps_config.get("adaptive_sampling", {})
+        sampler = None
+        if sampling_config.get("enabled"):
+            min_interval = sampling_config.get("min_interval_seconds", 1)
+            if fixes is None:
+                # Le bruit de la simulation est calibré pour sa cadence d'origine (10 s)
+                min_interval = max(min_interval, 10)
+            sampler = AdaptiveSampler(
+                min_interval=min_interval,
+                walking_interval=max(min_interval, sampling_config.get("walking_interval_seconds", 5)),
+                max_interval=sampling_config.get("max_interval_seconds", 30)
+            )
+        geofences = None
+        fences = [geofence_from_config(entry) for entry in config.get_geofences_config()]
+        if fences:
+            geofences = GeofenceMonitor(GeofenceIndex(fences))
+            logger.info(f"{len(fences)} zones géographiques chargées")
+        t_static = threading.Thread(target=static_monitor,
+                                    args=(orchestrator, static_agent, fixes, sampler, geofences))
         t_static.daemon = True
         t_static.start()
         
+        # Démarrer le monitoring accélérométrique si une source IMU est configurée
+        imu_config = config.get("imu", {})
+        if imu_config.get("source"):
+            logger.info(f"Démarrage du monitoring IMU: {imu_config['source']}")
+            detector = IMUFallDetector(
+                sample_rate=imu_config.get("sample_rate", 100),
+                position_provider=lambda: orchestrator.current_position
+            )
+            samples = open_imu_source(imu_config["source"], stop_event=orchestrator.shutdown_event)
+            t_imu = threading.Thread(target=imu_monitor, args=(orchestrator, detector, samples))
+            t_imu.daemon = True
+            t_imu.start()
+        
         # Démarrer le monitoring vocal si disponible
         if voice_agent:
             logger.info("Démarrage du monitoring vocal...")
@@ -1027,7 +1349,11 @@ def main():
                 time.sleep(1)
         except KeyboardInterrupt:
             logger.info("Arrêt demandé par l'utilisateur")
-            orchestrator.shutdown_event.set()
+            orchestrator.services.shutdown()
+            print(orchestrator.latency.format_report())
+            if sampler:
+                print(sampler.format_report())
+            print(MODEL_REGISTRY.format_report())
             
     except Exception as e:
         logger.error(f"Erreur lors du démarrage: {e}")
@@ -26,6 +26,8 @@ try:
 except ImportError:
     VOSK_AVAILABLE = False
 
+from guardian.vosk_models import get_model
+
 # Gemini pour analyse cloud
 try:
     from google import genai
@@ -107,7 +109,7 @@ class HybridVoiceAgent:
         if VOSK_AVAILABLE:
             try:
                 if os.path.exists(self.vosk_model_path):
-                    self.vosk_model = vosk.Model(self.vosk_model_path)
+                    self.vosk_model = get_model(self.vosk_model_path)
                     self.vosk_recognizer = vosk.KaldiRecognizer(self.vosk_model, 16000)
                     self.logger.info("✅ Vosk initialisé (fallback offline prêt)")
                 else:
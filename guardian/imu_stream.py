@@ -0,0 +1,215 @@
+"""
+Détection de chute par accéléromètre (IMU 50-200 Hz) pour Guardian
+Fenêtre glissante sur un tampon circulaire NumPy : pic d'impact, phase de
+chute libre et immobilité après l'impact. Détection en moins d'une seconde,
+au lieu d'attendre le fix GPS suivant.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from guardian.gps_sources import socket_lines
+
+GRAVITY = 9.80665  # m/s²
+
+logger = logging.getLogger(__name__)
+
+
+class IMUSample(NamedTuple):
+    """Échantillon d'accéléromètre (secondes, m/s² sur les trois axes)"""
+    timestamp: float
+    ax: float
+    ay: float
+    az: float
+
+
+def read_imu_csv(lines: Iterable[str]) -> Iterator[IMUSample]:
+    """Lignes 't,ax,ay,az' (en-têtes et lignes invalides ignorées)"""
+    for line in lines:
+        parts = line.strip().split(',')
+        if len(parts) < 4:
+            continue
+        try:
+            yield IMUSample(float(parts[0]), float(parts[1]), float(parts[2]), float(parts[3]))
+        except ValueError:
+            continue
+
+
+def open_imu_source(uri: str, stop_event: Optional[threading.Event] = None) -> Iterator[IMUSample]:
+    """
+    Ouvre un flux IMU CSV depuis un fichier ou un socket
+
+    Exemples : imu.csv, udp://0.0.0.0:5555, tcp://192.168.1.30:5555
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme in ('udp', 'tcp'):
+        yield from read_imu_csv(socket_lines(parsed.hostname, parsed.port, parsed.scheme, stop_event))
+        return
+    with open(uri, 'r', encoding='utf-8') as f:
+        yield from read_imu_csv(f)
+
+
+class IMUFallDetector:
+    """
+    Détecteur de chute sur flux accélérométrique
+
+    Une chute = un pic d'impact, précédé d'une chute libre (ou d'un impact
+    très fort), suivi d'une immobilité. La fenêtre est évaluée tous les
+    hop_seconds ; le dict émis est compatible avec handle_fall_detection.
+    """
+
+    def __init__(self, sample_rate: float = 100.0,
+                 window_seconds: float = 2.5,
+                 impact_threshold_g: float = 2.5,
+                 strong_impact_g: float = 4.0,
+                 free_fall_threshold_g: float = 0.5,
+                 min_free_fall_seconds: float = 0.08,
+                 stillness_seconds: float = 0.4,
+                 settle_seconds: float = 0.1,
+                 stillness_std_g: float = 0.1,
+                 hop_seconds: float = 0.1,
+                 refractory_seconds: float = 10.0,
+                 position_provider: Optional[Callable[[], Optional[Tuple[float, float]]]] = None):
+        self.sample_rate = sample_rate
+        self.impact_threshold_g = impact_threshold_g
+        self.strong_impact_g = strong_impact_g
+        self.free_fall_threshold_g = free_fall_threshold_g
+        self.stillness_std_g = stillness_std_g
+        self.refractory_seconds = refractory_seconds
+        self.position_provider = position_provider
+
+        samples = lambda seconds: max(1, int(round(seconds * sample_rate)))
+        self.window = samples(window_seconds)
+        self.free_fall_samples = samples(min_free_fall_seconds)
+        self.lookback_samples = samples(1.0)  # chute libre cherchée dans la seconde avant l'impact
+        self.stillness_samples = samples(stillness_seconds)
+        self.settle_samples = samples(settle_seconds)
+        self.hop = samples(hop_seconds)
+
+        # Tampon doublé : la fenêtre la plus récente est toujours contiguë
+        self._magnitude = np.zeros(2 * self.window)
+        self._time = np.zeros(2 * self.window)
+        self._head = 0
+        self._count = 0
+        self._since_eval = 0
+        self._last_impact_time = float('-inf')
+
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def add_sample(self, timestamp: float, ax: float, ay: float, az: float) -> Optional[Dict]:
+        """
+        Ajoute un échantillon (m/s²)
+
+        Returns:
+            Dict 'fall_detected' si une chute est confirmée, None sinon
+        """
+        magnitude = (ax * ax + ay * ay + az * az) ** 0.5 / GRAVITY
+        i = self._head
+        self._magnitude[i] = self._magnitude[i + self.window] = magnitude
+        self._time[i] = self._time[i + self.window] = timestamp
+        self._head = (i + 1) % self.window
+        self._count += 1
+
+        self._since_eval += 1
+        if self._since_eval < self.hop:
+            return None
+        self._since_eval = 0
+        return self._evaluate()
+
+    def process(self, samples: Iterable[IMUSample]) -> Iterator[Dict]:
+        """Traite un flux d'échantillons et produit les chutes détectées"""
+        for sample in samples:
+            fall_info = self.add_sample(*sample)
+            if fall_info:
+                yield fall_info
+
+    def _recent(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Vue (sans copie) des derniers échantillons, du plus ancien au plus récent"""
+        n = min(self._count, self.window)
+        end = self._head + self.window
+        return self._magnitude[end - n:end], self._time[end - n:end]
+
+    def _evaluate(self) -> Optional[Dict]:
+        magnitude, times = self._recent()
+        post = self.settle_samples + self.stillness_samples
+        if len(magnitude) <= post:
+            return None
+
+        # 1. Pic d'impact, antérieur à la fenêtre d'immobilité
+        candidates = magnitude[:len(magnitude) - post]
+        impact = int(np.argmax(candidates))
+        peak = float(candidates[impact])
+        impact_time = float(times[impact])
+        if peak < self.impact_threshold_g or impact_time <= self._last_impact_time + self.refractory_seconds:
+            return None
+
+        # 2. Immobilité depuis l'impact (rebonds terminés) : écart-type glissant
+        #    faible sur les derniers échantillons, ~1 g (allongé)
+        after = magnitude[-self.stillness_samples:]
+        k = max(2, self.stillness_samples // 4)
+        rolling_std = sliding_window_view(after, k).std(axis=1)
+        if rolling_std.max() > self.stillness_std_g or abs(after.mean() - 1.0) > 0.3:
+            return None
+
+        # 3. Chute libre avant l'impact : plus longue suite sous le seuil
+        before = magnitude[max(0, impact - self.lookback_samples):impact]
+        free_fall = self._longest_run(before < self.free_fall_threshold_g)
+        if free_fall < self.free_fall_samples and peak < self.strong_impact_g:
+            return None
+
+        self._last_impact_time = impact_time
+        return self._fall_info(peak, free_fall / self.sample_rate, impact_time, float(times[-1]))
+
+    def _longest_run(self, mask: np.ndarray) -> int:
+        """Longueur de la plus longue suite de True (fenêtres glissantes)"""
+        if len(mask) < self.free_fall_samples or not mask.any():
+            return 0
+        if not sliding_window_view(mask, self.free_fall_samples).all(axis=1).any():
+            return 0
+        padded = np.concatenate(([0], mask.astype(np.int8), [0]))
+        edges = np.flatnonzero(np.diff(padded))
+        return int((edges[1::2] - edges[::2]).max())
+
+    def _fall_info(self, peak_g: float, free_fall_seconds: float,
+                   impact_time: float, detection_time: float) -> Dict:
+        """Dict de chute au format de FallDetector (+ mesures IMU)"""
+        if peak_g >= 6.0:
+            severity, impact_force = "critique", "fort"
+        elif peak_g >= 4.0:
+            severity, impact_force = "grave", "fort"
+        elif peak_g >= 3.0 or free_fall_seconds >= 0.3:
+            severity, impact_force = "modérée", "modéré"
+        else:
+            severity, impact_force = "légère", "léger"
+
+        fall_info = {
+            'type': 'fall_detected',
+            'fall_type': 'impact_brutal' if peak_g >= self.strong_impact_g else 'chute_generale',
+            'source': 'imu',
+            'previous_speed': 0.0,
+            'current_speed': 0.0,
+            'acceleration': -peak_g * GRAVITY,
+            'peak_g': peak_g,
+            'free_fall_seconds': free_fall_seconds,
+            'duration_seconds': free_fall_seconds,
+            'impact_force': impact_force,
+            'movement_detected_after': False,
+            'impact_time': impact_time,
+            'detection_time': detection_time,
+            'detection_latency': detection_time - impact_time,
+            'severity': severity
+        }
+        position = self.position_provider() if self.position_provider else None
+        if position:
+            fall_info['position'] = position
+
+        self.logger.warning(
+            f"🚨 CHUTE DÉTECTÉE (IMU) ! Pic {peak_g:.1f} g, chute libre {free_fall_seconds:.2f}s, "
+            f"détectée en {fall_info['detection_latency']:.2f}s"
+        )
+        return fall_info
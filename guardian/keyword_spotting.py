@@ -0,0 +1,108 @@
+"""
+Détection de mots-clés vocaux pour Guardian
+Reconnaisseur Vosk restreint à une grammaire (mots-clés + "[unk]") : le
+décodage n'explore plus tout le vocabulaire, d'où un facteur temps réel et
+une charge CPU bien plus faibles en écoute permanente. Les mots-clés sont
+signalés dès les résultats partiels.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from guardian.vad import GatedRecognizer, VoiceActivityGate
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+UNKNOWN = "[unk]"
+
+
+def keyword_grammar(keywords: List[str]) -> str:
+    """Grammaire Vosk (liste JSON) : les mots-clés et le jeton inconnu"""
+    phrases = list(dict.fromkeys(k.lower().strip() for k in keywords if k.strip()))
+    return json.dumps(phrases + [UNKNOWN], ensure_ascii=False)
+
+
+def find_keyword(text: str, keywords: List[str]) -> Optional[str]:
+    """Premier mot-clé présent comme mot (ou suite de mots) entier dans text"""
+    padded = f" {text.lower()} "
+    for key in keywords:
+        if f" {key} " in padded:
+            return key
+    return None
+
+
+class KeywordSpotter:
+    """
+    Reconnaisseur à grammaire restreinte, réutilisé d'une écoute à l'autre
+
+    accept() renvoie le mot-clé détecté dans le résultat partiel ou final du
+    bloc audio reçu ; le décodage repart alors de zéro pour ne pas signaler
+    deux fois la même occurrence. Avec une VoiceActivityGate, le silence
+    n'est pas décodé.
+    """
+
+    def __init__(self, model, keywords: List[str], samplerate: int = 16000,
+                 on_keyword: Optional[Callable[[str, str], None]] = None,
+                 factory: Optional[Callable[[str], Any]] = None,
+                 gate: Optional[VoiceActivityGate] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.keywords = [k.lower() for k in keywords]
+        self.grammar = keyword_grammar(self.keywords)
+        self.on_keyword = on_keyword
+        if factory is None:
+            factory = lambda grammar: vosk.KaldiRecognizer(model, samplerate, grammar)
+        self.recognizer = factory(self.grammar)
+        if gate is not None:
+            # Seuls les segments de parole sont décodés
+            self.recognizer = GatedRecognizer(self.recognizer, gate)
+        self.counts: Dict[str, int] = {key: 0 for key in self.keywords}
+
+    def accept(self, data: bytes) -> Optional[str]:
+        """Décode un bloc audio PCM 16 bits ; mot-clé détecté ou None"""
+        if self.recognizer.AcceptWaveform(bytes(data)):  # Vosk (cffi) attend des bytes
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+
+        keyword = find_keyword(text, self.keywords) if text else None
+        if keyword is None:
+            return None
+
+        self.counts[keyword] += 1
+        self.logger.info(f"🔑 Mot clé détecté: '{keyword}'")
+        self.recognizer.Reset()
+        if self.on_keyword:
+            self.on_keyword(keyword, text)
+        return keyword
+
+    def reset(self):
+        self.recognizer.Reset()
+
+
+def measure_decoding(recognizer, pcm: bytes, samplerate: int = 16000,
+                     chunk_bytes: int = 4000) -> Dict[str, float]:
+    """
+    Facteur temps réel d'un reconnaisseur sur un signal PCM 16 bits mono
+
+    Returns:
+        Dict avec audio_seconds, rtf (temps écoulé / durée audio) et cpu_rtf
+        (temps CPU du processus / durée audio)
+    """
+    audio_seconds = len(pcm) / (2 * samplerate)
+    wall, cpu = time.perf_counter(), time.process_time()
+    for offset in range(0, len(pcm), chunk_bytes):
+        if not recognizer.AcceptWaveform(pcm[offset:offset + chunk_bytes]):
+            recognizer.PartialResult()
+    recognizer.FinalResult()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return {
+        'audio_seconds': audio_seconds,
+        'rtf': wall / audio_seconds if audio_seconds else 0.0,
+        'cpu_rtf': cpu / audio_seconds if audio_seconds else 0.0,
+    }
@@ -0,0 +1,193 @@
+"""
+Mesure de latence des alertes Guardian
+Histogrammes par étape (déclenchement → analyse → localisation → première notification)
+et suivi du SLA "< 7 secondes"
+"""
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+
+class LatencyHistogram:
+    """
+    Histogramme à seaux logarithmiques (mémoire constante)
+
+    Couvre 1 ms à ~1000 s avec 20 seaux par décade, soit une erreur
+    relative d'environ 12 % sur les percentiles.
+    """
+
+    MIN_VALUE = 0.001
+    BUCKETS_PER_DECADE = 20
+    DECADES = 6
+
+    def __init__(self):
+        self.counts = [0] * (self.BUCKETS_PER_DECADE * self.DECADES + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.MIN_VALUE:
+            return 0
+        index = int(math.log10(value / self.MIN_VALUE) * self.BUCKETS_PER_DECADE) + 1
+        return min(index, len(self.counts) - 1)
+
+    def _bucket_upper_bound(self, index: int) -> float:
+        return self.MIN_VALUE * 10 ** (index / self.BUCKETS_PER_DECADE)
+
+    def record(self, value: float):
+        """Ajoute une mesure en secondes"""
+        self.counts[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Percentile q (0-100), borne supérieure du seau correspondant"""
+        if self.count == 0:
+            return None
+        rank = math.ceil(q / 100.0 * self.count)
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(self._bucket_upper_bound(index), self.max)
+        return self.max
+
+
+class AlertTrace:
+    """
+    Trace d'une alerte, du déclencheur à la première notification envoyée
+
+    Le temps d'attente de la réponse utilisateur est mesuré à part :
+    le SLA porte sur le temps de traitement du système.
+    """
+
+    __slots__ = ('tracker', 'trigger', 'start', 'response_time', 'notified')
+
+    def __init__(self, tracker: 'LatencyTracker', trigger: str):
+        self.tracker = tracker
+        self.trigger = trigger
+        self.start = tracker.clock()
+        self.response_time: Optional[float] = None
+        self.notified = False
+
+    def response_received(self):
+        """
+        Fin d'une attente utilisateur (réponse ou timeout)
+
+        La première attente alimente l'étape 'response_wait' ; le traitement
+        est toujours mesuré depuis la dernière entrée utilisateur.
+        """
+        now = self.tracker.clock()
+        if self.response_time is None:
+            self.tracker.record("response_wait", now - self.start)
+        self.response_time = now
+
+    def notification_sent(self, channel: str):
+        """Première notification (SMS ou email) réellement envoyée"""
+        if self.notified:
+            return
+        self.notified = True
+        now = self.tracker.clock()
+
+        self.tracker.record("first_notification", now - self.start)
+        processing = now - (self.response_time if self.response_time is not None else self.start)
+        self.tracker.record("processing", processing)
+        self.tracker.check_sla(self.trigger, channel, processing)
+
+
+class LatencyTracker:
+    """Collecteur des latences par étape, partagé par tout le processus"""
+
+    STAGES = ("response_wait", "analysis", "location_lookup", "first_notification", "processing")
+
+    def __init__(self, sla_seconds: float = 7.0, clock=time.perf_counter):
+        self.sla_seconds = sla_seconds
+        self.clock = clock
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._breaches: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def start_trace(self, trigger: str) -> AlertTrace:
+        """Démarre la trace d'une alerte"""
+        return AlertTrace(self, trigger)
+
+    def record(self, stage: str, seconds: float):
+        """Enregistre une durée pour une étape"""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    @contextmanager
+    def span(self, stage: str):
+        """Mesure la durée du bloc et l'enregistre pour l'étape"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(stage, self.clock() - start)
+
+    def check_sla(self, trigger: str, channel: str, processing: float):
+        """Signale un dépassement du SLA de traitement"""
+        if processing <= self.sla_seconds:
+            return
+        with self._lock:
+            self._breaches[trigger] = self._breaches.get(trigger, 0) + 1
+        self.logger.warning(
+            f"⏱️ SLA dépassé ({trigger}): première notification {channel} "
+            f"après {processing:.2f}s de traitement (> {self.sla_seconds}s)"
+        )
+
+    def report(self) -> Dict[str, Any]:
+        """Percentiles par étape et dépassements du SLA"""
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._histograms.items():
+                stages[stage] = {
+                    'count': histogram.count,
+                    'p50': histogram.percentile(50),
+                    'p95': histogram.percentile(95),
+                    'p99': histogram.percentile(99),
+                    'max': histogram.max,
+                    'mean': histogram.total / histogram.count
+                }
+            processing = self._histograms.get("processing")
+            return {
+                'sla_seconds': self.sla_seconds,
+                'stages': stages,
+                'sla_breaches': dict(self._breaches),
+                'sla_p99_ok': processing is None or processing.percentile(99) <= self.sla_seconds
+            }
+
+    def format_report(self) -> str:
+        """Rapport lisible des latences"""
+        report = self.report()
+        lines = [f"⏱️  LATENCES DES ALERTES (SLA: {report['sla_seconds']}s)"]
+
+        ordered = [s for s in self.STAGES if s in report['stages']]
+        ordered += [s for s in report['stages'] if s not in self.STAGES]
+        for stage in ordered:
+            info = report['stages'][stage]
+            flag = ""
+            if stage == "processing" and info['p99'] > report['sla_seconds']:
+                flag = " ⚠️ SLA"
+            lines.append(
+                f"   {stage:<20} n={info['count']:<6} p50={info['p50']:.3f}s "
+                f"p95={info['p95']:.3f}s p99={info['p99']:.3f}s{flag}"
+            )
+
+        if report['sla_breaches']:
+            for trigger, count in report['sla_breaches'].items():
+                lines.append(f"   🚨 {count} dépassement(s) du SLA pour '{trigger}'")
+        else:
+            lines.append("   ✅ Aucun dépassement du SLA")
+        return "\n".join(lines)
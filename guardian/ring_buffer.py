@@ -0,0 +1,117 @@
+"""
+Tampon circulaire de positions GPS pour Guardian
+Tableaux float64 préalloués (lat, lon, t, vitesse) et longueur de trajet
+cumulée mise à jour en O(1) à chaque ajout
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from guardian.geodesy import distance_m
+
+
+class PositionRingBuffer:
+    """
+    Historique de positions à capacité fixe, sans allocation par mise à jour
+
+    La longueur du trajet couvert par la fenêtre est maintenue en continu :
+    on ajoute le segment entrant et on retire celui qui sort de la fenêtre.
+    """
+
+    # Recalcul complet périodique pour éviter la dérive des arrondis
+    RESYNC_EVERY = 4096
+
+    def __init__(self, capacity: int = 10):
+        if capacity < 2:
+            raise ValueError("La capacité doit être d'au moins 2 positions")
+        self.capacity = capacity
+        self.lat = np.zeros(capacity)
+        self.lon = np.zeros(capacity)
+        self.t = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        # segment[i] = distance depuis la position précédant l'entrée i
+        self.segment = np.zeros(capacity)
+
+        self._head = 0      # prochain emplacement à écrire
+        self._size = 0
+        self._path_length = 0.0
+        self._appends = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _index(self, i: int) -> int:
+        """Indice physique de la i-ème entrée (0 = la plus ancienne, -1 = la plus récente)"""
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("Indice hors de l'historique")
+        return (self._head - self._size + i) % self.capacity
+
+    def append(self, lat: float, lon: float, t: float, speed: float = 0.0):
+        """Ajoute une position ; la plus ancienne est écrasée si le tampon est plein"""
+        segment = 0.0
+        if self._size:
+            last = (self._head - 1) % self.capacity
+            segment = distance_m((self.lat[last], self.lon[last]), (lat, lon))
+
+        if self._size == self.capacity:
+            # L'entrée la plus ancienne sort : le segment vers la suivante aussi
+            oldest = self._head
+            self._path_length -= self.segment[(oldest + 1) % self.capacity]
+            self._size -= 1
+
+        i = self._head
+        self.lat[i] = lat
+        self.lon[i] = lon
+        self.t[i] = t
+        self.speed[i] = speed
+        self.segment[i] = segment
+        self._head = (i + 1) % self.capacity
+        self._size += 1
+        self._path_length += segment
+
+        self._appends += 1
+        if self._appends % self.RESYNC_EVERY == 0:
+            self._resync()
+
+    def _resync(self):
+        """Recalcule la longueur cumulée à partir des segments stockés"""
+        if self._size < 2:
+            self._path_length = 0.0
+            return
+        indices = (self._head - self._size + 1 + np.arange(self._size - 1)) % self.capacity
+        self._path_length = float(self.segment[indices].sum())
+
+    @property
+    def path_length(self) -> float:
+        """Longueur du trajet (mètres) couvert par les positions de la fenêtre"""
+        return max(0.0, self._path_length)
+
+    def last(self) -> Optional[Tuple[Tuple[float, float], float, float]]:
+        """Dernière entrée : ((lat, lon), timestamp, vitesse) ou None"""
+        if not self._size:
+            return None
+        i = (self._head - 1) % self.capacity
+        return (float(self.lat[i]), float(self.lon[i])), float(self.t[i]), float(self.speed[i])
+
+    def positions(self) -> np.ndarray:
+        """Positions (N, 2) de la plus ancienne à la plus récente"""
+        indices = self._ordered_indices()
+        return np.column_stack([self.lat[indices], self.lon[indices]])
+
+    def timestamps(self) -> np.ndarray:
+        return self.t[self._ordered_indices()]
+
+    def speeds(self) -> np.ndarray:
+        return self.speed[self._ordered_indices()]
+
+    def _ordered_indices(self) -> np.ndarray:
+        return (self._head - self._size + np.arange(self._size)) % self.capacity
+
+    def clear(self):
+        """Vide l'historique"""
+        self._head = 0
+        self._size = 0
+        self._path_length = 0.0
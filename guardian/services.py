@@ -0,0 +1,82 @@
+"""
+Services partagés de Guardian
+Clients lourds (Gemini, Gmail, SMS, TTS, localisation) créés une seule fois par processus
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+from guardian.speech_agent import SpeechAgent
+from guardian.gemini_agent import GeminiAgent
+from guardian.sms_agent import SMSAgent
+from guardian.gmail_emergency_agent import GmailEmergencyAgent
+from guardian.emergency_response import EmergencyResponse
+from guardian.intelligent_advisor import IntelligentAdvisor, SmartResponseSystem
+from guardian.emergency_locations import EmergencyLocationService
+from guardian.timer_scheduler import TimerScheduler
+from guardian.latency import LatencyTracker
+
+
+def load_api_keys(path: str = 'api_keys.yaml') -> Dict[str, Any]:
+    """Charge les clés API (dictionnaire vide si le fichier est absent)"""
+    try:
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except Exception:
+        return {}
+
+
+class GuardianServices:
+    """Conteneur des clients partagés entre toutes les sessions utilisateur"""
+
+    def __init__(self, config: Dict[str, Any], api_keys_config: Optional[Dict[str, Any]] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        if api_keys_config is None:
+            api_keys_config = load_api_keys()
+
+        self.emergency_response = EmergencyResponse(config.get('emergency_response', {}), api_keys_config)
+
+        # Agent de synthèse vocale
+        self.speech_agent = SpeechAgent(api_keys_config)
+
+        # Agent SMS pour notifications d'urgence
+        self.sms_agent = SMSAgent(api_keys_config)
+
+        # Agent Gemini pour l'analyse avancée
+        self.gemini_agent = GeminiAgent(api_keys_config)
+
+        # Agent Gmail pour emails d'urgence
+        self.gmail_agent = GmailEmergencyAgent(api_keys_config)
+
+        # Système d'IA et de conseils (fallback si Gemini indisponible)
+        self.intelligent_advisor = IntelligentAdvisor()
+        self.smart_response_system = SmartResponseSystem(self.intelligent_advisor)
+
+        # Système de localisation d'urgence
+        try:
+            api_config = {}  # Chargé depuis api_keys.yaml si disponible
+            self.emergency_locations = EmergencyLocationService(api_config)
+        except Exception as e:
+            self.logger.warning(f"Service de localisation d'urgence non disponible: {e}")
+            self.emergency_locations = None
+
+        # Planificateur unique pour escalades et comptes à rebours
+        self.scheduler = TimerScheduler()
+        self.shutdown_event = threading.Event()
+
+        # Latences des alertes et suivi du SLA
+        self.latency = LatencyTracker(config.get('emergency_response', {}).get('sla_seconds', 7.0))
+
+        # Pool des plans d'actions d'urgence (étapes exécutées en parallèle)
+        self.action_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="guardian-action")
+
+    def shutdown(self):
+        """Arrête les services partagés"""
+        self.shutdown_event.set()
+        self.scheduler.shutdown()
+        self.action_executor.shutdown(wait=False)
+        self.gemini_agent.stop_health_probe()
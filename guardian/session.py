@@ -0,0 +1,71 @@
+"""
+Session utilisateur pour Guardian
+État compact propre à une personne surveillée (position, détecteurs, réponses)
+"""
+
+import queue
+import threading
+from typing import Optional, Tuple, List, Dict
+
+from guardian.GPS_agent import StaticAgent
+from guardian.fall_detector import FallDetector
+from guardian.trajectory import TrackRecorder
+from guardian.wrong_path_agent import WrongPathAgent
+
+
+class GuardianSession:
+    """
+    État par utilisateur ; les clients lourds sont partagés via GuardianServices
+    """
+
+    __slots__ = ('session_id', 'current_position', 'static_agent', 'fall_detector',
+                 'wrong_path_agent', 'track', 'emergency_contacts', 'escalation_handles', 'fall_countdown',
+                 'prompts', 'lock', 'alert_trace', '_response_queue')
+
+    def __init__(self, session_id: str,
+                 static_agent: Optional[StaticAgent] = None,
+                 fall_detector: Optional[FallDetector] = None,
+                 wrong_path_agent: Optional[WrongPathAgent] = None,
+                 emergency_contacts: Optional[List[Dict]] = None):
+        self.session_id = session_id
+        self.current_position: Optional[Tuple[float, float]] = None
+        self.static_agent = static_agent
+        self.fall_detector = fall_detector or FallDetector(
+            speed_threshold_high=15.0,  # km/h - vitesse élevée à vélo
+            speed_threshold_low=2.0,    # km/h - quasi-immobile
+            acceleration_threshold=-8.0, # m/s² - décélération brutale
+            stationary_time=30.0        # secondes sans mouvement = urgence
+        )
+        self.wrong_path_agent = wrong_path_agent  # créé au premier itinéraire suivi
+        self.track = TrackRecorder()  # 30 dernières minutes, simplifiées à 5 m
+        self.emergency_contacts = emergency_contacts
+        self.escalation_handles = []
+        self.fall_countdown = None
+        self.prompts = []  # questions non bloquantes (type, minuterie, callback)
+        self.lock = threading.Lock()
+        self.alert_trace = None
+        self._response_queue = None
+
+    @property
+    def response_queue(self) -> queue.Queue:
+        """File des réponses utilisateur, créée à la première alerte"""
+        if self._response_queue is None:
+            self._response_queue = queue.Queue()
+        return self._response_queue
+
+    @property
+    def alert_pending(self) -> bool:
+        """Countdown de chute, question ou escalade en cours"""
+        return (self.fall_countdown is not None or bool(self.prompts)
+                or any(h.active for h in self.escalation_handles))
+
+    def cancel_timers(self) -> int:
+        """Annule les escalades, les questions et le countdown de chute en attente"""
+        cancelled = sum(1 for handle in self.escalation_handles if handle.cancel())
+        self.escalation_handles = []
+        cancelled += sum(1 for _, handle, _ in self.prompts if handle.cancel())
+        self.prompts = []
+        if self.fall_countdown and self.fall_countdown[0].cancel():
+            cancelled += 1
+        self.fall_countdown = None
+        return cancelled
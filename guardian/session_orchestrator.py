@@ -0,0 +1,184 @@
+"""
+Orchestrateur multi-sessions pour Guardian
+Un processus surveille des milliers d'utilisateurs avec des services partagés
+"""
+
+import logging
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from guardian.GPS_agent import StaticAgent
+from guardian.guardian_agent import GuardianOrchestrator
+from guardian.services import GuardianServices
+from guardian.session import GuardianSession
+
+
+class SessionOrchestrator:
+    """
+    Orchestrateur partitionné par session
+
+    Les sessions sont réparties en shards (un verrou par shard) ; les positions,
+    alertes et réponses sont routées par identifiant de session. Le workflow
+    d'alerte de GuardianOrchestrator est réutilisé via une vue liée à la session,
+    construite à la demande sans recréer de client.
+
+    Aucun thread n'attend la réponse de l'utilisateur : chaque question arme
+    une minuterie du planificateur, et la suite du workflow est soumise au
+    pool d'alertes à la réponse (process_user_input) ou à l'échéance.
+    """
+
+    def __init__(self, config: Dict[str, Any], services: GuardianServices = None,
+                 shards: int = 16, max_alert_workers: int = 32):
+        self.config = config
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self.services = services or GuardianServices(config)
+
+        self._shards: List[Dict[str, GuardianSession]] = [{} for _ in range(shards)]
+        self._shard_locks = [threading.Lock() for _ in range(shards)]
+
+        # Étapes des workflows d'alerte (synthèse vocale, analyse, notifications) : pool borné
+        self._alert_executor = ThreadPoolExecutor(max_workers=max_alert_workers,
+                                                  thread_name_prefix="guardian-alert")
+
+        self.static_agent_config = config.get('static_agent', {})
+        self.logger.info(f"Orchestrateur multi-sessions initialisé ({shards} shards)")
+
+    def _shard_index(self, session_id: str) -> int:
+        return zlib.crc32(session_id.encode('utf-8')) % len(self._shards)
+
+    @property
+    def session_count(self) -> int:
+        """Nombre de sessions ouvertes"""
+        return sum(len(shard) for shard in self._shards)
+
+    def open_session(self, session_id: str, emergency_contacts: Optional[List[Dict]] = None) -> GuardianSession:
+        """Ouvre (ou retourne) la session d'un utilisateur"""
+        index = self._shard_index(session_id)
+        with self._shard_locks[index]:
+            session = self._shards[index].get(session_id)
+            if session is None:
+                session = GuardianSession(
+                    session_id,
+                    static_agent=StaticAgent(**self.static_agent_config),
+                    emergency_contacts=emergency_contacts
+                )
+                self._shards[index][session_id] = session
+                self.logger.debug(f"Session ouverte: {session_id}")
+            return session
+
+    def get_session(self, session_id: str) -> Optional[GuardianSession]:
+        """Retourne la session si elle existe"""
+        return self._shards[self._shard_index(session_id)].get(session_id)
+
+    def close_session(self, session_id: str) -> bool:
+        """Ferme la session et annule ses minuteries en attente"""
+        index = self._shard_index(session_id)
+        with self._shard_locks[index]:
+            session = self._shards[index].pop(session_id, None)
+        if session is None:
+            return False
+
+        with session.lock:
+            session.cancel_timers()
+        self.logger.debug(f"Session fermée: {session_id}")
+        return True
+
+    def _bind(self, session: GuardianSession) -> GuardianOrchestrator:
+        """Vue orchestrateur liée à une session (aucun client recréé)"""
+        return GuardianOrchestrator(self.config, services=self.services, session=session)
+
+    def update_position(self, session_id: str, position: Tuple[float, float],
+                        timestamp: Optional[float] = None):
+        """
+        Route une position GPS vers la session et déclenche les alertes éventuelles
+
+        timestamp: horodatage du fix GPS ; sinon l'horloge des détecteurs est utilisée
+        """
+        session = self.open_session(session_id)
+        session.current_position = position
+        session.track.append(timestamp if timestamp is not None else session.fall_detector.clock.now(), *position)
+
+        if session.static_agent and session.static_agent.update_position(position, timestamp):
+            if session.alert_pending:
+                self.logger.info(f"Immobilité de {session_id} : alerte déjà en cours, pas de nouvelle alerte")
+            else:
+                self.handle_alert(session_id, "immobilité prolongée", position)
+
+        fall_info = session.fall_detector.update_position(position, timestamp)
+        if fall_info:
+            self._alert_executor.submit(self._bind(session).handle_fall_detection, fall_info)
+
+        post_fall_info = session.fall_detector.check_post_fall_status(position, timestamp)
+        if post_fall_info:
+            self._alert_executor.submit(self._bind(session).handle_post_fall_emergency, post_fall_info)
+            # Une seule escalade par chute : le détecteur est réarmé
+            session.fall_detector.reset_fall_detection()
+
+        if session.wrong_path_agent and session.wrong_path_agent.update_position(position, timestamp):
+            self.handle_alert(session_id, "déviation d'itinéraire", position)
+
+    def handle_alert(self, session_id: str, trigger_type: str, position: Tuple[float, float] = None):
+        """Lance le workflow d'alerte de la session dans le pool d'alertes"""
+        session = self.open_session(session_id)
+        return self._alert_executor.submit(self._start_alert, session, trigger_type, position)
+
+    def _ask(self, session: GuardianSession, kind: str, timeout: float, continuation):
+        """Ouvre une question ; continuation(session, réponse) tourne dans le pool d'alertes"""
+        self._bind(session)._open_prompt(
+            kind, timeout,
+            lambda response: self._alert_executor.submit(continuation, session, response)
+        )
+
+    def _start_alert(self, session: GuardianSession, trigger_type: str, position: Tuple[float, float]):
+        """Pose la question 'Tout va bien ?' sans attendre la réponse"""
+        view = self._bind(session)
+        self._ask(session, "alert", view.response_timeout, self._on_alert_response)
+        view._announce_alert(trigger_type, position)
+
+    def _on_alert_response(self, session: GuardianSession, response: Optional[str]):
+        """Suite du workflow d'alerte (réponse 'oui'/'non' ou None à l'échéance)"""
+        view = self._bind(session)
+        view._trace_response_received()
+        response = response.lower() if response else None
+
+        if response == "oui":
+            view._handle_positive_response()
+        elif response == "non":
+            self._ask(session, "details", view.DETAILS_TIMEOUT, self._on_situation_details)
+            view._ask_for_details()
+        else:
+            view._handle_no_response()
+
+    def _on_situation_details(self, session: GuardianSession, reason: Optional[str]):
+        """Analyse de la description de l'utilisateur (None à l'échéance)"""
+        view = self._bind(session)
+        view._trace_response_received()
+        view._handle_situation_details(reason)
+
+    def handle_fall_detection(self, session_id: str, fall_info: dict):
+        """Route une détection de chute externe vers la session (pool d'alertes)"""
+        session = self.open_session(session_id)
+        return self._alert_executor.submit(self._bind(session).handle_fall_detection, fall_info)
+
+    def process_user_input(self, session_id: str, text_input: str) -> bool:
+        """
+        Route une réponse utilisateur vers sa session
+
+        Returns:
+            bool: False si la session est inconnue
+        """
+        session = self.get_session(session_id)
+        if session is None:
+            self.logger.warning(f"Réponse pour une session inconnue: {session_id}")
+            return False
+        self._bind(session).process_user_input(text_input)
+        return True
+
+    def shutdown(self):
+        """Arrête les workflows et les services partagés"""
+        self.services.shutdown()
+        self._alert_executor.shutdown(wait=False)
+        self.logger.info(f"Orchestrateur multi-sessions arrêté ({self.session_count} sessions)")
@@ -2,10 +2,13 @@
 SMS Agent for Guardian
 Handles emergency SMS notifications via Twilio
 """
+import asyncio
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from guardian.async_support import run_blocking
+
 try:
     from twilio.rest import Client
     TWILIO_AVAILABLE = True
@@ -84,6 +87,23 @@ class SMSAgent:
         
         return success_count > 0
     
+    async def send_emergency_sms_async(self, contacts: List[Dict], emergency_context: Dict) -> bool:
+        """
+        Variante asynchrone de send_emergency_sms : les contacts sont
+        notifiés en parallèle (client Twilio déporté dans le pool borné)
+        """
+        if not contacts:
+            self.logger.warning("Aucun contact pour envoi SMS")
+            return False
+        
+        sms_message = self._generate_emergency_sms_message(emergency_context)
+        
+        results = await asyncio.gather(*[
+            run_blocking(self._send_sms_to_contact, contact, sms_message)
+            for contact in contacts
+        ])
+        return any(results)
+    
     def _send_sms_to_contact(self, contact: Dict, message: str) -> bool:
         """Envoie un SMS à un contact spécifique"""
         phone = contact.get('phone')
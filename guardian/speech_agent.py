@@ -10,6 +10,8 @@ import tempfile
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+from guardian.async_support import run_blocking
+
 try:
     from google.cloud import texttospeech
     GOOGLE_TTS_AVAILABLE = True
@@ -318,6 +320,18 @@ class SpeechAgent:
         
         return self.speak(instructions_text, "urgent")
     
+    async def speak_alert_async(self, alert_type: str, message: str) -> bool:
+        """Variante asynchrone de speak_alert (lecture audio hors de la boucle)"""
+        return await run_blocking(self.speak_alert, alert_type, message)
+    
+    async def speak_fall_alert_async(self, fall_info: Dict[str, Any]) -> bool:
+        """Variante asynchrone de speak_fall_alert"""
+        return await run_blocking(self.speak_fall_alert, fall_info)
+    
+    async def speak_emergency_instructions_async(self, instructions: list) -> bool:
+        """Variante asynchrone de speak_emergency_instructions"""
+        return await run_blocking(self.speak_emergency_instructions, instructions)
+    
     def test_speech(self) -> bool:
         """Teste la synthèse vocale"""
         
@@ -0,0 +1,150 @@
+"""
+Transcription en continu pour Guardian
+Un flux par client (session WebSocket) : le navigateur envoie des trames PCM
+16 bits mono à 16 kHz, chaque trame est décodée dès réception avec un
+reconnaisseur emprunté au pool pour la durée du flux, et les transcriptions
+partielles puis finales sont renvoyées au fil de l'eau. Aucun thread n'est
+bloqué entre deux trames : seul l'état de décodage est conservé.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from guardian.vosk_models import RecognizerPool
+
+SAMPLE_BYTES = 2  # PCM 16 bits mono
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+class _Stream:
+    """État de décodage d'un client"""
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self.lock = threading.Lock()
+        self.last_partial = ""
+        self.audio_bytes = 0
+        self.closed = False
+        self.started = time.monotonic()
+
+
+class StreamingTranscriber:
+    """
+    Flux de transcription indexés par identifiant de session
+
+    start() emprunte un reconnaisseur (refus immédiat si le pool est épuisé),
+    feed() décode une trame et renvoie les évènements à émettre,
+    stop() finalise le décodage et rend le reconnaisseur au pool.
+
+    Les évènements sont des tuples (nom, données) :
+        ('partial', {'text': ...}) quand le résultat partiel change
+        ('final', {'text': ...})   à chaque fin d'énoncé
+    """
+
+    def __init__(self, pool: RecognizerPool, samplerate: int = 16000,
+                 max_frame_seconds: float = 2.0, acquire_timeout: float = 0.0):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.pool = pool
+        self.samplerate = samplerate
+        self.max_frame_bytes = int(max_frame_seconds * samplerate) * SAMPLE_BYTES
+        self.acquire_timeout = acquire_timeout
+        self._streams: Dict[str, _Stream] = {}
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.finals = 0
+
+    @property
+    def active(self) -> int:
+        return len(self._streams)
+
+    def start(self, session_id: str, samplerate: Optional[int] = None):
+        """
+        Ouvre (ou réouvre) le flux d'une session
+
+        Raises:
+            ValueError: fréquence d'échantillonnage différente de celle du pool
+            PoolExhausted: aucun reconnaisseur libre
+        """
+        if samplerate is not None and samplerate != self.samplerate:
+            raise ValueError(f"Fréquence {samplerate}Hz non supportée (attendu {self.samplerate}Hz)")
+        self.stop(session_id)
+        recognizer = self.pool.acquire(timeout=self.acquire_timeout)
+        with self._lock:
+            # Un stt_start concurrent a pu ouvrir un flux entre-temps : il est remplacé
+            previous = self._streams.pop(session_id, None)
+            self._streams[session_id] = _Stream(recognizer)
+        if previous is not None:
+            self._close(previous)
+        self.logger.info(f"🎙️ Flux de transcription ouvert ({self.active} actifs)")
+
+    def feed(self, session_id: str, data) -> List[Event]:
+        """
+        Décode une trame PCM
+
+        Raises:
+            KeyError: aucun flux ouvert pour cette session
+            ValueError: trame vide, trop longue ou d'une taille impaire
+        """
+        stream = self._streams[session_id]
+        frame = bytes(data)  # Vosk (cffi) attend des bytes
+        if not frame or len(frame) % SAMPLE_BYTES or len(frame) > self.max_frame_bytes:
+            raise ValueError(f"Trame PCM invalide ({len(frame)} octets, "
+                             f"max {self.max_frame_bytes})")
+
+        events: List[Event] = []
+        with stream.lock:
+            if stream.closed:
+                raise KeyError(session_id)
+            self.frames += 1
+            stream.audio_bytes += len(frame)
+            rec = stream.recognizer
+            if rec.AcceptWaveform(frame):
+                self._final(stream, rec.Result(), events)
+            else:
+                partial = json.loads(rec.PartialResult()).get('partial', '').strip()
+                if partial != stream.last_partial:
+                    stream.last_partial = partial
+                    if partial:
+                        events.append(('partial', {'text': partial}))
+        return events
+
+    def stop(self, session_id: str) -> List[Event]:
+        """Finalise le flux d'une session (sans effet s'il n'existe pas) et libère son reconnaisseur"""
+        with self._lock:
+            stream = self._streams.pop(session_id, None)
+        if stream is None:
+            return []
+
+        events = self._close(stream)
+        seconds = stream.audio_bytes / (SAMPLE_BYTES * self.samplerate)
+        self.logger.info(f"🎙️ Flux de transcription fermé ({seconds:.1f}s d'audio, {self.active} actifs)")
+        return events
+
+    def _close(self, stream: _Stream) -> List[Event]:
+        events: List[Event] = []
+        with stream.lock:
+            stream.closed = True
+            try:
+                self._final(stream, stream.recognizer.FinalResult(), events)
+            finally:
+                self.pool.release(stream.recognizer)
+        return events
+
+    def _final(self, stream: _Stream, result: str, events: List[Event]):
+        text = json.loads(result).get('text', '').strip()
+        stream.last_partial = ""
+        if text:
+            self.finals += 1
+            events.append(('final', {'text': text}))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'active': self.active,
+            'frames': self.frames,
+            'finals': self.finals,
+            'pool': self.pool.stats(),
+        }
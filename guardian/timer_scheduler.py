@@ -0,0 +1,193 @@
+"""
+Planificateur central de minuteries pour Guardian
+Un seul thread gère toutes les escalades, comptes à rebours et re-vérifications
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+
+class TimerHandle:
+    """
+    Poignée d'une minuterie programmée (annulation / reprogrammation)
+    """
+
+    __slots__ = ('_scheduler', '_callback', '_args', 'name', 'deadline',
+                 '_generation', '_active')
+
+    def __init__(self, scheduler: 'TimerScheduler', callback: Callable, args: tuple,
+                 deadline: float, name: str):
+        self._scheduler = scheduler
+        self._callback = callback
+        self._args = args
+        self.name = name
+        self.deadline = deadline
+        self._generation = 0
+        self._active = True
+
+    @property
+    def active(self) -> bool:
+        """True tant que la minuterie n'a été ni déclenchée ni annulée"""
+        return self._active
+
+    def remaining(self) -> float:
+        """Secondes restantes avant déclenchement (0 si inactive)"""
+        if not self._active:
+            return 0.0
+        return max(0.0, self.deadline - self._scheduler.clock())
+
+    def cancel(self) -> bool:
+        """Annule la minuterie. Retourne False si elle était déjà inactive."""
+        return self._scheduler.cancel(self)
+
+    def reschedule(self, delay_seconds: float) -> bool:
+        """Reprogramme la minuterie dans delay_seconds à partir de maintenant"""
+        return self._scheduler.reschedule(self, delay_seconds)
+
+
+class TimerScheduler:
+    """
+    Planificateur à tas binaire : un thread unique attend la prochaine échéance.
+
+    Chaque minuterie en attente occupe une poignée à slots et une entrée de tas.
+    Les entrées périmées (annulées ou reprogrammées) sont compactées dès
+    qu'elles dépassent le nombre de minuteries actives, ce qui garde une
+    mémoire constante par minuterie en attente.
+    Les callbacks sont exécutés dans un petit pool pour qu'un envoi SMTP lent
+    ne retarde pas les autres échéances.
+    """
+
+    def __init__(self, max_workers: int = 4, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._stale = 0
+        self._running = True
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="guardian-timer")
+        self._thread = threading.Thread(target=self._run, name="guardian-scheduler", daemon=True)
+        self._thread.start()
+
+        self.logger.info(f"Planificateur de minuteries démarré ({max_workers} workers)")
+
+    @property
+    def pending_count(self) -> int:
+        """Nombre de minuteries actives en attente"""
+        return self._pending
+
+    def schedule(self, delay_seconds: float, callback: Callable, *args,
+                 name: str = "timer") -> TimerHandle:
+        """
+        Programme callback(*args) dans delay_seconds
+
+        Returns:
+            TimerHandle permettant d'annuler ou de reprogrammer
+        """
+        with self._condition:
+            handle = TimerHandle(self, callback, args, self.clock() + max(0.0, delay_seconds), name)
+            self._push(handle)
+            self._pending += 1
+            self._condition.notify()
+
+        self.logger.debug(f"Minuterie '{name}' programmée dans {delay_seconds:.1f}s")
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> bool:
+        """Annule une minuterie en attente"""
+        with self._condition:
+            if not handle._active:
+                return False
+            handle._active = False
+            self._pending -= 1
+            self._mark_stale()
+
+        self.logger.debug(f"Minuterie '{handle.name}' annulée")
+        return True
+
+    def reschedule(self, handle: TimerHandle, delay_seconds: float) -> bool:
+        """Déplace l'échéance d'une minuterie encore active"""
+        with self._condition:
+            if not handle._active:
+                return False
+            handle.deadline = self.clock() + max(0.0, delay_seconds)
+            handle._generation += 1
+            self._mark_stale()
+            self._push(handle)
+            self._condition.notify()
+
+        self.logger.debug(f"Minuterie '{handle.name}' reprogrammée dans {delay_seconds:.1f}s")
+        return True
+
+    def shutdown(self, cancel_pending: bool = True):
+        """Arrête le planificateur (les minuteries en attente sont abandonnées)"""
+        with self._condition:
+            self._running = False
+            if cancel_pending:
+                for _, _, handle, _ in self._heap:
+                    handle._active = False
+                self._heap.clear()
+                self._pending = 0
+                self._stale = 0
+            self._condition.notify()
+
+        self._thread.join(timeout=1.0)
+        self._executor.shutdown(wait=False)
+        self.logger.info("Planificateur de minuteries arrêté")
+
+    def _push(self, handle: TimerHandle):
+        heapq.heappush(self._heap, (handle.deadline, next(self._sequence), handle, handle._generation))
+
+    def _mark_stale(self):
+        """Compte une entrée périmée et compacte le tas si nécessaire"""
+        self._stale += 1
+        if self._stale > max(self._pending, 64):
+            self._heap = [entry for entry in self._heap
+                          if entry[2]._active and entry[3] == entry[2]._generation]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _run(self):
+        """Boucle du thread planificateur"""
+        while True:
+            with self._condition:
+                while self._running:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+
+                    deadline, _, handle, generation = self._heap[0]
+                    if not handle._active or generation != handle._generation:
+                        heapq.heappop(self._heap)
+                        self._stale = max(0, self._stale - 1)
+                        continue
+
+                    wait_time = deadline - self.clock()
+                    if wait_time <= 0:
+                        break
+                    self._condition.wait(wait_time)
+
+                if not self._running:
+                    return
+
+                heapq.heappop(self._heap)
+                handle._active = False
+                self._pending -= 1
+
+            self.logger.debug(f"Minuterie '{handle.name}' déclenchée")
+            self._executor.submit(self._fire, handle)
+
+    def _fire(self, handle: TimerHandle):
+        try:
+            handle._callback(*handle._args)
+        except Exception as e:
+            self.logger.error(f"Erreur dans la minuterie '{handle.name}': {e}")
@@ -0,0 +1,264 @@
+"""
+Compression de trajectoires GPS pour Guardian
+Simplification à erreur bornée (en mètres) : Douglas-Peucker hors ligne et
+fenêtre glissante en ligne, plus un format binaire compact (deltas entiers
+encodés en varint) pour stocker ou transmettre l'historique d'un incident,
+et un export GPX lisible par les applications de cartographie des proches
+"""
+
+import math
+import struct
+from collections import deque
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from guardian.geodesy import EARTH_RADIUS_M, track_length
+from guardian.gps_sources import GPSFix
+
+METERS_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180.0
+
+TRACK_MAGIC = b'GTK1'
+COORDINATE_SCALE = 1e6   # 1e-6 degré ≈ 0,11 m
+TIME_SCALE = 1000        # millisecondes
+
+
+def _segment_distances(lat, lon, start, end) -> np.ndarray:
+    """Distances (mètres) des points au segment start-end, plan local autour de start"""
+    lon_scale = METERS_PER_DEGREE * math.cos(math.radians(start[0]))
+    x = (np.asarray(lon) - start[1]) * lon_scale
+    y = (np.asarray(lat) - start[0]) * METERS_PER_DEGREE
+    dx = (end[1] - start[1]) * lon_scale
+    dy = (end[0] - start[0]) * METERS_PER_DEGREE
+    len2 = dx * dx + dy * dy
+    if len2 == 0:
+        return np.hypot(x, y)
+    t = np.clip((x * dx + y * dy) / len2, 0.0, 1.0)
+    return np.hypot(x - t * dx, y - t * dy)
+
+
+def douglas_peucker(points: Sequence[Tuple[float, float]], tolerance_m: float) -> np.ndarray:
+    """
+    Simplification de Douglas-Peucker (hors ligne)
+
+    Args:
+        points: Points (lat, lon)
+        tolerance_m: Écart maximal toléré entre la trace et sa simplification
+
+    Returns:
+        Indices des points conservés (premier et dernier inclus), triés
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    n = len(points)
+    if n <= 2:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        inner = points[first + 1:last]
+        distances = _segment_distances(inner[:, 0], inner[:, 1], points[first], points[last])
+        worst = int(np.argmax(distances))
+        if distances[worst] > tolerance_m:
+            split = first + 1 + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+class OnlineSimplifier:
+    """
+    Simplification en ligne à erreur bornée (fenêtre glissante)
+
+    Chaque point reçu prolonge le segment depuis le dernier point conservé ;
+    dès qu'un point intermédiaire s'en écarte de plus de tolerance_m, le
+    point précédent est conservé et devient le nouveau départ. La fenêtre est
+    plafonnée à max_window points : coût par point borné.
+    """
+
+    def __init__(self, tolerance_m: float = 5.0, max_window: int = 128):
+        self.tolerance_m = tolerance_m
+        self.max_window = max_window
+        self.anchor: Optional[GPSFix] = None
+        self._window: List[GPSFix] = []
+
+    def push(self, fix: GPSFix) -> List[GPSFix]:
+        """Ajoute un fix ; retourne les points définitivement conservés (0 ou 1)"""
+        if self.anchor is None:
+            self.anchor = fix
+            return [fix]
+
+        emitted = []
+        if self._window and (len(self._window) >= self.max_window or not self._fits(fix)):
+            self.anchor = self._window[-1]
+            self._window = []
+            emitted.append(self.anchor)
+        self._window.append(fix)
+        return emitted
+
+    def _fits(self, fix: GPSFix) -> bool:
+        """Les points de la fenêtre restent à moins de tolerance_m du segment ancre-fix"""
+        lat = [p.latitude for p in self._window]
+        lon = [p.longitude for p in self._window]
+        distances = _segment_distances(lat, lon, self.anchor.position, fix.position)
+        return bool(distances.max() <= self.tolerance_m)
+
+    @property
+    def tail(self) -> Optional[GPSFix]:
+        """Dernier point reçu, pas encore conservé"""
+        return self._window[-1] if self._window else None
+
+    def flush(self) -> List[GPSFix]:
+        """Termine la trace : conserve le dernier point reçu"""
+        tail = self.tail
+        if tail is None:
+            return []
+        self.anchor = tail
+        self._window = []
+        return [tail]
+
+
+def simplify_online(fixes: Iterable[GPSFix], tolerance_m: float = 5.0) -> List[GPSFix]:
+    """Simplifie une trace complète avec OnlineSimplifier"""
+    simplifier = OnlineSimplifier(tolerance_m)
+    kept = []
+    for fix in fixes:
+        kept.extend(simplifier.push(GPSFix(*fix)))
+    kept.extend(simplifier.flush())
+    return kept
+
+
+# --- Format binaire ------------------------------------------------------------
+
+def _write_varint(out: bytearray, value: int):
+    """Entier signé en zigzag + varint (7 bits par octet)"""
+    value = (value << 1) ^ (value >> 63)
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    result, shift = 0, 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Trace binaire tronquée")
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+    return (result >> 1) ^ -(result & 1), offset
+
+
+def encode_track(fixes: Sequence[GPSFix]) -> bytes:
+    """
+    Encode une trace en binaire compact
+
+    En-tête 'GTK1' + nombre de points (uint32), puis pour chaque point les
+    deltas (temps en ms, lat et lon en 1e-6 degré) en varint zigzag.
+    """
+    out = bytearray(TRACK_MAGIC)
+    out += struct.pack('<I', len(fixes))
+    previous = (0, 0, 0)
+    for timestamp, lat, lon in fixes:
+        current = (int(round(timestamp * TIME_SCALE)),
+                   int(round(lat * COORDINATE_SCALE)),
+                   int(round(lon * COORDINATE_SCALE)))
+        for value, last in zip(current, previous):
+            _write_varint(out, value - last)
+        previous = current
+    return bytes(out)
+
+
+def decode_track(data: bytes) -> List[GPSFix]:
+    """
+    Décode une trace produite par encode_track
+
+    Raises:
+        ValueError: si les données ne sont pas une trace valide
+    """
+    if len(data) < 8 or data[:4] != TRACK_MAGIC:
+        raise ValueError("Format de trace inconnu")
+    count = struct.unpack_from('<I', data, 4)[0]
+    offset = 8
+    fixes = []
+    t = lat = lon = 0
+    for _ in range(count):
+        dt, offset = _read_varint(data, offset)
+        dlat, offset = _read_varint(data, offset)
+        dlon, offset = _read_varint(data, offset)
+        t, lat, lon = t + dt, lat + dlat, lon + dlon
+        fixes.append(GPSFix(t / TIME_SCALE, lat / COORDINATE_SCALE, lon / COORDINATE_SCALE))
+    return fixes
+
+
+def to_gpx(fixes: Sequence[GPSFix], name: str = "Trajet Guardian") -> str:
+    """Trace au format GPX 1.1 (horodatages UTC), pour une pièce jointe d'alerte"""
+    points = []
+    for timestamp, lat, lon in fixes:
+        when = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        points.append(f'<trkpt lat="{lat:.6f}" lon="{lon:.6f}"><time>{when}</time></trkpt>')
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<gpx version="1.1" creator="Guardian" xmlns="http://www.topografix.com/GPX/1/1">\n'
+            f'<trk><name>{escape(name)}</name><trkseg>\n'
+            + "\n".join(points) +
+            '\n</trkseg></trk>\n</gpx>\n')
+
+
+class TrackRecorder:
+    """
+    Historique compressé des positions d'un utilisateur
+
+    Conserve retention_seconds de trace simplifiée en ligne ; export()
+    fournit la trace d'un incident au format binaire.
+    """
+
+    def __init__(self, tolerance_m: float = 5.0, retention_seconds: float = 1800):
+        self.retention_seconds = retention_seconds
+        self._simplifier = OnlineSimplifier(tolerance_m)
+        self._kept: deque = deque()
+        self.received = 0
+
+    def append(self, timestamp: float, lat: float, lon: float):
+        self.received += 1
+        self._kept.extend(self._simplifier.push(GPSFix(timestamp, lat, lon)))
+        horizon = timestamp - self.retention_seconds
+        while len(self._kept) > 1 and self._kept[1].timestamp <= horizon:
+            self._kept.popleft()
+
+    def points(self, since: Optional[float] = None) -> List[GPSFix]:
+        """Trace simplifiée (dernière position incluse), depuis since si fourni"""
+        points = list(self._kept)
+        tail = self._simplifier.tail
+        if tail is not None:
+            points.append(tail)
+        if since is not None:
+            points = [p for p in points if p.timestamp >= since]
+        return points
+
+    def export(self, since: Optional[float] = None) -> bytes:
+        """Trace simplifiée au format binaire (encode_track)"""
+        return encode_track(self.points(since))
+
+    def gpx(self, since: Optional[float] = None) -> str:
+        """Trace simplifiée au format GPX (to_gpx)"""
+        return to_gpx(self.points(since))
+
+    def summary(self, since: Optional[float] = None) -> str:
+        """Résumé lisible pour les messages d'alerte"""
+        points = self.points(since)
+        if len(points) < 2:
+            return "Trajet récent indisponible"
+        duration = (points[-1].timestamp - points[0].timestamp) / 60
+        distance = track_length([p.position for p in points])
+        return f"Trajet des {duration:.0f} dernières minutes : {distance:.0f} m ({len(points)} points)"
@@ -0,0 +1,199 @@
+"""
+Détection d'activité vocale (VAD) pour Guardian
+Porte énergie / taux de passage par zéro calculée avec NumPy sur des trames
+int16 de 20 ms, avec pré-roll et maintien (hangover) : seuls les segments de
+parole sont transmis à Vosk, le silence de l'écoute permanente n'est plus
+décodé.
+"""
+
+import json
+import time
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+SAMPLE_BYTES = 2  # PCM 16 bits mono
+
+
+class VoiceActivityGate:
+    """
+    Porte de parole trame par trame
+
+    Une trame est de la parole si son énergie dépasse le bruit de fond
+    estimé de margin_db (et au moins min_energy_db), sauf si elle ressemble
+    à un souffle (taux de passage par zéro élevé) sans être nettement plus
+    forte. Le bruit de fond descend immédiatement et remonte lentement.
+    """
+
+    def __init__(self, samplerate: int = 16000, frame_ms: int = 20,
+                 min_energy_db: float = -50.0, margin_db: float = 9.0, max_zcr: float = 0.35,
+                 hangover_ms: int = 300, preroll_ms: int = 200):
+        self.samplerate = samplerate
+        self.frame_samples = samplerate * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * SAMPLE_BYTES
+        self.min_energy_db = min_energy_db
+        self.margin_db = margin_db
+        self.max_zcr = max_zcr
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.preroll_frames = preroll_ms // frame_ms
+
+        self.noise_floor_db = min_energy_db - margin_db
+        self.frames_speech = 0
+        self.frames_silence = 0
+        self.cpu_seconds = 0.0
+        self.reset()
+
+    def reset(self):
+        """Oublie le segment en cours (le bruit de fond estimé est conservé)"""
+        self.active = False
+        self._hang = 0
+        self._remainder = b""
+        self._preroll: deque = deque(maxlen=self.preroll_frames)
+
+    def classify(self, samples: np.ndarray) -> np.ndarray:
+        """Booléen parole/silence pour chaque trame d'un tableau (n_trames, frame_samples)"""
+        x = samples.astype(np.float32) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(x * x, axis=1) + 1e-10)
+        signs = np.signbit(samples)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        threshold = max(self.min_energy_db, self.noise_floor_db + self.margin_db)
+        speech = (energy_db > threshold) & ((zcr < self.max_zcr) | (energy_db > threshold + 10.0))
+
+        # Bruit de fond : 10e percentile des trames du bloc
+        quiet = float(np.percentile(energy_db, 10))
+        if quiet < self.noise_floor_db:
+            self.noise_floor_db = quiet
+        else:
+            self.noise_floor_db += 0.2 * (quiet - self.noise_floor_db)
+        return speech
+
+    def process(self, data) -> List[Tuple[bytes, bool]]:
+        """
+        Filtre un bloc audio PCM 16 bits
+
+        Returns:
+            Liste de (audio de parole à décoder, fin de segment) : le pré-roll
+            précède chaque début de parole, le maintien prolonge chaque fin
+        """
+        started = time.process_time()
+        buffer = self._remainder + bytes(data)
+        n_frames = len(buffer) // self.frame_bytes
+        self._remainder = buffer[n_frames * self.frame_bytes:]
+        if n_frames == 0:
+            self.cpu_seconds += time.process_time() - started
+            return []
+
+        samples = np.frombuffer(buffer, dtype='<i2', count=n_frames * self.frame_samples)
+        flags = self.classify(samples.reshape(n_frames, self.frame_samples))
+
+        out: List[Tuple[bytes, bool]] = []
+        current = bytearray()
+        for i, speech in enumerate(flags.tolist()):
+            frame = buffer[i * self.frame_bytes:(i + 1) * self.frame_bytes]
+            if speech:
+                self.frames_speech += 1
+                if not self.active:
+                    self.active = True
+                    current.extend(b"".join(self._preroll))
+                    self._preroll.clear()
+                current.extend(frame)
+                self._hang = self.hangover_frames
+                continue
+
+            self.frames_silence += 1
+            if self.active:
+                current.extend(frame)
+                self._hang -= 1
+                if self._hang <= 0:
+                    self.active = False
+                    out.append((bytes(current), True))
+                    current = bytearray()
+            else:
+                self._preroll.append(frame)
+
+        if current:
+            out.append((bytes(current), False))
+        self.cpu_seconds += time.process_time() - started
+        return out
+
+    @property
+    def speech_ratio(self) -> float:
+        total = self.frames_speech + self.frames_silence
+        return self.frames_speech / total if total else 0.0
+
+
+class GatedRecognizer:
+    """
+    KaldiRecognizer précédé d'une VoiceActivityGate (même interface)
+
+    Seule la parole est décodée ; à chaque fin de segment le décodage est
+    finalisé (FinalResult), puisque le silence qui déclencherait la fin
+    d'énoncé n'est plus transmis.
+    """
+
+    def __init__(self, recognizer, gate: VoiceActivityGate = None):
+        self.recognizer = recognizer
+        self.gate = gate or VoiceActivityGate()
+        self._results: deque = deque()
+        self.received_seconds = 0.0
+        self.decoded_seconds = 0.0
+        self.decoder_cpu_seconds = 0.0
+
+    def AcceptWaveform(self, data) -> bool:
+        self.received_seconds += len(data) / (SAMPLE_BYTES * self.gate.samplerate)
+        for audio, ended in self.gate.process(data):
+            started = time.process_time()
+            self.decoded_seconds += len(audio) / (SAMPLE_BYTES * self.gate.samplerate)
+            if audio and self.recognizer.AcceptWaveform(audio):
+                self._results.append(self.recognizer.Result())
+            if ended:
+                final = self.recognizer.FinalResult()
+                if json.loads(final).get("text"):
+                    self._results.append(final)
+            self.decoder_cpu_seconds += time.process_time() - started
+        return bool(self._results)
+
+    def Result(self) -> str:
+        if self._results:
+            return self._results.popleft()
+        return self.recognizer.Result()
+
+    def PartialResult(self) -> str:
+        return self.recognizer.PartialResult()
+
+    def FinalResult(self) -> str:
+        self.gate.reset()
+        if self._results:
+            self.recognizer.Reset()
+            return self._results.popleft()
+        return self.recognizer.FinalResult()
+
+    def Reset(self):
+        self._results.clear()
+        self.gate.reset()
+        self.recognizer.Reset()
+
+    def __getattr__(self, name):
+        # SetWords, SetGrammar... transmis au reconnaisseur Vosk
+        return getattr(self.recognizer, name)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Part de parole et temps CPU économisé
+
+        L'économie est estimée au coût CPU mesuré du décodage par seconde
+        d'audio, appliqué à l'audio écarté, moins le coût de la porte.
+        """
+        skipped = max(0.0, self.received_seconds - self.decoded_seconds)
+        cost_per_second = self.decoder_cpu_seconds / self.decoded_seconds if self.decoded_seconds else 0.0
+        return {
+            'speech_ratio': self.gate.speech_ratio,
+            'received_seconds': self.received_seconds,
+            'decoded_seconds': self.decoded_seconds,
+            'skipped_seconds': skipped,
+            'gate_cpu_seconds': self.gate.cpu_seconds,
+            'decoder_cpu_seconds': self.decoder_cpu_seconds,
+            'saved_cpu_seconds': skipped * cost_per_second - self.gate.cpu_seconds,
+        }
@@ -1,12 +1,18 @@
 import vosk
-import sounddevice as sd
-import queue
 import json
 import logging
-from typing import List, Optional
+import os
+from typing import Callable, List, Optional
+
+from guardian.audio_capture import get_capture
+from guardian.keyword_spotting import KeywordSpotter
+from guardian.vad import GatedRecognizer, VoiceActivityGate
+from guardian.vosk_models import get_model
 
 class VoiceAgent:
-    def __init__(self, keywords: List[str] = None, model_path: str = None, samplerate: int = 16000):
+    def __init__(self, keywords: List[str] = None, model_path: str = None, samplerate: int = 16000,
+                 keyword_spotting: bool = False, on_keyword: Optional[Callable[[str, str], None]] = None,
+                 vad: bool = False):
         """
         Initialise l'agent vocal
         
@@ -14,6 +20,10 @@ class VoiceAgent:
             keywords: Liste des mots clés à détecter
             model_path: Chemin vers le modèle Vosk
             samplerate: Fréquence d'échantillonnage audio
+            keyword_spotting: Décodage restreint à la grammaire des mots clés
+                (détection sur résultats partiels, CPU réduit)
+            on_keyword: Appelé avec (mot clé, texte) à chaque détection
+            vad: Ne décoder que les segments de parole (détection d'activité vocale)
         """
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
@@ -25,20 +35,40 @@ class VoiceAgent:
         if model_path is None:
             raise ValueError("Veuillez fournir le chemin vers le modèle Vosk.")
             
-        try:
-            self.logger.info(f"Chargement du modèle Vosk depuis: {model_path}")
-            self.model = vosk.Model(model_path)
-            self.logger.info("Modèle Vosk chargé avec succès")
-        except Exception as e:
-            self.logger.error(f"Erreur lors du chargement du modèle: {e}")
+        if not os.path.exists(model_path):
             raise ValueError(f"Modèle Vosk non trouvé à {model_path}. Télécharge-le sur alphacephei.com/vosk/models")
+        # Chargé à la première écoute, partagé avec les autres agents du processus
+        self.model_path = model_path
             
         self.samplerate = samplerate
-        self.q = queue.Queue()
-        self.logger.info(f"Agent vocal initialisé - Fréquence: {samplerate}Hz")
+        self.keyword_spotting = keyword_spotting
+        self.on_keyword = on_keyword
+        self.vad = vad
+        self._spotter = None
+        self._recognizer = None
+        # Lecteur persistant sur la capture micro partagée : pas d'audio perdu entre deux écoutes
+        self._reader = None
+        mode = "détection de mots clés" if keyword_spotting else "vocabulaire complet"
+        self.logger.info(f"Agent vocal initialisé - Fréquence: {samplerate}Hz, {mode}")
 
-    def callback(self, indata, frames, time, status):
-        self.q.put(bytes(indata))
+    @property
+    def model(self):
+        """Modèle Vosk partagé (voir guardian.vosk_models)"""
+        return get_model(self.model_path)
+
+    @property
+    def vad_stats(self) -> Optional[dict]:
+        """Part de parole et CPU économisé par la détection d'activité vocale (None sans VAD)"""
+        recognizer = self._spotter.recognizer if self._spotter else self._recognizer
+        return recognizer.stats() if isinstance(recognizer, GatedRecognizer) else None
+
+    def _read_audio(self, max_bytes: int):
+        """Prochain bloc audio du micro (memoryview), None après 5 s de silence du flux"""
+        if self._reader is None:
+            self._reader = get_capture(self.samplerate).reader()
+        if self._reader.ring.closed:
+            raise RuntimeError("Capture micro arrêtée")
+        return self._reader.read(max_bytes, timeout=5.0)
 
     def listen_for_keywords(self) -> Optional[bool]:
         """
@@ -47,35 +77,56 @@ class VoiceAgent:
         Returns:
             bool: True si mot clé détecté, False sinon, None en cas d'erreur
         """
+        if self.keyword_spotting:
+            return self._spot_keywords()
         try:
             self.logger.debug("En attente d'un mot clé vocal...")
+            if self._recognizer is None:
+                self._recognizer = vosk.KaldiRecognizer(self.model, self.samplerate)
+                if self.vad:
+                    self._recognizer = GatedRecognizer(self._recognizer, VoiceActivityGate(self.samplerate))
+            rec = self._recognizer
             
-            with sd.RawInputStream(samplerate=self.samplerate, blocksize=8000, dtype='int16',
-                                   channels=1, callback=self.callback):
-                rec = vosk.KaldiRecognizer(self.model, self.samplerate)
-                
-                while True:
-                    try:
-                        data = self.q.get(timeout=5.0)  # Timeout pour éviter le blocage
+            while True:
+                data = self._read_audio(self.samplerate)  # au plus 0,5 s d'audio
+                if data is None:
+                    # Timeout atteint, continuer l'écoute
+                    continue
+                    
+                if rec.AcceptWaveform(bytes(data)):  # Vosk (cffi) attend des bytes
+                    result = rec.Result()
+                    text = json.loads(result).get("text", "").lower()
+                    
+                    if text.strip():  # Ignorer les résultats vides
+                        self.logger.info(f"Texte reconnu: '{text}'")
                         
-                        if rec.AcceptWaveform(data):
-                            result = rec.Result()
-                            text = json.loads(result).get("text", "").lower()
-                            
-                            if text.strip():  # Ignorer les résultats vides
-                                self.logger.info(f"Texte reconnu: '{text}'")
-                                
-                                for key in self.keywords:
-                                    if key in text:
-                                        self.logger.info(f"Mot clé détecté: '{key}' dans '{text}'")
-                                        return True
-                                        
-                                return False
+                        for key in self.keywords:
+                            if key in text:
+                                self.logger.info(f"Mot clé détecté: '{key}' dans '{text}'")
+                                return True
                                 
-                    except queue.Empty:
-                        # Timeout atteint, continuer l'écoute
-                        continue
+                        return False
+                        
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'écoute vocale: {e}")
+            return None
+
+    def _spot_keywords(self) -> Optional[bool]:
+        """Écoute en grammaire restreinte ; True dès qu'un mot clé apparaît dans un résultat partiel"""
+        try:
+            if self._spotter is None:
+                # Grammaire compilée une fois, reconnaisseur réutilisé entre les écoutes
+                gate = VoiceActivityGate(self.samplerate) if self.vad else None
+                self._spotter = KeywordSpotter(self.model, self.keywords, self.samplerate,
+                                               on_keyword=self.on_keyword, gate=gate)
+            self.logger.debug("En attente d'un mot clé vocal (grammaire restreinte)...")
+            
+            while True:
+                # Blocs de 250 ms au plus : les résultats partiels arrivent plus tôt
+                data = self._read_audio(self.samplerate // 2)
+                if data is not None and self._spotter.accept(data):
+                    return True
                         
         except Exception as e:
             self.logger.error(f"Erreur lors de l'écoute vocale: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -8,10 +8,8 @@ Permet de parler avec Guardian et recevoir des réponses intelligentes de Gemini
 import logging
 import threading
 import time
-import queue
 import json
 from typing import Dict, Any, Optional, Callable
-import sounddevice as sd
 
 try:
     import vosk
@@ -29,6 +27,9 @@ except ImportError:
 try:
     from .speech_agent import SpeechAgent
     from .gemini_agent import GeminiAgent
+    from .vosk_models import get_model
+    from .audio_capture import get_capture
+    from .vad import GatedRecognizer, VoiceActivityGate
     GUARDIAN_MODULES_AVAILABLE = True
 except ImportError:
     try:
@@ -40,6 +41,9 @@ except ImportError:
         
         from speech_agent import SpeechAgent
         from gemini_agent import GeminiAgent
+        from vosk_models import get_model
+        from audio_capture import get_capture
+        from vad import GatedRecognizer, VoiceActivityGate
         GUARDIAN_MODULES_AVAILABLE = True
     except ImportError:
         GUARDIAN_MODULES_AVAILABLE = False
@@ -66,11 +70,14 @@ class VoiceConversationAgent:
         self.is_listening = False
         self.is_speaking = False
         self.conversation_active = False
-        self.audio_queue = queue.Queue()
+        self._reader = None
         
         # Configuration audio
         self.samplerate = 16000
         self.blocksize = 8000
+        self.max_segment_seconds = 15.0  # segment Google STT envoyé au plus tard après 15 s
+        self._last_partial = ""
+        self._segment = bytearray()
         
         # Initialiser les agents
         self._setup_speech_agents()
@@ -78,6 +85,7 @@ class VoiceConversationAgent:
         
         # Callbacks personnalisables
         self.on_speech_recognized: Optional[Callable[[str], None]] = None
+        self.on_partial_result: Optional[Callable[[str], None]] = None
         self.on_ai_response: Optional[Callable[[str], None]] = None
         
     def _setup_speech_agents(self):
@@ -124,6 +132,8 @@ class VoiceConversationAgent:
                 return False
                 
             self.stt_client = speech.SpeechClient()
+            # Découpage en segments de parole : un appel par énoncé
+            self._segmenter = VoiceActivityGate(self.samplerate)
             self.stt_config = speech.RecognitionConfig(
                 encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
                 sample_rate_hertz=self.samplerate,
@@ -149,8 +159,9 @@ class VoiceConversationAgent:
             if not os.path.exists(self.vosk_model_path):
                 return False
                 
-            self.vosk_model = vosk.Model(self.vosk_model_path)
-            self.vosk_recognizer = vosk.KaldiRecognizer(self.vosk_model, self.samplerate)
+            self.vosk_model = get_model(self.vosk_model_path)
+            # Seuls les segments de parole sont décodés
+            self.vosk_recognizer = GatedRecognizer(vosk.KaldiRecognizer(self.vosk_model, self.samplerate))
             
             self.logger.info("✅ Vosk (offline) configuré")
             return True
@@ -242,50 +253,48 @@ class VoiceConversationAgent:
         self.logger.info("👂 Début de l'écoute continue...")
         
         try:
-            with sd.RawInputStream(
-                samplerate=self.samplerate, 
-                blocksize=self.blocksize, 
-                dtype='int16',
-                channels=1, 
-                callback=self._audio_callback
-            ):
-                while self.conversation_active:
-                    if self.is_listening and not self.is_speaking:
-                        recognized_text = self._process_audio_queue()
+            # Capture micro partagée du processus, lue via un curseur propre à l'agent
+            self._reader = get_capture(self.samplerate).reader()
+            while self.conversation_active:
+                if self.is_listening and not self.is_speaking:
+                    recognized_text = self._process_audio_queue()
+                    
+                    if recognized_text:
+                        self._handle_recognized_speech(recognized_text)
+                else:
+                    # Ne pas transcrire la voix de Guardian ni l'audio hors écoute
+                    self._reader.skip()
                         
-                        if recognized_text:
-                            self._handle_recognized_speech(recognized_text)
-                            
-                    time.sleep(0.1)  # Éviter une boucle trop intensive
+                time.sleep(0.1)  # Éviter une boucle trop intensive
                     
         except Exception as e:
             self.logger.error(f"❌ Erreur dans l'écoute continue: {e}")
             
-    def _audio_callback(self, indata, frames, time, status):
-        """Callback pour capturer l'audio"""
-        if self.is_listening and not self.is_speaking:
-            self.audio_queue.put(bytes(indata))
-            
     def _process_audio_queue(self) -> Optional[str]:
-        """Traite la file audio pour reconnaissance vocale"""
+        """
+        Décode le flux micro au fil de l'eau
+        
+        Chaque bloc n'est transmis qu'une fois au moteur de reconnaissance :
+        coût constant par seconde d'audio.
+        
+        Returns:
+            Texte final du premier énoncé reconnu, None après ~5 s sans audio
+        """
         try:
-            # Collecter suffisamment de données audio
-            audio_data = b""
             timeout_counter = 0
             
             while timeout_counter < 50:  # ~5 secondes de timeout
-                try:
-                    chunk = self.audio_queue.get(timeout=0.1)
-                    audio_data += chunk
-                    
-                    # Si on a assez de données, essayer la reconnaissance
-                    if len(audio_data) >= self.blocksize * 5:  # ~0.5 secondes d'audio
-                        text = self._recognize_speech(audio_data)
-                        if text and text.strip():
-                            return text.strip()
-                            
-                except queue.Empty:
+                chunk = self._reader.read(self.blocksize * 2, timeout=0.1)  # au plus 0,5 s d'audio
+                if chunk is None:
                     timeout_counter += 1
+                    continue
+                if not self.is_listening or self.is_speaking:
+                    self._reset_recognition()
+                    return None
+                
+                text = self._recognize_speech(chunk)
+                if text and text.strip():
+                    return text.strip()
                     
             return None
             
@@ -298,14 +307,14 @@ class VoiceConversationAgent:
         Reconnaissance vocale selon le moteur disponible
         
         Args:
-            audio_data: Données audio à traiter
+            audio_data: Nouveau bloc audio (jamais retransmis)
             
         Returns:
-            Texte reconnu ou None
+            Texte d'un énoncé terminé ou None
         """
         try:
             if self.recognition_type == "google_stt":
-                return self._recognize_with_google_stt(audio_data)
+                return self._recognize_google_segments(audio_data)
             elif self.recognition_type == "vosk":
                 return self._recognize_with_vosk(audio_data)
             else:
@@ -330,19 +339,47 @@ class VoiceConversationAgent:
             
         return None
         
+    def _recognize_google_segments(self, audio_data: bytes) -> Optional[str]:
+        """Accumule la parole du segment en cours ; un seul appel Google STT par segment"""
+        max_bytes = int(self.max_segment_seconds * self.samplerate) * 2
+        for speech_audio, ended in self._segmenter.process(audio_data):
+            self._segment += speech_audio
+            if ended or len(self._segment) >= max_bytes:
+                segment, self._segment = bytes(self._segment), bytearray()
+                text = self._recognize_with_google_stt(segment)
+                if text and text.strip():
+                    return text
+        return None
+        
     def _recognize_with_vosk(self, audio_data: bytes) -> Optional[str]:
-        """Reconnaissance avec Vosk"""
+        """Reconnaissance Vosk en flux (reconnaisseur persistant, résultats partiels puis final)"""
         try:
-            if self.vosk_recognizer.AcceptWaveform(audio_data):
+            if self.vosk_recognizer.AcceptWaveform(bytes(audio_data)):
+                self._last_partial = ""
                 result = self.vosk_recognizer.Result()
                 result_dict = json.loads(result)
                 return result_dict.get("text", "")
                 
+            if self.on_partial_result:
+                partial = json.loads(self.vosk_recognizer.PartialResult()).get("partial", "")
+                if partial and partial != self._last_partial:
+                    self._last_partial = partial
+                    self.on_partial_result(partial)
+                
         except Exception as e:
             self.logger.error(f"Erreur Vosk: {e}")
             
         return None
         
+    def _reset_recognition(self):
+        """Abandonne l'énoncé en cours (Guardian parle ou l'écoute est suspendue)"""
+        self._last_partial = ""
+        self._segment = bytearray()
+        if self.recognition_type == "vosk":
+            self.vosk_recognizer.Reset()
+        elif self.recognition_type == "google_stt":
+            self._segmenter.reset()
+        
     def _simulate_recognition(self) -> Optional[str]:
         """Simulation de reconnaissance vocale pour les tests"""
         # En mode simulation, on peut demander à l'utilisateur de taper
@@ -0,0 +1,282 @@
+"""
+Registre des modèles Vosk de Guardian
+Chaque modèle (clé : chemin absolu) est chargé au plus une fois par processus,
+à la première utilisation, puis partagé par tous les agents et reconnaisseurs ;
+temps de chargement et mémoire consommée sont relevés. Préchargement possible
+en arrière-plan au démarrage. Pool borné de KaldiRecognizer pour servir
+plusieurs requêtes en parallèle sur un même modèle.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from guardian.latency import LatencyHistogram
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def _rss_mb() -> Optional[float]:
+    """Mémoire résidente du processus (Mo), None si indisponible"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Modèles Vosk partagés, chargés paresseusement
+
+    Les appels concurrents à get() pour un même chemin attendent le même
+    chargement. Un échec n'est pas mémorisé : l'appel suivant réessaie.
+    """
+
+    def __init__(self, loader: Optional[Callable[[str], Any]] = None):
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._models: Dict[str, Future] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._requests: Dict[str, int] = {}
+
+    @staticmethod
+    def _key(model_path: str) -> str:
+        return os.path.realpath(os.path.expanduser(model_path))
+
+    def _load(self, model_path: str):
+        if self._loader is not None:
+            return self._loader(model_path)
+        if not VOSK_AVAILABLE:
+            raise RuntimeError("Vosk non disponible (pip install vosk)")
+        return vosk.Model(model_path)
+
+    def get(self, model_path: str):
+        """
+        Retourne le modèle chargé depuis model_path (chargement au premier appel)
+
+        Raises:
+            FileNotFoundError: si le répertoire du modèle n'existe pas
+            Exception: erreur de chargement remontée par Vosk
+        """
+        key = self._key(model_path)
+        with self._lock:
+            future = self._models.get(key)
+            owner = future is None
+            if owner:
+                future = self._models[key] = Future()
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+        if owner:
+            self._load_into(key, future)
+        return future.result()
+
+    def _load_into(self, key: str, future: Future):
+        if not os.path.exists(key):
+            with self._lock:
+                del self._models[key]
+            future.set_exception(FileNotFoundError(f"Modèle Vosk non trouvé: {key}"))
+            return
+
+        self.logger.info(f"🔧 Chargement du modèle Vosk: {key}")
+        rss_before = _rss_mb()
+        started = time.perf_counter()
+        try:
+            model = self._load(key)
+        except Exception as e:
+            self.logger.error(f"❌ Échec du chargement du modèle Vosk {key}: {e}")
+            with self._lock:
+                del self._models[key]
+            future.set_exception(e)
+            return
+
+        load_seconds = time.perf_counter() - started
+        rss_after = _rss_mb()
+        memory_mb = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        with self._lock:
+            self._stats[key] = {'load_seconds': load_seconds, 'memory_mb': memory_mb}
+        memory = f", ~{memory_mb:.0f} Mo" if memory_mb is not None else ""
+        self.logger.info(f"✅ Modèle Vosk chargé en {load_seconds:.1f}s{memory}")
+        future.set_result(model)
+
+    def is_loaded(self, model_path: str) -> bool:
+        future = self._models.get(self._key(model_path))
+        return future is not None and future.done() and future.exception() is None
+
+    def preload(self, model_paths: Iterable[str]) -> threading.Thread:
+        """Charge les modèles en arrière-plan ; les get() concurrents attendent ce chargement"""
+        paths = list(model_paths)
+
+        def run():
+            for path in paths:
+                try:
+                    self.get(path)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Préchargement du modèle Vosk impossible ({path}): {e}")
+
+        thread = threading.Thread(target=run, name="guardian-vosk-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Par modèle chargé : load_seconds, memory_mb (approx., None si inconnu), requests"""
+        with self._lock:
+            return {key: dict(stats, requests=self._requests[key]) for key, stats in self._stats.items()}
+
+    def format_report(self) -> str:
+        """Rapport lisible des modèles chargés"""
+        stats = self.stats()
+        if not stats:
+            return "🎙️ Aucun modèle Vosk chargé"
+        lines = ["🎙️ Modèles Vosk chargés"]
+        for key, s in stats.items():
+            memory = f"{s['memory_mb']:.0f} Mo" if s['memory_mb'] is not None else "mémoire inconnue"
+            lines.append(f"   {os.path.basename(key)}: {s['load_seconds']:.1f}s, {memory}, "
+                         f"{s['requests']} utilisation(s)")
+        return "\n".join(lines)
+
+
+# Registre partagé par tout le processus
+MODEL_REGISTRY = ModelRegistry()
+
+
+def get_model(model_path: str):
+    """Modèle Vosk partagé du processus (voir ModelRegistry.get)"""
+    return MODEL_REGISTRY.get(model_path)
+
+
+def preload_models(model_paths: Iterable[str]) -> threading.Thread:
+    """Préchargement en arrière-plan dans le registre du processus"""
+    return MODEL_REGISTRY.preload(model_paths)
+
+
+class PoolExhausted(RuntimeError):
+    """Aucun reconnaisseur libéré à temps, ou file d'attente pleine"""
+
+
+class RecognizerPool:
+    """
+    Pool borné de KaldiRecognizer sur un modèle partagé
+
+    Chaque requête emprunte son propre reconnaisseur (checkout) : les états de
+    décodage ne se mélangent plus. Le reconnaisseur est réinitialisé au retour.
+    Quand le pool est épuisé, les requêtes attendent au plus `timeout` ; au-delà
+    de max_waiting requêtes en attente, elles sont refusées immédiatement.
+    """
+
+    def __init__(self, model, size: int = 4, samplerate: int = 16000, max_waiting: int = 8,
+                 factory: Optional[Callable[[], Any]] = None):
+        if size < 1:
+            raise ValueError("Le pool doit contenir au moins un reconnaisseur")
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.size = size
+        self.samplerate = samplerate
+        self.max_waiting = max_waiting
+        self._factory = factory or (lambda: vosk.KaldiRecognizer(model, samplerate))
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._created = 0
+        self._waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.wait_times = LatencyHistogram()
+
+    @property
+    def in_use(self) -> int:
+        return self._created - len(self._idle)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Emprunte un reconnaisseur (créé à la demande jusqu'à `size`)
+
+        Raises:
+            PoolExhausted: pool épuisé après `timeout` secondes, ou trop de requêtes en attente
+        """
+        started = time.perf_counter()
+        with self._cond:
+            if not self._idle and self._created >= self.size and self._waiting >= self.max_waiting:
+                self.rejected += 1
+                raise PoolExhausted(f"{self._waiting} requêtes déjà en attente d'un reconnaisseur")
+
+            self._waiting += 1
+            try:
+                while not self._idle and self._created >= self.size:
+                    remaining = None if timeout is None else timeout - (time.perf_counter() - started)
+                    if remaining is not None and remaining <= 0:
+                        self.rejected += 1
+                        raise PoolExhausted(f"Aucun reconnaisseur libre après {timeout:.1f}s")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+            recognizer = self._idle.pop() if self._idle else None
+            if recognizer is None:
+                self._created += 1
+            self.acquired += 1
+            self.wait_times.record(time.perf_counter() - started)
+
+        if recognizer is None:
+            try:
+                recognizer = self._factory()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        return recognizer
+
+    def release(self, recognizer):
+        """Rend un reconnaisseur ; il est réinitialisé, ou écarté si la réinitialisation échoue"""
+        try:
+            recognizer.Reset()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Reconnaisseur écarté du pool: {e}")
+            recognizer = None
+        with self._cond:
+            if recognizer is None:
+                self._created -= 1
+            else:
+                self._idle.append(recognizer)
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Emprunt le temps d'un bloc with"""
+        recognizer = self.acquire(timeout)
+        try:
+            yield recognizer
+        finally:
+            self.release(recognizer)
+
+    def stats(self) -> Dict[str, Any]:
+        """Occupation du pool et temps d'attente (secondes) des emprunts"""
+        with self._cond:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'in_use': self.in_use,
+                'waiting': self._waiting,
+                'acquired': self.acquired,
+                'rejected': self.rejected,
+                'wait_p50': self.wait_times.percentile(50),
+                'wait_p95': self.wait_times.percentile(95),
+                'wait_max': self.wait_times.max,
+            }
@@ -0,0 +1,226 @@
+"""
+Agent de déviation d'itinéraire pour Guardian
+Suit la position sur un itinéraire prévu (polyligne de l'API Directions) et
+alerte si la personne s'en écarte durablement de plus de deviation_threshold
+mètres. Chaque fix n'examine que les segments proches du dernier segment
+reconnu : coût constant même sur un long itinéraire.
+"""
+
+import logging
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from guardian.clock import SYSTEM_CLOCK
+from guardian.geodesy import EARTH_RADIUS_M, decode_polyline
+
+Coordinates = Tuple[float, float]
+
+METERS_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180.0
+
+
+class WrongPathAgent:
+    """
+    Détection de déviation par rapport à un itinéraire
+
+    Les segments sont projetés dans un plan local (mètres) autour du départ.
+    Recherche en deux temps : fenêtre le long de l'itinéraire autour du
+    dernier segment reconnu, puis index en grille des segments pour se
+    raccrocher à l'itinéraire (raccourci, demi-tour) avant de conclure à une
+    déviation.
+    """
+
+    def __init__(self, deviation_threshold: float = 50,
+                 sustained_seconds: float = 30,
+                 lookahead_m: float = 500,
+                 lookbehind_m: float = 100,
+                 max_window_segments: int = 64,
+                 clock=None):
+        self.deviation_threshold = deviation_threshold
+        self.sustained_seconds = sustained_seconds  # déviation continue avant alerte
+        self.lookahead_m = lookahead_m
+        self.lookbehind_m = lookbehind_m
+        self.max_window_segments = max_window_segments
+        self.clock = clock or SYSTEM_CLOCK
+        self.cell_size = max(2.0 * deviation_threshold, 50.0)  # mètres
+
+        self.route: Optional[np.ndarray] = None
+        self.matched_segment: Optional[int] = None
+        self.last_distance: Optional[float] = None
+        self.off_route_since: Optional[float] = None
+        self.alerted = False
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def has_route(self) -> bool:
+        return self.route is not None
+
+    def set_route(self, route: Union[str, Sequence[Coordinates]]) -> bool:
+        """
+        Définit l'itinéraire à suivre
+
+        Args:
+            route: Polyligne encodée Google ou liste de points (lat, lon)
+
+        Returns:
+            bool: False si l'itinéraire est inutilisable (moins de deux points)
+        """
+        if isinstance(route, str):
+            try:
+                route = decode_polyline(route)
+            except ValueError as e:
+                self.logger.warning(f"Polyligne d'itinéraire invalide: {e}")
+                return False
+
+        points = np.asarray(route, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 2:
+            self.logger.warning("Itinéraire trop court, suivi désactivé")
+            return False
+
+        self.route = points
+        self._origin = points[0]
+        self._lon_scale = METERS_PER_DEGREE * math.cos(math.radians(points[0, 0]))
+        xy = self._project(points[:, 0], points[:, 1])
+        self._ax, self._ay = xy[0][:-1], xy[1][:-1]
+        self._dx, self._dy = np.diff(xy[0]), np.diff(xy[1])
+        self._len2 = self._dx ** 2 + self._dy ** 2
+        self._start_m = np.concatenate(([0.0], np.cumsum(np.sqrt(self._len2))[:-1]))
+        self.length_m = float(self._start_m[-1] + math.sqrt(self._len2[-1]))
+        self._build_grid()
+
+        self.matched_segment = None
+        self.last_distance = None
+        self.off_route_since = None
+        self.alerted = False
+        self.logger.info(f"Itinéraire suivi: {len(points)} points, {self.length_m:.0f}m")
+        return True
+
+    def clear_route(self):
+        """Arrête le suivi d'itinéraire"""
+        self.route = None
+        self.matched_segment = None
+        self.off_route_since = None
+        self.alerted = False
+
+    def _project(self, lat, lon):
+        """(lat, lon) vers (x est, y nord) en mètres autour du départ"""
+        return ((lon - self._origin[1]) * self._lon_scale,
+                (lat - self._origin[0]) * METERS_PER_DEGREE)
+
+    def _build_grid(self):
+        """Index des segments par cellule de grille (rectangle englobant)"""
+        size = self.cell_size
+        bx, by = self._ax + self._dx, self._ay + self._dy
+        col_min = np.floor(np.minimum(self._ax, bx) / size).astype(np.int64)
+        col_max = np.floor(np.maximum(self._ax, bx) / size).astype(np.int64)
+        row_min = np.floor(np.minimum(self._ay, by) / size).astype(np.int64)
+        row_max = np.floor(np.maximum(self._ay, by) / size).astype(np.int64)
+
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for segment in range(len(self._ax)):
+            for row in range(row_min[segment], row_max[segment] + 1):
+                for col in range(col_min[segment], col_max[segment] + 1):
+                    grid.setdefault((row, col), []).append(segment)
+        self._grid = {cell: np.asarray(segments) for cell, segments in grid.items()}
+
+    def _distances(self, segments, x: float, y: float) -> np.ndarray:
+        """Distances point-segment (mètres) pour les segments donnés (slice ou indices)"""
+        ax, ay, dx, dy = self._ax[segments], self._ay[segments], self._dx[segments], self._dy[segments]
+        len2 = self._len2[segments]
+        t = np.zeros_like(len2)
+        np.divide((x - ax) * dx + (y - ay) * dy, len2, out=t, where=len2 > 0)
+        np.clip(t, 0.0, 1.0, out=t)
+        return np.hypot(ax + t * dx - x, ay + t * dy - y)
+
+    def _window(self) -> slice:
+        """Segments proches du dernier segment reconnu, le long de l'itinéraire"""
+        m = self.matched_segment
+        along = self._start_m[m]
+        first = int(np.searchsorted(self._start_m, along - self.lookbehind_m, side='left'))
+        last = int(np.searchsorted(self._start_m, along + self.lookahead_m, side='right'))
+        first = max(first, m - self.max_window_segments // 4)
+        last = min(last, m + self.max_window_segments)
+        return slice(max(0, first), max(last, m + 1))
+
+    def _nearby_segments(self, x: float, y: float) -> np.ndarray:
+        """Segments des cellules voisines du point (index en grille)"""
+        row, col = int(math.floor(y / self.cell_size)), int(math.floor(x / self.cell_size))
+        found = [self._grid[cell] for cell in
+                 ((row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1))
+                 if cell in self._grid]
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def distance_to_route(self, coord: Coordinates) -> float:
+        """
+        Distance (mètres) de la position à l'itinéraire ; met à jour le segment reconnu
+
+        Retourne inf si aucun segment n'est à portée de la grille.
+        """
+        x, y = self._project(coord[0], coord[1])
+        window_distance = float('inf')
+
+        if self.matched_segment is not None:
+            window = self._window()
+            distances = self._distances(window, x, y)
+            best = int(np.argmin(distances))
+            window_distance = float(distances[best])
+            if window_distance <= self.deviation_threshold:
+                self.matched_segment = window.start + best
+                return window_distance
+
+        # Hors fenêtre : raccroché ailleurs sur l'itinéraire ?
+        candidates = self._nearby_segments(x, y)
+        if len(candidates) == 0:
+            return window_distance
+        distances = self._distances(candidates, x, y)
+        best = int(np.argmin(distances))
+        distance = float(distances[best])
+        if distance <= self.deviation_threshold or self.matched_segment is None:
+            self.matched_segment = int(candidates[best])
+        return min(distance, window_distance)
+
+    @property
+    def progress_m(self) -> Optional[float]:
+        """Distance parcourue le long de l'itinéraire (début du segment reconnu)"""
+        if self.matched_segment is None:
+            return None
+        return float(self._start_m[self.matched_segment])
+
+    def update_position(self, coord: Coordinates, timestamp: Optional[float] = None) -> bool:
+        """
+        Met à jour la position et vérifie la déviation
+
+        Args:
+            coord: Tuple (latitude, longitude)
+            timestamp: Horodatage du fix GPS (secondes), sinon l'heure de l'horloge
+
+        Returns:
+            bool: True si une alerte de déviation doit être déclenchée
+                  (une seule fois par épisode de déviation)
+        """
+        if self.route is None:
+            return False
+        now = timestamp if timestamp is not None else self.clock.now()
+
+        distance = self.distance_to_route(coord)
+        self.last_distance = distance
+
+        if distance <= self.deviation_threshold:
+            if self.off_route_since is not None:
+                self.logger.info(f"Retour sur l'itinéraire ({distance:.0f}m)")
+            self.off_route_since = None
+            self.alerted = False
+            return False
+
+        if self.off_route_since is None:
+            self.off_route_since = now
+            self.logger.debug(f"Hors itinéraire: {distance:.0f}m > {self.deviation_threshold}m")
+
+        if not self.alerted and now - self.off_route_since >= self.sustained_seconds:
+            self.alerted = True
+            self.logger.warning(
+                f"Alerte déviation: {distance:.0f}m de l'itinéraire depuis {now - self.off_route_since:.0f}s"
+            )
+            return True
+        return False
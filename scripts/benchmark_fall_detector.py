@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+⏱️ Banc d'évaluation du détecteur de chute Guardian
+Précision, rappel, latence et débit sur des traces étiquetées, avec
+balayage optionnel des seuils
+
+Usage:
+    python scripts/benchmark_fall_detector.py                 # corpus synthétique
+    python scripts/benchmark_fall_detector.py --corpus traces/ # CSV étiquetés
+    python scripts/benchmark_fall_detector.py --sweep
+    python scripts/benchmark_fall_detector.py --export traces/ # écrit le corpus synthétique
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.fall_evaluation import (evaluate, format_report, generate_corpus,
+                                      load_corpus, save_labelled_trace, sweep)
+
+SWEEP_GRID = {
+    'speed_threshold_high': [10.0, 15.0, 20.0],
+    'acceleration_threshold': [-4.0, -6.0, -8.0],
+    'stationary_time': [20.0, 30.0, 60.0],
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Évaluation du détecteur de chute")
+    parser.add_argument('--corpus', help="Répertoire de traces CSV étiquetées")
+    parser.add_argument('--traces-per-kind', type=int, default=50)
+    parser.add_argument('--noise', type=float, default=0.5, help="Bruit GPS synthétique (mètres)")
+    parser.add_argument('--sweep', action='store_true', help="Balayer la grille de seuils")
+    parser.add_argument('--export', help="Écrire le corpus synthétique dans ce répertoire")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # une ligne de log par chute détectée sinon
+
+    if args.corpus:
+        traces = load_corpus(args.corpus)
+    else:
+        traces = generate_corpus(args.traces_per_kind, noise_m=args.noise)
+    print(f"📂 {len(traces)} traces, {sum(len(t.fixes) for t in traces):,} points")
+
+    if args.export:
+        os.makedirs(args.export, exist_ok=True)
+        for trace in traces:
+            save_labelled_trace(trace, os.path.join(args.export, f"{trace.name}.csv"))
+        print(f"💾 Corpus écrit dans {args.export}")
+
+    print(format_report(evaluate(traces)))
+
+    if args.sweep:
+        results = sweep(traces, SWEEP_GRID)
+        results.sort(key=lambda r: (-r['f1'], r['false_positives']))
+        print("\n📊 Balayage des seuils (meilleur F1 d'abord)")
+        print(f"   {'v_haute':>7} {'accél.':>7} {'immobile':>8}  {'préc.':>5} {'rappel':>6} {'F1':>5} {'post-chute':>10}")
+        for r in results:
+            p = r['params']
+            print(f"   {p['speed_threshold_high']:7.0f} {p['acceleration_threshold']:7.1f} {p['stationary_time']:8.0f}"
+                  f"  {r['precision']:5.0%} {r['recall']:6.0%} {r['f1']:5.2f} {r['post_fall_recall']:10.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark du moteur de flotte Guardian
+100 000 utilisateurs mis à jour chaque seconde sur un seul cœur
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.fleet import FleetDetector
+
+def main(users=100_000, ticks=60):
+    rng = np.random.default_rng(0)
+    fleet = FleetDetector(capacity=users, time_threshold=30)
+    user_ids = [f"user-{u}" for u in range(users)]
+    indices = fleet.register(user_ids)
+
+    lats = 48.8566 + rng.uniform(-0.2, 0.2, users)
+    lons = 2.3522 + rng.uniform(-0.2, 0.2, users)
+    moving = rng.random(users) < 0.5
+
+    by_id, by_index = [], []
+    events_total = 0
+    for tick in range(ticks):
+        lats = lats + np.where(moving, rng.normal(0, 0.0001, users), 0.0)
+        timestamps = np.full(users, float(tick))
+
+        started = time.perf_counter()
+        if tick % 2:
+            events = fleet.update(user_ids, lats, lons, timestamps)
+            by_id.append(time.perf_counter() - started)
+        else:
+            events = fleet.update_indices(indices, lats, lons, timestamps)
+            by_index.append(time.perf_counter() - started)
+        events_total += len(events)
+
+    print(f"👥 {users:,} utilisateurs, {ticks} lots, {events_total:,} événements")
+    print(f"   update (identifiants)   médiane {np.median(by_id)*1000:7.1f} ms / lot")
+    print(f"   update_indices          médiane {np.median(by_index)*1000:7.1f} ms / lot")
+    print(f"   budget temps réel       {'✅' if np.median(by_id) < 1.0 else '❌'} (< 1000 ms / lot)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark des distances géodésiques Guardian
+Compare l'ancienne haversine scalaire (boucle Python) au noyau NumPy
+de guardian.geodesy sur 1 million de points
+"""
+
+import os
+import sys
+import time
+from math import radians, cos, sin, asin, sqrt
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.geodesy import distances_from, consecutive_distances, distance_matrix
+
+def scalar_haversine(coord1, coord2):
+    """Ancienne implémentation scalaire (copie de FallDetector._haversine_distance)"""
+    lat1, lon1 = coord1
+    lat2, lon2 = coord2
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    a = sin((lat2 - lat1)/2)**2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1)/2)**2
+    return 2 * asin(sqrt(a)) * 6371000
+
+def timed(label, func, n, repeat=1):
+    """Meilleur temps sur repeat exécutions"""
+    elapsed = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    print(f"   {label:<42} {elapsed*1000:9.1f} ms  ({n / elapsed / 1e6:7.2f} M distances/s)")
+    return result, elapsed
+
+def main(n=1_000_000):
+    rng = np.random.default_rng(42)
+    points = np.column_stack([
+        48.8566 + rng.uniform(-0.5, 0.5, n),
+        2.3522 + rng.uniform(-0.5, 0.5, n)
+    ])
+    point_list = [tuple(p) for p in points]
+    origin = (48.8566, 2.3522)
+
+    print(f"📍 {n:,} points autour de Paris\n")
+    distances_from(origin, points[:1000])  # préchauffage NumPy (chargement paresseux, pages mémoire)
+
+    print("➡️  Un-vers-plusieurs (tri des refuges)")
+    scalar, t_scalar = timed("scalaire (boucle Python)",
+                             lambda: [scalar_haversine(origin, p) for p in point_list], n)
+    vector, t_vector = timed("NumPy distances_from", lambda: distances_from(origin, points), n, repeat=3)
+    print(f"   accélération x{t_scalar / t_vector:.0f}, écart max {np.max(np.abs(vector - scalar)):.2e} m\n")
+
+    print("➡️  Segments consécutifs (longueur de trace)")
+    scalar, t_scalar = timed("scalaire (boucle Python)",
+                             lambda: [scalar_haversine(point_list[i - 1], point_list[i]) for i in range(1, n)], n - 1)
+    vector, t_vector = timed("NumPy consecutive_distances", lambda: consecutive_distances(points), n - 1, repeat=3)
+    print(f"   accélération x{t_scalar / t_vector:.0f}, écart max {np.max(np.abs(vector - scalar)):.2e} m\n")
+
+    print("➡️  Plusieurs-vers-plusieurs (1000 x 1000)")
+    timed("NumPy distance_matrix", lambda: distance_matrix(points[:1000], points[1000:2000]), 1_000_000, repeat=3)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark de la détection de mots-clés Guardian
+Compare le décodage vocabulaire complet (ancien VoiceAgent) au reconnaisseur
+à grammaire restreinte, avec et sans détection d'activité vocale : facteur
+temps réel et temps CPU sur le même audio
+
+Usage:
+    python scripts/benchmark_keyword_spotting.py --wav enregistrement.wav
+    python scripts/benchmark_keyword_spotting.py                 # 60 s de bruit de fond synthétique
+"""
+
+import argparse
+import os
+import sys
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.keyword_spotting import keyword_grammar, measure_decoding
+from guardian.vad import GatedRecognizer
+from guardian.vosk_models import MODEL_REGISTRY, get_model
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+SAMPLERATE = 16000
+
+def load_pcm(path):
+    """PCM 16 bits mono 16 kHz depuis un WAV"""
+    with wave.open(path, 'rb') as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getframerate() != SAMPLERATE:
+            raise ValueError("WAV attendu : mono, 16 bits, 16 kHz")
+        return wav.readframes(wav.getnframes())
+
+def background_noise(seconds=60.0, seed=0):
+    """Bruit de fond de rue (faible niveau) : cas typique de l'écoute permanente"""
+    rng = np.random.default_rng(seed)
+    samples = rng.normal(0, 300, int(seconds * SAMPLERATE))
+    return np.clip(samples, -32768, 32767).astype('<i2').tobytes()
+
+def main():
+    parser = argparse.ArgumentParser(description="Vocabulaire complet vs grammaire de mots-clés")
+    parser.add_argument('--model', default='vosk-model-small-fr-0.22')
+    parser.add_argument('--wav', help="Enregistrement 16 kHz mono (défaut : bruit synthétique)")
+    parser.add_argument('--keywords', default="aide,stop,urgence,secours")
+    args = parser.parse_args()
+
+    if not VOSK_AVAILABLE:
+        print("❌ Vosk non disponible (pip install vosk)")
+        return 1
+
+    vosk.SetLogLevel(-1)
+    model = get_model(args.model)
+    print(MODEL_REGISTRY.format_report())
+
+    pcm = load_pcm(args.wav) if args.wav else background_noise()
+    keywords = [k.strip() for k in args.keywords.split(',')]
+
+    grammar = keyword_grammar(keywords)
+    gated_full = GatedRecognizer(vosk.KaldiRecognizer(model, SAMPLERATE))
+    gated_spotting = GatedRecognizer(vosk.KaldiRecognizer(model, SAMPLERATE, grammar))
+    results = [
+        ("vocabulaire complet", measure_decoding(vosk.KaldiRecognizer(model, SAMPLERATE), pcm, SAMPLERATE)),
+        ("grammaire mots-clés", measure_decoding(vosk.KaldiRecognizer(model, SAMPLERATE, grammar), pcm, SAMPLERATE)),
+        ("complet + VAD", measure_decoding(gated_full, pcm, SAMPLERATE)),
+        ("grammaire + VAD", measure_decoding(gated_spotting, pcm, SAMPLERATE)),
+    ]
+
+    print(f"\n🎙️ {results[0][1]['audio_seconds']:.0f}s d'audio, mots-clés: {', '.join(keywords)}")
+    print(f"   {'mode':<22} {'RTF':>7} {'CPU RTF':>8}")
+    for label, result in results:
+        print(f"   {label:<22} {result['rtf']:7.3f} {result['cpu_rtf']:8.3f}")
+    baseline = results[0][1]['cpu_rtf']
+    for label, result in results[1:]:
+        if result['cpu_rtf']:
+            print(f"   ⚡ {label}: CPU divisé par {baseline / result['cpu_rtf']:.1f}")
+
+    stats = gated_full.stats()
+    print(f"   🗣️ Parole: {stats['speech_ratio']:.0%} de l'audio, "
+          f"CPU économisé par la VAD: {stats['saved_cpu_seconds']:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
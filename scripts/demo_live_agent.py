@@ -11,35 +11,16 @@ import yaml
 import json
 import time
 import requests
-import math
 from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from guardian.vosk_models import get_model
+
 def calculate_distance(lat1, lon1, lat2, lon2):
     """Calcule la distance en mètres entre deux points géographiques (formule haversine)"""
-    # Rayon de la Terre en kilomètres
-    R = 6371.0
-    
-    # Conversion en radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-    
-    # Différences
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
-    
-    # Formule haversine
-    a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    
-    # Distance en kilomètres, puis conversion en mètres
-    distance_km = R * c
-    distance_m = distance_km * 1000
-    
-    return round(distance_m)
+    from guardian.geodesy import distance_m
+    return round(distance_m((lat1, lon1), (lat2, lon2)))
 
 def format_distance(distance_meters):
     """Formate la distance pour l'affichage"""
@@ -82,7 +63,7 @@ class VoiceRecognizer:
                 return False
                 
             print("🔧 Chargement du modèle Vosk français...")
-            self.model = vosk.Model(self.model_path)
+            self.model = get_model(self.model_path)
             self.rec = vosk.KaldiRecognizer(self.model, 16000)
             print("✅ Modèle Vosk chargé avec succès")
             return True
@@ -18,15 +18,15 @@ CRITICAL_MODULES = [
     ("requests", "requests"),
     ("pygame", "pygame"),
     ("sounddevice", "sounddevice"),
-    ("werkzeug", "Werkzeug")
+    ("werkzeug", "Werkzeug"),
+    ("numpy", "numpy")
 ]
 
 # Dépendances optionnelles
 OPTIONAL_MODULES = [
     ("google.generativeai", "google-generativeai"),
     ("twilio", "twilio"),
-    ("PIL", "Pillow"),
-    ("numpy", "numpy")
+    ("PIL", "Pillow")
 ]
 
 def test_python_version():
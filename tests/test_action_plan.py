@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test du plan d'actions d'urgence parallèle (dépendances, échéance, timings)
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.action_plan import ActionPlan
+
+def test_notification_not_delayed_by_slow_enrichment():
+    """Le SMS part sans attendre une recherche de refuges lente"""
+    executor = ThreadPoolExecutor(max_workers=4)
+    plan = ActionPlan("test_critique", executor)
+    sent = []
+
+    plan.add_step("refuges", lambda: time.sleep(0.3) or ["Pharmacie de Garde"])
+    plan.add_step("transports", lambda: {"bus_stops": []})
+    plan.add_step("formatage", lambda refuges, transports: f"{len(refuges)} refuge(s)",
+                  depends_on=("refuges", "transports"))
+    plan.add_step("sms_urgence", lambda: sent.append("sms") or True, notification=True)
+    plan.add_step("mise_a_jour", lambda message: sent.append(message), depends_on=("formatage",))
+
+    report = plan.run(deadline=2.0, first_notification_budget=0.2)
+
+    print(f"⏱️  Première notification: {report['first_notification']:.3f}s")
+    for name, info in report['steps'].items():
+        print(f"   {name}: {info['status']} ({info['duration']:.3f}s)")
+
+    assert report['deadline_met']
+    assert report['first_notification_in_budget']
+    assert sent == ["sms", "1 refuge(s)"]
+    assert all(info['status'] == 'done' for info in report['steps'].values())
+    executor.shutdown()
+
+def test_failed_and_timed_out_steps():
+    """Une étape en échec ignore ses dépendants ; l'échéance coupe les étapes lentes"""
+    executor = ThreadPoolExecutor(max_workers=4)
+    plan = ActionPlan("test_echecs", executor)
+
+    def failing_lookup():
+        raise ConnectionError("Places API injoignable")
+
+    plan.add_step("refuges", failing_lookup)
+    plan.add_step("formatage", lambda refuges: refuges, depends_on=("refuges",))
+    plan.add_step("lent", lambda: time.sleep(0.5))
+    plan.add_step("sms_urgence", lambda: True, notification=True)
+
+    report = plan.run(deadline=0.1)
+    steps = report['steps']
+
+    assert not report['deadline_met']
+    assert steps['refuges']['status'] == 'failed'
+    assert "Places API" in steps['refuges']['error']
+    assert steps['formatage']['status'] == 'skipped'
+    assert steps['lent']['status'] == 'timeout'
+    assert steps['sms_urgence']['status'] == 'done'
+    executor.shutdown()
+
+def test_notification_step_that_sent_nothing():
+    """Une notification qui n'a rien envoyé est en échec et ne compte pas comme première notification"""
+    executor = ThreadPoolExecutor(max_workers=4)
+
+    plan = ActionPlan("test_sans_contact", executor)
+    plan.add_step("sms_urgence", lambda: False, notification=True)
+    plan.add_step("alerte_danger", lambda: None, notification=True)
+    report = plan.run(deadline=1.0, first_notification_budget=1.0)
+
+    assert report['steps']['sms_urgence']['status'] == 'failed'
+    assert "aucune notification" in report['steps']['alerte_danger']['error']
+    assert report['first_notification'] is None
+    assert not report['first_notification_in_budget']
+
+    plan = ActionPlan("test_un_envoi", executor)
+    plan.add_step("sms_urgence", lambda: False, notification=True)
+    plan.add_step("emails_proches", lambda: time.sleep(0.05) or True, notification=True)
+    report = plan.run(deadline=1.0, first_notification_budget=1.0)
+
+    assert report['first_notification'] >= 0.05
+    assert report['first_notification_in_budget']
+    executor.shutdown()
+
+if __name__ == "__main__":
+    test_notification_not_delayed_by_slow_enrichment()
+    test_failed_and_timed_out_steps()
+    test_notification_step_that_sent_nothing()
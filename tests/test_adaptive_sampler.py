@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test de l'échantillonnage GPS adaptatif : moins de points traités,
+mêmes détections que le rejeu à 1 Hz
+"""
+
+import sys
+import os
+import math
+import random
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.adaptive_sampler import AdaptiveSampler
+from guardian.clock import SimulatedClock
+from guardian.GPS_agent import StaticAgent
+from guardian.fall_detector import FallDetector
+from guardian.gps_sources import GPSFix
+from guardian.replay import replay_trace
+
+START = 1_700_000_000.0
+METERS_PER_DEGREE = 111_320.0
+
+
+def record_trace(segments, noise_m=0.2, seed=0):
+    """
+    Trace à 1 Hz : segments [(durée en secondes, vitesse en km/h)] vers le nord,
+    avec un bruit GPS de noise_m mètres
+    """
+    rng = random.Random(seed)
+    trace = []
+    t, north = 0, 0.0
+    for duration, speed_kmh in segments:
+        for _ in range(duration):
+            noise = rng.uniform(-noise_m, noise_m)
+            trace.append(GPSFix(START + t, 48.8566 + (north + noise) / METERS_PER_DEGREE, 2.3522))
+            north += speed_kmh / 3.6
+            t += 1
+    return trace
+
+
+# Corpus : immobilité, marche, vélo avec chute, vélo avec arrêts normaux
+TRACES = {
+    'immobile': [(1300, 0)],
+    'marche_puis_arret': [(900, 4), (700, 0)],
+    'chute_velo': [(120, 0), (300, 20), (90, 0)],
+    'chute_rapide': [(60, 0), (200, 30), (60, 0)],
+    'velo_arrets': [(60, 0), (200, 20), (20, 0), (200, 20), (400, 0)],
+}
+
+
+def run(trace, sampler=None):
+    """Rejoue une trace ; retourne (types d'événements, points traités)"""
+    static_agent = StaticAgent(distance_threshold=10, time_threshold=300, clock=SimulatedClock())
+    fall_detector = FallDetector(clock=SimulatedClock())
+    processed = []
+    counted = (processed.append(fix) or fix for fix in trace)
+    events = replay_trace(counted, static_agent, fall_detector, sampler=sampler)
+    if sampler is not None:
+        processed = processed[:sampler.metrics()['samples']]
+    return [e['type'] for e in events], len(processed)
+
+
+def test_same_recall_with_fewer_points():
+    """Les mêmes événements sont détectés, avec bien moins de points"""
+    total_full, total_adaptive = 0, 0
+    for name, segments in TRACES.items():
+        trace = record_trace(segments)
+        full_events, full_points = run(trace)
+        sampler = AdaptiveSampler()
+        adaptive_events, adaptive_points = run(trace, sampler)
+
+        print(f"📡 {name}: {full_points} -> {adaptive_points} points, événements {adaptive_events}")
+        # Rappel identique : mêmes types détectés, autant d'alertes d'immobilité
+        assert set(adaptive_events) == set(full_events), name
+        assert adaptive_events.count('immobility') == full_events.count('immobility'), name
+        assert adaptive_points < full_points
+        total_full += full_points
+        total_adaptive += adaptive_points
+
+    print(f"📉 Total: {total_adaptive}/{total_full} points traités ({total_adaptive / total_full:.0%})")
+    assert total_adaptive < 0.5 * total_full
+
+
+def test_fixed_slow_cadence_misses_falls():
+    """Une cadence fixe lente (10 s) rate la chute à vélo que l'adaptatif détecte"""
+    trace = record_trace(TRACES['chute_velo'])
+    slow_events, _ = run(trace[::10])
+    adaptive_events, _ = run(trace, AdaptiveSampler())
+
+    assert 'fall' not in slow_events
+    assert 'fall' in adaptive_events
+
+
+def test_decisions_follow_detector_state():
+    """Raisons de décision selon l'état des détecteurs"""
+    sampler = AdaptiveSampler(min_interval=1, walking_interval=5, max_interval=30)
+    static_agent = StaticAgent(distance_threshold=10, time_threshold=300, clock=SimulatedClock())
+    fall_detector = FallDetector(clock=SimulatedClock())
+
+    assert sampler.decide(static_agent, fall_detector) == 1
+    assert sampler.reason == 'initial'
+
+    # Immobile : intervalle long, raccourci à l'approche du seuil d'immobilité
+    for t in range(0, 20, 10):
+        static_agent.update_position((48.8566, 2.3522), START + t)
+        fall_detector.update_position((48.8566, 2.3522), START + t)
+    assert sampler.decide(static_agent, fall_detector) == 30
+    assert sampler.reason == 'stationary'
+    static_agent.static_time = 295
+    assert sampler.decide(static_agent, fall_detector) == 6
+
+    # Alerte en cours : cadence maximale
+    assert sampler.decide(static_agent, fall_detector, alert_pending=True) == 1
+    assert sampler.reason == 'alert_pending'
+
+    # Vélo : cadence maximale (motifs de chute possibles)
+    lat = 48.8566
+    for t in range(20, 25):
+        lat += 5.0 / METERS_PER_DEGREE
+        fall_detector.update_position((lat, 2.3522), START + t)
+    sampler.decide(static_agent, fall_detector)
+    assert sampler.reason in ('fast_motion', 'speed_change')
+
+    metrics = sampler.metrics()
+    assert metrics['samples'] == 5
+    assert metrics['decisions']['stationary'] == 2
+    assert 'Échantillonnage' in sampler.format_report()
+
+
+def test_simulate_gps_follows_sampler_interval():
+    """La simulation GPS dort l'intervalle choisi par l'échantillonneur"""
+    clock = SimulatedClock()
+    agent = StaticAgent(clock=clock)
+    sampler = AdaptiveSampler()
+    sampler.interval = 30
+
+    positions = agent.simulate_gps(interval=lambda: sampler.interval)
+    next(positions)
+    next(positions)
+    assert math.isclose(clock.now(), 30)
+
+
+if __name__ == "__main__":
+    test_same_recall_with_fewer_points()
+    test_fixed_slow_cadence_misses_falls()
+    test_decisions_follow_detector_state()
+    test_simulate_gps_follows_sampler_interval()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test des variantes asyncio des agents (résultats identiques aux API synchrones)
+"""
+
+import sys
+import os
+import asyncio
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.gemini_agent import GeminiAgent
+from guardian.emergency_locations import EmergencyLocationService
+
+def test_gemini_async_matches_sync():
+    """L'analyse asynchrone (mode simulation) donne la même réponse"""
+    agent = GeminiAgent({})
+    situation = "Je suis tombé à vélo et j'ai très mal au bras"
+
+    sync_analysis = agent.analyze_emergency_situation(situation, (48.8566, 2.3522))
+    async_analysis = asyncio.run(agent.analyze_emergency_situation_async(situation, (48.8566, 2.3522)))
+
+    print(f"🤖 Urgence sync: {sync_analysis['urgency_level']}/10, async: {async_analysis['urgency_level']}/10")
+    assert sync_analysis == async_analysis
+
+def test_refuges_async_matches_sync():
+    """La recherche de refuges en parallèle retourne les mêmes lieux"""
+    service = EmergencyLocationService({})
+    location = (48.8566, 2.3522)
+
+    sync_refuges = service.find_emergency_refuges(location)
+    async_refuges = asyncio.run(service.find_emergency_refuges_async(location))
+
+    print(f"🏠 {len(async_refuges)} refuges trouvés en parallèle")
+    assert [r['name'] for r in sync_refuges] == [r['name'] for r in async_refuges]
+
+def test_many_concurrent_analyses():
+    """Des centaines d'analyses concurrentes sur une seule boucle"""
+    agent = GeminiAgent({})
+
+    async def run_all():
+        return await asyncio.gather(*[
+            agent.analyze_emergency_situation_async(f"Je suis perdu (utilisateur {i})")
+            for i in range(200)
+        ])
+
+    analyses = asyncio.run(run_all())
+    assert len(analyses) == 200
+    assert all(1 <= a['urgency_level'] <= 10 for a in analyses)
+
+if __name__ == "__main__":
+    test_gemini_async_matches_sync()
+    test_refuges_async_matches_sync()
+    test_many_concurrent_analyses()
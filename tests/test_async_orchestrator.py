@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test de l'orchestrateur asyncio : alertes déclenchées par le flux GPS
+(immobilité, compte à rebours de chute, escalade après chute, zones sûres,
+déviation d'itinéraire), trace enregistrée et routage des réponses vers la
+bonne question
+"""
+
+import sys
+import os
+import asyncio
+import threading
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.async_orchestrator import AsyncGuardianOrchestrator, static_monitor_async
+from guardian.GPS_agent import StaticAgent
+from guardian.geofence import GeofenceIndex, GeofenceMonitor, geofence_from_config
+from guardian.gps_sources import GPSFix
+from guardian.latency import LatencyTracker
+from guardian.session import GuardianSession
+from guardian.timer_scheduler import TimerScheduler
+from guardian.wrong_path_agent import WrongPathAgent
+
+PARIS = (48.8566, 2.3522)
+METERS_PER_DEGREE = 111320.0
+
+
+class RecordingAgent:
+    """Agent factice : enregistre chaque appel, synchrone ou *_async"""
+
+    def __init__(self, name, calls, **attributes):
+        self._name = name
+        self._calls = calls
+        self.__dict__.update(attributes)
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self._calls.append((self._name, method, args))
+            return True
+
+        async def call_async(*args, **kwargs):
+            return call(*args, **kwargs)
+
+        return call_async if method.endswith('_async') else call
+
+
+class FakeServices:
+    """Services partagés factices (planificateur et latences réels)"""
+
+    def __init__(self):
+        self.calls = []
+        self.emergency_response = RecordingAgent("emergency_response", self.calls)
+        self.speech_agent = RecordingAgent("speech", self.calls)
+        self.sms_agent = RecordingAgent("sms", self.calls)
+        self.gemini_agent = RecordingAgent("gemini", self.calls, is_available=False)
+        self.gmail_agent = RecordingAgent("gmail", self.calls, is_available=False)
+        self.intelligent_advisor = None
+        self.smart_response_system = RecordingAgent("smart_response", self.calls)
+        self.emergency_locations = None
+        self.scheduler = TimerScheduler()
+        self.shutdown_event = threading.Event()
+        self.latency = LatencyTracker()
+        self.action_executor = None
+
+    def called(self, name, method):
+        return sum(1 for n, m, _ in self.calls if (n, m) == (name, method))
+
+    def shutdown(self):
+        self.shutdown_event.set()
+        self.scheduler.shutdown()
+
+
+def make_orchestrator():
+    services = FakeServices()
+    orchestrator = AsyncGuardianOrchestrator({'emergency_response': {'timeout_seconds': 5}},
+                                             services=services, session=GuardianSession("test"))
+    return orchestrator, services
+
+
+async def replay(fixes):
+    for fix in fixes:
+        yield fix
+
+
+def stationary(start, seconds, step, position=PARIS):
+    return [GPSFix(start + t, *position) for t in range(0, seconds + 1, step)]
+
+
+def bike_fall(start=1000.0):
+    """Vélo à ~20 km/h vers le nord pendant 3 s puis arrêt net (décélération de 5,5 m/s²)"""
+    lat, lon = PARIS
+    moving = [GPSFix(start + t, lat + 5.5 * t / METERS_PER_DEGREE, lon) for t in range(4)]
+    stop = moving[-1]
+    return moving + [GPSFix(start + 4, stop.latitude, stop.longitude)], (stop.latitude, stop.longitude)
+
+
+async def wait_for(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+def test_immobility_alert_and_answer():
+    """Immobilité au-delà du seuil : alerte posée, 'oui' la clôt sans urgence"""
+    async def scenario():
+        orchestrator, services = make_orchestrator()
+        agent = StaticAgent(distance_threshold=10, time_threshold=60)
+        try:
+            await static_monitor_async(orchestrator, agent, replay(stationary(0, 90, 10)))
+            assert await wait_for(lambda: orchestrator.pending_prompts == ["alert"])
+
+            orchestrator.process_user_input("oui")
+            assert await wait_for(lambda: services.called("emergency_response",
+                                                          "send_confirmation_alert_async") == 1)
+            assert orchestrator.pending_prompts == []
+            assert services.called("emergency_response", "send_location_to_contacts_async") == 0
+        finally:
+            services.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_fall_countdown_from_fix_timestamps():
+    """Arrêt brutal à vélo (horodatages des fixes) : compte à rebours de chute, 'oui' déclenche l'urgence"""
+    async def scenario():
+        orchestrator, services = make_orchestrator()
+        fixes, _ = bike_fall()
+        try:
+            await static_monitor_async(orchestrator, StaticAgent(), replay(fixes))
+            assert await wait_for(lambda: orchestrator.pending_prompts == ["fall"])
+            assert services.called("speech", "speak_fall_alert_async") == 1
+
+            orchestrator.process_user_input("oui")
+            assert await wait_for(lambda: services.called("emergency_response",
+                                                          "send_fall_emergency_alert_async") == 1)
+        finally:
+            services.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_post_fall_escalation_once():
+    """Immobile plus de 30 s après la chute : escalade immédiate, une seule fois"""
+    async def scenario():
+        orchestrator, services = make_orchestrator()
+        fixes, stop = bike_fall(start=1000.0)
+        fixes += stationary(1005, 60, 5, position=stop)
+        try:
+            await static_monitor_async(orchestrator, StaticAgent(), replay(fixes))
+            assert await wait_for(lambda: services.called("emergency_response",
+                                                          "send_fall_emergency_alert_async") == 1)
+            assert orchestrator.session.alert_trace.trigger == "immobilité après chute"
+            assert orchestrator.pending_prompts == ["fall"]  # question de chute toujours posée
+            await asyncio.sleep(0.05)
+            assert services.called("emergency_response", "send_fall_emergency_alert_async") == 1
+        finally:
+            for task in list(orchestrator._tasks):
+                task.cancel()
+            services.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_safe_zone_suspends_immobility_alert_and_track_recorded():
+    """Immobile à la maison : pas d'alerte, mais les fixes sont enregistrés dans la trace"""
+    async def scenario():
+        orchestrator, services = make_orchestrator()
+        agent = StaticAgent(distance_threshold=10, time_threshold=60)
+        geofences = GeofenceMonitor(GeofenceIndex([
+            geofence_from_config({'id': 'maison', 'kind': 'safe', 'center': list(PARIS), 'radius_m': 80})
+        ]))
+        try:
+            await static_monitor_async(orchestrator, agent, replay(stationary(0, 90, 10)), geofences=geofences)
+            await asyncio.sleep(0.05)
+            assert geofences.in_safe_zone
+            assert orchestrator.pending_prompts == []
+            assert services.called("speech", "speak_alert_async") == 0
+            points = orchestrator.session.track.points()
+            assert points and points[0].timestamp == 0 and points[-1].timestamp == 90
+        finally:
+            services.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_wrong_path_alert():
+    """Écart durable de l'itinéraire suivi : alerte de déviation"""
+    async def scenario():
+        orchestrator, services = make_orchestrator()
+        lat, lon = PARIS
+        wrong_path = WrongPathAgent(deviation_threshold=50, sustained_seconds=30)
+        wrong_path.set_route([(lat, lon), (lat + 0.01, lon)])
+        orchestrator.session.wrong_path_agent = wrong_path
+        off_route = (lat + 0.005, lon + 0.003)  # ~220 m à l'est de l'itinéraire
+        try:
+            await static_monitor_async(orchestrator, StaticAgent(),
+                                       replay(stationary(0, 40, 10, position=off_route)))
+            assert await wait_for(lambda: orchestrator.pending_prompts == ["alert"])
+            assert orchestrator.session.alert_trace.trigger == "déviation d'itinéraire"
+        finally:
+            services.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_answers_routed_to_their_own_prompt():
+    """Alerte d'immobilité et chute simultanées : 'non' va à la chute, 'oui' à l'alerte"""
+    async def scenario():
+        orchestrator, services = make_orchestrator()
+        agent = StaticAgent(distance_threshold=10, time_threshold=60)
+        fixes, _ = bike_fall(start=1000.0)
+        try:
+            await static_monitor_async(orchestrator, agent, replay(stationary(0, 90, 10)))
+            assert await wait_for(lambda: orchestrator.pending_prompts == ["alert"])
+            await static_monitor_async(orchestrator, StaticAgent(), replay(fixes))
+            assert await wait_for(lambda: sorted(orchestrator.pending_prompts) == ["alert", "fall"])
+
+            orchestrator.process_user_input("non")   # pas blessé : répond à la chute
+            assert await wait_for(lambda: orchestrator.pending_prompts == ["alert"])
+            orchestrator.process_user_input("oui")   # tout va bien : répond à l'alerte
+            assert await wait_for(lambda: services.called("emergency_response",
+                                                          "send_confirmation_alert_async") == 1)
+            assert services.called("emergency_response", "send_fall_emergency_alert_async") == 0
+            assert services.called("emergency_response", "send_location_to_contacts_async") == 0
+        finally:
+            services.shutdown()
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_immobility_alert_and_answer()
+    test_fall_countdown_from_fix_timestamps()
+    test_post_fall_escalation_once()
+    test_safe_zone_suspends_immobility_alert_and_track_recorded()
+    test_wrong_path_alert()
+    test_answers_routed_to_their_own_prompt()
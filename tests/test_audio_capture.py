@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test du tampon circulaire audio (capture micro partagée)
+"""
+
+import sys
+import os
+import threading
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.audio_capture import AudioRingBuffer
+
+
+def pcm(start, frames):
+    """Échantillons int16 numérotés : permet de vérifier l'ordre et les pertes"""
+    return (np.arange(start, start + frames) % 32768).astype('<i2').tobytes()
+
+
+def read_all(reader, max_bytes=None):
+    data = b""
+    while True:
+        view = reader.read(max_bytes, timeout=0)
+        if view is None:
+            return data
+        data += view
+
+
+def test_readers_get_every_sample_in_order():
+    """Deux lecteurs indépendants relisent le flux intact, à travers le bouclage de l'anneau"""
+    ring = AudioRingBuffer(capacity_bytes=1000, guard_bytes=200)
+    fast, slow = ring.reader(), ring.reader()
+    received_fast = b""
+    received_slow = b""
+    for block in range(40):
+        ring.write(pcm(block * 70, 70))
+        received_fast += read_all(fast, max_bytes=64)
+        if block % 3 == 2:
+            received_slow += read_all(slow)
+
+    received_slow += read_all(slow)
+    assert received_fast == received_slow == pcm(0, 40 * 70)
+    assert fast.dropped_frames == slow.dropped_frames == ring.dropped_frames == 0
+
+
+def test_reads_are_zero_copy_views():
+    """Les lectures sont des vues sur le tampon préalloué"""
+    ring = AudioRingBuffer(capacity_bytes=100)
+    reader = ring.reader()
+    ring.write(pcm(0, 10))
+    view = reader.read()
+    assert isinstance(view, memoryview)
+    assert view.obj is ring._buffer
+    assert bytes(view) == pcm(0, 10)
+
+
+def test_slow_reader_drops_oldest_frames():
+    """Lecteur distancé : mémoire bornée, trames perdues comptées, lecture reprise sur du récent"""
+    ring = AudioRingBuffer(capacity_bytes=1000, guard_bytes=200)
+    reader = ring.reader()
+    for block in range(20):
+        ring.write(pcm(block * 50, 50))           # 2000 octets écrits
+
+    data = read_all(reader)
+    assert len(data) == 800                        # capacité - marge
+    assert data == pcm(2000 // 2 - 400, 400)      # les 400 trames les plus récentes
+    assert reader.dropped_frames == ring.dropped_frames == 600
+    assert len(ring._buffer) == 1000
+
+
+def test_blocking_read_and_close():
+    """read() attend le prochain bloc ; close() réveille les lecteurs"""
+    ring = AudioRingBuffer(capacity_bytes=1000)
+    reader = ring.reader()
+    assert reader.read(timeout=0.01) is None
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(bytes(reader.read(timeout=2))))
+    waiter.start()
+    ring.write(pcm(0, 8))
+    waiter.join(timeout=2)
+    assert results == [pcm(0, 8)]
+
+    ring.close()
+    assert reader.read(timeout=2) is None
+
+
+def test_skip_and_oversized_block():
+    """skip() saute l'audio en attente ; un bloc plus grand que l'anneau n'en garde que la fin"""
+    ring = AudioRingBuffer(capacity_bytes=100)
+    reader = ring.reader()
+    ring.write(pcm(0, 10))
+    reader.skip()
+    assert reader.read(timeout=0) is None
+
+    ring.write(pcm(10, 80))
+    assert read_all(reader) == pcm(40, 50)
+    assert ring.written == 180
+
+
+if __name__ == "__main__":
+    test_readers_get_every_sample_in_order()
+    test_reads_are_zero_copy_views()
+    test_slow_reader_drops_oldest_frames()
+    test_blocking_read_and_close()
+    test_skip_and_oversized_block()
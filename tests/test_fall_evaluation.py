@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test du banc d'évaluation du détecteur de chute
+"""
+
+import sys
+import os
+import tempfile
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.fall_detector import FallDetector
+from guardian.fall_evaluation import (KINDS, evaluate, format_report, generate_corpus,
+                                      generate_trace, load_corpus, save_labelled_trace, sweep)
+
+
+def test_generated_corpus_is_labelled():
+    """Corpus équilibré ; seules les traces 'fall' portent un instant de chute"""
+    corpus = generate_corpus(traces_per_kind=3)
+    assert len(corpus) == 3 * len(KINDS)
+    for trace in corpus:
+        assert (trace.fall_time is not None) == (trace.kind == 'fall')
+        timestamps = [fix.timestamp for fix in trace.fixes]
+        assert timestamps == sorted(timestamps)
+
+    # Déterministe pour une graine donnée
+    assert generate_trace('bus_stop', seed=4).fixes == generate_trace('bus_stop', seed=4).fixes
+
+
+def test_metrics_on_clean_traces():
+    """Sans bruit GPS : chutes reconnues vite, pas de fausse alerte aux arrêts"""
+    metrics = evaluate(generate_corpus(traces_per_kind=10, noise_m=0.0))
+    print(format_report(metrics))
+
+    assert metrics['recall'] >= 0.8
+    assert metrics['precision'] == 1.0
+    assert metrics['by_kind']['bus_stop']['detected'] == 0
+    assert metrics['by_kind']['red_light']['detected'] == 0
+    assert metrics['max_latency'] <= 2.0
+    assert metrics['points_per_second'] > 10_000
+
+
+def test_false_positives_are_counted():
+    """Un détecteur qui alerte à chaque arrêt est pénalisé en précision"""
+    class TriggerHappy(FallDetector):
+        def update_position(self, position, timestamp=None):
+            previous = self.history.last()
+            info = super().update_position(position, timestamp)
+            if info is None and previous is not None and self._calculate_speed(
+                    previous[0], position, previous[1], timestamp) < 1.0 and previous[2] > 5.0:
+                self.fall_detected = True
+                self.fall_detection_time = timestamp
+                return {'type': 'fall_detected'}
+            return info
+
+    corpus = generate_corpus(traces_per_kind=5, noise_m=0.0)
+    strict = evaluate(corpus)
+    loose = evaluate(corpus, detector_factory=TriggerHappy)
+    assert loose['false_positives'] > strict['false_positives']
+    assert loose['precision'] < strict['precision']
+    assert loose['false_alarms_per_hour'] > 0
+
+
+def test_threshold_sweep():
+    """Une ligne de résultats par combinaison de seuils"""
+    corpus = generate_corpus(traces_per_kind=2, noise_m=0.0)
+    grid = {'speed_threshold_high': [10.0, 20.0],
+            'acceleration_threshold': [-4.0, -8.0],
+            'stationary_time': [20.0, 60.0]}
+    results = sweep(corpus, grid)
+
+    assert len(results) == 8
+    assert results[0]['params'] == {'speed_threshold_high': 10.0, 'acceleration_threshold': -4.0,
+                                    'stationary_time': 20.0}
+    # Plus le délai d'immobilité est long, moins l'urgence post-chute se déclenche tôt
+    for r in results:
+        if r['mean_post_fall_latency'] is not None:
+            assert r['mean_post_fall_latency'] > r['params']['stationary_time']
+    short = [r['post_fall_recall'] for r in results if r['params']['stationary_time'] == 20.0]
+    long = [r['post_fall_recall'] for r in results if r['params']['stationary_time'] == 60.0]
+    assert max(long) <= min(short)
+
+
+def test_labelled_csv_round_trip():
+    """Export puis chargement d'un corpus étiqueté"""
+    corpus = generate_corpus(traces_per_kind=1)
+    with tempfile.TemporaryDirectory() as directory:
+        for trace in corpus:
+            save_labelled_trace(trace, os.path.join(directory, f"{trace.name}.csv"))
+        loaded = {trace.name: trace for trace in load_corpus(directory)}
+
+    assert len(loaded) == len(corpus)
+    for trace in corpus:
+        restored = loaded[trace.name]
+        assert restored.kind == trace.kind
+        assert restored.fall_time == trace.fall_time
+        assert len(restored.fixes) == len(trace.fixes)
+
+
+if __name__ == "__main__":
+    test_generated_corpus_is_labelled()
+    test_metrics_on_clean_traces()
+    test_false_positives_are_counted()
+    test_threshold_sweep()
+    test_labelled_csv_round_trip()
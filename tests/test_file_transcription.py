@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test de la transcription de fichiers audio (conversion PCM et pool de processus)
+"""
+
+import sys
+import os
+import io
+import json
+import wave
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.file_transcription import TranscriptionPool, decode_audio, transcribe_pcm
+from guardian.vosk_models import PoolExhausted, RecognizerPool
+
+
+class LoudnessRecognizer:
+    """Reconnaisseur factice : 'fort' par bloc non nul, un bloc nul termine l'énoncé"""
+
+    def __init__(self):
+        self.words = []
+
+    def AcceptWaveform(self, data):
+        if not any(data):
+            return bool(self.words)
+        self.words.append("fort")
+        return False
+
+    def Result(self):
+        text, self.words = " ".join(self.words), []
+        return json.dumps({"text": text})
+
+    def FinalResult(self):
+        return self.Result()
+
+    def Reset(self):
+        self.words = []
+
+
+def make_wav(samples, samplerate=16000, channels=1, width=2):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(samplerate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def test_decode_wav_stereo_resampled_to_16k_mono():
+    """WAV 44,1 kHz stéréo : moyenne des canaux et rééchantillonnage à 16 kHz"""
+    stereo = np.tile(np.array([[1000, 3000]], dtype="<i2"), (44100, 1))
+    pcm = decode_audio(make_wav(stereo, samplerate=44100, channels=2))
+    samples = np.frombuffer(pcm, dtype="<i2")
+    assert len(samples) == 16000
+    assert np.all(samples == 2000)
+
+
+def test_decode_wav_8_bit_and_unknown_format():
+    """WAV 8 bits non signé converti ; contenu inconnu refusé (ou confié à ffmpeg)"""
+    pcm = decode_audio(make_wav(np.full(160, 192, dtype=np.uint8), width=1))
+    assert np.all(np.frombuffer(pcm, dtype="<i2") == 64 * 256)
+    try:
+        decode_audio(b"pas un fichier audio")
+        assert False, "ValueError attendu"
+    except ValueError:
+        pass
+
+
+def test_transcribe_pcm_joins_utterances():
+    """Énoncés successifs joints, reconnaisseur remis à zéro pour le fichier suivant"""
+    loud, quiet = b"\x01\x00" * 4000, b"\x00\x00" * 4000
+    recognizer = LoudnessRecognizer()
+    assert transcribe_pcm(recognizer, loud + quiet + loud + loud) == "fort fort fort"
+    assert recognizer.words == []
+
+
+def test_short_files_inline_long_files_in_worker_processes():
+    """Fichier court : reconnaisseur libre en ligne ; long ou pool occupé : processus worker"""
+    pool = TranscriptionPool(None, workers=1, inline_max_seconds=1.0, factory=LoudnessRecognizer)
+    inline_pool = RecognizerPool(None, size=1, factory=LoudnessRecognizer)
+    try:
+        short = pool.transcribe(b"\x01\x00" * 8000, timeout=30, inline_pool=inline_pool)
+        assert short['mode'] == 'inline' and short['text'] == "fort fort"
+
+        long_file = pool.transcribe(b"\x01\x00" * 32000, timeout=30, inline_pool=inline_pool)
+        assert long_file['mode'] == 'process'
+        assert long_file['text'] == " ".join(["fort"] * 8)
+        assert long_file['audio_seconds'] == 2.0 and long_file['queue_depth'] == 1
+
+        with inline_pool.checkout():
+            busy = pool.transcribe(b"\x01\x00" * 8000, timeout=30, inline_pool=inline_pool)
+        assert busy['mode'] == 'process'
+
+        stats = pool.stats()
+        assert stats['completed'] == 3 and stats['inline'] == 1 and stats['queue_depth'] == 0
+        assert stats['rtf'] >= 0
+    finally:
+        pool.close()
+
+
+def test_queue_limit_rejects():
+    """File pleine : refus immédiat plutôt qu'une attente sans fin"""
+    pool = TranscriptionPool(None, workers=1, max_pending=0, factory=LoudnessRecognizer)
+    try:
+        pool.transcribe(b"\x01\x00" * 32000, timeout=30)
+        assert False, "PoolExhausted attendu"
+    except PoolExhausted:
+        assert pool.stats()['rejected'] == 1
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    test_decode_wav_stereo_resampled_to_16k_mono()
+    test_decode_wav_8_bit_and_unknown_format()
+    test_transcribe_pcm_joins_utterances()
+    test_short_files_inline_long_files_in_worker_processes()
+    test_queue_limit_rejects()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test du moteur de détection par lots pour une flotte d'utilisateurs
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.fleet import FleetDetector, EVENT_IMMOBILITY, EVENT_FALL, EVENT_POST_FALL
+from guardian.GPS_agent import StaticAgent
+from guardian.fall_detector import FallDetector
+
+def make_traces(users=60, steps=400, seed=3):
+    """Utilisateurs immobiles, piétons et cyclistes qui chutent, un fix par seconde"""
+    rng = np.random.default_rng(seed)
+    lats = np.empty((steps, users))
+    lons = np.empty((steps, users))
+    for u in range(users):
+        lat, lon = 48.85 + u * 0.001, 2.35
+        behaviour = u % 3
+        fall_step = int(rng.integers(50, 300))
+        for s in range(steps):
+            if behaviour == 1:        # piéton
+                lat += rng.normal(0, 0.00002)
+                lon += rng.normal(0, 0.00002)
+            elif behaviour == 2 and s < fall_step:  # cycliste ~20 km/h puis arrêt
+                lat += 0.00005
+            lats[s, u], lons[s, u] = lat, lon
+    return lats, lons
+
+def test_fleet_matches_single_user_detectors():
+    """Les événements d'immobilité et de chute sont ceux des détecteurs individuels"""
+    lats, lons = make_traces()
+    steps, users = lats.shape
+    user_ids = [f"user-{u}" for u in range(users)]
+
+    fleet = FleetDetector(capacity=8, time_threshold=120)
+    statics = [StaticAgent(10, 120) for _ in range(users)]
+    detectors = [FallDetector() for _ in range(users)]
+
+    fleet_events = set()
+    single_events = set()
+    for s in range(steps):
+        t = 1_700_000_000.0 + s
+        for user_id, event in fleet.update(user_ids, lats[s], lons[s], np.full(users, t)):
+            if event != EVENT_POST_FALL:
+                fleet_events.add((user_id, event, s))
+        for u in range(users):
+            position = (lats[s, u], lons[s, u])
+            if statics[u].update_position(position, t):
+                single_events.add((user_ids[u], EVENT_IMMOBILITY, s))
+            if detectors[u].update_position(position, t):
+                single_events.add((user_ids[u], EVENT_FALL, s))
+
+    kinds = {e[1] for e in fleet_events}
+    print(f"🚲 {len(fleet_events)} événements pour {users} utilisateurs: {sorted(kinds)}")
+    assert kinds == {EVENT_IMMOBILITY, EVENT_FALL}
+    assert fleet_events == single_events
+
+def test_post_fall_and_fall_info():
+    """Urgence post-chute après immobilité, détails de chute au format FallDetector"""
+    fleet = FleetDetector()
+    lat = 48.8566
+    t = 0.0
+    events = []
+    for _ in range(10):
+        events += fleet.update(["camille"], [lat], [2.3522], [t])
+        lat += 0.00005
+        t += 1.0
+    for _ in range(40):
+        events += fleet.update(["camille"], [lat], [2.3522], [t])
+        t += 1.0
+
+    assert events[0] == ("camille", EVENT_FALL)
+    assert ("camille", EVENT_POST_FALL) in events
+    info = fleet.fall_info("camille")
+    assert info['fall_type'] in ("chute_velo", "chute_haute_vitesse")
+    assert info['previous_speed'] > 15
+
+def test_duplicate_users_in_batch():
+    """Plusieurs positions d'un même utilisateur dans un lot sont traitées dans l'ordre"""
+    fleet = FleetDetector(time_threshold=5)
+    events = fleet.update(["a"] * 8 + ["b"], [48.0] * 9, [2.0] * 9,
+                          [0, 1, 2, 3, 4, 5, 6, 7, 0])
+    assert events == [("a", EVENT_IMMOBILITY)]
+    assert len(fleet) == 2
+
+if __name__ == "__main__":
+    test_fleet_matches_single_user_detectors()
+    test_post_fall_and_fall_info()
+    test_duplicate_users_in_batch()
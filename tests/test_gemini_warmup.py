@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test du démarrage non bloquant de l'agent Gemini (sonde de santé en arrière-plan)
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.gemini_agent import GeminiAgent
+
+class SlowProbeAgent(GeminiAgent):
+    """Agent dont la sonde de connectivité est lente (réseau simulé)"""
+    release = threading.Event()
+
+    def _initialize_api(self):
+        self.release.wait(5)
+        self._set_availability(self.AVAILABILITY_DOWN)
+
+def test_constructor_does_not_wait_for_probe():
+    """Le constructeur rend la main immédiatement en état inconnu"""
+    started = time.perf_counter()
+    agent = SlowProbeAgent({'gemini': {'api_key': 'test-key', 'probe_retry_interval': 3600}})
+    elapsed = time.perf_counter() - started
+
+    print(f"⚡ Construction en {elapsed*1000:.1f}ms, état: {agent.availability}")
+    assert elapsed < 0.5
+    assert agent.availability == GeminiAgent.AVAILABILITY_UNKNOWN
+    assert agent.is_available  # la première analyse tente l'API sans attendre
+
+    SlowProbeAgent.release.set()
+    assert agent.wait_until_ready(timeout=2) is False
+    assert not agent.is_available
+    agent.stop_health_probe()
+
+def test_analysis_not_blocked_by_probe():
+    """Une analyse pendant la sonde n'attend pas son résultat"""
+    SlowProbeAgent.release.clear()
+    agent = SlowProbeAgent({'gemini': {'api_key': 'YOUR_GEMINI_API_KEY'}})
+
+    started = time.perf_counter()
+    analysis = agent.analyze_emergency_situation("Je suis tombé et j'ai mal")
+    elapsed = time.perf_counter() - started
+
+    assert 1 <= analysis['urgency_level'] <= 10
+    assert elapsed < 1.0
+    SlowProbeAgent.release.set()
+    agent.stop_health_probe()
+
+def test_no_probe_without_api_key():
+    """Sans clé, l'agent est directement en mode simulation"""
+    agent = GeminiAgent({})
+    assert agent.availability == GeminiAgent.AVAILABILITY_DOWN
+    assert agent.wait_until_ready(timeout=0) is False
+
+if __name__ == "__main__":
+    test_constructor_does_not_wait_for_probe()
+    test_analysis_not_blocked_by_probe()
+    test_no_probe_without_api_key()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test du noyau géodésique vectorisé (convention (lat, lon) partout)
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.geodesy import (distance_m, distances_from, distance_matrix,
+                              consecutive_distances, track_length, sort_by_distance)
+from guardian.GPS_agent import haversine
+from guardian.emergency_locations import EmergencyLocationService
+
+PARIS = (48.8566, 2.3522)
+LONDON = (51.5074, -0.1278)
+
+def test_known_distance():
+    """Paris - Londres ≈ 343.5 km"""
+    distance = distance_m(PARIS, LONDON)
+    print(f"📏 Paris - Londres: {distance/1000:.1f} km")
+    assert abs(distance - 343_500) < 1000
+    # Ancienne API (longitude, latitude) conservée
+    assert haversine((PARIS[1], PARIS[0]), (LONDON[1], LONDON[0])) == distance
+
+def test_batch_matches_scalar():
+    """Les API vectorisées donnent les mêmes distances que le chemin scalaire"""
+    rng = np.random.default_rng(0)
+    points = np.column_stack([48.8 + rng.uniform(0, 0.1, 500), 2.3 + rng.uniform(0, 0.1, 500)])
+
+    one_to_many = distances_from(PARIS, points)
+    matrix = distance_matrix(points[:20], points[:30])
+    segments = consecutive_distances(points)
+
+    assert np.allclose(one_to_many, [distance_m(PARIS, p) for p in points])
+    assert matrix.shape == (20, 30)
+    assert np.isclose(matrix[3, 7], distance_m(points[3], points[7]))
+    assert np.allclose(segments, [distance_m(points[i - 1], points[i]) for i in range(1, 500)])
+    assert np.isclose(track_length(points), segments.sum())
+
+def test_sort_by_distance():
+    """Tri par distance, distances rendues dans l'ordre d'origine"""
+    order, distances = sort_by_distance(PARIS, [LONDON, (48.86, 2.35), PARIS])
+    assert list(order) == [2, 1, 0]
+    assert distances[2] == 0.0
+
+def test_places_distances_use_lat_lon():
+    """Les refuges trouvés via Places ont des distances (lat, lon) correctes"""
+    service = EmergencyLocationService({})
+    data = {'results': [
+        {'name': 'Pharmacie', 'vicinity': '', 'geometry': {'location': {'lat': 48.8576, 'lng': 2.3522}}},
+        {'name': 'Café', 'vicinity': '', 'geometry': {'location': {'lat': 48.8566, 'lng': 2.3622}}},
+    ]}
+    places = service._parse_places_response(data, PARIS, 'pharmacy')
+    assert places[0]['distance_m'] == int(distance_m(PARIS, (48.8576, 2.3522)))
+    assert 110 <= places[0]['distance_m'] <= 112
+    assert 730 <= places[1]['distance_m'] <= 733
+
+def test_refuges_sorted_by_distance_open_first():
+    """Refuges de tous types triés par distance à la position, lieux ouverts d'abord"""
+    service = EmergencyLocationService({})
+    refuges = [
+        {'name': 'Loin ouvert', 'is_open': True, 'location': {'lat': 48.8666, 'lng': 2.3522}},
+        {'name': 'Proche fermé', 'is_open': False, 'location': {'lat': 48.8567, 'lng': 2.3522}},
+        {'name': 'Proche ouvert', 'is_open': True, 'location': {'lat': 48.8576, 'lng': 2.3522}, 'distance_m': 9999},
+    ]
+    sorted_refuges = service._filter_and_sort_refuges(refuges, PARIS)
+    assert [r['name'] for r in sorted_refuges] == ['Proche ouvert', 'Loin ouvert', 'Proche fermé']
+    assert sorted_refuges[0]['distance_m'] == int(distance_m(PARIS, (48.8576, 2.3522)))
+    assert service._filter_and_sort_refuges([], PARIS) == []
+
+if __name__ == "__main__":
+    test_known_distance()
+    test_batch_matches_scalar()
+    test_sort_by_distance()
+    test_refuges_sorted_by_distance_open_first()
+    test_places_distances_use_lat_lon()
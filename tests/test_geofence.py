@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test des zones géographiques : index en grille, entrées/sorties, zones sûres
+"""
+
+import sys
+import os
+import random
+import time
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.geofence import (Geofence, GeofenceIndex, GeofenceMonitor,
+                               geofence_from_config, SAFE, CAUTION)
+
+HOME = (48.8566, 2.3522)
+
+
+def test_circle_and_polygon_membership():
+    """Appartenance exacte aux cercles et polygones"""
+    home = Geofence('maison', SAFE, center=HOME, radius_m=80)
+    square = Geofence('chantier', CAUTION,
+                      polygon=((48.860, 2.340), (48.860, 2.345), (48.865, 2.345), (48.865, 2.340)))
+
+    assert home.contains(HOME)
+    assert home.contains((HOME[0] + 50 / 111_320, HOME[1]))
+    assert not home.contains((HOME[0] + 120 / 111_320, HOME[1]))
+    assert square.contains((48.862, 2.342))
+    assert not square.contains((48.862, 2.347))
+
+
+def test_enter_exit_events_and_safe_zone():
+    """Événements d'entrée et de sortie, zone sûre courante"""
+    index = GeofenceIndex([
+        geofence_from_config({'id': 'maison', 'kind': 'safe', 'center': list(HOME), 'radius_m': 80}),
+        geofence_from_config({'id': 'parc', 'kind': 'caution',
+                              'polygon': [[48.850, 2.340], [48.850, 2.350], [48.855, 2.350], [48.855, 2.340]]})
+    ])
+    monitor = GeofenceMonitor(index)
+
+    events = monitor.update(HOME, 0)
+    assert [(e['type'], e['fence'].fence_id) for e in events] == [('enter', 'maison')]
+    assert monitor.in_safe_zone
+    assert monitor.update((HOME[0] + 10 / 111_320, HOME[1]), 10) == []
+
+    events = monitor.update((48.852, 2.345), 20)
+    assert sorted((e['type'], e['fence'].fence_id) for e in events) == [('enter', 'parc'), ('exit', 'maison')]
+    assert not monitor.in_safe_zone
+    assert monitor.inside == {'parc'}
+
+
+def test_index_matches_brute_force_with_many_fences():
+    """Avec 20 000 zones, l'index donne les mêmes résultats qu'un balayage complet"""
+    rng = random.Random(1)
+    fences = []
+    for i in range(20_000):
+        lat = 48.7 + rng.random() * 0.3
+        lon = 2.2 + rng.random() * 0.3
+        if i % 2:
+            fences.append(Geofence(i, SAFE, center=(lat, lon), radius_m=rng.uniform(20, 300)))
+        else:
+            d = rng.uniform(0.0005, 0.003)
+            fences.append(Geofence(i, CAUTION, polygon=((lat, lon), (lat, lon + d), (lat + d, lon + d / 2))))
+    index = GeofenceIndex(fences)
+    points = [(48.7 + rng.random() * 0.3, 2.2 + rng.random() * 0.3) for _ in range(500)]
+
+    started = time.perf_counter()
+    indexed = [sorted(f.fence_id for f in index.query(p)) for p in points]
+    elapsed = time.perf_counter() - started
+    brute = [sorted(f.fence_id for f in fences if f.contains(p)) for p in points[:50]]
+
+    print(f"🗺️ {len(points)} requêtes sur {len(index)} zones: {elapsed / len(points) * 1e6:.0f} µs/requête")
+    assert indexed[:50] == brute
+    assert any(indexed)
+    assert elapsed / len(points) < 0.005
+
+
+def test_remove_and_replace():
+    """Retrait et remplacement d'une zone"""
+    index = GeofenceIndex([Geofence('maison', SAFE, center=HOME, radius_m=80)])
+    index.add(Geofence('maison', SAFE, center=(48.9, 2.4), radius_m=80))
+    assert index.query(HOME) == []
+    assert len(index) == 1
+    assert index.remove('maison')
+    assert not index.remove('maison')
+    assert index.query((48.9, 2.4)) == []
+
+
+if __name__ == "__main__":
+    test_circle_and_polygon_membership()
+    test_enter_exit_events_and_safe_zone()
+    test_index_matches_brute_force_with_many_fences()
+    test_remove_and_replace()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test du pipeline d'ingestion GPS (NMEA, GPX, JSON-lines, socket UDP)
+"""
+
+import sys
+import os
+import io
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.gps_sources import GPSFix, read_nmea, read_gpx, read_jsonl, build_pipeline, open_source
+from guardian.GPS_agent import StaticAgent
+from guardian.clock import SimulatedClock
+from guardian.replay import replay_trace
+
+def nmea(body):
+    """Phrase NMEA avec somme de contrôle"""
+    checksum = 0
+    for char in body:
+        checksum ^= ord(char)
+    return f"${body}*{checksum:02X}"
+
+def test_nmea_rmc_and_gga():
+    """RMC et GGA d'une même époque donnent un seul fix après dédoublonnage"""
+    lines = [
+        nmea("GPRMC,123519.00,A,4851.396,N,00221.132,E,0.0,0.0,161026,,,A"),
+        nmea("GPGGA,123519.00,4851.396,N,00221.132,E,1,08,0.9,35.0,M,46.9,M,,"),
+        nmea("GNRMC,123520.00,V,,,,,,,161026,,,N"),          # pas de fix
+        "$GPRMC,123521.00,A,4851.396,N,00221.132,E,0.0,0.0,161026,,,A*00",  # somme fausse
+        nmea("GPGGA,123522.00,4851.400,N,00221.140,E,1,08,0.9,35.0,M,46.9,M,,"),
+    ]
+    stats = {}
+    fixes = list(build_pipeline(read_nmea(lines, stats), stats=stats))
+
+    expected_t = datetime(2026, 10, 16, 12, 35, 19, tzinfo=timezone.utc).timestamp()
+    assert len(fixes) == 2
+    assert fixes[0].timestamp == expected_t
+    assert abs(fixes[0].latitude - 48.8566) < 1e-4
+    assert abs(fixes[0].longitude - 2.3522) < 1e-4
+    assert fixes[1].timestamp == expected_t + 3
+    assert stats['duplicate'] == 1 and stats['invalid'] == 1 and stats['emitted'] == 2
+
+def test_gpx_streaming():
+    """Points de trace GPX avec et sans horodatage"""
+    gpx = """<?xml version="1.0"?>
+<gpx xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>
+  <trkpt lat="48.8566" lon="2.3522"><time>2026-10-16T08:00:00Z</time></trkpt>
+  <trkpt lat="48.8567" lon="2.3523"><time>2026-10-16T08:00:01Z</time></trkpt>
+  <trkpt lat="48.8568" lon="2.3524"></trkpt>
+</trkseg></trk></gpx>"""
+    fixes = list(read_gpx(io.StringIO(gpx)))
+    assert [f.position for f in fixes] == [(48.8566, 2.3522), (48.8567, 2.3523)]
+    assert fixes[1].timestamp - fixes[0].timestamp == 1.0
+
+def test_jsonl_out_of_order_and_rate_limit():
+    """Fixes hors d'ordre rejetés, débit limité en temps des fixes"""
+    lines = [
+        '{"lat": 48.85, "lon": 2.35, "timestamp": 100}',
+        '{"latitude": 48.85, "lng": 2.35, "t": 100.5}',
+        '{"lat": 48.85, "lon": 2.35, "timestamp": 99}',
+        'pas du json',
+        '{"lat": 48.85, "lon": 2.35, "time": "1970-01-01T00:01:42Z"}',
+    ]
+    stats = {}
+    fixes = list(build_pipeline(read_jsonl(lines, stats), min_interval=1.0, stats=stats))
+    assert [f.timestamp for f in fixes] == [100.0, 102.0]
+    assert stats == {'invalid': 1, 'out_of_order': 1, 'rate_limited': 1, 'emitted': 2}
+
+def test_pipeline_feeds_detectors_without_delay():
+    """Un flux à 10 Hz (10 minutes) alimente StaticAgent, sans attente ni mémoire croissante"""
+    lines = (f'{{"lat": 48.8566, "lon": 2.3522, "timestamp": {i / 10}}}' for i in range(6000))
+    fixes = build_pipeline(read_jsonl(lines), min_interval=1.0)
+
+    started = time.perf_counter()
+    events = replay_trace(fixes, static_agent=StaticAgent(10, 300, clock=SimulatedClock()))
+    elapsed = time.perf_counter() - started
+
+    print(f"📡 6000 fixes traités en {elapsed*1000:.0f}ms: {[e['type'] for e in events]}")
+    assert [e['type'] for e in events] == ['immobility']
+
+def test_udp_source():
+    """Lecture NMEA depuis un socket UDP"""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    stop = threading.Event()
+    received = []
+
+    def consume():
+        for fix in open_source(f"udp://127.0.0.1:{port}?format=nmea", stop_event=stop):
+            received.append(fix)
+            if len(received) == 2:
+                stop.set()
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    time.sleep(0.2)
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    payload = "\r\n".join([
+        nmea("GPRMC,080000.00,A,4851.396,N,00221.132,E,0.0,0.0,161026,,,A"),
+        nmea("GPRMC,080001.00,A,4851.397,N,00221.133,E,0.0,0.0,161026,,,A"),
+    ])
+    sender.sendto(payload.encode('ascii'), ("127.0.0.1", port))
+    sender.close()
+
+    consumer.join(timeout=3)
+    stop.set()
+    assert len(received) == 2
+    assert isinstance(received[0], GPSFix)
+
+if __name__ == "__main__":
+    test_nmea_rmc_and_gga()
+    test_gpx_streaming()
+    test_jsonl_out_of_order_and_rate_limit()
+    test_pipeline_feeds_detectors_without_delay()
+    test_udp_source()
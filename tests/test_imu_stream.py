@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test de la détection de chute par accéléromètre (fenêtres glissantes)
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.imu_stream import IMUFallDetector, IMUSample, read_imu_csv, GRAVITY
+
+def synthetic_stream(rate, segments, seed=0):
+    """Signal |a| par segments (durée s, magnitude g) avec bruit, axe z"""
+    rng = np.random.default_rng(seed)
+    samples = []
+    t = 0.0
+    for duration, magnitude_g, noise_g in segments:
+        for _ in range(int(duration * rate)):
+            value = (magnitude_g + rng.normal(0, noise_g)) * GRAVITY
+            samples.append(IMUSample(t, 0.0, 0.0, value))
+            t += 1.0 / rate
+    return samples
+
+FALL = [(3.0, 1.0, 0.05),    # marche
+        (0.3, 0.1, 0.02),    # chute libre
+        (0.04, 5.0, 0.1),    # impact
+        (0.3, 1.6, 0.3),     # rebonds
+        (3.0, 1.0, 0.01)]    # immobile au sol
+
+def test_fall_detected_under_one_second():
+    """Chute libre + impact + immobilité à 50, 100 et 200 Hz"""
+    for rate in (50, 100, 200):
+        detector = IMUFallDetector(sample_rate=rate, position_provider=lambda: (48.8566, 2.3522))
+        falls = list(detector.process(synthetic_stream(rate, FALL)))
+
+        assert len(falls) == 1, rate
+        fall = falls[0]
+        print(f"📉 {rate} Hz: pic {fall['peak_g']:.1f} g, chute libre {fall['free_fall_seconds']:.2f}s, "
+              f"latence {fall['detection_latency']:.2f}s")
+        assert fall['type'] == 'fall_detected'
+        assert fall['detection_latency'] < 1.0
+        assert abs(fall['impact_time'] - 3.3) < 0.05
+        assert fall['free_fall_seconds'] >= 0.25
+        assert fall['position'] == (48.8566, 2.3522)
+
+def test_no_fall_while_moving():
+    """Course (pics répétés sans immobilité) et pose du téléphone (pas d'impact)"""
+    running = [(0.15, 2.8, 0.2), (0.35, 0.7, 0.1)] * 20
+    set_down = [(2.0, 1.0, 0.05), (0.1, 1.8, 0.1), (3.0, 1.0, 0.01)]
+    for segments in (running, set_down):
+        detector = IMUFallDetector(sample_rate=100)
+        assert list(detector.process(synthetic_stream(100, segments))) == []
+
+def test_csv_reader():
+    lines = ["t,ax,ay,az", "0.00,0.1,0.2,9.8", "bad,line", "0.01,0.0,0.0,9.81"]
+    samples = list(read_imu_csv(lines))
+    assert samples == [IMUSample(0.0, 0.1, 0.2, 9.8), IMUSample(0.01, 0.0, 0.0, 9.81)]
+
+if __name__ == "__main__":
+    test_fall_detected_under_one_second()
+    test_no_fall_while_moving()
+    test_csv_reader()
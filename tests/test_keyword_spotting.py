@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test de la détection de mots-clés à grammaire restreinte
+"""
+
+import sys
+import os
+import json
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.keyword_spotting import KeywordSpotter, find_keyword, keyword_grammar, measure_decoding
+
+
+class ScriptedRecognizer:
+    """Reconnaisseur factice : chaque bloc audio est le texte 'entendu', b'.' termine la phrase"""
+
+    def __init__(self, grammar):
+        self.grammar = json.loads(grammar)
+        self.words = []
+        self.resets = 0
+
+    def AcceptWaveform(self, data):
+        if data == b".":
+            return True
+        self.words.append(data.decode())
+        return False
+
+    def _text(self):
+        return " ".join(w if w in self.grammar else "[unk]" for w in self.words)
+
+    def PartialResult(self):
+        return json.dumps({"partial": self._text()})
+
+    def Result(self):
+        text = self._text()
+        self.words = []
+        return json.dumps({"text": text})
+
+    def FinalResult(self):
+        return self.Result()
+
+    def Reset(self):
+        self.words = []
+        self.resets += 1
+
+
+def test_grammar_contains_keywords_and_unknown():
+    """Grammaire : mots-clés dédoublonnés en minuscules, puis [unk]"""
+    grammar = json.loads(keyword_grammar(["Aide", "urgence", "aide", "au secours"]))
+    assert grammar == ["aide", "urgence", "au secours", "[unk]"]
+
+
+def test_find_keyword_whole_words():
+    """Mots entiers uniquement : 'aide' ne se déclenche pas dans 'aider'"""
+    keywords = ["aide", "au secours"]
+    assert find_keyword("[unk] aide", keywords) == "aide"
+    assert find_keyword("[unk] au secours [unk]", keywords) == "au secours"
+    assert find_keyword("aider", keywords) is None
+    assert find_keyword("[unk] secours", keywords) is None
+
+
+def test_spotter_triggers_on_partial_result_once():
+    """Détection dès le résultat partiel, sans doublon au résultat final"""
+    events = []
+    spotter = KeywordSpotter(None, ["aide", "urgence"], on_keyword=lambda k, t: events.append(k),
+                             factory=ScriptedRecognizer)
+
+    assert spotter.accept(b"bonjour") is None
+    assert spotter.accept(b"aide") == "aide"        # partiel, avant la fin de phrase
+    assert spotter.accept(b".") is None             # décodage remis à zéro : pas de doublon
+    assert spotter.accept(b"urgence") == "urgence"
+    assert events == ["aide", "urgence"]
+    assert spotter.counts == {"aide": 1, "urgence": 1}
+    assert spotter.recognizer.resets == 2
+
+
+def test_measure_decoding_reports_real_time_factor():
+    """Facteur temps réel calculé sur la durée du signal PCM"""
+    recognizer = ScriptedRecognizer(keyword_grammar(["aide"]))
+    recognizer.AcceptWaveform = lambda data: False
+    result = measure_decoding(recognizer, b"\x00\x00" * 16000 * 2, samplerate=16000)
+    assert result['audio_seconds'] == 2.0
+    assert 0 <= result['rtf'] < 1 and 0 <= result['cpu_rtf'] < 1
+
+
+if __name__ == "__main__":
+    test_grammar_contains_keywords_and_unknown()
+    test_find_keyword_whole_words()
+    test_spotter_triggers_on_partial_result_once()
+    test_measure_decoding_reports_real_time_factor()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test de la mesure de latence des alertes (percentiles par étape, SLA < 7 s)
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.latency import LatencyHistogram, LatencyTracker
+
+class FakeClock:
+    """Horloge manuelle pour des durées déterministes"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_histogram_percentiles():
+    """Les percentiles respectent la précision des seaux logarithmiques"""
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 100.0)  # 0.01 s à 10 s
+
+    p50 = histogram.percentile(50)
+    p99 = histogram.percentile(99)
+    print(f"📊 p50={p50:.3f}s p99={p99:.3f}s max={histogram.max:.3f}s")
+
+    assert 5.0 <= p50 <= 5.0 * 1.13
+    assert 9.9 <= p99 <= 10.0
+    assert histogram.count == 1000
+
+def test_alert_trace_excludes_user_wait_from_sla():
+    """L'attente de réponse utilisateur n'entre pas dans le SLA de traitement"""
+    clock = FakeClock()
+    tracker = LatencyTracker(sla_seconds=7.0, clock=clock)
+
+    trace = tracker.start_trace("immobilité prolongée")
+    clock.now = 600.0  # 10 minutes sans réponse
+    trace.response_received()
+    with tracker.span("analysis"):
+        clock.now += 2.0
+    trace.notification_sent("sms")
+    clock.now += 1.0
+    trace.notification_sent("email")  # seule la première compte
+
+    report = tracker.report()
+    stages = report['stages']
+    assert stages['response_wait']['count'] == 1
+    assert stages['first_notification']['count'] == 1
+    assert stages['processing']['max'] == 2.0
+    assert report['sla_breaches'] == {}
+    assert report['sla_p99_ok']
+
+def test_sla_breach_flagged():
+    """Un traitement de plus de 7 s est signalé"""
+    clock = FakeClock()
+    tracker = LatencyTracker(sla_seconds=7.0, clock=clock)
+
+    trace = tracker.start_trace("chute")
+    trace.response_received()
+    with tracker.span("location_lookup"):
+        clock.now += 9.5
+    trace.notification_sent("sms")
+
+    report = tracker.report()
+    print(tracker.format_report())
+
+    assert report['sla_breaches'] == {"chute": 1}
+    assert not report['sla_p99_ok']
+    assert "⚠️ SLA" in tracker.format_report()
+
+if __name__ == "__main__":
+    test_histogram_percentiles()
+    test_alert_trace_excludes_user_wait_from_sla()
+    test_sla_breach_flagged()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test du rejeu accéléré des traces GPS (horloge injectable)
+"""
+
+import sys
+import os
+import time
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.clock import SimulatedClock
+from guardian.GPS_agent import StaticAgent
+from guardian.fall_detector import FallDetector
+from guardian.replay import replay_trace, sweep_thresholds
+
+def immobility_trace(duration=600, interval=10, start=1_700_000_000.0):
+    """Personne immobile à Paris pendant duration secondes"""
+    return [(start + t, 48.8566, 2.3522) for t in range(0, duration + 1, interval)]
+
+def bike_fall_trace(start=1_700_000_000.0):
+    """Vélo à ~20 km/h puis arrêt brutal et immobilité"""
+    trace = []
+    lat = 48.8566
+    for i in range(10):
+        trace.append((start + i, lat, 2.3522))
+        lat += 0.00005  # ~5.6 m/s
+    for i in range(10, 80):
+        trace.append((start + i, lat, 2.3522))
+    return trace
+
+def test_simulate_gps_does_not_sleep_with_simulated_clock():
+    """simulate_gps avance l'horloge simulée au lieu de dormir"""
+    clock = SimulatedClock()
+    agent = StaticAgent(distance_threshold=10, time_threshold=300, clock=clock)
+
+    started = time.perf_counter()
+    alert = False
+    for i, position in enumerate(agent.simulate_gps()):
+        if agent.update_position(position):
+            alert = True
+            break
+        if i > 100:
+            break
+    elapsed = time.perf_counter() - started
+
+    print(f"⏱️ 5 minutes d'immobilité simulées en {elapsed*1000:.1f}ms (horloge: {clock.now():.0f}s)")
+    assert alert
+    assert clock.now() >= 300
+    assert elapsed < 1.0
+
+def test_replay_immobility_uses_fix_timestamps():
+    """Les horodatages des fixes pilotent la détection d'immobilité"""
+    agent = StaticAgent(distance_threshold=10, time_threshold=300, clock=SimulatedClock())
+    events = replay_trace(immobility_trace(duration=600), static_agent=agent)
+
+    assert [e['type'] for e in events] == ['immobility']
+    assert events[0]['timestamp'] == 1_700_000_000.0 + 310
+
+def test_replay_fall_and_post_fall():
+    """Une chute à vélo suivie d'immobilité déclenche chute puis urgence post-chute"""
+    detector = FallDetector(clock=SimulatedClock())
+    events = replay_trace(bike_fall_trace(), fall_detector=detector)
+
+    types = [e['type'] for e in events]
+    print(f"🚴 Événements rejoués: {types}")
+    assert types[0] == 'fall'
+    assert 'post_fall' in types
+
+def test_threshold_sweep():
+    """Balayage d'une grille de seuils sur un corpus"""
+    traces = [immobility_trace(duration=d) for d in (120, 240, 360, 480)]
+    results = sweep_thresholds(traces, StaticAgent, {
+        'distance_threshold': [10],
+        'time_threshold': [100, 200, 300, 400]
+    })
+
+    alerted = [r['traces_with_events'] for r in results]
+    print(f"📊 Traces en alerte par seuil: {alerted}")
+    assert alerted == [4, 3, 2, 1]
+
+if __name__ == "__main__":
+    test_simulate_gps_does_not_sleep_with_simulated_clock()
+    test_replay_immobility_uses_fix_timestamps()
+    test_replay_fall_and_post_fall()
+    test_threshold_sweep()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test du tampon circulaire de positions (longueur de trajet cumulée en O(1))
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.ring_buffer import PositionRingBuffer
+from guardian.geodesy import track_length
+from guardian.fall_detector import FallDetector
+from guardian.clock import SimulatedClock
+
+def test_running_path_length_matches_full_recompute():
+    """La longueur cumulée reste égale au recalcul complet après de nombreux tours"""
+    rng = np.random.default_rng(7)
+    buffer = PositionRingBuffer(capacity=50)
+    lat, lon = 48.8566, 2.3522
+
+    for i in range(5000):
+        lat += rng.normal(0, 0.00005)
+        lon += rng.normal(0, 0.00005)
+        buffer.append(lat, lon, float(i))
+        if i % 250 == 0 or i == 4999:
+            expected = track_length(buffer.positions())
+            assert abs(buffer.path_length - expected) < 1e-6, (i, buffer.path_length, expected)
+
+    assert len(buffer) == 50
+    assert list(buffer.timestamps()) == [float(t) for t in range(4950, 5000)]
+    assert buffer.last()[1] == 4999.0
+
+def test_fall_detector_long_window():
+    """Une fenêtre d'une minute à 10 Hz pour la surveillance post-chute"""
+    clock = SimulatedClock()
+    detector = FallDetector(clock=clock, history_size=600)
+
+    t = 0.0
+    lat = 48.8566
+    for _ in range(50):           # vélo à ~20 km/h
+        detector.update_position((lat, 2.3522), t)
+        lat += 0.0000500
+        t += 1.0
+    fall_info = None
+    while fall_info is None and t < 60:
+        fall_info = detector.update_position((lat, 2.3522), t)
+        t += 0.1
+    assert fall_info is not None
+
+    status = None
+    while status is None and t < 200:
+        detector.update_position((lat, 2.3522), t)
+        status = detector.check_post_fall_status((lat, 2.3522), t)
+        t += 0.1
+
+    print(f"🚨 Urgence post-chute après {status['time_since_fall']:.1f}s, "
+          f"mouvement {status['movement_since_fall']:.1f}m")
+    assert status['status'] == 'immobile_prolongé'
+    assert len(detector.history) == 600
+
+if __name__ == "__main__":
+    test_running_path_length_matches_full_recompute()
+    test_fall_detector_long_window()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Test de l'orchestrateur multi-sessions : routage des positions et des
+réponses par session, isolation de l'état et questions non bloquantes
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.intelligent_advisor import IntelligentAdvisor, SmartResponseSystem
+from guardian.latency import LatencyTracker
+from guardian.session import GuardianSession
+from guardian.session_orchestrator import SessionOrchestrator
+from guardian.timer_scheduler import TimerScheduler
+
+PARIS = (48.8566, 2.3522)
+LYON = (45.7640, 4.8357)
+METERS_PER_DEGREE = 111320.0
+
+
+class RecordingAgent:
+    """Agent factice : enregistre chaque appel et renvoie result"""
+
+    def __init__(self, name, calls, result=True, **attributes):
+        self._name = name
+        self._calls = calls
+        self._result = result
+        self.__dict__.update(attributes)
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self._calls.append((self._name, method, args))
+            return self._result
+        return call
+
+
+class FakeServices:
+    """Services partagés factices (planificateur, latences et IA locale réels)"""
+
+    def __init__(self):
+        self.calls = []
+        self.emergency_response = RecordingAgent("emergency_response", self.calls)
+        self.speech_agent = RecordingAgent("speech", self.calls)
+        self.sms_agent = RecordingAgent("sms", self.calls)
+        self.gemini_agent = RecordingAgent("gemini", self.calls, is_available=False)
+        self.gmail_agent = RecordingAgent("gmail", self.calls, is_available=False)
+        self.intelligent_advisor = IntelligentAdvisor()
+        self.smart_response_system = SmartResponseSystem(self.intelligent_advisor)
+        self.emergency_locations = None
+        self.scheduler = TimerScheduler()
+        self.shutdown_event = threading.Event()
+        self.latency = LatencyTracker()
+        self.action_executor = None
+
+    def called(self, name, method):
+        return sum(1 for n, m, _ in self.calls if (n, m) == (name, method))
+
+    def shutdown(self):
+        self.shutdown_event.set()
+        self.scheduler.shutdown()
+
+
+def make_orchestrator(timeout_seconds=5, max_alert_workers=2):
+    services = FakeServices()
+    config = {
+        'emergency_response': {'timeout_seconds': timeout_seconds},
+        'static_agent': {'distance_threshold': 10, 'time_threshold': 60},
+    }
+    orchestrator = SessionOrchestrator(config, services=services, shards=4,
+                                       max_alert_workers=max_alert_workers)
+    return orchestrator, services
+
+
+def prompt_kinds(session):
+    return [kind for kind, _, _ in session.prompts]
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_positions_routed_to_their_session():
+    """Chaque position met à jour la seule session concernée ; pas d'alerte croisée"""
+    orchestrator, services = make_orchestrator()
+    try:
+        for t in range(0, 91, 10):
+            orchestrator.update_position("alice", PARIS, timestamp=t)
+            orchestrator.update_position("bob", (LYON[0] + t * 0.001, LYON[1]), timestamp=t)
+
+        alice, bob = orchestrator.get_session("alice"), orchestrator.get_session("bob")
+        assert isinstance(alice, GuardianSession) and orchestrator.session_count == 2
+        assert alice.current_position == PARIS and bob.current_position[1] == LYON[1]
+        assert alice.static_agent is not bob.static_agent
+        assert alice.track.points()[0].position == PARIS
+        assert bob.track.points()[0].position == LYON
+
+        # Alice immobile : une seule question, posée à Alice
+        assert wait_for(lambda: prompt_kinds(alice) == ["alert"] and alice.alert_trace is not None)
+        assert prompt_kinds(bob) == []
+        assert alice.alert_trace.trigger == "immobilité prolongée" and bob.alert_trace is None
+    finally:
+        orchestrator.shutdown()
+
+
+def test_alerts_do_not_park_alert_threads():
+    """Un seul thread d'alerte suffit pour des questions en attente sur plusieurs sessions"""
+    orchestrator, services = make_orchestrator(max_alert_workers=1)
+    try:
+        futures = [orchestrator.handle_alert(f"user-{i}", "mot-clé d'urgence détecté") for i in range(5)]
+        for future in futures:
+            future.result(timeout=2)
+        assert all(prompt_kinds(orchestrator.get_session(f"user-{i}")) == ["alert"] for i in range(5))
+        assert services.scheduler.pending_count == 5
+    finally:
+        orchestrator.shutdown()
+
+
+def test_answer_routed_to_its_session():
+    """'oui' de l'un clôt sa propre alerte ; l'autre reste en attente ; session inconnue refusée"""
+    orchestrator, services = make_orchestrator()
+    try:
+        orchestrator.handle_alert("alice", "mot-clé d'urgence détecté", PARIS).result(timeout=2)
+        orchestrator.handle_alert("bob", "mot-clé d'urgence détecté", LYON).result(timeout=2)
+
+        assert orchestrator.process_user_input("alice", "oui")
+        assert wait_for(lambda: services.called("emergency_response", "send_confirmation_alert") == 1)
+        assert prompt_kinds(orchestrator.get_session("alice")) == []
+        assert prompt_kinds(orchestrator.get_session("bob")) == ["alert"]
+        assert not orchestrator.process_user_input("inconnu", "oui")
+    finally:
+        orchestrator.shutdown()
+
+
+def test_negative_answer_then_details():
+    """'non' ouvre la demande de description ; le texte libre est analysé puis notifié"""
+    orchestrator, services = make_orchestrator()
+    try:
+        orchestrator.handle_alert("alice", "mot-clé d'urgence détecté", PARIS).result(timeout=2)
+        alice = orchestrator.get_session("alice")
+
+        orchestrator.process_user_input("alice", "non")
+        assert wait_for(lambda: prompt_kinds(alice) == ["details"])
+
+        orchestrator.process_user_input("alice", "je suis perdue dans le parc")
+        assert wait_for(lambda: services.called("emergency_response", "send_location_to_contacts") == 1)
+        assert prompt_kinds(alice) == []
+        assert any(handle.active for handle in alice.escalation_handles)
+    finally:
+        orchestrator.shutdown()
+
+
+def test_no_answer_times_out_into_emergency():
+    """Sans réponse, la minuterie déclenche l'urgence automatique"""
+    orchestrator, services = make_orchestrator(timeout_seconds=0.1)
+    try:
+        orchestrator.handle_alert("alice", "mot-clé d'urgence détecté", PARIS).result(timeout=2)
+        assert wait_for(lambda: services.called("emergency_response", "send_location_to_contacts") == 1)
+        assert orchestrator.get_session("alice").prompts == []
+    finally:
+        orchestrator.shutdown()
+
+
+def test_email_alert_traced_without_twilio():
+    """Sans Twilio, le premier email EmergencyResponse envoyé est mesuré ; un email échoué ne l'est pas"""
+    for email_sent in (True, False):
+        orchestrator, services = make_orchestrator(timeout_seconds=0.1)
+        services.sms_agent = RecordingAgent("sms", services.calls, result=False)
+        services.emergency_response = RecordingAgent("emergency_response", services.calls, result=email_sent)
+        try:
+            orchestrator.handle_alert("alice", "mot-clé d'urgence détecté", PARIS).result(timeout=2)
+            assert wait_for(lambda: services.called("emergency_response", "send_location_to_contacts") == 1)
+            time.sleep(0.05)
+
+            stages = services.latency.report()['stages']
+            if email_sent:
+                assert stages['first_notification']['count'] == 1
+                assert stages['processing']['count'] == 1
+                assert orchestrator.get_session("alice").alert_trace.notified
+            else:
+                assert 'first_notification' not in stages and 'processing' not in stages
+        finally:
+            orchestrator.shutdown()
+
+
+def test_fall_routed_to_alert_pool_and_session():
+    """Chute détectée sur le flux d'une session : countdown armé pour elle seule"""
+    orchestrator, services = make_orchestrator()
+    try:
+        lat, lon = PARIS
+        for t in range(4):  # ~20 km/h vers le nord
+            orchestrator.update_position("alice", (lat + 5.5 * t / METERS_PER_DEGREE, lon), timestamp=1000 + t)
+            orchestrator.update_position("bob", LYON, timestamp=1000 + t)
+        stop = orchestrator.get_session("alice").current_position
+        orchestrator.update_position("alice", stop, timestamp=1004)
+
+        alice, bob = orchestrator.get_session("alice"), orchestrator.get_session("bob")
+        assert wait_for(lambda: alice.fall_countdown is not None)
+        assert bob.fall_countdown is None
+
+        # Le 'non' répond au countdown de chute d'Alice (pas blessée)
+        orchestrator.process_user_input("alice", "non")
+        assert alice.fall_countdown is None
+        assert services.called("emergency_response", "send_fall_emergency_alert") == 0
+    finally:
+        orchestrator.shutdown()
+
+
+def test_post_fall_escalation_once():
+    """Chute puis longue immobilité : une seule urgence post-chute, pas d'alerte d'immobilité en plus"""
+    orchestrator, services = make_orchestrator()
+    services.intelligent_advisor = None  # analyse de chute par défaut (sans IA)
+    try:
+        lat, lon = PARIS
+        for t in range(4):  # ~20 km/h vers le nord
+            orchestrator.update_position("alice", (lat + 5.5 * t / METERS_PER_DEGREE, lon), timestamp=1000 + t)
+        stop = orchestrator.get_session("alice").current_position
+        orchestrator.update_position("alice", stop, timestamp=1004)
+        alice = orchestrator.get_session("alice")
+        assert wait_for(lambda: alice.fall_countdown is not None)
+
+        for t in range(1005, 1306, 5):  # 5 minutes immobile
+            orchestrator.update_position("alice", stop, timestamp=t)
+
+        assert wait_for(lambda: services.called("emergency_response", "send_fall_emergency_alert") == 1)
+        time.sleep(0.1)
+        assert services.called("emergency_response", "send_fall_emergency_alert") == 1
+        assert prompt_kinds(alice) == []
+    finally:
+        orchestrator.shutdown()
+
+
+def test_close_session_cancels_prompts():
+    """Fermer une session annule ses questions en attente"""
+    orchestrator, services = make_orchestrator()
+    try:
+        orchestrator.handle_alert("alice", "mot-clé d'urgence détecté").result(timeout=2)
+        assert services.scheduler.pending_count == 1
+        assert orchestrator.close_session("alice")
+        assert services.scheduler.pending_count == 0
+        assert orchestrator.get_session("alice") is None
+    finally:
+        orchestrator.shutdown()
+
+
+if __name__ == "__main__":
+    test_positions_routed_to_their_session()
+    test_alerts_do_not_park_alert_threads()
+    test_answer_routed_to_its_session()
+    test_negative_answer_then_details()
+    test_no_answer_times_out_into_emergency()
+    test_email_alert_traced_without_twilio()
+    test_fall_routed_to_alert_pool_and_session()
+    test_post_fall_escalation_once()
+    test_close_session_cancels_prompts()
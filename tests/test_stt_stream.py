@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test de la transcription en continu (flux WebSocket par client)
+"""
+
+import sys
+import os
+import json
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.stt_stream import StreamingTranscriber
+from guardian.vosk_models import PoolExhausted, RecognizerPool
+
+
+class WordRecognizer:
+    """Reconnaisseur factice : chaque trame non nulle ajoute un mot, une trame nulle termine l'énoncé"""
+
+    def __init__(self):
+        self.words = []
+        self.resets = 0
+
+    def AcceptWaveform(self, data):
+        if not any(data):
+            return True
+        self.words.append(f"mot{len(self.words) + 1}")
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": " ".join(self.words)})
+
+    def Result(self):
+        text, self.words = " ".join(self.words), []
+        return json.dumps({"text": text})
+
+    def FinalResult(self):
+        return self.Result()
+
+    def Reset(self):
+        self.words = []
+        self.resets += 1
+
+
+SPEECH = b"\x01\x00" * 1600   # 100 ms
+SILENCE = b"\x00\x00" * 1600
+
+
+def make_transcriber(size=2):
+    return StreamingTranscriber(RecognizerPool(None, size=size, factory=WordRecognizer))
+
+
+def test_partial_then_final_events():
+    """Partiels à chaque changement, final en fin d'énoncé, partiel remis à zéro"""
+    transcriber = make_transcriber()
+    transcriber.start("client-a", samplerate=16000)
+
+    assert transcriber.feed("client-a", SPEECH) == [('partial', {'text': 'mot1'})]
+    assert transcriber.feed("client-a", memoryview(SPEECH)) == [('partial', {'text': 'mot1 mot2'})]
+    assert transcriber.feed("client-a", SILENCE) == [('final', {'text': 'mot1 mot2'})]
+    assert transcriber.feed("client-a", SPEECH) == [('partial', {'text': 'mot1'})]
+    assert transcriber.stop("client-a") == [('final', {'text': 'mot1'})]
+    assert transcriber.stats()['finals'] == 2
+
+
+def test_sessions_decode_independently():
+    """Deux clients simultanés : états de décodage séparés, reconnaisseurs rendus au pool"""
+    transcriber = make_transcriber()
+    transcriber.start("a")
+    transcriber.start("b")
+    transcriber.feed("a", SPEECH)
+    transcriber.feed("a", SPEECH)
+    assert transcriber.feed("b", SPEECH) == [('partial', {'text': 'mot1'})]
+    assert transcriber.active == 2
+
+    transcriber.stop("a")
+    transcriber.stop("b")
+    assert transcriber.active == 0
+    assert transcriber.pool.stats()['in_use'] == 0
+
+
+def test_pool_exhausted_rejects_immediately():
+    """Pool plein : refus immédiat ; un départ (déconnexion) libère une place"""
+    transcriber = make_transcriber(size=1)
+    transcriber.start("a")
+    try:
+        transcriber.start("b")
+        assert False, "PoolExhausted attendu"
+    except PoolExhausted:
+        pass
+
+    assert transcriber.stop("a") == []
+    transcriber.start("b")
+    assert transcriber.active == 1
+
+
+def test_concurrent_start_releases_replaced_stream():
+    """Deux stt_start simultanés pour une session : le flux remplacé rend son reconnaisseur"""
+    transcriber = make_transcriber(size=2)
+    acquire = transcriber.pool.acquire
+    calls = []
+
+    def acquire_with_concurrent_start(timeout=None):
+        recognizer = acquire(timeout)
+        calls.append(recognizer)
+        if len(calls) == 1:
+            transcriber.start("a")  # second stt_start arrivé pendant le premier
+        return recognizer
+
+    transcriber.pool.acquire = acquire_with_concurrent_start
+    transcriber.start("a")
+    assert transcriber.active == 1
+    assert transcriber.pool.stats()['in_use'] == 1
+    transcriber.stop("a")
+    assert transcriber.pool.stats()['in_use'] == 0
+
+
+def test_invalid_frames_and_unknown_session():
+    """Trames vides, impaires ou trop longues refusées ; session inconnue ou fermée → KeyError"""
+    transcriber = make_transcriber()
+    for bad_rate in (8000, 44100):
+        try:
+            transcriber.start("a", samplerate=bad_rate)
+            assert False, "ValueError attendu"
+        except ValueError:
+            pass
+
+    transcriber.start("a")
+    for frame in (b"", b"\x01\x00\x01", b"\x01\x00" * (2 * 16000 + 1)):
+        try:
+            transcriber.feed("a", frame)
+            assert False, "ValueError attendu"
+        except ValueError:
+            pass
+
+    transcriber.stop("a")
+    try:
+        transcriber.feed("a", SPEECH)
+        assert False, "KeyError attendu"
+    except KeyError:
+        pass
+    assert transcriber.stop("a") == []
+
+
+if __name__ == "__main__":
+    test_partial_then_final_events()
+    test_sessions_decode_independently()
+    test_pool_exhausted_rejects_immediately()
+    test_concurrent_start_releases_replaced_stream()
+    test_invalid_frames_and_unknown_session()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test du planificateur central de minuteries (escalades, countdowns)
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.timer_scheduler import TimerScheduler
+
+def test_timers_fire_in_deadline_order():
+    """Les minuteries se déclenchent dans l'ordre des échéances"""
+    scheduler = TimerScheduler()
+    fired = []
+    done = threading.Event()
+
+    scheduler.schedule(0.15, fired.append, "escalade")
+    scheduler.schedule(0.05, fired.append, "countdown")
+    scheduler.schedule(0.25, lambda: done.set())
+
+    assert scheduler.pending_count == 3
+    assert done.wait(2.0)
+    time.sleep(0.05)
+
+    print(f"⏱️  Ordre de déclenchement: {fired}")
+    assert fired == ["countdown", "escalade"]
+    assert scheduler.pending_count == 0
+    scheduler.shutdown()
+
+def test_cancel_and_reschedule():
+    """Annulation et reprogrammation d'une escalade"""
+    scheduler = TimerScheduler()
+    fired = []
+
+    cancelled = scheduler.schedule(0.05, fired.append, "annulée")
+    moved = scheduler.schedule(10.0, fired.append, "reprogrammée")
+
+    assert cancelled.cancel()
+    assert not cancelled.cancel()
+    assert moved.reschedule(0.05)
+    assert scheduler.pending_count == 1
+
+    time.sleep(0.3)
+    print(f"✅ Minuteries déclenchées: {fired}")
+    assert fired == ["reprogrammée"]
+    assert not moved.active
+    assert not moved.reschedule(1.0)
+    scheduler.shutdown()
+
+def test_many_pending_timers_single_thread():
+    """Des milliers d'escalades n'ajoutent aucun thread"""
+    scheduler = TimerScheduler()
+    threads_before = threading.active_count()
+
+    handles = [scheduler.schedule(600, lambda: None) for _ in range(5000)]
+    assert scheduler.pending_count == 5000
+    assert threading.active_count() == threads_before
+
+    for handle in handles[:4000]:
+        handle.cancel()
+
+    print(f"📊 Minuteries en attente: {scheduler.pending_count}, entrées du tas: {len(scheduler._heap)}")
+    assert scheduler.pending_count == 1000
+    assert len(scheduler._heap) <= 2 * 1000 + 64
+    scheduler.shutdown()
+
+if __name__ == "__main__":
+    test_timers_fire_in_deadline_order()
+    test_cancel_and_reschedule()
+    test_many_pending_timers_single_thread()
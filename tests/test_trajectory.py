@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test de la compression de trajectoires (simplification et format binaire)
+"""
+
+import sys
+import os
+import json
+import math
+import random
+import xml.etree.ElementTree as ET
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.gps_sources import GPSFix
+from guardian.trajectory import (TrackRecorder, decode_track, douglas_peucker,
+                                 encode_track, simplify_online, to_gpx, _segment_distances)
+
+START = 1_700_000_000.0
+METERS_PER_DEGREE = 111_195.0
+
+
+def walk_trace(seconds=1800, seed=0):
+    """Marche urbaine à 1 Hz : rues droites, virages à angle droit, bruit GPS ~1 m"""
+    rng = random.Random(seed)
+    lat, lon = 48.8566, 2.3522
+    lon_scale = METERS_PER_DEGREE * math.cos(math.radians(lat))
+    heading = 0.0
+    trace = []
+    for t in range(seconds):
+        if t % 120 == 0 and t:
+            heading += rng.choice((-90.0, 90.0))
+        lat += 1.3 * math.cos(math.radians(heading)) / METERS_PER_DEGREE
+        lon += 1.3 * math.sin(math.radians(heading)) / lon_scale
+        noise_lat = rng.uniform(-1, 1) / METERS_PER_DEGREE
+        noise_lon = rng.uniform(-1, 1) / lon_scale
+        trace.append(GPSFix(START + t, lat + noise_lat, lon + noise_lon))
+    return trace
+
+
+def max_error(trace, kept):
+    """Écart maximal (m) entre chaque point de la trace et la trace simplifiée"""
+    times = [p.timestamp for p in kept]
+    worst = 0.0
+    for a, b in zip(kept[:-1], kept[1:]):
+        inner = [p for p in trace if a.timestamp <= p.timestamp <= b.timestamp]
+        distances = _segment_distances([p.latitude for p in inner], [p.longitude for p in inner],
+                                       a.position, b.position)
+        worst = max(worst, float(distances.max()))
+    assert times == sorted(times)
+    return worst
+
+
+def test_douglas_peucker_error_bound():
+    """Douglas-Peucker : erreur bornée, forte réduction"""
+    trace = walk_trace()
+    indices = douglas_peucker([p.position for p in trace], tolerance_m=5.0)
+    kept = [trace[i] for i in indices]
+
+    print(f"✂️ Douglas-Peucker: {len(trace)} -> {len(kept)} points")
+    assert indices[0] == 0 and indices[-1] == len(trace) - 1
+    assert max_error(trace, kept) <= 5.0 + 1e-6
+    assert len(kept) < len(trace) / 10
+
+
+def test_online_simplifier_error_bound():
+    """Simplification en ligne : erreur bornée, dernier point conservé"""
+    trace = walk_trace()
+    kept = simplify_online(trace, tolerance_m=5.0)
+
+    print(f"✂️ En ligne: {len(trace)} -> {len(kept)} points")
+    assert kept[0] == trace[0] and kept[-1] == trace[-1]
+    assert max_error(trace, kept) <= 5.0 + 1e-6
+    assert len(kept) < len(trace) / 10
+
+
+def test_binary_round_trip_and_size():
+    """Format binaire : aller-retour à 0,11 m / 1 ms près, bien plus compact que JSON"""
+    trace = walk_trace()
+    data = encode_track(trace)
+    decoded = decode_track(data)
+
+    assert len(decoded) == len(trace)
+    for original, restored in zip(trace, decoded):
+        assert abs(original.timestamp - restored.timestamp) < 1e-3
+        assert abs(original.latitude - restored.latitude) < 1e-6
+        assert abs(original.longitude - restored.longitude) < 1e-6
+
+    raw = json.dumps([list(p) for p in trace]).encode()
+    print(f"📦 {len(trace)} points: JSON {len(raw)} octets, binaire {len(data)} octets")
+    assert len(data) < len(raw) / 5
+
+    try:
+        decode_track(b'XXXX' + data[4:])
+        assert False, "en-tête invalide accepté"
+    except ValueError:
+        pass
+
+
+def test_recorder_keeps_last_30_minutes_compactly():
+    """TrackRecorder : 30 min de trace, dernière position incluse, quelques centaines d'octets"""
+    trace = walk_trace(seconds=3600)
+    recorder = TrackRecorder(tolerance_m=5.0, retention_seconds=1800)
+    for fix in trace:
+        recorder.append(*fix)
+
+    points = recorder.points()
+    assert points[-1] == trace[-1]
+    assert points[0].timestamp <= trace[-1].timestamp - 1800
+    assert points[1].timestamp > trace[-1].timestamp - 1800
+
+    payload = recorder.export()
+    print(f"🗺️ 30 min de trace: {len(points)} points, {len(payload)} octets ; {recorder.summary()}")
+    assert len(payload) < 1024
+    assert decode_track(payload)[-1].timestamp == trace[-1].timestamp
+    assert "dernières minutes" in recorder.summary()
+
+    since = trace[-1].timestamp - 600
+    assert all(p.timestamp >= since for p in recorder.points(since))
+
+
+def test_gpx_export_for_alert_attachment():
+    """Trace simplifiée en GPX : un trkpt par point gardé, horodatages UTC"""
+    recorder = TrackRecorder()
+    for fix in walk_trace(seconds=600):
+        recorder.append(*fix)
+    points = recorder.points()
+
+    root = ET.fromstring(recorder.gpx().encode('utf-8'))
+    ns = {'gpx': 'http://www.topografix.com/GPX/1/1'}
+    trkpts = root.findall('.//gpx:trkpt', ns)
+    assert len(trkpts) == len(points)
+    assert abs(float(trkpts[-1].get('lat')) - points[-1].latitude) < 1e-6
+    assert trkpts[0].find('gpx:time', ns).text == "2023-11-14T22:13:20Z"
+    assert "&amp;" in to_gpx(points[:2], name="Alice & Bob")
+
+
+if __name__ == "__main__":
+    test_douglas_peucker_error_bound()
+    test_online_simplifier_error_bound()
+    test_binary_round_trip_and_size()
+    test_recorder_keeps_last_30_minutes_compactly()
+    test_gpx_export_for_alert_attachment()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test de la détection d'activité vocale devant Vosk
+"""
+
+import sys
+import os
+import json
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.vad import GatedRecognizer, VoiceActivityGate
+
+SAMPLERATE = 16000
+
+
+def noise(rng, seconds, level=100.0):
+    return rng.normal(0, level, int(seconds * SAMPLERATE))
+
+
+def voiced(rng, seconds, amplitude=4000.0, level=100.0):
+    """Voyelle synthétique : harmoniques de 150 Hz modulées à 4 Hz (syllabes) sur bruit de fond"""
+    t = np.arange(int(seconds * SAMPLERATE)) / SAMPLERATE
+    harmonics = sum(np.sin(2 * np.pi * 150 * (k + 1) * t) / (k + 1) for k in range(4))
+    syllables = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    return amplitude * harmonics * syllables + noise(rng, seconds, level)
+
+
+def to_pcm(signal):
+    return np.clip(signal, -32768, 32767).astype('<i2').tobytes()
+
+
+def scene(level=100.0, seed=0):
+    """5 s de rue calme, 1,5 s de parole, 5 s de calme, 1 s de parole, 3 s de calme"""
+    rng = np.random.default_rng(seed)
+    return to_pcm(np.concatenate([noise(rng, 5, level), voiced(rng, 1.5, level=level), noise(rng, 5, level),
+                                  voiced(rng, 1.0, level=level), noise(rng, 3, level)]))
+
+
+def blocks(pcm, size=16000):
+    return [pcm[i:i + size] for i in range(0, len(pcm), size)]
+
+
+class RecordingRecognizer:
+    """Reconnaisseur factice : enregistre l'audio reçu, 'texte' = nombre d'octets du segment"""
+
+    def __init__(self):
+        self.received = 0
+        self.segment = 0
+        self.finals = 0
+
+    def AcceptWaveform(self, data):
+        self.received += len(data)
+        self.segment += len(data)
+        return False
+
+    def PartialResult(self):
+        return json.dumps({"partial": ""})
+
+    def FinalResult(self):
+        self.finals += 1
+        text, self.segment = str(self.segment), 0
+        return json.dumps({"text": text})
+
+    def Result(self):
+        return self.FinalResult()
+
+    def Reset(self):
+        self.segment = 0
+
+
+def test_gate_keeps_speech_with_preroll_and_hangover():
+    """Deux segments de parole, chacun allongé du pré-roll et du maintien"""
+    gate = VoiceActivityGate(SAMPLERATE, hangover_ms=300, preroll_ms=200)
+    segments = []
+    current = 0
+    for block in blocks(scene()):
+        for audio, ended in gate.process(block):
+            current += len(audio)
+            if ended:
+                segments.append(current / (2 * SAMPLERATE))
+                current = 0
+
+    print(f"🗣️ Segments: {segments}, parole {gate.speech_ratio:.0%}")
+    assert len(segments) == 2
+    assert 1.5 < segments[0] < 1.5 + 0.2 + 0.3 + 0.1
+    assert 1.0 < segments[1] < 1.0 + 0.2 + 0.3 + 0.1
+    assert 0.1 < gate.speech_ratio < 0.2
+
+
+def test_gate_adapts_to_loud_background():
+    """Souffle continu fort : le bruit de fond s'adapte, la porte se referme"""
+    gate = VoiceActivityGate(SAMPLERATE)
+    rng = np.random.default_rng(1)
+    hiss = blocks(to_pcm(noise(rng, 20, level=2000)))
+    for block in hiss[:20]:
+        gate.process(block)
+    forwarded = sum(len(audio) for block in hiss[20:] for audio, _ in gate.process(block))
+    assert forwarded == 0
+
+
+def test_gated_recognizer_decodes_only_speech():
+    """Seule la parole atteint Vosk ; chaque fin de segment produit un résultat final"""
+    inner = RecordingRecognizer()
+    recognizer = GatedRecognizer(inner)
+    pcm = scene()
+    results = []
+    for block in blocks(pcm):
+        if recognizer.AcceptWaveform(block):
+            results.append(json.loads(recognizer.Result())["text"])
+
+    stats = recognizer.stats()
+    print(f"⚡ VAD: {stats}")
+    assert len(results) == 2 and inner.finals == 2
+    assert inner.received < len(pcm) / 4
+    assert abs(stats['received_seconds'] - len(pcm) / (2 * SAMPLERATE)) < 1e-6
+    assert stats['skipped_seconds'] > 10
+    assert stats['gate_cpu_seconds'] > 0
+
+
+def test_reset_clears_pending_results_and_segment():
+    """Reset() : résultats en attente et segment en cours oubliés (retour au pool)"""
+    recognizer = GatedRecognizer(RecordingRecognizer())
+    for block in blocks(scene())[:14]:
+        recognizer.AcceptWaveform(block)
+    recognizer.Reset()
+    assert not recognizer.gate.active
+    assert recognizer.AcceptWaveform(to_pcm(np.zeros(SAMPLERATE))) is False
+
+
+if __name__ == "__main__":
+    test_gate_keeps_speech_with_preroll_and_hangover()
+    test_gate_adapts_to_loud_background()
+    test_gated_recognizer_decodes_only_speech()
+    test_reset_clears_pending_results_and_segment()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test du décodage en flux de VoiceConversationAgent (chaque bloc décodé une seule fois)
+"""
+
+import sys
+import os
+import json
+
+import numpy as np
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.audio_capture import AudioRingBuffer
+from guardian.vad import VoiceActivityGate
+from guardian.voice_conversation_agent import VoiceConversationAgent
+
+SAMPLERATE = 16000
+
+
+class CountingRecognizer:
+    """Reconnaisseur factice : énoncé terminé après 2 s d'audio, partiels entre-temps"""
+
+    def __init__(self):
+        self.fed = 0
+        self.utterance = 0
+        self.partials = 0
+
+    def AcceptWaveform(self, data):
+        assert isinstance(data, bytes)
+        self.fed += len(data)
+        self.utterance += len(data)
+        return self.utterance >= 2 * 2 * SAMPLERATE
+
+    def PartialResult(self):
+        self.partials += 1
+        return json.dumps({"partial": f"{self.utterance // 32000} secondes"})
+
+    def Result(self):
+        self.utterance = 0
+        return json.dumps({"text": "j'ai besoin d'aide"})
+
+    def Reset(self):
+        self.utterance = 0
+
+
+def make_agent(recognition_type):
+    agent = VoiceConversationAgent({}, vosk_model_path='/nonexistent')
+    agent.recognition_type = recognition_type
+    agent.is_listening = True
+    ring = AudioRingBuffer(capacity_bytes=20 * 2 * SAMPLERATE)
+    agent._reader = ring.reader()
+    return agent, ring
+
+
+def test_vosk_stream_feeds_each_chunk_once():
+    """Vosk : 2 s d'audio décodées une seule fois, partiels transmis, texte final rendu"""
+    agent, ring = make_agent("vosk")
+    agent.vosk_recognizer = CountingRecognizer()
+    partials = []
+    agent.on_partial_result = partials.append
+
+    ring.write(b"\x00\x00" * 3 * SAMPLERATE)  # 3 s d'audio disponibles
+    text = agent._process_audio_queue()
+
+    assert text == "j'ai besoin d'aide"
+    assert agent.vosk_recognizer.fed == 2 * 2 * SAMPLERATE   # ni plus, ni re-décodage
+    assert partials == ["0 secondes", "1 secondes"]
+
+
+def test_google_stt_receives_one_batch_per_segment():
+    """Google STT : un seul appel par segment de parole, silence exclu"""
+    agent, ring = make_agent("google_stt")
+    agent._segmenter = VoiceActivityGate(SAMPLERATE)
+    calls = []
+    agent._recognize_with_google_stt = lambda segment: calls.append(len(segment)) or "au secours"
+
+    rng = np.random.default_rng(0)
+    t = np.arange(SAMPLERATE) / SAMPLERATE
+    speech = 4000 * np.sin(2 * np.pi * 150 * t) + rng.normal(0, 100, SAMPLERATE)
+    signal = np.concatenate([rng.normal(0, 100, 2 * SAMPLERATE), speech, rng.normal(0, 100, 2 * SAMPLERATE)])
+    ring.write(np.clip(signal, -32768, 32767).astype('<i2').tobytes())
+
+    assert agent._process_audio_queue() == "au secours"
+    assert len(calls) == 1
+    assert 2 * SAMPLERATE <= calls[0] < 2 * 2 * SAMPLERATE  # ~1 s de parole + pré-roll et maintien
+
+
+def test_speaking_discards_current_utterance():
+    """Si Guardian parle, l'énoncé en cours est abandonné"""
+    agent, ring = make_agent("vosk")
+    agent.vosk_recognizer = CountingRecognizer()
+    agent.vosk_recognizer.utterance = 1000
+    agent.is_speaking = True
+    ring.write(b"\x00\x00" * SAMPLERATE)
+
+    assert agent._process_audio_queue() is None
+    assert agent.vosk_recognizer.utterance == 0 and agent.vosk_recognizer.fed == 0
+
+
+if __name__ == "__main__":
+    test_vosk_stream_feeds_each_chunk_once()
+    test_google_stt_receives_one_batch_per_segment()
+    test_speaking_discards_current_utterance()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test du registre des modèles Vosk (chargement unique, paresseux et partagé)
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from guardian.vosk_models import ModelRegistry, PoolExhausted, RecognizerPool
+
+
+class CountingLoader:
+    """Chargeur lent qui compte ses appels (remplace vosk.Model)"""
+
+    def __init__(self, delay=0.05, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path)
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("modèle corrompu")
+        return object()
+
+
+def test_model_loaded_once_and_shared():
+    """Un seul chargement même avec des appels concurrents et des chemins équivalents"""
+    loader = CountingLoader()
+    registry = ModelRegistry(loader)
+    with tempfile.TemporaryDirectory() as model_dir:
+        assert not registry.is_loaded(model_dir)  # rien n'est chargé avant usage
+
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(registry.get(model_dir)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        models.append(registry.get(os.path.join(model_dir, '.', '')))
+
+        assert len(loader.calls) == 1
+        assert all(model is models[0] for model in models)
+        assert registry.is_loaded(model_dir)
+
+        stats = registry.stats()[os.path.realpath(model_dir)]
+        assert stats['requests'] == 9
+        assert stats['load_seconds'] >= 0.05
+        print(registry.format_report())
+
+
+def test_missing_model_and_failed_load():
+    """Chemin absent : FileNotFoundError ; échec de chargement : nouvel essai au prochain appel"""
+    loader = CountingLoader(delay=0, failures=1)
+    registry = ModelRegistry(loader)
+    try:
+        registry.get('/nonexistent/vosk-model')
+        assert False, "modèle absent accepté"
+    except FileNotFoundError:
+        pass
+    assert loader.calls == []
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        try:
+            registry.get(model_dir)
+            assert False, "erreur de chargement masquée"
+        except RuntimeError:
+            pass
+        assert not registry.is_loaded(model_dir)
+        assert registry.get(model_dir) is not None
+        assert len(loader.calls) == 2
+
+
+def test_background_preload():
+    """Le préchargement ne bloque pas ; get() attend le chargement en cours"""
+    loader = CountingLoader(delay=0.2)
+    registry = ModelRegistry(loader)
+    with tempfile.TemporaryDirectory() as model_dir:
+        started = time.perf_counter()
+        thread = registry.preload([model_dir, '/nonexistent/vosk-model'])
+        assert time.perf_counter() - started < 0.1
+
+        model = registry.get(model_dir)
+        thread.join(timeout=5)
+        assert model is registry.get(model_dir)
+        assert len(loader.calls) == 1
+
+
+class FakeRecognizer:
+    """Reconnaisseur factice : accumule l'audio reçu jusqu'au Reset()"""
+
+    def __init__(self):
+        self.buffer = b""
+        self.resets = 0
+
+    def AcceptWaveform(self, data):
+        self.buffer += data
+        return False
+
+    def Reset(self):
+        self.buffer = b""
+        self.resets += 1
+
+
+def test_recognizer_pool_isolates_parallel_requests():
+    """Requêtes parallèles : un reconnaisseur chacune, remis à zéro au retour"""
+    pool = RecognizerPool(model=None, size=3, factory=FakeRecognizer)
+    transcripts = {}
+    barrier = threading.Barrier(3)
+
+    def transcribe(user):
+        with pool.checkout(timeout=1) as rec:
+            barrier.wait(timeout=1)  # les trois requêtes décodent en même temps
+            for _ in range(50):
+                rec.AcceptWaveform(user.encode())
+            transcripts[user] = rec.buffer
+
+    threads = [threading.Thread(target=transcribe, args=(user,)) for user in "abc"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert transcripts == {user: user.encode() * 50 for user in "abc"}
+    stats = pool.stats()
+    assert stats['created'] == 3 and stats['in_use'] == 0 and stats['acquired'] == 3
+
+    with pool.checkout() as rec:
+        assert rec.buffer == b"" and rec.resets >= 1
+
+
+def test_recognizer_pool_back_pressure():
+    """Pool épuisé : attente bornée, puis refus ; file d'attente plafonnée"""
+    pool = RecognizerPool(model=None, size=1, max_waiting=1, factory=FakeRecognizer)
+    held = pool.acquire()
+
+    started = time.perf_counter()
+    try:
+        pool.acquire(timeout=0.1)
+        assert False, "pool épuisé accepté"
+    except PoolExhausted:
+        pass
+    assert time.perf_counter() - started >= 0.1
+
+    # Un emprunteur en attente : le suivant est refusé sans attendre
+    waiter = threading.Thread(target=lambda: pool.release(pool.acquire(timeout=2)))
+    waiter.start()
+    time.sleep(0.05)
+    started = time.perf_counter()
+    try:
+        pool.acquire(timeout=2)
+        assert False, "file d'attente pleine acceptée"
+    except PoolExhausted:
+        pass
+    assert time.perf_counter() - started < 0.05
+
+    time.sleep(0.05)
+    pool.release(held)
+    waiter.join(timeout=2)
+
+    stats = pool.stats()
+    print(f"🎛️ Pool: {stats}")
+    assert stats['rejected'] == 2 and stats['acquired'] == 2
+    assert stats['wait_max'] >= 0.1
+
+
+if __name__ == "__main__":
+    test_model_loaded_once_and_shared()
+    test_missing_model_and_failed_load()
+    test_background_preload()
+    test_recognizer_pool_isolates_parallel_requests()
+    test_recognizer_pool_back_pressure()
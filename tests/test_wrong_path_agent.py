@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test de l'agent de déviation d'itinéraire (recherche locale des segments)
+"""
+
+import sys
+import os
+import time
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from guardian.clock import SimulatedClock
+from guardian.geodesy import decode_polyline
+from guardian.wrong_path_agent import WrongPathAgent
+
+START = (48.8566, 2.3522)
+METERS_PER_DEGREE = 111_195.0
+
+
+def straight_route(length_m=2000, step_m=20):
+    """Itinéraire vers l'est, un point tous les step_m mètres"""
+    lon_scale = METERS_PER_DEGREE * np.cos(np.radians(START[0]))
+    return [(START[0], START[1] + d / lon_scale) for d in np.arange(0, length_m + step_m, step_m)]
+
+
+def offset(point, north_m=0.0, east_m=0.0):
+    lon_scale = METERS_PER_DEGREE * np.cos(np.radians(point[0]))
+    return (point[0] + north_m / METERS_PER_DEGREE, point[1] + east_m / lon_scale)
+
+
+def test_decode_polyline():
+    """Décodage d'une polyligne encodée Google"""
+    points = decode_polyline('_p~iF~ps|U_ulLnnqC_mqNvxq`@')
+    assert points == [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+
+
+def test_on_route_then_sustained_deviation():
+    """Pas d'alerte sur l'itinéraire ; alerte unique après une déviation durable"""
+    route = straight_route()
+    agent = WrongPathAgent(deviation_threshold=50, sustained_seconds=30, clock=SimulatedClock())
+    assert agent.set_route(route)
+
+    # Sur l'itinéraire, avec un écart latéral de 20 m
+    for t, point in enumerate(route[:40]):
+        assert not agent.update_position(offset(point, north_m=20), t)
+        assert agent.last_distance < 25
+    assert agent.progress_m > 700
+
+    # Écart de 120 m : alerte après 30 s, une seule fois
+    alerts = [agent.update_position(offset(route[40], north_m=120), 40 + t) for t in range(60)]
+    assert alerts.count(True) == 1
+    assert alerts.index(True) == 30
+
+    # Retour sur l'itinéraire : l'épisode se termine
+    assert not agent.update_position(route[45], 101)
+    assert agent.off_route_since is None
+
+
+def test_brief_deviation_does_not_alert():
+    """Un écart bref (trottoir d'en face, détour de 20 s) n'alerte pas"""
+    route = straight_route()
+    agent = WrongPathAgent(deviation_threshold=50, sustained_seconds=30)
+    agent.set_route(route)
+    for t in range(20):
+        assert not agent.update_position(offset(route[10], north_m=80), t)
+    assert not agent.update_position(route[12], 21)
+
+
+def test_shortcut_is_reacquired_via_grid():
+    """Un saut loin en avant sur l'itinéraire est raccroché par l'index en grille"""
+    route = straight_route(length_m=5000)
+    agent = WrongPathAgent(deviation_threshold=50)
+    agent.set_route(route)
+    agent.update_position(route[0], 0)
+
+    assert not agent.update_position(route[200], 1)
+    assert agent.matched_segment in (199, 200)
+    assert agent.last_distance < 1
+
+
+def test_per_fix_cost_independent_of_route_length():
+    """Coût par fix constant : itinéraire de 2 km ou de 200 km"""
+    timings = {}
+    for length in (2_000, 200_000):
+        route = straight_route(length_m=length, step_m=10)
+        agent = WrongPathAgent(deviation_threshold=50)
+        agent.set_route(route)
+        walk = [offset(route[i], north_m=5) for i in range(0, 190)]
+
+        started = time.perf_counter()
+        for t, point in enumerate(walk):
+            agent.update_position(point, t)
+        timings[length] = (time.perf_counter() - started) / len(walk)
+
+    print(f"🧭 Coût par fix: {timings[2_000] * 1e6:.0f} µs (2 km), {timings[200_000] * 1e6:.0f} µs (200 km)")
+    assert timings[200_000] < 3 * timings[2_000]
+
+
+def test_invalid_routes():
+    """Polylignes invalides ou trop courtes refusées"""
+    agent = WrongPathAgent()
+    assert not agent.set_route('simulation_polyline')
+    assert not agent.set_route([START])
+    assert not agent.update_position(START, 0)
+
+
+if __name__ == "__main__":
+    test_decode_polyline()
+    test_on_route_then_sustained_deviation()
+    test_brief_deviation_does_not_alert()
+    test_shortcut_is_reacquired_via_grid()
+    test_per_fix_cost_independent_of_route_length()
+    test_invalid_routes()
@@ -9,7 +9,6 @@ import logging
 import os
 import socket
 import threading
-import queue
 import json
 import sys
 from pathlib import Path
@@ -33,6 +32,21 @@ gmail_agent = None
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
+from guardian.audio_capture import get_capture
+from guardian.file_transcription import TranscriptionPool, decode_audio
+from guardian.stt_stream import StreamingTranscriber
+from guardian.vad import GatedRecognizer
+from guardian.vosk_models import PoolExhausted, RecognizerPool, get_model
+
+# Transcription de fichiers : les processus workers sont forkés ici, avant que
+# les agents (sonde de disponibilité Gemini...) ne démarrent leurs threads ;
+# le modèle est chargé d'abord pour être hérité par les workers
+VOSK_MODEL_PATH = os.path.join(parent_dir, "models", "vosk-model-small-fr-0.22")
+file_transcriber = None
+if VOSK_AVAILABLE and os.path.exists(VOSK_MODEL_PATH):
+    get_model(VOSK_MODEL_PATH)
+    file_transcriber = TranscriptionPool(VOSK_MODEL_PATH, workers=2)
+
 try:
     
     config_path = os.path.join(parent_dir, 'config', 'api_keys.yaml')
@@ -82,101 +96,111 @@ logger = logging.getLogger(__name__)
 
 # Classe VoiceRecognizer pour Vosk
 class VoiceRecognizer:
-    """Gestionnaire de reconnaissance vocale avec Vosk"""
+    """Gestionnaire de reconnaissance vocale avec Vosk (un reconnaisseur du pool par requête)"""
     
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, pool_size=4, wait_timeout=5.0):
         if model_path is None:
             # Chemin relatif vers le modèle depuis le dossier web
             parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             model_path = os.path.join(parent_dir, "models", "vosk-model-small-fr-0.22")
         self.model_path = model_path
         self.model = None
-        self.rec = None
-        self.audio_queue = queue.Queue()
-        self.is_listening = False
+        self.pool = None
+        self.pool_size = pool_size
+        self.wait_timeout = wait_timeout
+        self._stop_events = set()
         
     def initialize(self):
-        """Initialise le modèle Vosk"""
+        """Initialise le modèle Vosk et le pool de reconnaisseurs"""
         try:
             if not os.path.exists(self.model_path):
                 logger.error(f"Modèle Vosk non trouvé: {self.model_path}")
                 return False
                 
-            self.model = vosk.Model(self.model_path)
-            self.rec = vosk.KaldiRecognizer(self.model, 16000)
+            self.model = get_model(self.model_path)
+            # Chaque reconnaisseur du pool ne décode que les segments de parole
+            self.pool = RecognizerPool(self.model, size=self.pool_size, samplerate=16000,
+                                       factory=lambda: GatedRecognizer(vosk.KaldiRecognizer(self.model, 16000)))
             return True
             
         except Exception as e:
             logger.error(f"Erreur initialisation Vosk: {e}")
             return False
     
-    def audio_callback(self, indata, frames, time, status):
-        """Callback pour capturer l'audio"""
-        if status:
-            logger.warning(f"Audio status: {status}")
-        self.audio_queue.put(bytes(indata))
+    @property
+    def is_listening(self):
+        return bool(self._stop_events)
     
     def listen_for_speech(self, timeout=30, stop_words=['stop', 'arrêt', 'arrête']):
-        """Écoute et reconnaît la parole"""
+        """
+        Écoute et reconnaît la parole
+        
+        Raises:
+            PoolExhausted: aucun reconnaisseur libre dans le délai wait_timeout
+        """
         if not self.model:
             return None
-            
+        
+        with self.pool.checkout(timeout=self.wait_timeout) as rec:
+            return self._listen(rec, timeout, stop_words)
+    
+    def _listen(self, rec, timeout, stop_words):
+        """Décodage du micro (capture partagée, curseur propre à la requête) avec le reconnaisseur emprunté"""
+        stop_event = threading.Event()
+        
         try:
-
-            
-            self.is_listening = True
+            self._stop_events.add(stop_event)
             recognized_text = ""
+            reader = get_capture(16000).reader()
             
-            with sd.RawInputStream(samplerate=16000, blocksize=8000, device=None, 
-                                   dtype='int16', channels=1, callback=self.audio_callback):
-                
-                start_time = time.time()
-                
-                while self.is_listening and (time.time() - start_time) < timeout:
-                    try:
-                        data = self.audio_queue.get(timeout=1)
+            start_time = time.time()
+            
+            while not stop_event.is_set() and (time.time() - start_time) < timeout:
+                try:
+                    data = reader.read(16000, timeout=1)
+                    if data is None:
+                        continue
+                    
+                    if rec.AcceptWaveform(bytes(data)):  # Vosk (cffi) attend des bytes
+                        # Phrase complète reconnue
+                        result = json.loads(rec.Result())
+                        text = result.get('text', '').strip()
                         
-                        if self.rec.AcceptWaveform(data):
-                            # Phrase complète reconnue
-                            result = json.loads(self.rec.Result())
-                            text = result.get('text', '').strip()
+                        if text:
+                            logger.info(f"RECONNU: '{text}'")
+                            recognized_text = text
                             
-                            if text:
-                                logger.info(f"RECONNU: '{text}'")
-                                recognized_text = text
-                                
-                                # Vérifier les mots d'arrêt
-                                if any(stop_word in text.lower() for stop_word in stop_words):
-                                    logger.info("🛑 Mot d'arrêt détecté")
-                                    break
-                                else:
-                                    # Phrase reconnue, on peut s'arrêter
-                                    break
-                        else:
-                            # Reconnaissance partielle
-                            partial = json.loads(self.rec.PartialResult())
-                            partial_text = partial.get('partial', '').strip()
-                            if partial_text:
-                                logger.debug(f"En cours: {partial_text}")
-                                
-                    except queue.Empty:
-                        continue
-                    except Exception as e:
-                        logger.error(f"Erreur reconnaissance: {e}")
-                        break
+                            # Vérifier les mots d'arrêt
+                            if any(stop_word in text.lower() for stop_word in stop_words):
+                                logger.info("🛑 Mot d'arrêt détecté")
+                                break
+                            else:
+                                # Phrase reconnue, on peut s'arrêter
+                                break
+                    else:
+                        # Reconnaissance partielle
+                        partial = json.loads(rec.PartialResult())
+                        partial_text = partial.get('partial', '').strip()
+                        if partial_text:
+                            logger.debug(f"En cours: {partial_text}")
+                            
+                except Exception as e:
+                    logger.error(f"Erreur reconnaissance: {e}")
+                    break
             
-            self.is_listening = False
             logger.info(f"Reconnaissance terminée: '{recognized_text}'")
             return recognized_text if recognized_text else None
             
         except Exception as e:
             logger.error(f"Erreur écoute: {e}")
-            self.is_listening = False
             return None
+        finally:
+            self._stop_events.discard(stop_event)
     
     def stop_listening(self):
-        """Arrête l'écoute"""
-        self.is_listening = False
+        """Arrête toutes les écoutes en cours"""
+        for stop_event in list(self._stop_events):
+            stop_event.set()
 
 def fallback_situation_analysis(situation_text, user_info={}):
     """Analyse de situation de fallback quand Gemini n'est pas disponible"""
@@ -640,6 +664,14 @@ if VOSK_AVAILABLE:
 else:
     logger.warning("Vosk non disponible, reconnaissance vocale désactivée")
 
+# Transcription en continu via WebSocket : un reconnaisseur par client connecté
+# le temps de son flux, pool distinct de celui des requêtes HTTP
+stream_transcriber = None
+if voice_recognizer:
+    stream_transcriber = StreamingTranscriber(RecognizerPool(
+        voice_recognizer.model, size=16, samplerate=16000,
+        factory=lambda: GatedRecognizer(vosk.KaldiRecognizer(voice_recognizer.model, 16000))))
+
 @app.route('/')
 def home():
     """Page d'accueil épurée - Informations utilisateur"""
@@ -865,6 +897,8 @@ def start_vosk_recognition():
                     'method': 'vosk_no_speech'
                 })
                 
+        except PoolExhausted as e:
+            return recognizer_busy_response(e, method='vosk_busy')
         except Exception as e:
             logger.error(f"❌ Erreur lors de la capture Vosk: {e}")
             import traceback
@@ -932,6 +966,65 @@ def handle_emergency_alert(data):
         'timestamp': data.get('timestamp')
     })
 
+def emit_stt_events(events):
+    for name, payload in events:
+        emit(f'stt_{name}', payload)
+
+@socketio.on('stt_start')
+def handle_stt_start(data=None):
+    """Ouvre un flux de transcription : le client envoie ensuite des trames PCM 16 bits mono 16 kHz"""
+    if not stream_transcriber:
+        emit('stt_error', {'error': 'Reconnaissance vocale Vosk non disponible'})
+        return
+    try:
+        stream_transcriber.start(request.sid, (data or {}).get('samplerate'))
+        emit('stt_ready', {'samplerate': stream_transcriber.samplerate,
+                           'max_frame_bytes': stream_transcriber.max_frame_bytes})
+    except PoolExhausted as e:
+        logger.warning(f"⏳ Transcription en continu saturée: {e}")
+        emit('stt_error', {'error': 'Reconnaissance vocale saturée, réessayez dans quelques secondes',
+                           'busy': True, 'retry_after': 2})
+    except ValueError as e:
+        emit('stt_error', {'error': str(e)})
+
+@socketio.on('stt_audio')
+def handle_stt_audio(data):
+    """Trame audio binaire : décodée aussitôt, transcriptions partielles/finales renvoyées"""
+    if not stream_transcriber:
+        return
+    try:
+        emit_stt_events(stream_transcriber.feed(request.sid, data))
+    except KeyError:
+        emit('stt_error', {'error': 'Aucun flux ouvert (envoyer stt_start)'})
+    except (TypeError, ValueError) as e:
+        emit('stt_error', {'error': str(e)})
+
+@socketio.on('stt_stop')
+def handle_stt_stop():
+    """Fin du flux : dernière transcription et libération du reconnaisseur"""
+    if stream_transcriber:
+        emit_stt_events(stream_transcriber.stop(request.sid))
+    emit('stt_stopped', {})
+
+@socketio.on('disconnect')
+def handle_disconnect(reason=None):
+    """Client déconnecté : son reconnaisseur retourne au pool"""
+    if stream_transcriber:
+        stream_transcriber.stop(request.sid)
+
+def recognizer_busy_response(error, **extra):
+    """503 + Retry-After quand tous les reconnaisseurs Vosk sont occupés"""
+    logger.warning(f"⏳ Reconnaissance vocale saturée: {error}")
+    response = jsonify({
+        'success': False,
+        'error': 'Reconnaissance vocale saturée, réessayez dans quelques secondes',
+        'pool': voice_recognizer.pool.stats(),
+        **extra
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = '2'
+    return response
+
 @app.route('/api/vosk/listen', methods=['POST'])
 def vosk_listen():
     """API pour démarrer l'écoute avec Vosk"""
@@ -953,6 +1046,8 @@ def vosk_listen():
             try:
                 result = voice_recognizer.listen_for_speech(timeout=timeout)
                 return result
+            except PoolExhausted:
+                raise
             except Exception as e:
                 logger.error(f"Erreur thread écoute: {e}")
                 return None
@@ -973,6 +1068,8 @@ def vosk_listen():
                 'message': 'Aucun texte reconnu'
             })
             
+    except PoolExhausted as e:
+        return recognizer_busy_response(e)
     except Exception as e:
         logger.error(f"Erreur API Vosk: {e}")
         return jsonify({
@@ -989,6 +1086,9 @@ def vosk_status():
             'available': VOSK_AVAILABLE and voice_recognizer is not None,
             'model_path': voice_recognizer.model_path if voice_recognizer else None,
             'is_listening': voice_recognizer.is_listening if voice_recognizer else False,
+            'pool': voice_recognizer.pool.stats() if voice_recognizer else None,
+            'streaming': stream_transcriber.stats() if stream_transcriber else None,
+            'transcription': file_transcriber.stats() if file_transcriber else None,
             'message': 'Vosk prêt' if voice_recognizer else 'Vosk non disponible'
         })
     except Exception as e:
@@ -1017,66 +1117,52 @@ def process_audio():
                 'error': 'Nom de fichier audio invalide'
             }), 400
         
-        # Utiliser Vosk si disponible
-        if voice_recognizer and hasattr(voice_recognizer, 'recognize_from_file'):
-            try:
-                # Sauvegarder temporairement le fichier
-                import tempfile
-                import os
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                    audio_file.save(temp_file.name)
-                    
-                    # Traiter avec Vosk
-                    transcript = voice_recognizer.recognize_from_file(temp_file.name)
-                    
-                    # Nettoyer le fichier temporaire
-                    os.unlink(temp_file.name)
-                    
-                    if transcript and transcript.strip():
-                        logger.info(f"✅ Transcript audio Vosk: {transcript}")
-                        return jsonify({
-                            'success': True,
-                            'transcript': transcript.strip(),
-                            'method': 'vosk_file_processing',
-                            'language': language
-                        })
-                    else:
-                        return jsonify({
-                            'success': False,
-                            'error': 'Aucune parole détectée dans l\'audio'
-                        })
-                        
-            except Exception as e:
-                logger.error(f"Erreur traitement audio Vosk: {e}")
-                # Continue vers simulation
-        
-        # Simulation intelligente basée sur la taille du fichier
-        logger.warning("Vosk non disponible pour fichiers audio - simulation basée sur métadonnées")
-        
-        file_size = len(audio_file.read())
-        audio_file.seek(0)  # Reset file pointer
-        
-        # Simuler basé sur la taille (plus réaliste)
-        if file_size < 1000:  # Très petit fichier
-            transcript = "Guardian, aidez-moi"
-        elif file_size < 5000:  # Petit fichier
-            transcript = "Guardian, je ne me sens pas bien"
-        elif file_size < 10000:  # Fichier moyen
-            transcript = "Guardian, pouvez-vous me dire où je suis"
-        else:  # Gros fichier
-            transcript = "Guardian, j'ai besoin d'aide pour rentrer chez moi"
-            
-        logger.info(f"📱 Simulation audio réaliste: {transcript} (taille: {file_size} bytes)")
+        if not (file_transcriber and voice_recognizer):
+            return jsonify({
+                'success': False,
+                'error': 'Reconnaissance vocale Vosk non disponible',
+                'message': 'Le système Vosk n\'est pas configuré correctement'
+            }), 503
         
+        try:
+            pcm = decode_audio(audio_file.read())
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 415
+        
+        # Courts : reconnaisseur libre du pool HTTP ; longs ou pool occupé : processus workers
+        result = file_transcriber.transcribe(pcm, timeout=120, inline_pool=voice_recognizer.pool)
+        metrics = {key: result[key] for key in
+                   ('mode', 'audio_seconds', 'decode_seconds', 'rtf', 'wait_seconds', 'queue_depth')}
+        logger.info(f"🗂️ Fichier audio transcrit ({result['mode']}): {result['audio_seconds']:.1f}s, "
+                    f"RTF {result['rtf']:.2f}, file {result['queue_depth']}")
+        
+        if not result['text']:
+            return jsonify({
+                'success': False,
+                'error': 'Aucune parole détectée dans l\'audio',
+                **metrics
+            })
+        
+        logger.info(f"✅ Transcript audio Vosk: {result['text']}")
         return jsonify({
             'success': True,
-            'transcript': transcript,
-            'method': 'audio_simulation',
+            'transcript': result['text'],
+            'method': 'vosk_file_processing',
             'language': language,
-            'note': f'Simulation basée sur audio {file_size} bytes'
+            **metrics
         })
         
+    except PoolExhausted as e:
+        return recognizer_busy_response(e, transcription=file_transcriber.stats())
+    except TimeoutError as e:
+        logger.error(f"Transcription trop longue: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 504
     except Exception as e:
         logger.error(f"Erreur traitement audio: {e}")
         return jsonify({